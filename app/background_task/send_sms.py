@@ -39,7 +39,7 @@ class SmsActivity:
         """
         Send sms to users
         """
-        response = SMSHelper().send_sms_to_many(
+        response = await SMSHelper().send_sms_to_many_async(
             send_to=send_to,
             dlt_content_id=dlt_content_id,
             sms_content=sms_content,
@@ -47,14 +47,15 @@ class SmsActivity:
             sender_name=sender,
             mobile_prefix=mobile_prefix
         )
-        if (template := await DatabaseConfiguration().template_collection.find_one(
-                {"dlt_content_id": dlt_content_id})) is None:
-            template = {}
-        for number, response_data in zip(send_to, response.json()["submitResponses"]):
-            student = await DatabaseConfiguration().studentsPrimaryDetails.find_one(
-                {"basic_details.mobile_number": number}
+        template = await SMSHelper().get_dlt_template(dlt_content_id)
+        students = {
+            student.get("basic_details", {}).get("mobile_number"): student
+            async for student in DatabaseConfiguration().studentsPrimaryDetails.find(
+                {"basic_details.mobile_number": {"$in": list(send_to)}}
             )
-            if student:
+        }
+        for number, response_data in zip(send_to, response.json()["submitResponses"]):
+            if student := students.get(number):
                 try:
                     toml_data = utility_obj.read_current_toml_file()
                     if toml_data.get("testing", {}).get("test") is False:
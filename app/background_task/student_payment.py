@@ -15,6 +15,7 @@ from app.core.log_config import get_logger
 from app.core.utils import utility_obj
 from app.database.configuration import DatabaseConfiguration
 from app.dependencies.oauth import cache_invalidation, is_testing_env
+from app.helpers.campaign.campaign_analytics import CampaignAnalytics
 from app.helpers.promocode_voucher_helper.promocode_vouchers_helper import (
     promocode_vouchers_obj,
 )
@@ -289,6 +290,8 @@ class StudentPaymentActivity:
             )
         ) is not None:
             if application_payment_status != "captured" and status == "captured":
+                await CampaignAnalytics().bump_version(
+                    application.get("college_id"))
                 if (
                     student := await DatabaseConfiguration().studentsPrimaryDetails.find_one(
                         {"_id": application.get("student_id")}
@@ -5,7 +5,7 @@ this file contains all functions regarding user audit trails using celery.
 import pika
 import json
 from app.core.celery_app import celery_app
-from app.core.utils import settings, utility_obj, logger
+from app.core.utils import utility_obj, logger
 from app.database.configuration import DatabaseConfiguration
 
 
@@ -24,7 +24,7 @@ class UserAuditTrail:
         Retrieves user audit messages from RabbitMQ and stores them in MongoDB.
 
         This method performs the following operations:
-        1. Establishes a connection to the RabbitMQ server using the credentials and URL provided in the settings.
+        1. Gets the RabbitMQ channel of the worker process, connection is reused between the tasks.
         2. Declares the 'user_audit_queue' if it does not already exist.
         3. Continuously retrieves messages from the 'user_audit_queue' until no more messages are available.
         4. Processes each message by appending it to a list and acknowledging receipt.
@@ -45,10 +45,7 @@ class UserAuditTrail:
             None
         """
         try:
-            url = (f"amqp://{settings.rmq_username}:{settings.rmq_password}@{settings.rmq_url}:{settings.rmq_port}/"
-                   f"{settings.rmq_host}")
-            connection = pika.BlockingConnection(pika.URLParameters(url))
-            channel = connection.channel()
+            channel = utility_obj.get_sync_rabbitMQ_connection_channel()
             channel.queue_declare(queue=queue_name, durable=True)
             messages = []
             while True:
@@ -0,0 +1,96 @@
+"""
+This file contains celery tasks related to data segments.
+"""
+
+import asyncio
+
+from bson import ObjectId
+
+from app.core.celery_app import celery_app
+from app.core.log_config import get_logger
+from app.core.reset_credentials import Reset_the_settings
+from app.database.database_sync import DatabaseConfigurationSync
+
+logger = get_logger(name=__name__)
+
+
+class DataSegmentCeleryTasks:
+    """
+    Contain celery tasks related to data segments.
+
+    Count of a data segment is refreshed when its stale count is read (see
+    `SegmentCardinality.request_refresh`). Periodic tasks are scheduled by
+    celery beat when it runs (see `beat_schedule` of `celery_app`), a task of
+    college is queued for every configured college hence a college is
+    processed in its own task and a failure of one college doesn't affect
+    others.
+    """
+
+    @staticmethod
+    @celery_app.task(ignore_result=True)
+    def refresh_data_segment_cardinality() -> None:
+        """
+        Queue the refresh of cached count of stale dynamic data segments of
+        all the configured colleges.
+
+        Returns: None
+        """
+        colleges = DatabaseConfigurationSync("master").college_collection.find(
+            {"is_configured": True}, {"_id": 1}
+        )
+        for college in colleges:
+            DataSegmentCeleryTasks.refresh_college_data_segment_cardinality.delay(
+                college_id=str(college.get("_id")))
+
+    @staticmethod
+    @celery_app.task(ignore_result=True)
+    def refresh_college_data_segment_cardinality(college_id: str) -> None:
+        """
+        Refresh the cached count of stale dynamic data segments of a college.
+        Data segments whose cached count is fresh are skipped, so every run
+        only recomputes the segments which are due.
+
+        Params:
+            college_id (str): An unique identifier of college.
+
+        Returns: None
+        """
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.helpers.data_segment.segment_cardinality import SegmentCardinality
+        try:
+            Reset_the_settings().check_college_mapped(college_id=college_id)
+            refreshed = asyncio.run(
+                SegmentCardinality().refresh_stale_segments(college_id))
+            logger.debug(f"Refreshed count of {refreshed} data segments of "
+                         f"college `{college_id}`.")
+        except Exception as error:
+            logger.error(f"An error got while refreshing count of data "
+                         f"segments of college `{college_id}`. Error - {error}")
+
+    @staticmethod
+    @celery_app.task(ignore_result=True)
+    def refresh_segment_cardinality(segment_id: str, college_id: str) -> None:
+        """
+        Refresh the cached count of a data segment, queued when a stale count
+        of the data segment is read.
+
+        Params:
+            segment_id (str): An unique identifier of data segment.
+            college_id (str): An unique identifier of college.
+
+        Returns: None
+        """
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.helpers.data_segment.segment_cardinality import SegmentCardinality
+        try:
+            Reset_the_settings().check_college_mapped(college_id=college_id)
+            segment = DatabaseConfigurationSync().data_segment_collection.find_one(
+                {"_id": ObjectId(segment_id)})
+            if segment:
+                asyncio.run(SegmentCardinality().refresh(
+                    segment, college_id, with_members=True))
+        except Exception as error:
+            logger.error(f"An error got while refreshing count of data "
+                         f"segment `{segment_id}`. Error - {error}")
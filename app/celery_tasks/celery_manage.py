@@ -15,6 +15,7 @@ from app.core.utils import utility_obj, settings
 from app.database.database_sync import DatabaseConfigurationSync
 from app.database.motor_base_singleton import MotorBaseSingleton
 from app.helpers.sms_activity.sms_configuration import SMSHelper
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 from app.helpers.whatsapp_sms_activity.whatsapp_activity import WhatsappHelper
 
 
@@ -93,6 +94,7 @@ class RawDataActivity:
                     each.pop("email")
                     each.pop("mobile_number")
                 temp_data.update({"other_field": each})
+                temp_data.update(SearchKeyHelper().for_raw_data(temp_data))
                 lead_inserted.append(temp_data)
                 successful_lead_count += 1
         if lead_inserted:
@@ -239,52 +241,57 @@ class RawDataActivity:
                     }
                 )
             else:
-                response = WhatsappHelper().send_whatsapp_to_users(
+                results = WhatsappHelper().send_whatsapp_batches(
                     send_to, payload.get("whatsapp_text")
                 )
                 message_list = []
-                for number, response_data in zip(
-                    send_to, response.json()["MESSAGEBACK"]
-                ):
-                    if (
-                        student := DatabaseConfigurationSync().studentsPrimaryDetails.find_one(
-                            {"basic_details.mobile_number": number}
-                        )
-                    ) is not None:
-                        CommunicationLogActivity().add_whatsapp_communication_log(
-                            student_id=str(student.get("_id")),
-                            response=response_data,
-                            data_type="whatsapp",
-                            event_type="whatsapp",
-                            event_status="sent",
-                            event_name=f"mobile number {number}",
-                            action_type=action_type,
-                            template_id=template_id,
-                        )
-                        name = utility_obj.name_can(student.get("basic_details", {}))
-                        StudentActivity().student_timeline(
-                            student_id=str(student.get("_id")),
-                            event_type="Whatsapp",
-                            event_status="Send Whatsapp",
-                            message=f"{name} has send a Whatsapp",
-                            template_id=template_id,
-                            college_id=college_id,
-                        )
+                # Messages of every batch are logged with the numbers sent in
+                # that batch
+                for batch_response, batch_numbers in results:
+                    if batch_response.status_code != 200:
+                        continue
+                    for number, response_data in zip(
+                        batch_numbers, batch_response.json().get("MESSAGEBACK", [])
+                    ):
+                        if (
+                            student := DatabaseConfigurationSync().studentsPrimaryDetails.find_one(
+                                {"basic_details.mobile_number": number}
+                            )
+                        ) is not None:
+                            CommunicationLogActivity().add_whatsapp_communication_log(
+                                student_id=str(student.get("_id")),
+                                response=response_data,
+                                data_type="whatsapp",
+                                event_type="whatsapp",
+                                event_status="sent",
+                                event_name=f"mobile number {number}",
+                                action_type=action_type,
+                                template_id=template_id,
+                            )
+                            name = utility_obj.name_can(student.get("basic_details", {}))
+                            StudentActivity().student_timeline(
+                                student_id=str(student.get("_id")),
+                                event_type="Whatsapp",
+                                event_status="Send Whatsapp",
+                                message=f"{name} has send a Whatsapp",
+                                template_id=template_id,
+                                college_id=college_id,
+                            )
 
-                    message_list.append(
-                        {
-                            "user_name": user.get("user_name"),
-                            "user_id": ObjectId(user.get("_id")),
-                            "send_to": student,
-                            "ip_address": ip_address,
-                            "created_at": datetime.datetime.utcnow(),
-                            "submit_date": response_data.get("GUID").get("SUBMITDATE"),
-                            "wa_sms_content": payload.get("whatsapp_text", ""),
-                            "id": response_data.get("GUID").get("ID"),
-                            "guid": response_data.get("GUID").get("GUID"),
-                            "status": "sent",
-                        }
-                    )
+                        message_list.append(
+                            {
+                                "user_name": user.get("user_name"),
+                                "user_id": ObjectId(user.get("_id")),
+                                "send_to": student,
+                                "ip_address": ip_address,
+                                "created_at": datetime.datetime.utcnow(),
+                                "submit_date": response_data.get("GUID").get("SUBMITDATE"),
+                                "wa_sms_content": payload.get("whatsapp_text", ""),
+                                "id": response_data.get("GUID").get("ID"),
+                                "guid": response_data.get("GUID").get("GUID"),
+                                "status": "sent",
+                            }
+                        )
 
                 # For Billing Dashboard
                 selected_college_id = MotorBaseSingleton.get_instance().master_data.get("college_id")
@@ -292,9 +299,10 @@ class RawDataActivity:
                     {"_id": ObjectId(selected_college_id)}, {"$inc": {"usages.whatsapp_sms_sent": len(message_list)}}
                 )
 
-                DatabaseConfigurationSync().whatsapp_sms_activity.insert_many(
-                    message_list
-                )
+                if message_list:
+                    DatabaseConfigurationSync().whatsapp_sms_activity.insert_many(
+                        message_list
+                    )
 
     @staticmethod
     @celery_app.task(ignore_result=True)
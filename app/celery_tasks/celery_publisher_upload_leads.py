@@ -19,6 +19,8 @@ from app.core.utils import utility_obj
 from app.database.database_sync import DatabaseConfigurationSync
 from app.dependencies.hashing import Hash
 from app.dependencies.oauth import is_testing_env, sync_cache_invalidation
+from app.helpers.campaign.campaign_analytics import CampaignAnalytics
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 from app.helpers.student_curd.student_user_crud_configuration import (
     StudentUserCrudHelper,
 )
@@ -1029,6 +1031,7 @@ class PublisherActivity:
                 data["extra_fields"] = extra_fields
             if imported_id is not None:
                 data["lead_data_id"] = imported_id
+            data.update(SearchKeyHelper().for_student(data))
             # insert data in database
             if (
                     check := DatabaseConfigurationSync().studentsPrimaryDetails.insert_one(
@@ -1039,6 +1042,7 @@ class PublisherActivity:
                 DatabaseConfigurationSync("master").college_collection.update_one(
                     {"_id": ObjectId(college_id)}, {"$inc": {"usages.lead_registered": 1}}
                 )
+                CampaignAnalytics().bump_version_sync(college_id)
                 data = {
                     "id": str(check.inserted_id),
                     "user_name": email,
@@ -1224,6 +1228,7 @@ class PublisherActivity:
                     detail="You have not registered with us, please register.",
                 )
             data["source"] = course_getting.get("source")
+            data.update(SearchKeyHelper().for_student(course_getting))
             if (
                     check := DatabaseConfigurationSync().studentApplicationForms.insert_one(
                         data
@@ -1231,6 +1236,7 @@ class PublisherActivity:
             ) is not None:
                 app_id = check.inserted_id
                 new_app_create = True
+                CampaignAnalytics().bump_version_sync(data.get("college_id"))
 
         data1 = dict()
         data = {
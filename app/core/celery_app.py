@@ -6,9 +6,11 @@ import socket
 import sys
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from kombu.exceptions import KombuError
 
 from app.core.utils import settings, logger
+from app.core.worker_resources import worker_resources
 
 
 def create_celery_app():
@@ -82,9 +84,37 @@ def create_celery_app():
     return celery_app
 
 
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """
+    Initialize the connections of a worker process, connections are reused
+    by the tasks of process.
+    """
+    worker_resources.init_process()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    """
+    Close the connections of a worker process and log the connection churn
+    metrics.
+    """
+    worker_resources.shutdown_process()
+
+
 # Initialize the Celery instance
 celery_app = create_celery_app()
 
+# Periodic tasks, run by celery beat (`celery -A app.core.celery_app beat`)
+# instead of the scheduler of every web worker
+celery_app.conf.beat_schedule = {
+    "refresh-data-segment-cardinality": {
+        "task": "app.celery_tasks.celery_data_segment."
+                "refresh_data_segment_cardinality",
+        "schedule": 30 * 60,
+    },
+}
+
 # List of modules to import that contain Celery tasks
 task_modules = [
     "app.routers.api_v1.routes.student_email_routers",
@@ -93,6 +123,7 @@ task_modules = [
     "app.celery_tasks.celery_add_user_audit_logs",
     "app.celery_tasks.celery_add_user_timeline",
     "app.celery_tasks.celery_communication_log",
+    "app.celery_tasks.celery_data_segment",
     "app.celery_tasks.celery_email_activity",
     "app.celery_tasks.celery_generate_pdf",
     "app.celery_tasks.celery_login_activity",
@@ -24,7 +24,6 @@ import meilisearch
 import pandas as pd
 import pika
 import pytz
-import razorpay
 import redis
 import toml
 from aio_pika import DeliveryMode
@@ -44,6 +43,7 @@ from sqlalchemy.orm import DeclarativeMeta
 from app.core.custom_error import ObjectIdInValid, CustomError, DataNotFoundError
 from app.core.log_config import get_logger
 from app.core.settings.tag_metadata import tags_metadata
+from app.core.worker_resources import worker_resources
 from app.database.master_db_connection import toml_data
 from app.database.motor_base_singleton import MotorBaseSingleton
 
@@ -51,6 +51,12 @@ master_credential = MotorBaseSingleton.get_instance().master_data
 
 logger = get_logger(__name__)
 
+# Login activities waiting to be sent to celery, see
+# `Utility.store_login_activity_helper`.
+LOGIN_ACTIVITY_QUEUE_SIZE = 10000
+_login_activity_queue: asyncio.Queue | None = None
+_login_activity_task: asyncio.Task | None = None
+
 
 def get_new_instance_mastar_data():
     """get new instance of MotorBase class"""
@@ -865,14 +871,11 @@ class Utility:
         payment_mode = details.get("payment_mode", "N/A")
         payment_id = details.get("payment_id", "N/A")
         if payment_mode in ["NA", None]:
-            from app.helpers.college_configuration import CollegeHelper
+            from app.helpers.razorpay_gateway import RazorpayGateway
 
-            headers, x_razorpay_account, client_id, client_secret = (
-                await CollegeHelper().razorpay_header_update_partner(college)
-            )
-            client = razorpay.Client(auth=(client_id, client_secret))
             try:
-                details = client.payment.fetch(payment_id, headers=headers)
+                details = await (await RazorpayGateway.get(college)).call(
+                    "payment", "fetch", payment_id)
             except Exception:
                 details = {}
             from app.helpers.payment_configuration import PaymentHelper
@@ -1705,13 +1708,14 @@ class Utility:
         pattern = r"^\d{10}$"
         return re.match(pattern, phone) is not None
 
-    async def store_login_activity_helper(self, username, ip_address):
+    def publish_login_activity(self, username, ip_address, college_id=None):
         """
-        Get the login activity helper for the current user
+        Send the login activity of user to the celery task which stores it.
 
         params:
             - username (str): Get the current username
-            -ip_address (str): get the current IP address
+            - ip_address (str): get the current IP address
+            - college_id (str | None): Unique identifier of college of student
 
         return:
             - None
@@ -1728,18 +1732,61 @@ class Utility:
                 #  celery work fine.
                 if settings.environment in ["demo"]:
                     login_activity().store_login_activity(
-                        user_name=username, ip_address=ip_address
+                        user_name=username, ip_address=ip_address,
+                        college_id=college_id
                     )
                 else:
                     if not is_testing_env():
                         login_activity().store_login_activity.delay(
-                            user_name=username, ip_address=ip_address
+                            user_name=username, ip_address=ip_address,
+                            college_id=college_id
                         )
         except KombuError as celery_error:
             logger.error(f"Error in sending task to Celery: {celery_error}")
         except Exception as error:
             logger.error(f"General error: {error}")
 
+    async def _login_activity_worker(self):
+        """
+        Publish the queued login activities one by one, publish runs in a
+        thread because broker publish is blocking.
+        """
+        while True:
+            activity = await _login_activity_queue.get()
+            try:
+                await asyncio.to_thread(self.publish_login_activity, *activity)
+            finally:
+                _login_activity_queue.task_done()
+
+    async def store_login_activity_helper(self, username, ip_address,
+                                          college_id=None):
+        """
+        Get the login activity helper for the current user, login activity is
+        queued and stored in background hence login response is not waiting
+        for it.
+
+        params:
+            - username (str): Get the current username
+            - ip_address (str): get the current IP address
+            - college_id (str | None): Unique identifier of college of student
+
+        return:
+            - None
+        """
+        global _login_activity_queue, _login_activity_task
+        if (_login_activity_task is None or _login_activity_task.done()
+                or _login_activity_task.get_loop()
+                is not asyncio.get_running_loop()):
+            _login_activity_queue = asyncio.Queue(
+                maxsize=LOGIN_ACTIVITY_QUEUE_SIZE)
+            _login_activity_task = asyncio.create_task(
+                self._login_activity_worker())
+        try:
+            _login_activity_queue.put_nowait((username, ip_address, college_id))
+        except asyncio.QueueFull:
+            logger.error(f"Login activity queue is full, login activity of "
+                         f"{username} is not stored.")
+
     async def convert_date_to_utc(self, date: str):
         """
         Convert a date to UTC from any format
@@ -2056,117 +2103,16 @@ class Utility:
                 if event == "Data Segment Assignment":
                     data["data_segment_redirect_link"] = data_segment_redirect_link
                     data["data_segment_id"] = data_segment_id
-                inserted = (
-                    await DatabaseConfiguration().notification_collection.insert_one(
-                        data
-                    )
+                # Notification is delivered to the websocket of user by the
+                # notification change stream
+                await DatabaseConfiguration().notification_collection.insert_one(
+                    data
                 )
-                data["_id"] = inserted.inserted_id
-                await self.update_redis(data, str(data.get("send_to")))
         except Exception as error:
             logger.error(
                 f"An error occurred while updating notifications database {error}"
             )
 
-    async def bulk_update_to_redis(self, data: list):
-        """
-        This function is used to process bulk updates to users
-        Params:
-            - data (dict): all notifications data to be processed
-        Returns:
-            None
-        Raises:
-            - Exception: An error occurred when something wrong happen in the code.
-        """
-        try:
-            for notification in data:
-                notification.pop("id")
-                await self.update_redis(notification, str(notification.get("send_to")))
-        except Exception as error:
-            logger.error(f"An error occurred while bulk update in redis: {error}")
-
-    async def update_redis(self, data: dict, counselor_id: str):
-        """
-        This function will update notification details in redis
-        Params:
-            - data (dict): The data which is to be stored in redis
-            - counselor_id (str): The unique id of counselor
-        Returns:
-            None
-        Raises:
-            - Exception: An error occurred when something wrong happen in the code.
-        """
-        from app.dependencies.oauth import get_redis_client, is_testing_env
-
-        if not is_testing_env():
-            r = get_redis_client()
-            data.update(
-                {
-                    "send_to": str(data.get("send_to")),
-                    "student_id": (
-                        str(data.get("student_id")) if data.get("student_id") else ""
-                    ),
-                    "application_id": (
-                        str(data.get("application_id"))
-                        if data.get("application_id")
-                        else ""
-                    ),
-                    "event_datetime": str(data.get("event_datetime")),
-                    "created_at": (
-                        str(data.get("created_at"))
-                        if data.get("created_at")
-                        else str(datetime.datetime.utcnow())
-                    ),
-                    "_id": str(data.get("_id")),
-                }
-            )
-            update_resource_id = data.get("update_resource_id")
-            data_segment_redirect_link = data.get("data_segment_redirect_link")
-            data_segment_id = data.get("data_segment_id")
-            for value, key_name in [
-                (update_resource_id, "update_resource_id"),
-                (data_segment_redirect_link, "data_segment_redirect_link"),
-                (data_segment_id, "data_segment_id")
-            ]:
-                if value:
-                    data.update({key_name: str(value)})
-            key = f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/{counselor_id}_notifications"
-            async with r.pipeline() as pipe:
-                while True:
-                    try:
-                        await pipe.watch(key)
-                        pipe.multi()
-                        try:
-                            data = json.dumps(data)
-                        except Exception as e:
-                            logger.error(f"Some internal error occurred: {e}")
-                            break
-                        if await pipe.rpush(key, data):
-                            await pipe.expire(key, (300 + random.randint(0, 300)))
-                        await pipe.execute()
-                        break
-                    except redis.WatchError as e:
-                        logger.error(f"While storing data in cache got error: {e}")
-                        continue
-                    except redis.TimeoutError as e:
-                        logger.error(f"Timeout while storing data in cache: {e}")
-                        break
-                    except Exception as e:
-                        logger.error(f"Some internal error occurred: {e}")
-                        break
-            connection = await utility_obj.get_rabbitMQ_connection_channel()
-            async with connection:
-                channel = await connection.channel()
-                message_body = "Data published"
-                exchange = await channel.declare_exchange(key, aio_pika.ExchangeType.FANOUT,
-                                                          durable=True)
-                await exchange.publish(
-                    aio_pika.Message(body=message_body.encode()),
-                    routing_key=""
-                )
-                await channel.close()
-            await connection.close()
-
     def get_count_aggregation(self, pipeline, skip=None, limit=None):
         """
         Add an aggregation functions which is taking count all documents
@@ -2380,14 +2326,20 @@ class Utility:
             "message": "Data stored successfully"
         }
 
-    async def cache_roles_and_permissions(self):
+    async def cache_roles_and_permissions(self, role_ids: list | None = None):
         """
-        Fetches all roles and their associated permissions from PostgreSQL and caches them in Redis.
+        Fetches roles and their associated permissions from PostgreSQL and caches them in Redis.
 
         This function:
-        - Queries the database to retrieve roles and their associated permissions.
+        - Queries the database to retrieve the given roles (all the roles when not given) and
+          their associated permissions.
         - Formats the data into a dictionary with role IDs as keys and role details as JSON.
-        - Clears existing cached data in Redis before storing new role-permission mappings.
+        - Writes only the changed fields of the cached hash, roles which no longer exist are
+          removed from it.
+
+        Params:
+            role_ids (list | None): Mongo IDs of the changed roles. All the roles are
+                synchronized when not provided.
 
         Returns:
             dict: A response containing a status code and a message.
@@ -2395,59 +2347,32 @@ class Utility:
         Raises:
             Exception: If any error occurs during database query execution or Redis operations.
         """
-        from app.dependencies.oauth import get_redis_client, is_testing_env
-        from app.database.motor_base import pgsql_conn
-        db = await pgsql_conn.get_db_session()
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.helpers.roles.rbac_cache_sync import RBACCacheSync
         try:
-            sql_query = text("""
-                SELECT 
-                    r.id, r.name, r.description, r.scope, r.mongo_id,
-                    JSONB_BUILD_OBJECT(
-                        'college_permissions', COALESCE(
-                            JSONB_AGG(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL AND p.scope = 'college'
-                        ), '[]'::jsonb),
-                        'global_permissions', COALESCE(
-                            JSONB_AGG(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL AND p.scope = 'global'
-                        ), '[]'::jsonb)
-                    ) AS permissions
-                FROM roles r
-                LEFT JOIN role_permissions rp ON r.id = rp.role_id
-                LEFT JOIN permissions p ON rp.permission_id = p.id
-                GROUP BY r.id
-            """)
-            result_data = await db.execute(sql_query)
-            result = result_data.fetchall()
-            roles_data = {
-                str(row.mongo_id): json.dumps({**row._mapping})
-                for row in result
-            }
-            if not is_testing_env():
-                redis_client = get_redis_client()
-                # Delete existing data
-                await redis_client.delete("roles_permissions")
-                # Store new data in Redis
-                await redis_client.hset("roles_permissions", mapping=roles_data)
+            roles_data = await RBACCacheSync().sync_roles(mongo_ids=role_ids)
             return {
                 "code": 200,
                 "message": "Roles and permissions cached successfully",
                 "data": roles_data
             }
         except Exception as e:
-            await db.rollback()  # Rollback on error
             raise Exception(f"Error caching roles and permissions: {e}")
-        finally:
-            await db.close()
 
-    async def cache_groups_and_permissions(self, data=None):
+    async def cache_groups_and_permissions(self, data=None, group_ids: list | None = None):
         """
         Cache group and permission mappings in Redis.
 
-        If `data` is provided, only that group's data is cached. Otherwise, all group-permission mappings
-        are fetched from the database and cached. Caching is skipped entirely in a testing environment.
+        If `data` is provided, only that group's data is cached. If `group_ids` are provided,
+        only those groups are re-fetched and their cached fields are updated. Otherwise, all
+        group-permission mappings are fetched from the database and only the changed fields
+        are cached. Caching is skipped entirely in a testing environment.
 
         Params:
             data (Optional[Groups]): An optional Groups SQLAlchemy model instance. If provided,
                                      only this group's information will be cached.
+            group_ids (list | None): IDs of the changed groups.
 
         Returns:
             dict: A response dict containing:
@@ -2458,10 +2383,7 @@ class Utility:
         Raises:
             Exception: If an error occurs during the caching process or DB interaction.
         """
-        from app.dependencies.oauth import get_redis_client, is_testing_env
-        from app.database.motor_base import pgsql_conn
-        from app.database.configuration import DatabaseConfiguration
-        db = await pgsql_conn.get_db_session()
+        from app.helpers.roles.rbac_cache_sync import RBACCacheSync, GROUPS_KEY
         try:
             if data:
                 groups_data = {
@@ -2471,66 +2393,26 @@ class Utility:
                         "permissions": [], "users": []
                     })
                 }
+                rbac_cache_sync = RBACCacheSync()
+                if await rbac_cache_sync.write_hash(GROUPS_KEY, groups_data):
+                    await rbac_cache_sync.invalidate_dependents(roles_changed=False)
             else:
-                sql_query = text("""
-                    SELECT 
-                        row_to_json(g) AS group_data,
-                        JSONB_BUILD_OBJECT(
-                            'college_permissions', COALESCE(
-                                JSONB_AGG(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL AND p.scope = 'college'
-                            ), '[]'::jsonb),
-                            'global_permissions', COALESCE(
-                                JSONB_AGG(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL AND p.scope = 'global'
-                            ), '[]'::jsonb)
-                        ) AS permissions
-                    FROM groups g
-                    LEFT JOIN group_permissions gp ON g.id = gp.group_id
-                    LEFT JOIN permissions p ON gp.permission_id = p.id
-                    GROUP BY g.id
-                """)
-                result_data = await db.execute(sql_query)
-                result = result_data.fetchall()
-                pipeline = [
-                    {"$unwind": "$group_ids"},
-                    {"$group": {"_id": "$group_ids",
-                                "user_ids": {"$addToSet": {"$toString": "$_id"}}}}
-                ]
-                group_user_map = await DatabaseConfiguration().user_collection.aggregate(
-                    pipeline).to_list(None)
-                group_to_users = {item["_id"]: item["user_ids"] for item in group_user_map}
-                groups_data = {
-                    str(row.group_data.get("id")): json.dumps(
-                        {**row.group_data, "permissions": row.permissions,
-                         "users": group_to_users.get(row.group_data.get("id"), [])}
-                    )
-                    for row in result
-                }
-            if not is_testing_env():
-                redis_client = get_redis_client()
-                key = "groups_and_permissions"
-                if not data:
-                    # Delete existing data
-                    await redis_client.delete(key)
-                # Store new data in Redis
-                await redis_client.hset(key, mapping=groups_data)
+                groups_data = await RBACCacheSync().sync_groups(group_ids=group_ids)
             return {
                 "code": 200,
                 "message": "Groups and their permissions cached successfully",
                 "data": groups_data
             }
         except Exception as e:
-            await db.rollback()  # Rollback on error
             raise Exception(f"Error caching groups and permissions: {e}")
-        finally:
-            await db.close()
 
     async def cache_permissions(self, collection: str) -> dict[str, Any]:
         """
         Cache permission data from the database into Redis.
 
         This method fetches all permissions from the database, serializes the data,
-        and stores it in a Redis hash under the specified collection. It deletes any
-        existing data in the Redis collection before storing the updated data.
+        and stores it in a Redis hash under the specified collection. Only the changed
+        permissions are written, and permissions which no longer exist are removed.
 
         Params:
             collection (str): The Redis collection name to store the permission data.
@@ -2545,7 +2427,6 @@ class Utility:
         Raises:
             Exception: If any error occurs during the caching process.
         """
-        from app.dependencies.oauth import get_redis_client, is_testing_env
         from app.database.motor_base import pgsql_conn
 
         db = await pgsql_conn.get_db_session()
@@ -2556,12 +2437,11 @@ class Utility:
                 {"id": p.get("id"), "name": p.get("name"), "description": p.get("description"),
                  "scope": p.get("scope")})), result)
         )
-        if not is_testing_env():
-            redis_client = get_redis_client()
-            # Delete existing data
-            await redis_client.delete(collection)
-            # Store new data in Redis
-            await redis_client.hset(collection, mapping=perm_data)
+        await db.close()
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.helpers.roles.rbac_cache_sync import RBACCacheSync
+        await RBACCacheSync().write_hash(collection, perm_data, replace=True)
         return {
             "code": 200,
             "message": "Permissions cached successfully",
@@ -3073,16 +2953,13 @@ class Utility:
             )
             logger.info(f"Added job on Email service Queue")
 
-    def get_sync_rabbitMQ_connection_channel(self):
+    def get_sync_rabbitMQ_connection_channel(self, reconnect: bool = False):
         """
-        Returns rabbitMq connection
+        Returns rabbitMq channel, connection is reused by the process.
+        Connection is re-created when `reconnect` is True.
         """
         url = f"amqp://{settings.rmq_username}:{settings.rmq_password}@{settings.rmq_url}:{settings.rmq_port}/{settings.rmq_host}"
-        connection = pika.BlockingConnection(
-            pika.URLParameters(url)
-        )
-        channel = connection.channel()
-        return channel
+        return worker_resources.get_amqp_channel(url, reconnect=reconnect)
 
     def sync_publish_email_sending_on_queue(self, data, priority=1, cc: bool = False):
         """
@@ -3116,17 +2993,28 @@ class Utility:
                 {"_id": ObjectId(template_id)}
             )
             data["template_details"] = template_details
-        channel = self.get_sync_rabbitMQ_connection_channel()
         queue = f"{settings.aws_env}/{settings.rmq_email_queue}"
-        channel.queue_declare(queue=queue, durable=True, arguments={'x-max-priority': 20})
-        channel.basic_publish(
-            exchange='',
-            routing_key=queue,
-            body=json.dumps(data, default=self.custom_serializer).encode('utf-8'),
-            properties=pika.BasicProperties(
-                delivery_mode=pika.DeliveryMode.Persistent,
-                priority=priority
-            ))
+        body = json.dumps(data, default=self.custom_serializer).encode('utf-8')
+        # Cached connection can be lost between liveness check and publish,
+        # publish is retried once on a new connection
+        for attempt in range(2):
+            try:
+                channel = self.get_sync_rabbitMQ_connection_channel(reconnect=attempt > 0)
+                channel.queue_declare(queue=queue, durable=True, arguments={'x-max-priority': 20})
+                channel.basic_publish(
+                    exchange='',
+                    routing_key=queue,
+                    body=body,
+                    properties=pika.BasicProperties(
+                        delivery_mode=pika.DeliveryMode.Persistent,
+                        priority=priority
+                    ))
+                break
+            except (pika.exceptions.AMQPConnectionError,
+                    pika.exceptions.AMQPChannelError) as error:
+                if attempt:
+                    raise
+                logger.warning(f"Failed to publish on Email service Queue, retrying. Error - {error}")
         logger.info(f"Added job on Email service Queue")
 
     def get_data_segment_details(self, data_segment_ids):
@@ -3294,8 +3182,8 @@ class Utility:
 
         If a specific `role_id` is provided, this function retrieves all descendant role IDs
         from the database for that role and stores them in Redis under the 'role_descendants' hash.
-        If no `role_id` is provided, it computes descendant mappings for all roles and updates Redis
-        with the entire mapping in a single operation.
+        If no `role_id` is provided, it computes descendant mappings for all roles and writes only
+        the changed mappings to Redis.
 
         Params:
             role_id (str | None): Optional Mongo ID of the role. If provided, only that role's
@@ -3369,9 +3257,8 @@ class Utility:
                 data = {"descendant_ids": row.descendant_mongo_ids}
                 redis_mapping[row.root_mongo_id] = json.dumps(data)
                 return_data[row.root_mongo_id] = data["descendant_ids"]
-            if not is_testing_env():
-                await redis_client.delete(redis_key)
-                await redis_client.hset(redis_key, mapping=redis_mapping)
+            from app.helpers.roles.rbac_cache_sync import RBACCacheSync
+            await RBACCacheSync().write_hash(redis_key, redis_mapping, replace=True)
             return return_data
 
     def flatten_features(self, features):
@@ -3741,6 +3628,33 @@ class Utility:
 
         return result
 
+    def get_associated_college_id(self, user: dict) -> str | None:
+        """
+        Get the id of requested college of a user who is associated with
+        colleges.
+
+        Params:
+            user (dict): A dictionary containing the user details.
+
+        Returns:
+            str | None: Id of requested college, None when user is not
+                associated with colleges.
+
+        Raises:
+            CustomError: An error occurred when requested college is not one of
+                the associated colleges of user.
+        """
+        from app.database.motor_base_singleton import MotorBaseSingleton
+        if not user.get("associated_colleges", []):
+            return None
+        college_id_master = str(
+            MotorBaseSingleton.get_instance().master_data.get("college_id"))
+        if college_id_master not in [
+                str(college_id)
+                for college_id in user.get("associated_colleges", [])]:
+            raise CustomError(message="College ID not found in associated colleges.")
+        return college_id_master
+
     async def mapped_feature_permissions(
             self,
             data: dict,
@@ -3756,21 +3670,12 @@ class Utility:
         Returns:
             dict: A dictionary containing the mapped role permissions.
         """
-        from app.database.motor_base_singleton import MotorBaseSingleton
-        master_data = MotorBaseSingleton.get_instance().master_data
         is_college = False
         college_data = {}
         if user.get("associated_colleges", []):
 
-            college_id_master = master_data.get("college_id")
-
-            for college_id in user.get("associated_colleges", []):
-                if str(college_id) == str(college_id_master):
-                    is_college = True
-                    break
-
-            if not is_college:
-                raise CustomError(message="College ID not found in associated colleges.")
+            college_id_master = self.get_associated_college_id(user)
+            is_college = True
 
             college_data = await self.fetch_store_master_screen_features(
                 "college_screen/admin_dashboard", field=str(college_id_master))
@@ -3833,13 +3738,12 @@ class Utility:
 
     async def update_role_features(self, role_id):
         """
-        Updates the cached role features and clears related user dashboard feature caches in Redis.
+        Updates the cached role features and the version of compiled feature permission maps.
 
         This method performs the following steps:
         1. Updates and stores role-specific feature data in Redis using `fetch_store_cache_features`.
-        2. Retrieves all users associated with the specified role from the database.
-        3. Deletes Redis keys for allowed features for each user across both 'admin' and 'student' dashboards,
-           ensuring updated feature permissions take effect.
+        2. Increments the version of feature permission maps, hence maps of all the processes
+           are re-built on next request and updated feature permissions take effect.
 
         Params:
             role_id (str): The ID of the role whose features are being updated.
@@ -3847,21 +3751,12 @@ class Utility:
         Raises:
             HTTPException (400): If any error occurs while updating role features or deleting Redis keys.
         """
-        from app.database.configuration import DatabaseConfiguration
-        from app.dependencies.oauth import get_redis_client
+        from app.dependencies.jwttoken import Authentication
+        from app.helpers.roles.feature_permissions import feature_permission_map
         try:
-            roles_features = await self.fetch_store_cache_features("role_features", role_id,
-                                                                   update_data=True)
-            user_roles = await DatabaseConfiguration().user_collection.find(
-                {"role.role_id": ObjectId(role_id)}).to_list(length=None)
-            redis_client = get_redis_client()
-            if redis_client:
-                key = f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/allowed_features"
-                for user in user_roles:
-                    user_name = user.get("user_name")
-                    for dashboard in ["admin", "student"]:
-                        redis_key = f"{key}/{dashboard}_dashboard/{user_name}"
-                        await redis_client.delete(redis_key)
+            await self.fetch_store_cache_features("role_features", role_id, update_data=True)
+            await feature_permission_map.bump_version()
+            Authentication.invalidate_verified_tokens()
         except Exception as e:
             raise HTTPException(status_code=400,
                                 detail="Something went wrong while updating user allowed features")
@@ -0,0 +1,226 @@
+"""
+This file contains class and functions related to hold the connections of a
+process (e.g., celery worker process) and reuse them between the tasks.
+"""
+
+import os
+import threading
+import time
+
+import pika
+import redis
+
+from app.core.log_config import get_logger
+from app.database.master_db_connection import Master_db
+
+logger = get_logger(name=__name__)
+
+# Master data (college credentials) of a college is re-read after below
+# seconds in a worker process.
+MASTER_DATA_TTL = 300
+MAX_CACHED_MASTER_DATA = 100
+
+
+class WorkerResources:
+    """
+    Hold the connections of a process, one per tenant.
+
+    - Redis connection pool by host, port and password.
+    - AMQP (pika) connection and channel by url and thread, pika connection
+      is not thread-safe.
+    - Master data of a college, only in celery worker processes, hence
+      switching the college of a task does not re-read it from master DB.
+
+    Connections are created lazily and re-created in a forked process. Celery
+    worker process calls `init_process` and `shutdown_process` through
+    `worker_process_init`/`worker_process_shutdown` signals.
+
+    Usage:
+        pool = worker_resources.get_redis_pool(host, port, password)
+        channel = worker_resources.get_amqp_channel(url)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._redis_pools: dict = {}
+        self._amqp_connections: dict = {}
+        self._master_data: dict = {}
+        self.is_worker_process = False
+        self.metrics = self._get_empty_metrics()
+
+    def _get_empty_metrics(self) -> dict:
+        """
+        Get the metrics with zero count.
+        """
+        return {
+            "redis_pools_created": 0,
+            "amqp_connections_created": 0,
+            "amqp_connections_reused": 0,
+            "mongo_clients_created": 0,
+            "master_data_loaded": 0,
+            "master_data_reused": 0,
+        }
+
+    def _check_process(self) -> None:
+        """
+        Drop the connections inherited from the parent process.
+        """
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._redis_pools, self._amqp_connections = {}, {}
+            self._master_data = {}
+            self.metrics = self._get_empty_metrics()
+
+    def record(self, metric: str) -> None:
+        """
+        Increment a connection metric. e.g., "mongo_clients_created"
+        """
+        self.metrics[metric] = self.metrics.get(metric, 0) + 1
+
+    def get_metrics(self) -> dict:
+        """
+        Get the connection churn metrics of the process.
+
+        Returns:
+            dict: A dictionary which contains the metrics.
+                e.g., {"pid": 123, "redis_pools_created": 1, ...}
+        """
+        self._check_process()
+        return {"pid": self._pid, **self.metrics}
+
+    def get_redis_pool(self, host: str, port: int,
+                       password: str) -> redis.ConnectionPool:
+        """
+        Get the redis connection pool of a server.
+        """
+        self._check_process()
+        key = (host, port, password)
+        if (pool := self._redis_pools.get(key)) is None:
+            with self._lock:
+                if (pool := self._redis_pools.get(key)) is None:
+                    pool = redis.ConnectionPool(
+                        host=host,
+                        port=port,
+                        password=password,
+                        health_check_interval=10,
+                        socket_keepalive=True,
+                    )
+                    self._redis_pools[key] = pool
+                    self.record("redis_pools_created")
+        return pool
+
+    def get_amqp_channel(self, url: str, reconnect: bool = False):
+        """
+        Get the AMQP channel of a broker, connection/channel is re-created
+        when it is closed or dead.
+
+        Blocking connection services heartbeats only when it is used, hence
+        pending events of a cached connection are processed before reuse,
+        which raises an error when broker has closed an idle connection.
+
+        Params:
+            url (str): AMQP url of the broker.
+            reconnect (bool): When True, cached connection is closed and a
+                new connection is created. e.g., after a publish failed.
+
+        Returns:
+            BlockingChannel: A pika channel.
+        """
+        self._check_process()
+        key = (url, threading.get_ident())
+        connection, channel = self._amqp_connections.get(key, (None, None))
+        if connection is not None and (reconnect or not self._is_alive(connection)):
+            self._close_amqp_connection(connection)
+            connection, channel = None, None
+        if connection is not None and channel.is_open:
+            self.record("amqp_connections_reused")
+            return channel
+        if connection is not None:
+            channel = connection.channel()
+        else:
+            connection = pika.BlockingConnection(pika.URLParameters(url))
+            channel = connection.channel()
+            self.record("amqp_connections_created")
+        self._amqp_connections[key] = (connection, channel)
+        return channel
+
+    def _is_alive(self, connection) -> bool:
+        """
+        Check whether an AMQP connection is open, heartbeats and other pending
+        events of connection are processed without waiting.
+        """
+        if not connection.is_open:
+            return False
+        try:
+            connection.process_data_events(time_limit=0)
+        except pika.exceptions.AMQPError as error:
+            logger.warning(f"Cached AMQP connection is dead, reconnecting. "
+                           f"Error - {error}")
+            return False
+        return connection.is_open
+
+    def _close_amqp_connection(self, connection) -> None:
+        """
+        Close an AMQP connection, errors of a dead connection are ignored.
+        """
+        try:
+            if connection.is_open:
+                connection.close()
+        except Exception as error:
+            logger.error(f"Failed to close AMQP connection. Error - {error}")
+
+    def get_master_db(self, college_id=None, db_name=None) -> Master_db:
+        """
+        Get the master data of a college. Master data is cached only in
+        worker process.
+        """
+        self._check_process()
+        key = (str(college_id), db_name)
+        master_db, expire_at = self._master_data.get(key, (None, 0))
+        if master_db is not None and expire_at > time.monotonic():
+            self.record("master_data_reused")
+            return master_db
+        master_db = Master_db(college_id=college_id, db_name=db_name)
+        self.record("master_data_loaded")
+        if self.is_worker_process and college_id is not None:
+            if len(self._master_data) >= MAX_CACHED_MASTER_DATA:
+                self._master_data.clear()
+            self._master_data[key] = (
+                master_db, time.monotonic() + MASTER_DATA_TTL)
+        return master_db
+
+    def init_process(self) -> None:
+        """
+        Initialize the resources of a worker process. Season database clients
+        inherited from the parent process are dropped, PyMongo clients are
+        not fork-safe.
+        """
+        from app.database.database_sync import pymongo_base
+
+        self._check_process()
+        self.is_worker_process = True
+        pymongo_base.season_db = {}
+        pymongo_base.reset_connections()
+        logger.info(f"Resources of worker process {self._pid} initialized.")
+
+    def shutdown_process(self) -> None:
+        """
+        Close the connections of a worker process.
+        """
+        from app.database.database_sync import pymongo_base
+
+        for connection, _ in self._amqp_connections.values():
+            self._close_amqp_connection(connection)
+        for pool in self._redis_pools.values():
+            pool.disconnect()
+        for clients in pymongo_base.season_db.values():
+            for client in clients.values():
+                client.close()
+        logger.info(f"Resources of worker process closed. {self.get_metrics()}")
+        self._amqp_connections, self._redis_pools = {}, {}
+        self._master_data = {}
+        pymongo_base.season_db = {}
+
+
+worker_resources = WorkerResources()
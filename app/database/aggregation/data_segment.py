@@ -47,6 +47,7 @@ class DataSegmentPipeline:
                     "updated_on": 1,
                     "data_count": 1,
                     "count_at_origin": 1,
+                    "cardinality": 1,
                     "status": {
                         "$cond": [{"$eq": ["$enabled", True]}, "Active", "Closed"]
                     },
@@ -257,12 +258,15 @@ class DataSegment(DataSegmentPipeline):
                 total_data = documents.get("totalCount")[0].get("count")
             except IndexError:
                 total_data = 0
-            # Todo - We can improvement below statement if possible
+            paginated_results = documents.get("paginated_results", [])
+            resolver = await DataSegmentHelper().get_reference_resolver(
+                paginated_results)
             data = [
                 await DataSegmentHelper().data_helper(
-                    document, college_id, data_segments=data_segments
+                    document, college_id, data_segments=data_segments,
+                    resolver=resolver
                 )
-                for document in documents.get("paginated_results", [])
+                for document in paginated_results
             ]
         return total_data, data
 
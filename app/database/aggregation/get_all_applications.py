@@ -18,6 +18,12 @@ class Application:
     Contains functions related to application activities.
     """
 
+    # Top-level fields added by lookups which are read by the columns of
+    # application/lead rows (see `get_data_based_on_condition`), a lazy lookup
+    # of advance filter which adds one of them is always added.
+    column_lookup_fields = {"student_education_details", "lead_details",
+                            "course_details"}
+
     async def get_application_project_stage_info(self):
         """
         Get the project stage information for application collection.
@@ -254,8 +260,6 @@ class Application:
                 pipeline, payload=payload
             )
         if advance_filters:
-            pipeline = await self.apply_lookup_on_communication_log(pipeline)
-            pipeline = await self.apply_lookup_on_queries(pipeline)
             pipeline = await AdvanceFilterHelper().apply_advance_filter(
                 advance_filters,
                 pipeline,
@@ -265,6 +269,11 @@ class Application:
                 lead_followup="lead_details",
                 communication_log="communication_log",
                 queries="queries",
+                lazy_lookups=[
+                    await self.apply_lookup_on_communication_log([]),
+                    await self.apply_lookup_on_queries([]),
+                ],
+                required_fields=self.column_lookup_fields,
             )
         lead_stage_info = payload.get("lead_name", [])
         if lead_stage_info:
@@ -1717,14 +1726,9 @@ class Application:
             pipeline = await self.course_pipeline(pipeline)
             pipeline = await self.apply_lookup_on_student_secondary(pipeline)
             if advance_filters:
-                check = str(advance_filters)
                 pipeline = await self.apply_lookup_on_leadfollowup(
                     pipeline, payload=payload
                 )
-                pipeline = await self.apply_lookup_on_communication_log(
-                    pipeline)
-                if "queries" in check:
-                    pipeline = await self.apply_lookup_on_queries(pipeline)
                 pipeline = await AdvanceFilterHelper().apply_advance_filter(
                     advance_filters,
                     pipeline,
@@ -1734,6 +1738,11 @@ class Application:
                     lead_followup="lead_details",
                     communication_log="communication_log",
                     queries="queries",
+                    lazy_lookups=[
+                        await self.apply_lookup_on_communication_log([]),
+                        await self.apply_lookup_on_queries([]),
+                    ],
+                    required_fields=self.column_lookup_fields,
                 )
             pipeline = self.apply_twelve_board_form_initiated_application_filling_stage(
                 form_initiated,
@@ -1807,17 +1816,28 @@ class Application:
             pipeline[0].get("$match", {}).update(
                 {"current_stage": {"$gte": 2}})
         if payload.get("application_filling_stage"):
-            match_stage = pipeline[0].get("$match", {})
-            if "$or" in match_stage:
-                match_stage.update({"$and": [
-                    {"$or": payload.get("application_filling_stage", [])},
-                    {"$or": match_stage.pop("$or")}]})
-            else:
-                match_stage.update(
-                    {"$or": payload.get("application_filling_stage", [])}
-                )
+            self.add_or_filter(pipeline[0].get("$match", {}),
+                               payload.get("application_filling_stage", []))
         return pipeline
 
+    def add_or_filter(self, match_stage: dict, conditions: list) -> None:
+        """
+        Add the `$or` conditions in the match stage without replacing the
+        existing `$or`/`$and` conditions of it.
+
+        Params:
+            - match_stage (dict): A match stage which want to update.
+            - conditions (list): A list of conditions, any one of them must
+                match.
+        """
+        if "$or" not in match_stage and "$and" not in match_stage:
+            match_stage["$or"] = conditions
+            return
+        and_conditions = [{"$or": conditions}, *match_stage.get("$and", [])]
+        if "$or" in match_stage:
+            and_conditions.append({"$or": match_stage.pop("$or")})
+        match_stage["$and"] = and_conditions
+
     async def course_pipeline(self, pipeline: list) -> list:
         pipeline.extend(
             [
@@ -2129,12 +2149,8 @@ class Application:
                          "spec_name1": spec_name}
                     )
             if course_filter:
-                match_stage = pipeline[0].get("$match", {})
-                if "$or" in match_stage:
-                    match_stage.update({"$and": [{"$or": course_filter}, {
-                        "$or": match_stage.pop("$or")}]})
-                else:
-                    match_stage.update({"$or": course_filter})
+                self.add_or_filter(pipeline[0].get("$match", {}),
+                                   course_filter)
         return pipeline
 
     def apply_payment_status_filter(
@@ -2187,17 +2203,8 @@ class Application:
                 if "refunded" in payment_status:
                     payment_data.append({"payment_info.status": "refunded"})
             if payment_data:
-                match_stage = pipeline[0].get("$match", {})
-                if "$and" in match_stage:
-                    multiple_stages = [{
-                        "$or": payment_data}] + match_stage.pop(
-                        "$and")
-                    match_stage.update({"$and": multiple_stages})
-                elif "$or" in match_stage:
-                    match_stage.update({"$and": [{"$or": payment_data}, {
-                        "$or": match_stage.pop("$or")}]})
-                else:
-                    match_stage.update({"$or": payment_data})
+                self.add_or_filter(pipeline[0].get("$match", {}),
+                                   payment_data)
         return pipeline
 
     def apply_is_verify_filter(self, pipeline: list, payload: dict):
@@ -2476,10 +2483,6 @@ class Application:
             ]
         )
         if advance_filters:
-            pipeline = await self.apply_lookup_on_communication_log(pipeline)
-            check = str(advance_filters)
-            if "queries" in check:
-                pipeline = await self.apply_lookup_on_queries(pipeline)
             pipeline = await AdvanceFilterHelper().apply_advance_filter(
                 advance_filters,
                 pipeline,
@@ -2489,6 +2492,11 @@ class Application:
                 lead_followup="lead_details",
                 communication_log="communication_log",
                 queries="queries",
+                lazy_lookups=[
+                    await self.apply_lookup_on_communication_log([]),
+                    await self.apply_lookup_on_queries([]),
+                ],
+                required_fields=self.column_lookup_fields,
             )
         if payload.get("counselor_id"):
             pipeline[0].get("$match", {}).update(
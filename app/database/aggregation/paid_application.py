@@ -110,12 +110,6 @@ class PaidApplication:
             pipeline = await application_obj.apply_lookup_on_leadfollowup(
                 pipeline=pipeline, payload=payload
             )
-            pipeline = await application_obj.apply_lookup_on_communication_log(
-                pipeline=pipeline
-            )
-            check = str(advance_filters)
-            if "queries" in check:
-                pipeline = await application_obj.apply_lookup_on_queries(pipeline)
             pipeline = await AdvanceFilterHelper().apply_advance_filter(
                 advance_filters,
                 pipeline,
@@ -125,6 +119,11 @@ class PaidApplication:
                 lead_followup="lead_details",
                 communication_log="communication_log",
                 queries="queries",
+                lazy_lookups=[
+                    await application_obj.apply_lookup_on_communication_log([]),
+                    await application_obj.apply_lookup_on_queries([]),
+                ],
+                required_fields=application_obj.column_lookup_fields,
             )
         pipeline = self.apply_twelve_score_sort_and_application_filling_stage(
             twelve_score_sort=twelve_score_sort, pipeline=pipeline, payload=payload
@@ -9,6 +9,7 @@ from app.core.utils import utility_obj, settings
 from app.database.configuration import DatabaseConfiguration
 from app.helpers.report.update_report_status import ReportStatusHelper
 from app.helpers.report.report_configuration import ReportHelper
+from app.helpers.reference_resolver import ReferenceResolver
 from app.s3_events.s3_events_configuration import get_download_url
 import boto3
 from pathlib import Path, PurePath
@@ -55,7 +56,6 @@ class Report:
         """
         Get reports data
         """
-        from app.dependencies.oauth import get_collection_from_cache, store_collection_in_cache
         pipeline.append(
             {
                 "$facet": {
@@ -66,12 +66,17 @@ class Report:
         )
         result = DatabaseConfiguration().report_collection.aggregate(pipeline)
         reports, total_data = [], 0
-        states = await get_collection_from_cache(collection_name="states")
         async for documents in result:
             try:
                 total_data = documents.get("totalCount")[0].get("count")
             except IndexError:
                 total_data = 0
+            resolver = ReferenceResolver()
+            for data in documents.get("paginated_results"):
+                payload = data.get("payload") or {}
+                resolver.add("users", payload.get("counselor_id", [])).add(
+                    "states", payload.get("state_code", []))
+            await resolver.resolve()
             for data in documents.get("paginated_results"):
                 time_difference = datetime.utcnow() - data.get("requested_on")
                 time = time_difference.total_seconds() / 60
@@ -105,26 +110,12 @@ class Report:
                         {'schedule_type': data.get('schedule_type'),
                          'schedule_value': data.get('schedule_value')})
                 if data.get("payload"):
-                    counselor_names, state_names = [], []
-                    for item in data.get('payload', {}).get('counselor_id',
-                                                            []):
-                        counselor_names.append(utility_obj.name_can(
-                            await DatabaseConfiguration().user_collection.find_one(
-                                {'_id': ObjectId(item)})))
-                    for state_code in data.get('payload', {}).get('state_code',
-                                                                  []):
-                        if states:
-                            state = utility_obj.search_for_document_two_fields(states,
-                                                                               field1="state_code",
-                                                                               field1_search_name=str(state_code).upper(),
-                                                                               field2="country_code",
-                                                                               field2_search_name="IN"
-                                                                               )
-                        else:
-                            state = await DatabaseConfiguration().state_collection.find_one(
-                                {'state_code': str(state_code).upper(),
-                                 'country_code': "IN"})
-                        state_names.append(state.get('name'))
+                    counselor_names = [
+                        resolver.user_name(item) for item in
+                        data.get('payload', {}).get('counselor_id', [])]
+                    state_names = [
+                        resolver.state_name(state_code) for state_code in
+                        data.get('payload', {}).get('state_code', [])]
                     data['payload']['counselor_names'] = counselor_names
                     data['payload']['state_names'] = state_names
                     report_data.update(
@@ -195,9 +186,6 @@ class Report:
                     }
                 )
                 reports.append(report_data)
-        if not states:
-            collection = await DatabaseConfiguration().state_collection.aggregate([]).to_list(None)
-            await store_collection_in_cache(collection, collection_name="states")
         return reports, total_data
 
     async def current_user_reports(
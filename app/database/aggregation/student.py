@@ -238,13 +238,6 @@ class Student:
             },
         ]
         if advance_filters:
-            check = str(advance_filters)
-            pipeline = await application_obj.apply_lookup_on_student_secondary(
-                pipeline, field="_id"
-            )
-            pipeline = await application_obj.apply_lookup_on_communication_log(pipeline)
-            if "queries" in check:
-                pipeline = await application_obj.apply_lookup_on_queries(pipeline)
             pipeline = await AdvanceFilterHelper().apply_advance_filter(
                 advance_filters,
                 pipeline,
@@ -254,6 +247,13 @@ class Student:
                 lead_followup="lead_details",
                 communication_log="communication_log",
                 queries="queries",
+                lazy_lookups=[
+                    await application_obj.apply_lookup_on_student_secondary(
+                        [], field="_id"),
+                    await application_obj.apply_lookup_on_communication_log([]),
+                    await application_obj.apply_lookup_on_queries([]),
+                ],
+                required_fields=application_obj.column_lookup_fields,
             )
         if start_date not in ["", None] and end_date not in ["", None]:
             pipeline[0].get("$match", {}).update(
@@ -636,7 +636,6 @@ class Student:
             pipeline, field="_id"
         )
         if advance_filters:
-            check = str(advance_filters)
             pipeline.append({
                 "$addFields": {
                     "lead_age": {
@@ -655,13 +654,6 @@ class Student:
                     }
                 }
             })
-            if "queries" in check:
-                pipeline = await application_obj.apply_lookup_on_queries(
-                    pipeline, local_field="_id"
-                )
-            pipeline = await application_obj.apply_lookup_on_communication_log(
-                pipeline, local_field="_id"
-            )
             pipeline = await AdvanceFilterHelper().apply_advance_filter(
                 advance_filters,
                 pipeline,
@@ -671,6 +663,13 @@ class Student:
                 lead_followup="lead_details",
                 communication_log="communication_log",
                 queries="queries",
+                lazy_lookups=[
+                    await application_obj.apply_lookup_on_queries(
+                        [], local_field="_id"),
+                    await application_obj.apply_lookup_on_communication_log(
+                        [], local_field="_id"),
+                ],
+                required_fields=application_obj.column_lookup_fields,
             )
             if collection_index is not None:
                 if filter_index is not None:
@@ -54,11 +54,33 @@ async def check_connection(some_data: DBConfigModel):
 
 
 class DatabaseConfiguration:
+    # Collection handles of a season database, shared by all the instances
+    # which use the same season database.
+    # e.g., {id(season_database): {"season_database": ..., "raw_data": ...}}
+    _collection_handles = {}
+
     def __init__(self, season=None):
         self.season_database = SeasonConnectionManager(season=season).get_db_client()
         self.master_database = master_database
-        self.pgsql_database = pgsql_conn.get_sqlalchemy_session()
-        self.initialize()
+        handles = self._collection_handles.get(id(self.season_database))
+        if handles and handles.get("season_database") is self.season_database:
+            self.__dict__.update(handles)
+        else:
+            self.initialize()
+            if len(self._collection_handles) >= 100:
+                # Season databases are reconnected after cache reset, drop
+                # the handles of old connections.
+                self._collection_handles.clear()
+            self._collection_handles[id(self.season_database)] = dict(
+                self.__dict__)
+
+    @property
+    def pgsql_database(self):
+        """
+        Get a PostgreSQL session context, session is created only when it is
+        used hence Mongo-only requests never touch PostgreSQL.
+        """
+        return pgsql_conn.get_sqlalchemy_session()
 
     def initialize(self):
         self.user_collection = self.master_database.users
@@ -85,6 +107,7 @@ class DatabaseConfiguration:
         self.state_collection = self.master_database.states
         self.city_collection = self.master_database.cities
         self.cache_invalidations = self.master_database.cache_invalidations
+        self.import_report_collection = self.master_database.import_reports
         self.Diploma_Inventory = self.master_database.Diploma_Inventory
         self.comments_collection = self.season_database.query_comments
         self.college_form_details = self.master_database.application_form_details
@@ -9,6 +9,7 @@ from pymongo.database import Database
 
 from app.core.log_config import get_logger
 from app.core.utils import settings, utility_obj
+from app.core.worker_resources import worker_resources
 from app.database.master_db_connection import singleton_client, \
     CreateConnection
 from app.database.motor_base_singleton import MotorBaseSingleton
@@ -143,6 +144,7 @@ class PyMongoBase:
 
         # Create new connection
         logger.info("Creating new season sync client connection")
+        worker_resources.record("mongo_clients_created")
         season_client = self.get_client_uri(
             credentials.get("username"),
             credentials.get("password"),
@@ -10,7 +10,9 @@ import toml
 from fastapi.exceptions import HTTPException
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo.errors import NetworkTimeout, ConnectionFailure
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, \
+    AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.background_task_logging import background_task_wrapper
 from app.core.log_config import get_logger
@@ -439,7 +441,59 @@ class SeasonConnectionManager:
             return motor_base.season_db[college_id][self.season]
 
 
+# Engine options of PostgreSQL by environment, an option can be overridden
+# with the same key in `pgsql_db` section of config. e.g., pgsql_pool_size = 20
+PGSQL_ENGINE_OPTIONS = {
+    "default": {
+        "pool_size": 10, "max_overflow": 5, "pool_timeout": 30,
+        "pool_recycle": 3600, "pool_pre_ping": True,
+        "statement_cache_size": 100, "echo": False,
+    },
+    "development": {"pool_size": 5, "max_overflow": 5},
+    "demo": {"pool_size": 2, "max_overflow": 2},
+    "testing": {"pool_size": 2, "max_overflow": 2, "pool_pre_ping": False},
+}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Connection pool of PostgreSQL engine which records the checkouts and
+    the time spent waiting for a connection.
+    """
+
+    metrics: dict = {}
+
+    def _do_get(self):
+        start = time.monotonic()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics["checkout_timeouts"] = self.metrics.get(
+                "checkout_timeouts", 0) + 1
+            raise
+        wait_time = time.monotonic() - start
+        self.metrics["checkouts"] = self.metrics.get("checkouts", 0) + 1
+        self.metrics["total_wait_time"] = self.metrics.get(
+            "total_wait_time", 0) + wait_time
+        self.metrics["max_wait_time"] = max(
+            self.metrics.get("max_wait_time", 0), wait_time)
+        return connection
+
+
 class PostgresConnection:
+    """
+    Manages PostgreSQL engine and sessions.
+
+    Engine (and pool) is created on first use, hence a process or request
+    which never queries PostgreSQL does not open a connection. Pool size,
+    overflow, pre-ping, statement cache and SQL logging are taken from
+    `PGSQL_ENGINE_OPTIONS` of the environment.
+
+    Usage:
+        async with pgsql_conn.get_sqlalchemy_session() as session:
+            await session.execute(...)
+    """
+
     def __init__(self):
         """
         Initialize PostgreSQL connection parameters.
@@ -453,25 +507,92 @@ class PostgresConnection:
             parts[-1] = "test"
             self.database_url = "/".join(parts)
 
-        self.engine_generate = create_async_engine(
-            self.database_url, pool_size=10, max_overflow=5,
-            pool_timeout=30, pool_recycle=3600, pool_pre_ping=True,
-            echo=True)
+        self._engine = None
+        self._async_session = None
+        self.metrics = InstrumentedQueuePool.metrics = self._get_empty_metrics()
 
-        self.async_session = async_sessionmaker(
-            self.engine_generate, class_=AsyncSession, expire_on_commit=False)
+    def _get_empty_metrics(self) -> dict:
+        """
+        Get the pool metrics with zero count.
+        """
+        return {
+            "engines_created": 0,
+            "checkouts": 0,
+            "checkout_timeouts": 0,
+            "total_wait_time": 0,
+            "max_wait_time": 0,
+        }
+
+    def get_engine_options(self) -> dict:
+        """
+        Get the engine options of current environment.
+
+        Returns:
+            dict: A dictionary which contains engine options.
+                e.g., {"pool_size": 10, "max_overflow": 5, ...}
+        """
+        environment = ("testing" if toml_data["testing"]["test"]
+                       else settings.environment)
+        options = {**PGSQL_ENGINE_OPTIONS["default"],
+                   **PGSQL_ENGINE_OPTIONS.get(environment, {})}
+        for key in options:
+            value = settings.pgsql_db_credentials.get(f"pgsql_{key}")
+            if value is not None:
+                options[key] = type(options[key])(value)
+        return options
+
+    @property
+    def engine_generate(self) -> AsyncEngine:
+        """
+        Get the engine of PostgreSQL, engine is created on first use.
+        """
+        if self._engine is None:
+            options = self.get_engine_options()
+            statement_cache_size = options.pop("statement_cache_size")
+            self._engine = create_async_engine(
+                self.database_url, poolclass=InstrumentedQueuePool,
+                connect_args={
+                    "prepared_statement_cache_size": statement_cache_size},
+                **options)
+            self.metrics["engines_created"] += 1
+            logger.info(f"PostgreSQL engine created with pool size "
+                        f"{options.get('pool_size')}")
+        return self._engine
+
+    @property
+    def async_session(self) -> async_sessionmaker:
+        """
+        Get the session factory of PostgreSQL.
+        """
+        if self._async_session is None:
+            self._async_session = async_sessionmaker(
+                self.engine_generate, class_=AsyncSession, expire_on_commit=False)
+        return self._async_session
+
+    def get_metrics(self) -> dict:
+        """
+        Get the pool metrics of the process.
+
+        Returns:
+            dict: A dictionary which contains the metrics.
+                e.g., {"engines_created": 1, "checkouts": 10,
+                "total_wait_time": 0.02, "pool": "Pool size: 10 ..."}
+        """
+        return {**self.metrics,
+                "pool": self._engine.pool.status() if self._engine else None}
 
     @asynccontextmanager
     async def get_sqlalchemy_session(self):
         """
         Provides an asynchronous session for FastAPI dependency injection.
+        Connection is checked out from the pool on first query of session,
+        session is committed only when a transaction is started.
         """
         async with self.async_session() as session:
             try:
-                logger.info("Establishing PostgreSQL connection")
                 yield session
-                await session.commit()
-                logger.info("PostgreSQL connection created successfully")
+                if session.in_transaction():
+                    await session.commit()
             except Exception as e:
                 await session.rollback()
                 raise e
@@ -489,5 +610,13 @@ class PostgresConnection:
             logger.error(f"Failed to create PostgresSQL session: {e}")
             raise
 
+    async def dispose(self) -> None:
+        """
+        Close the connections of pool, when engine is created.
+        """
+        if self._engine is not None:
+            await self._engine.dispose()
+            logger.info(f"PostgresSQL connection closed. {self.get_metrics()}")
+
 
 pgsql_conn = PostgresConnection()
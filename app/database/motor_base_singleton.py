@@ -1,4 +1,4 @@
-from app.database.master_db_connection import Master_db
+from app.core.worker_resources import worker_resources
 
 
 class MotorBaseSingleton:
@@ -36,8 +36,8 @@ class MotorBaseSingleton:
         if MotorBaseSingleton.__instance is not None:
             raise Exception("This class is a singleton!")
         else:
-            MotorBaseSingleton.__instance = Master_db(college_id=college_id,
-                                                      db_name=db_name)
+            MotorBaseSingleton.__instance = worker_resources.get_master_db(
+                college_id=college_id, db_name=db_name)
 
     @staticmethod
     def clear_instance():
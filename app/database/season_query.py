@@ -0,0 +1,201 @@
+"""
+This file contains class and functions related to run the same query over
+multiple season databases.
+"""
+
+import asyncio
+from functools import cmp_to_key
+
+from app.core.log_config import get_logger
+from app.database.configuration import DatabaseConfiguration
+
+logger = get_logger(name=__name__)
+
+
+class SeasonQuery:
+    """
+    Run the same query over multiple seasons concurrently and merge the
+    results, useful for the season comparison and all time data.
+
+    Collection handles of season databases are reused across calls (see
+    `DatabaseConfiguration`), hence creating an instance is cheap.
+
+    Usage:
+        season_query = SeasonQuery(["season_id_1", "season_id_2"])
+        leads = await season_query.aggregate(
+            "studentsPrimaryDetails", pipeline, sort=[("created_at", -1)],
+            limit=10)
+        counts = await season_query.group_sum(
+            "studentApplicationForms", group_pipeline)
+    """
+
+    def __init__(self, seasons: list | None = None):
+        """
+        Params:
+            seasons (list | None): A list which contains season ids. Current
+                season is used when seasons not provided.
+                e.g., ["season_id_1", "season_id_2"]
+        """
+        self.seasons = list(dict.fromkeys(seasons or [None]))
+
+    def get_collection(self, season: str | None, collection_name: str):
+        """
+        Get the collection handle of a season.
+
+        Params:
+            season (str | None): An unique identifier of season.
+            collection_name (str): Attribute name of the collection in
+                `DatabaseConfiguration`. e.g., "studentsPrimaryDetails"
+
+        Returns:
+            A collection handle of the season database.
+        """
+        return getattr(DatabaseConfiguration(season=season), collection_name)
+
+    async def _aggregate_season(
+            self, season: str | None, collection_name: str, pipeline: list
+    ) -> list:
+        """
+        Run the aggregation pipeline on a season and add season id in every
+        document of the result.
+        """
+        result = await self.get_collection(
+            season, collection_name).aggregate(pipeline).to_list(None)
+        for document in result:
+            document.setdefault("season", season)
+        return result
+
+    async def _fan_out(self, collection_name: str, pipeline: list) -> list:
+        """
+        Run the aggregation pipeline on all the seasons concurrently.
+
+        Returns:
+            list: A list which contains result of every season, in the order
+                of seasons.
+        """
+        return await asyncio.gather(
+            *[
+                self._aggregate_season(season, collection_name, list(pipeline))
+                for season in self.seasons
+            ]
+        )
+
+    @staticmethod
+    def _compare(sort: list):
+        """
+        Get the compare function which compares two documents by the sort
+        specification, documents having missing value come last.
+        """
+
+        def compare(first: dict, second: dict) -> int:
+            for field, direction in sort:
+                first_value, second_value = first.get(field), second.get(field)
+                if first_value == second_value:
+                    continue
+                if first_value is None:
+                    return 1
+                if second_value is None:
+                    return -1
+                result = -1 if first_value < second_value else 1
+                return result if direction == 1 else -result
+            return 0
+
+        return compare
+
+    async def aggregate(
+            self,
+            collection_name: str,
+            pipeline: list,
+            sort: list | None = None,
+            skip: int = 0,
+            limit: int | None = None,
+    ) -> list:
+        """
+        Run the aggregation pipeline on all the seasons and merge the results
+        into one list.
+
+        Params:
+            collection_name (str): Attribute name of the collection in
+                `DatabaseConfiguration`. e.g., "studentsPrimaryDetails"
+            pipeline (list): An aggregation pipeline. Pipeline should sort and
+                limit the documents to `skip + limit` for the pagination,
+                results of seasons are re-sorted after merge.
+            sort (list | None): A list which contains sort specification.
+                e.g., [("created_at", -1), ("_id", -1)]
+            skip (int): Number of documents to skip from the merged result.
+            limit (int | None): Maximum number of documents in the merged
+                result.
+
+        Returns:
+            list: Merged documents of all the seasons, every document has the
+                field `season`.
+        """
+        documents = [
+            document
+            for result in await self._fan_out(collection_name, pipeline)
+            for document in result
+        ]
+        if sort:
+            documents.sort(key=cmp_to_key(self._compare(sort)))
+        if limit is not None:
+            return documents[skip: skip + limit]
+        return documents[skip:]
+
+    async def count(self, collection_name: str, query: dict) -> int:
+        """
+        Get the count of documents which match the query in all the seasons.
+
+        Params:
+            collection_name (str): Attribute name of the collection in
+                `DatabaseConfiguration`. e.g., "studentsPrimaryDetails"
+            query (dict): A query to filter the documents.
+
+        Returns:
+            int: Total count of documents.
+        """
+        counts = await asyncio.gather(
+            *[
+                self.get_collection(season, collection_name).count_documents(
+                    query)
+                for season in self.seasons
+            ]
+        )
+        return sum(counts)
+
+    async def group_sum(
+            self, collection_name: str, pipeline: list, key: str = "_id"
+    ) -> list:
+        """
+        Run the `$group` aggregation pipeline on all the seasons and sum the
+        numeric fields of groups which have the same key.
+
+        Params:
+            collection_name (str): Attribute name of the collection in
+                `DatabaseConfiguration`. e.g., "studentApplicationForms"
+            pipeline (list): An aggregation pipeline which ends with `$group`
+                stage having counts/sums. e.g.,
+                [{"$group": {"_id": "$source", "count": {"$sum": 1}}}]
+            key (str): Name of the field which identifies the group.
+
+        Returns:
+            list: A list which contains merged groups.
+                e.g., [{"_id": "google", "count": 20}]
+        """
+        groups = {}
+        for result in await self._fan_out(collection_name, pipeline):
+            for document in result:
+                document.pop("season", None)
+                group_key = str(document.get(key))
+                if group_key not in groups:
+                    groups[group_key] = document
+                    continue
+                group = groups[group_key]
+                for field, value in document.items():
+                    if field == key:
+                        continue
+                    if isinstance(value, (int, float)) and not isinstance(
+                            value, bool):
+                        group[field] = (group.get(field) or 0) + value
+                    else:
+                        group.setdefault(field, value)
+        return list(groups.values())
@@ -1,10 +1,25 @@
 """
 This file contain class and functions related to hash password and verify hash password
 """
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, hence hashing runs in a bounded thread pool
+# instead of blocking the event loop.
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+# Maximum number of hash/verify operations running or waiting for a worker,
+# further operations are rejected instead of queueing behind them.
+MAX_PENDING_HASHES = HASH_WORKERS * 16
+_hash_executor = ThreadPoolExecutor(
+    max_workers=HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_pending_hashes = 0
 
 
 class Hash:
@@ -24,3 +39,59 @@ class Hash:
         Verify the hash password and normal password
         """
         return pwd_context.verify(normal, hashed)
+
+    async def _run_in_pool(self, function, *args):
+        """
+        Run the hash function in the hash pool.
+
+        Raises:
+            HTTPException: An error occurred when hash pool is saturated.
+        """
+        global _pending_hashes
+        if _pending_hashes >= MAX_PENDING_HASHES:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many login requests. Please try again.",
+                headers={"Retry-After": "1"},
+            )
+        _pending_hashes += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                _hash_executor, function, *args
+            )
+        finally:
+            _pending_hashes -= 1
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """
+        Hash the password without blocking the event loop.
+        """
+        return await self._run_in_pool(pwd_context.hash, password)
+
+    async def verify_password_async(self, hashed, normal) -> bool:
+        """
+        Verify the hash password and normal password without blocking the
+        event loop.
+        """
+        if not hashed:
+            return False
+        return await self._run_in_pool(pwd_context.verify, normal, hashed)
+
+    async def verify_and_update(self, hashed, normal) -> tuple:
+        """
+        Verify the hash password and normal password, also get the new hash
+        when hash uses a deprecated scheme or old cost.
+
+        Params:
+            hashed (str): Stored hash of the password.
+            normal (str): Password entered by the user.
+
+        Returns:
+            tuple: A tuple which contains verification result and new hash
+                (None when hash is not need to update). e.g., (True, None)
+        """
+        if not hashed:
+            return False, None
+        return await self._run_in_pool(
+            pwd_context.verify_and_update, normal, hashed
+        )
@@ -1,6 +1,8 @@
 """
 This file contain class and functions related to authentication using jwttoken
 """
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -8,7 +10,7 @@ from bson import ObjectId
 from jose import JWTError, jwt
 
 from app.core.log_config import get_logger
-from app.core.utils import settings
+from app.core.utils import settings, utility_obj
 from app.models.student_user_schema import TokenData
 
 logger = get_logger(name=__name__)
@@ -16,6 +18,13 @@ logger = get_logger(name=__name__)
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm_used
 ACCESS_TOKEN_EXPIRE_DAYS = 1
+# Verified access tokens by digest of token, token is verified again after
+# below seconds or when it is expired. e.g., {"digest": (expire_at,
+# token_data, {"college_folder": user})}
+_verified_tokens: dict = {}
+VERIFIED_TOKEN_TTL = 60
+MAX_VERIFIED_TOKENS = 10000
+_verified_token_metrics = {"hits": 0, "misses": 0}
 
 
 class Authentication:
@@ -108,8 +117,106 @@ class Authentication:
         await DatabaseConfiguration().refresh_token_collection.update_one(
             {"refresh_token": token}, {
             "$set": {"revoked": True, "revoked_datetime": datetime.utcnow()}})
+        self.invalidate_verified_tokens(
+            user_id=str(refresh_token_data.get("user_id", "")) or None)
         return {"message": "Refresh token is revoked."}
 
+    @staticmethod
+    def get_token_digest(token: str) -> str:
+        """
+        Get the digest of a token, token itself is not kept in the memory.
+        """
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _get_verified_token(self, token: str) -> tuple:
+        """
+        Get the cached entry of a verified token.
+
+        Returns:
+            tuple: A tuple which contains token data and users, (None, None)
+                when token is not cached or entry is expired.
+        """
+        digest = self.get_token_digest(token)
+        expire_at, token_data, users = _verified_tokens.get(
+            digest, (0, None, None))
+        if token_data is not None and expire_at > time.monotonic():
+            _verified_token_metrics["hits"] += 1
+            return token_data, users
+        _verified_token_metrics["misses"] += 1
+        _verified_tokens.pop(digest, None)
+        return None, None
+
+    def _cache_verified_token(self, token: str, token_data: TokenData,
+                              expire_timestamp) -> None:
+        """
+        Cache the data of a verified token till `VERIFIED_TOKEN_TTL` or expiry
+        of token, whichever is earlier.
+        """
+        ttl = VERIFIED_TOKEN_TTL
+        if isinstance(expire_timestamp, (int, float)):
+            ttl = min(ttl, expire_timestamp - time.time())
+        if ttl <= 0:
+            return
+        if len(_verified_tokens) >= MAX_VERIFIED_TOKENS:
+            _verified_tokens.clear()
+        _verified_tokens[self.get_token_digest(token)] = (
+            time.monotonic() + ttl, token_data, {})
+
+    def get_token_user(self, token: str) -> dict | None:
+        """
+        Get the cached user of a verified token for the current college.
+        """
+        _, _, users = _verified_tokens.get(
+            self.get_token_digest(token), (0, None, {}))
+        return users.get(utility_obj.get_university_name_s3_folder())
+
+    def cache_token_user(self, token: str, user: dict) -> None:
+        """
+        Cache the user of a verified token for the current college, user is
+        cached only when token is cached.
+        """
+        _, _, users = _verified_tokens.get(
+            self.get_token_digest(token), (0, None, None))
+        if users is not None:
+            users[utility_obj.get_university_name_s3_folder()] = user
+
+    @staticmethod
+    def invalidate_verified_tokens(user_name: str | None = None,
+                                   user_id: str | None = None) -> None:
+        """
+        Remove the verified tokens of a user from cache, all the verified
+        tokens are removed when user is not given.
+
+        Params:
+            user_name (str | None): User name of the user.
+            user_id (str | None): An unique identifier of the user.
+        """
+        if user_name is None and user_id is None:
+            _verified_tokens.clear()
+            return
+        for digest, (_, token_data, users) in list(_verified_tokens.items()):
+            if token_data.user_name == user_name or any(
+                    user_id and str(user.get("_id")) == user_id
+                    for user in users.values()):
+                _verified_tokens.pop(digest, None)
+
+    @staticmethod
+    def get_verified_token_metrics() -> dict:
+        """
+        Get the hit ratio metrics of verified token cache.
+
+        Returns:
+            dict: A dictionary which contains metrics.
+                e.g., {"hits": 90, "misses": 10, "hit_ratio": 0.9, "size": 8}
+        """
+        total = _verified_token_metrics["hits"] + _verified_token_metrics["misses"]
+        return {
+            **_verified_token_metrics,
+            "hit_ratio": round(_verified_token_metrics["hits"] / total, 4)
+            if total else 0.0,
+            "size": len(_verified_tokens),
+        }
+
     async def create_access_token(self, data: dict,
                                   expires_delta: Optional[timedelta] = None):
         """
@@ -148,8 +255,11 @@ class Authentication:
                            websocket=False):
         # todo: need to validate role_id as well, role_id should not be None
         """
-        Verify and return the token data of user
+        Verify and return the token data of user, verified token is cached
+        for a short time (see `VERIFIED_TOKEN_TTL`).
         """
+        if token and (cached_data := self._get_verified_token(token)[0]):
+            return cached_data
         token_data = {}
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -170,6 +280,8 @@ class Authentication:
                     raise credentials_exception
             token_data = TokenData(scopes=token_scopes, user_name=user_name,
                                    college_info=college_info, role_id=role_id, groups=groups_info)
+            if user_name is not None and len(token_scopes) == 1:
+                self._cache_verified_token(token, token_data, payload.get("exp"))
         except JWTError:
             if websocket:
                 pass
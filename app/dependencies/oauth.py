@@ -21,11 +21,13 @@ from starlette import status
 from app.core.log_config import get_logger
 from app.core.reset_credentials import Reset_the_settings
 from app.core.utils import utility_obj, settings, CustomJSONEncoder
+from app.core.worker_resources import worker_resources
 from app.database.configuration import DatabaseConfiguration
 from app.database.database_sync import DatabaseConfigurationSync
 from app.database.motor_base import pgsql_conn
 from app.dependencies.hashing import Hash
 from app.dependencies.jwttoken import Authentication
+from app.helpers.roles.feature_permissions import feature_permission_map
 from app.helpers.student_curd.student_user_crud_configuration import (
     StudentUserCrudHelper,
 )
@@ -33,6 +35,18 @@ from app.helpers.student_curd.student_user_crud_configuration import (
 logger = get_logger(name=__name__)
 
 REDIS_MAX_CONNECTIONS = 3000
+# Fields of student needed for login, see `AuthenticateUser.authenticate_student`.
+STUDENT_LOGIN_PROJECTION = {
+    "user_name": 1,
+    "password": 1,
+    "basic_details.first_name": 1,
+    "basic_details.middle_name": 1,
+    "basic_details.last_name": 1,
+    "is_verify": 1,
+    "is_email_verify": 1,
+    "accept_payment": 1,
+    "system_info.stored_at": 1,
+}
 
 oauth2_student_scheme = OAuth2PasswordBearer(
     tokenUrl="/oauth/token",
@@ -123,22 +137,46 @@ class AuthenticateUser:
         data.update({"refresh_token": token_info.pop("refresh_token")})
         return data
 
-    async def get_application_details(self, student_id: str, college_id: str):
+    async def get_college_name(self, college_id: str) -> str | None:
+        """
+        Get the name of college from the cached college record, college is
+        fetched from the DB only when it is not cached.
+
+        params:
+            college_id (str): Unique identifier of the college
+
+        returns:
+            str | None: Name of the college, None when college not found
+        """
+        if college := await get_collection_from_cache(
+                collection_name="colleges", field=college_id):
+            return college.get("name")
+        college = await DatabaseConfiguration().college_collection.find_one(
+            {"_id": ObjectId(college_id)}, {"name": 1}
+        )
+        return college.get("name") if college else None
+
+    async def get_application_details(
+            self, student_id: str, college_id: str,
+            accept_payment: bool | None = None
+    ):
         """
         get application data for the payment
 
         params:
             student_id (str): Unique Identify number of the student
+            college_id (str): Unique identifier of the college
+            accept_payment (bool | None): Accept payment flag of student,
+                fetched from the DB when not provided
 
         returns:
             Response:In form of dictionary of application data
         """
-        if (
-                await DatabaseConfiguration().studentsPrimaryDetails.find_one(
-                    {"accept_payment": True, "_id": ObjectId(student_id)}
-                )
-                is None
-        ):
+        if accept_payment is None:
+            accept_payment = await DatabaseConfiguration().studentsPrimaryDetails.find_one(
+                {"accept_payment": True, "_id": ObjectId(student_id)}
+            ) is not None
+        if not accept_payment:
             return {}
         application = DatabaseConfiguration().studentApplicationForms.find(
             {"student_id": ObjectId(student_id), "college_id": ObjectId(college_id)}
@@ -191,32 +229,33 @@ class AuthenticateUser:
         Get the access token and token type of student user
         """
         await utility_obj.is_id_length_valid(_id=college_id, name="College id")
-        college = await DatabaseConfiguration().college_collection.find_one(
-            {"_id": ObjectId(college_id)}
-        )
-        if not college:
+        if (college_name := await self.get_college_name(college_id)) is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"College not found. Make sure " f"college id is valid.",
             )
         user = await DatabaseConfiguration().studentsPrimaryDetails.find_one(
-            {"college_id": ObjectId(college_id), "user_name": user_name}
+            {"college_id": ObjectId(college_id), "user_name": user_name},
+            STUDENT_LOGIN_PROJECTION,
         )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No Student found with this {user_name} user_name",
             )
-        if not Hash().verify_password(user.get("password"), password):
+        verified, new_hash = await Hash().verify_and_update(
+            user.get("password"), password)
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Wrong user_name or password",
             )
-        college = await DatabaseConfiguration().college_collection.find_one(
-            {"_id": ObjectId(college_id)}
-        )
+        if new_hash:
+            await DatabaseConfiguration().studentsPrimaryDetails.update_one(
+                {"_id": user.get("_id")}, {"$set": {"password": new_hash}}
+            )
         authentication_obj = Authentication()
-        college = [{"name": college.get("name"), "_id": college_id}]
+        college = [{"name": college_name, "_id": college_id}]
         name = utility_obj.name_can(user.get("basic_details", {}))
         payload = {
             "sub": user.get("user_name"),
@@ -228,12 +267,10 @@ class AuthenticateUser:
         data = {"access_token": access_token, "token_type": "bearer"}
         ip_address = None
         if request:
-            if await DatabaseConfiguration().studentsPrimaryDetails.find_one(
-                    {"_id": user.get("_id"), "system_info": {"$exists": False}}
-            ):
+            if "system_info" not in user:
                 ip_address = utility_obj.get_ip_address(request)
-                DatabaseConfiguration().studentsPrimaryDetails.update_one(
-                    {"user_name": user_name},
+                await DatabaseConfiguration().studentsPrimaryDetails.update_one(
+                    {"_id": user.get("_id")},
                     {
                         "$set": {
                             "system_info": {
@@ -258,7 +295,8 @@ class AuthenticateUser:
                 name,
             )
         application = await self.get_application_details(
-            student_id=str(user.get("_id")), college_id=str(college_id)
+            student_id=str(user.get("_id")), college_id=str(college_id),
+            accept_payment=bool(user.get("accept_payment"))
         )
         data.update(application)
         data.update({"_id": str(user.get("_id"))})
@@ -275,15 +313,17 @@ class AuthenticateUser:
             scopes: list,
             refresh_token=False,
             request=None,
-            is_college_level_user=False
+            is_college_level_user=False,
+            user: dict | None = None,
     ):
         """
         Verify the authentication of user by validation user_name, password
-        and scope
+        and scope, user is fetched from the DB when not provided
         """
-        user = await DatabaseConfiguration().user_collection.find_one(
-            {"user_name": user_name}
-        )
+        if user is None:
+            user = await DatabaseConfiguration().user_collection.find_one(
+                {"user_name": user_name}
+            )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -291,11 +331,17 @@ class AuthenticateUser:
             )
         if not user.get("is_activated"):
             raise HTTPException(422, detail="You are deactivated.")
-        if not Hash().verify_password(user.get("password"), password):
+        verified, new_hash = await Hash().verify_and_update(
+            user.get("password"), password)
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Wrong user_name or password",
             )
+        if new_hash:
+            await DatabaseConfiguration().user_collection.update_one(
+                {"_id": user.get("_id")}, {"$set": {"password": new_hash}}
+            )
         if user.get("role", {}).get("role_name") != scopes[0]:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail=f"Wrong Scope Defined"
@@ -375,7 +421,10 @@ class AuthenticateUser:
 
 
 async def get_db():
-    """ Dependency function to get the postgres database session """
+    """
+    Dependency function to get the postgres database session of a request,
+    connection is checked out from the pool only when session is used.
+    """
     async with pgsql_conn.get_sqlalchemy_session() as session:
         yield session
 
@@ -396,21 +445,26 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": authenticate_value},
     )
-    token_data = await Authentication().verify_token(token, credentials_exception)
+    authentication = Authentication()
+    token_data = await authentication.verify_token(token, credentials_exception)
     if token_data.scopes[0] == "student":
         college_id = token_data.college_info[0].get("_id")
         toml_data = utility_obj.read_current_toml_file()
         if toml_data.get("testing", {}).get("test") is False:
             Reset_the_settings().check_college_mapped(college_id)
-        if (
-                user := await DatabaseConfiguration().studentsPrimaryDetails.find_one(
-                    {"user_name": token_data.user_name}
-                )
-        ) is None:
-            raise HTTPException(status_code=404, detail="username not found")
+        if (user := authentication.get_token_user(token)) is None:
+            if (
+                    user := await DatabaseConfiguration().studentsPrimaryDetails.find_one(
+                        {"user_name": token_data.user_name}
+                    )
+            ) is None:
+                raise HTTPException(status_code=404, detail="username not found")
+            authentication.cache_token_user(token, user)
         user_name = user["user_name"]
     else:
-        user = await get_collection_from_cache(collection_name="users", field=token_data.user_name)
+        user = authentication.get_token_user(token)
+        if not user:
+            user = await get_collection_from_cache(collection_name="users", field=token_data.user_name)
         if not user:
             user = await DatabaseConfiguration().user_collection.find_one(
                 {"user_name": token_data.user_name})
@@ -419,6 +473,7 @@ async def get_current_user(
                                                 expiration_time=10800, field=token_data.user_name)
         if not user:
             raise HTTPException(status_code=404, detail="username not found")
+        authentication.cache_token_user(token, user)
         # Todo: we will deleted this hard coded after the introduce new logic
         toml_data = utility_obj.read_current_toml_file()
         if toml_data.get("testing", {}).get("test") is False:
@@ -488,7 +543,8 @@ async def get_current_user_object(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": authenticate_value},
     )
-    token_data = await Authentication().verify_token(token, credentials_exception)
+    authentication = Authentication()
+    token_data = await authentication.verify_token(token, credentials_exception)
     global_permissions_set = set()
     college_permissions_set = set()
     dashboard_type = "admin_dashboard"
@@ -502,12 +558,14 @@ async def get_current_user_object(
         toml_data = utility_obj.read_current_toml_file()
         if toml_data.get("testing", {}).get("test") is False:
             Reset_the_settings().check_college_mapped(college_ids)
-        if (
-            user := await DatabaseConfiguration().studentsPrimaryDetails.find_one(
-                {"user_name": token_data.user_name}
-            )
-        ) is None:
-            raise HTTPException(status_code=404, detail="username not found")
+        if (user := authentication.get_token_user(token)) is None:
+            if (
+                user := await DatabaseConfiguration().studentsPrimaryDetails.find_one(
+                    {"user_name": token_data.user_name}
+                )
+            ) is None:
+                raise HTTPException(status_code=404, detail="username not found")
+            authentication.cache_token_user(token, user)
         user_name = user["user_name"]
     else:
         college_id = None
@@ -545,9 +603,11 @@ async def get_current_user_object(
                     group_perms.get("college_permissions", [])
                 )
 
-        user = await get_collection_from_cache(
-            collection_name="users", field=token_data.user_name
-        )
+        user = authentication.get_token_user(token)
+        if not user:
+            user = await get_collection_from_cache(
+                collection_name="users", field=token_data.user_name
+            )
         if not user:
             user = await DatabaseConfiguration().user_collection.find_one(
                 {"user_name": token_data.user_name})
@@ -560,6 +620,7 @@ async def get_current_user_object(
                 )
         if not user:
             raise HTTPException(status_code=404, detail="username not found")
+        authentication.cache_token_user(token, user)
 
         # Todo: we will deleted this hard coded after the introduce new logic
         toml_data = utility_obj.read_current_toml_file()
@@ -574,19 +635,11 @@ async def get_current_user_object(
         user_name = user["user_name"]
     if user is None:
         raise credentials_exception
-    allowed_features = await get_collection_from_cache(
-        f"allowed_features/{dashboard_type}", user_name
-    )
-    if not allowed_features and not is_testing_env():
-        allowed_features = await utility_obj.get_user_feature_permissions(
+    allowed_features, compiled_features = None, {}
+    if not is_testing_env():
+        allowed_features, compiled_features = await feature_permission_map.get(
             user=user, dashboard_type=dashboard_type, college_id=college_id
         )
-        if allowed_features:
-            await store_collection_in_cache(
-                collection=allowed_features,
-                collection_name=f"allowed_features/{dashboard_type}",
-                field=user_name,
-            )
     for scope in security_scopes.scopes:
         if scope not in token_data.scopes:
             raise HTTPException(
@@ -596,15 +649,9 @@ async def get_current_user_object(
             )
 
     if feature_key and not is_testing_env():
-        feature = allowed_features.get(feature_key)
-
-        if not (feature and feature.get("visibility", False)):
-            raise HTTPException(
-                status_code=403,
-                detail="Access denied. You are not permitted to perform this operation.",
-            )
-
-        if not is_student and required_permission and not feature.get("permissions", {}).get(required_permission):
+        if not feature_permission_map.is_allowed(
+                compiled_features, feature_key,
+                None if is_student else required_permission):
             raise HTTPException(
                 status_code=403,
                 detail="Access denied. You are not permitted to perform this operation.",
@@ -629,6 +676,7 @@ async def get_current_user_object(
         },
         "associated_colleges": college_ids,
         "allowed_features": allowed_features,
+        "dashboard_type": dashboard_type,
     }
     return user_object
 
@@ -742,11 +790,11 @@ def get_sync_redis_client():
     """
     if not is_testing_env():
         redis_client = redis.Redis(
-            host=settings.redis_cache_host,
-            port=settings.redis_cache_port,
-            password=settings.redis_cache_password,
-            health_check_interval=10,
-            socket_keepalive=True
+            connection_pool=worker_resources.get_redis_pool(
+                host=settings.redis_cache_host,
+                port=settings.redis_cache_port,
+                password=settings.redis_cache_password,
+            )
         )
         return redis_client
 
@@ -1038,6 +1086,8 @@ async def cache_invalidation(api_updated: str, user_id=None) -> None:
     Raises:
         - Exception: An error occurred when something wrong happen in the code.
     """
+    if api_updated == "updated_user":
+        Authentication.invalidate_verified_tokens(user_name=user_id)
     if not is_testing_env():
         try:
             data = await get_collection_from_cache(collection_name="cache_invalidations")
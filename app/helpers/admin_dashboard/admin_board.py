@@ -21,6 +21,7 @@ from app.database.aggregation.get_all_applications import Application
 from app.database.aggregation.student import Student
 from app.database.configuration import DatabaseConfiguration
 from app.dependencies.oauth import insert_data_in_cache, get_collection_from_cache, store_collection_in_cache
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 
 
 @dataclass
@@ -4635,15 +4636,8 @@ class AdminBoardHelper:
                     "unsubscribe.template_id": {"$in": templates}
                 })
             if (search := filters.get("search")):
-                early_match.update({
-                        "$or": [
-                            {"basic_details.first_name": {"$regex": f".*{search}.*", "$options": "i"}},
-                            {"basic_details.middle_name": {"$regex": f".*{search}.*", "$options": "i"}},
-                            {"basic_details.last_name": {"$regex": f".*{search}.*", "$options": "i"}},
-                            {"user_name": {"$regex": f".*{search}.*", "$options": "i"}},
-                            {"basic_details.mobile_number": {"$regex": f".*{search}.*", "$options": "i"}}
-                       ]
-                    })
+                early_match.setdefault("$and", []).append(
+                    SearchKeyHelper().get_search_query(search))
         else:
             limited = True
             pipeline = [
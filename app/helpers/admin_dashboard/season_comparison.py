@@ -0,0 +1,77 @@
+"""
+This file contains class and functions related to compare the leads and
+applications of multiple seasons.
+"""
+
+from app.core.log_config import get_logger
+from app.database.season_query import SeasonQuery
+
+logger = get_logger(name=__name__)
+
+
+class SeasonComparison:
+    """
+    Get the lead and application counts of multiple seasons, every season
+    is queried concurrently through `SeasonQuery`.
+
+    Usage:
+        data = await SeasonComparison().get_season_comparison(
+            ["season_id_1", "season_id_2"])
+    """
+
+    async def get_season_comparison(self, seasons: list) -> dict:
+        """
+        Get the lead/application counts of every season and source wise lead
+        counts of all the seasons.
+
+        Params:
+            seasons (list): A list which contains season ids.
+                e.g., ["season_id_1", "season_id_2"]
+
+        Returns:
+            dict: A dictionary which contains season wise counts, total
+                counts and source wise lead counts. e.g.,
+                {"seasons": [{"season": "season_id_1", "total_leads": 10,
+                "total_applications": 8, "paid_applications": 2}],
+                "total_leads": 10, "total_applications": 8,
+                "paid_applications": 2,
+                "source_wise_leads": [{"source": "google", "total_leads": 10}]}
+        """
+        season_query = SeasonQuery(seasons)
+        leads = await season_query.aggregate(
+            "studentsPrimaryDetails",
+            [{"$group": {"_id": None, "total_leads": {"$sum": 1}}}])
+        applications = await season_query.aggregate(
+            "studentApplicationForms",
+            [{"$group": {
+                "_id": None,
+                "total_applications": {"$sum": 1},
+                "paid_applications": {"$sum": {"$cond": [
+                    {"$eq": ["$payment_info.status", "captured"]}, 1, 0]}},
+            }}])
+        source_wise_leads = await season_query.group_sum(
+            "studentsPrimaryDetails",
+            [{"$group": {"_id": "$source.primary_source.utm_source",
+                         "total_leads": {"$sum": 1}}}])
+        season_wise = {
+            season: {"season": season, "total_leads": 0,
+                     "total_applications": 0, "paid_applications": 0}
+            for season in season_query.seasons
+        }
+        for document in leads + applications:
+            data = season_wise[document.get("season")]
+            for field in ["total_leads", "total_applications",
+                          "paid_applications"]:
+                if field in document:
+                    data[field] = document.get(field)
+        return {
+            "seasons": list(season_wise.values()),
+            **{field: sum(data.get(field) for data in season_wise.values())
+               for field in ["total_leads", "total_applications",
+                             "paid_applications"]},
+            "source_wise_leads": sorted(
+                [{"source": source.get("_id"),
+                  "total_leads": source.get("total_leads", 0)}
+                 for source in source_wise_leads],
+                key=lambda source: source.get("total_leads"), reverse=True),
+        }
@@ -708,15 +708,213 @@ class AdvanceFilterHelper:
                 query_list.append({collection_field_name: {"$exists": True}})
         return query_list
 
+    def get_predicate_fields(self, predicate: dict) -> set | None:
+        """
+        Get the top-level fields referenced by a match predicate.
+
+        Params:
+            - predicate (dict): A match predicate.
+                e.g., {"$or": [{"source.primary_source.utm_source": "google"}]}
+
+        Returns:
+            - set | None: A set of top-level field names. e.g., {"source"}.
+                None when predicate uses an operator like `$expr` whose
+                fields can't be known.
+        """
+        fields = set()
+        for key, value in predicate.items():
+            if key in ["$and", "$or", "$nor"]:
+                for sub_predicate in value:
+                    sub_fields = self.get_predicate_fields(sub_predicate)
+                    if sub_fields is None:
+                        return None
+                    fields.update(sub_fields)
+            elif key.startswith("$"):
+                return None
+            else:
+                fields.add(key.split(".")[0])
+        return fields
+
+    def get_stage_fields(self, stages: list) -> tuple:
+        """
+        Get the top-level fields which are added/changed by the stages, a
+        predicate on other fields gives same result before the stages.
+
+        Params:
+            - stages (list): Aggregation pipeline stages.
+
+        Returns:
+            - tuple: A tuple which contains set of added/changed top-level
+                field names and whether predicates can be moved before the
+                stages. Predicates can't be moved before a stage which
+                changes the documents count or shape (e.g., `$group`).
+        """
+        fields, movable = set(), True
+        for stage in stages:
+            name, value = next(iter(stage.items()))
+            if name in ["$match", "$sort"]:
+                continue
+            if name == "$lookup":
+                fields.add(value.get("as", "").split(".")[0])
+            elif name == "$unwind":
+                path = value.get("path") if isinstance(value, dict) else value
+                fields.add(path.lstrip("$").split(".")[0])
+                if isinstance(value, dict) and value.get("includeArrayIndex"):
+                    fields.add(value.get("includeArrayIndex").split(".")[0])
+            elif name in ["$addFields", "$set"]:
+                fields.update(key.split(".")[0] for key in value)
+            elif name == "$unset":
+                value = [value] if isinstance(value, str) else value
+                fields.update(key.split(".")[0] for key in value)
+            elif name == "$project":
+                included = {key.split(".")[0] for key, field_value in value.items()
+                            if field_value in [1, True]}
+                computed = {key.split(".")[0] for key, field_value in value.items()
+                            if field_value not in [0, 1, True, False]}
+                excluded = {key.split(".")[0] for key, field_value in value.items()
+                            if field_value in [0, False] and key != "_id"}
+                fields.update(computed | excluded)
+                if included or computed:
+                    # Fields which are not projected become missing
+                    fields.add(("$project", frozenset(included | {"_id"})))
+            else:
+                movable = False
+        return fields, movable
+
+    def is_predicate_independent(self, predicate_fields: set | None,
+                                 stage_fields: set) -> bool:
+        """
+        Check whether a predicate does not depend on the fields added/changed
+        by the stages.
+        """
+        if predicate_fields is None:
+            return False
+        for field in stage_fields:
+            if isinstance(field, tuple):
+                if not predicate_fields.issubset(field[1]):
+                    return False
+            elif field in predicate_fields:
+                return False
+        return True
+
+    def get_conjuncts(self, predicates: list) -> list:
+        """
+        Flatten the nested `$and` predicates into a list of predicates which
+        all must match.
+        """
+        conjuncts = []
+        for predicate in predicates:
+            if list(predicate.keys()) == ["$and"]:
+                conjuncts.extend(self.get_conjuncts(predicate.get("$and")))
+            else:
+                conjuncts.append(predicate)
+        return conjuncts
+
+    def get_referenced_fields(self, value) -> set:
+        """
+        Get the top-level fields read by the aggregation stages/expressions,
+        i.e., field paths like "$queries.status".
+
+        Params:
+            - value: Aggregation stages or an expression.
+
+        Returns:
+            - set: A set of top-level field names. e.g., {"queries"}.
+        """
+        if isinstance(value, dict):
+            return set().union(
+                *[self.get_referenced_fields(item) for item in value.values()])
+        if isinstance(value, list):
+            return set().union(
+                *[self.get_referenced_fields(item) for item in value])
+        if (isinstance(value, str) and value.startswith("$")
+                and not value.startswith("$$")):
+            return {value.lstrip("$").split(".")[0]}
+        return set()
+
+    def plan_advance_filter(
+            self, predicates: list, pipeline: list,
+            lazy_lookups: list[list] | None = None,
+            required_fields: set | None = None) -> list:
+        """
+        Add the advance filter predicates in the aggregation pipeline.
+
+        Predicates which use only the fields of main collection are moved
+        to the start of pipeline (hence index can be used), other predicates
+        are added after the pipeline. A lazy lookup is added only when a
+        predicate or a column of response uses its fields, right before the
+        predicates which need it.
+
+        Params:
+            - predicates (list): A list of match predicates which all must
+                match.
+            - pipeline (list): An aggregation pipeline which want to update.
+            - lazy_lookups (list[list] | None): Either None or a list of
+                lookup stages (e.g., lookup and unwind of queries) which are
+                not needed when no predicate/column uses them.
+            - required_fields (set | None): Either None or a set of top-level
+                fields read by the columns of response (see
+                `get_referenced_fields`), lookups which add them are always
+                added.
+
+        Returns:
+            - list: A list which contains updated aggregation pipeline.
+        """
+        lazy_lookups = [(stages, self.get_stage_fields(stages)[0])
+                        for stages in (lazy_lookups or [])]
+        stage_fields, movable = self.get_stage_fields(pipeline)
+        all_lazy_fields = set().union(*[fields for _, fields in lazy_lookups])
+        required_fields = required_fields or set()
+        pushdown, remaining = [], []
+        for predicate in self.get_conjuncts(predicates):
+            predicate_fields = self.get_predicate_fields(predicate)
+            if movable and self.is_predicate_independent(
+                    predicate_fields, stage_fields | all_lazy_fields):
+                pushdown.append(predicate)
+            else:
+                remaining.append((predicate, predicate_fields))
+        if pushdown:
+            # Predicates are added in a separate stage (right after the first
+            # `$match`) because callers update the first `$match` later.
+            # Adjacent `$match` stages are coalesced by MongoDB, hence index
+            # is still used.
+            pipeline.insert(1 if pipeline and "$match" in pipeline[0] else 0,
+                            {"$match": {"$and": pushdown}})
+        pending_lookups = list(lazy_lookups)
+        while remaining or any(required_fields & fields
+                               for _, fields in pending_lookups):
+            pending_fields = set().union(
+                *[fields for _, fields in pending_lookups])
+            ready = [predicate for predicate, predicate_fields in remaining
+                     if not pending_lookups or self.is_predicate_independent(
+                        predicate_fields, pending_fields)]
+            if ready:
+                pipeline.append({"$match": {"$and": ready}})
+                remaining = [(predicate, predicate_fields)
+                             for predicate, predicate_fields in remaining
+                             if not any(predicate is item for item in ready)]
+            if not pending_lookups:
+                break
+            stages, fields = pending_lookups.pop(0)
+            needed = required_fields & fields or any(
+                predicate_fields is None or not self.is_predicate_independent(
+                    predicate_fields, fields)
+                for _, predicate_fields in remaining)
+            if needed:
+                pipeline.extend(stages)
+        return pipeline
+
     async def apply_advance_filter(
             self, advance_filters: list[dict], pipeline: list,
             student_primary: str | None = None, courses: str | None = None,
             student_secondary: str | None = None,
             lead_followup: str | None = None,
             student_application: str | None = None, communication_log=None,
-            queries=None) -> list:
+            queries=None, lazy_lookups: list[list] | None = None,
+            required_fields: set | None = None) -> list:
         """
-        Add advance filter query in the aggregation pipeline.
+        Add advance filter query in the aggregation pipeline, see
+        `plan_advance_filter` for the placement of filter.
 
         Params:
             - advance_filters (list[dict]): A list of dictionaries which
@@ -737,6 +935,11 @@ class AdvanceFilterHelper:
                 useful for get field from communication log collection.
             - queries (str | None): Either None or a string which
                 useful for get field from queries collection.
+            - lazy_lookups (list[list] | None): Either None or a list of
+                lookup stages which are added only when filter or a column of
+                response uses them.
+            - required_fields (set | None): Either None or a set of top-level
+                fields read by the columns of response.
 
         Returns:
             - list: A list which contains updated aggregation pipeline.
@@ -764,6 +967,5 @@ class AdvanceFilterHelper:
                 elif condition_between_block == "OR":
                     main_query_list = [{"$or": main_query_list}]
 
-        if main_query_list:
-            pipeline.append({"$match": {"$and": main_query_list}})
-        return pipeline
+        return self.plan_advance_filter(
+            main_query_list, pipeline, lazy_lookups, required_fields)
@@ -14,6 +14,7 @@ from app.database.aggregation.get_all_applications import Application
 from app.database.aggregation.student import Student
 from app.database.configuration import DatabaseConfiguration
 from app.helpers.automation.segment_automation_data import data_segment_info
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 
 
 class AutomationHelper:
@@ -650,19 +651,9 @@ class AutomationHelper:
             pipeline = await self.get_filtered_pipeline(
                 pipeline=pipeline, filters=payload
             )
-        if search is not None:
-            search_match = {
-                "$match": {
-                    "$or": [
-                        {"other_field.full_name": {"$regex": search, "$options": "i"}},
-                        {"other_field.name": {"$regex": search, "$options": "i"}},
-                        {"other_field.first_name": {"$regex": search, "$options": "i"}},
-                        {"mandatory_field.email": {"$regex": search, "$options": "i"}},
-                        {"mobile_number": {"$regex": search, "$options": "i"}},
-                    ]
-                }
-            }
-            pipeline.append(search_match)
+        if search_query := SearchKeyHelper().get_search_query(search):
+            # Search fields are not projected, hence search is the first stage
+            pipeline.insert(0, {"$match": search_query})
         paginated_results = []
         if skip is not None and limit is not None:
             paginated_results = [{"$skip": skip}, {"$limit": limit}]
@@ -10,7 +10,8 @@ from fastapi.encoders import jsonable_encoder
 from app.core.custom_error import DataNotFoundError
 from app.core.utils import utility_obj
 from app.database.configuration import DatabaseConfiguration
-from app.helpers.automation.automation_configuration import AutomationHelper
+from app.helpers.data_segment.segment_cardinality import SegmentCardinality
+from app.helpers.reference_resolver import ReferenceResolver
 
 
 class nested_automation_helper:
@@ -108,19 +109,15 @@ class nested_automation_helper:
         automation_details = await self.validate_and_get_data(automation_id)
         for _id in data_segment_ids:
             await utility_obj.is_length_valid(_id, "Data Segment id")
-            if (
-                    segment_details := await DatabaseConfiguration().data_segment_collection.find_one(
-                        {"_id": ObjectId(_id)}
-                    )
-            ) is None:
+        resolver = await ReferenceResolver().add(
+            "segments", data_segment_ids).resolve()
+        for _id in data_segment_ids:
+            if resolver.get("segments", _id) is None:
                 raise DataNotFoundError(_id, "Data segment")
-            linked_automations = segment_details.get("linked_automations", [])
-            linked_automations.append(ObjectId(automation_id))
-            linked_automations = list(set(linked_automations))
-            await DatabaseConfiguration().data_segment_collection.update_one(
-                {"_id": ObjectId(_id)},
-                {"$set": {"linked_automations": linked_automations}},
-            )
+        await DatabaseConfiguration().data_segment_collection.update_many(
+            {"_id": {"$in": [ObjectId(_id) for _id in data_segment_ids]}},
+            {"$addToSet": {"linked_automations": ObjectId(automation_id)}},
+        )
         data_segment_id = automation_details.get("data_segment_id", [])
         for _id in data_segment_ids:
             data_segment_id.append(ObjectId(_id))
@@ -835,6 +832,8 @@ class nested_automation_helper:
         automation_data = await self.validate_and_get_data(automation_id)
         release_window = automation_data.get("release_window", {})
         data_segment = {}
+        resolver = await ReferenceResolver().add(
+            "segments", automation_data.get("data_segment_id", [])).resolve()
         data_segments = [
             {
                 "data_segment_name": data_segment.get("data_segment_name"),
@@ -842,15 +841,10 @@ class nested_automation_helper:
                 "segment_type": data_segment.get("segment_type"),
                 "count_of_entities": (
                     (
-                        await AutomationHelper().get_data_from_db(
-                            data_segment,
-                            college_id,
-                            data_segments=False,
-                            skip=0,
-                            limit=10,
-                            call_segments=True,
+                        await SegmentCardinality().get_count(
+                            data_segment, college_id
                         )
-                    )[0]
+                    ).get("count")
                     if data_segment.get("segment_type") != "Static"
                     else data_segment.get("count_at_origin", 0)
                 ),
@@ -864,11 +858,7 @@ class nested_automation_helper:
             }
             for segment_id in automation_data.get("data_segment_id", [])
             if await utility_obj.is_length_valid(str(segment_id), "Data segment id")
-               and (
-                   data_segment := await DatabaseConfiguration().data_segment_collection.find_one(
-                       {"_id": segment_id}
-                   )
-               )
+               and (data_segment := resolver.get("segments", segment_id))
                is not None
         ]
 
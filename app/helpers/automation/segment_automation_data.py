@@ -7,6 +7,7 @@ from bson import ObjectId
 from app.core.utils import utility_obj
 from app.database.aggregation.get_all_applications import Application
 from app.database.configuration import DatabaseConfiguration
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 
 
 class data_segment_info:
@@ -322,15 +323,6 @@ class data_segment_info:
                 pipeline.insert(-len(target_sequence), project_phase)
             else:
                 pipeline.append(project_phase)
-        if search is not None:
-            search_match = {
-                "$match": {
-                    "$or": [
-                        {"student_name": {"$regex": search, "$options": "i"}},
-                        {"email": {"$regex": search, "$options": "i"}},
-                        {"mobile_number": {"$regex": search, "$options": "i"}},
-                    ]
-                }
-            }
-            pipeline.append(search_match)
+        if search_query := SearchKeyHelper().get_search_query(search):
+            pipeline.insert(0, {"$match": search_query})
         return pipeline
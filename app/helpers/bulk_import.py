@@ -0,0 +1,232 @@
+"""
+This file contains class and functions related to import the rows of a CSV
+file (stored in S3) into a collection in chunks.
+"""
+
+import asyncio
+import datetime
+import io
+import json
+
+import chardet
+import pandas as pd
+from pymongo.errors import BulkWriteError
+
+from app.core.log_config import get_logger
+from app.core.utils import settings
+from app.database.configuration import DatabaseConfiguration
+
+logger = get_logger(name=__name__)
+
+# Number of rows read, validated and written at a time.
+CSV_CHUNK_SIZE = 5000
+# Encoding of file is detected from the below number of starting bytes.
+ENCODING_SNIFF_SIZE = 64 * 1024
+# Only below number of row errors are stored in the import report.
+MAX_REPORTED_ERRORS = 1000
+
+
+class _PrefixedStream(io.RawIOBase):
+    """
+    Read the sniffed prefix of an object and then the rest of the object
+    body, without holding the object in memory.
+    """
+
+    def __init__(self, prefix: bytes, body):
+        self._prefix = prefix
+        self._body = body
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        data = self._body.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class BulkImport:
+    """
+    Import the rows of a CSV file of S3 into a collection.
+
+    File is streamed from S3 and parsed in chunks of `CSV_CHUNK_SIZE` rows,
+    encoding is detected from the starting bytes of file. Required columns
+    of a chunk are validated on the whole chunk, remaining rows are converted
+    to write operations (upserts keyed by natural key of the data) by the
+    caller and written with one unordered `bulk_write` per chunk. Counts and row errors
+    are stored in an import report document.
+
+    Usage:
+        report = await BulkImport("courses").run(
+            bucket_name, object_key, collection, build_operations,
+            required_columns={"course_name": "Course name is required."})
+    """
+
+    def __init__(self, import_type: str, chunk_size: int = CSV_CHUNK_SIZE):
+        """
+        Params:
+            import_type (str): Type of data which is imported. e.g., "courses"
+            chunk_size (int): Number of rows read and written at a time.
+        """
+        self.import_type = import_type
+        self.chunk_size = chunk_size
+
+    def sniff_encoding(self, prefix: bytes) -> str:
+        """
+        Get the encoding of file from its starting bytes. ASCII is read as
+        UTF-8 because later rows can have non-ASCII characters.
+        """
+        encoding = (chardet.detect(prefix).get("encoding") or "utf-8").lower()
+        return "utf-8" if encoding == "ascii" else encoding
+
+    def read_csv_chunks(self, bucket_name: str, object_key: str):
+        """
+        Get the reader of CSV chunks of an S3 object.
+
+        Returns:
+            TextFileReader: An iterator of data frames.
+        """
+        body = settings.s3_client.get_object(
+            Bucket=bucket_name, Key=object_key)["Body"]
+        prefix = body.read(ENCODING_SNIFF_SIZE)
+        return pd.read_csv(
+            io.BufferedReader(_PrefixedStream(prefix, body)),
+            encoding=self.sniff_encoding(prefix),
+            chunksize=self.chunk_size,
+        )
+
+    def validate_chunk(self, chunk: pd.DataFrame, required_columns: dict) -> tuple:
+        """
+        Validate the required values of a chunk.
+
+        Params:
+            chunk (DataFrame): Rows of a chunk.
+            required_columns (dict): Columns which should have a value, with
+                error of row when value is missing.
+
+        Returns:
+            tuple: A tuple which contains valid rows and row errors.
+        """
+        errors, invalid = [], pd.Series(False, index=chunk.index)
+        for column, error in required_columns.items():
+            if column not in chunk.columns:
+                missing = pd.Series(True, index=chunk.index)
+            else:
+                values = chunk[column]
+                missing = values.isna() | (values.astype(str).str.strip() == "")
+            errors.extend({"row": int(index) + 2, "error": error}
+                          for index in chunk.index[missing & ~invalid])
+            invalid |= missing
+        return chunk[~invalid], errors
+
+    async def update_report(self, report_id, counts: dict, errors: list) -> None:
+        """
+        Add the counts and row errors of a chunk in the import report.
+        """
+        update = {"$inc": counts} if counts else {}
+        if errors:
+            update["$push"] = {"errors": {"$each": errors,
+                                          "$slice": MAX_REPORTED_ERRORS}}
+        await DatabaseConfiguration().import_report_collection.update_one(
+            {"_id": report_id}, update)
+
+    async def write_chunk(self, collection, operations: list,
+                          row_numbers: list) -> tuple:
+        """
+        Write the operations of a chunk.
+
+        Returns:
+            tuple: A tuple which contains counts and row errors of chunk.
+        """
+        if not operations:
+            return {"inserted": 0, "updated": 0}, []
+        errors = []
+        try:
+            result = (await collection.bulk_write(operations, ordered=False)).bulk_api_result
+        except BulkWriteError as error:
+            result = error.details
+            errors = [{"row": row_numbers[write_error.get("index")],
+                       "error": write_error.get("errmsg")}
+                      for write_error in result.get("writeErrors", [])]
+        return {
+            "inserted": result.get("nUpserted", 0) + result.get("nInserted", 0),
+            "updated": result.get("nModified", 0),
+        }, errors
+
+    async def run(self, bucket_name: str, object_key: str, collection,
+                  build_operations, required_columns: dict | None = None,
+                  created_by=None,
+                  college_id=None) -> dict:
+        """
+        Import the rows of a CSV file of S3.
+
+        Params:
+            bucket_name (str): Name of S3 bucket.
+            object_key (str): Key of CSV file in the bucket.
+            collection: Collection in which rows are written.
+            build_operations: An async function which is called with valid
+                rows (list of dict) and row numbers of a chunk, and returns
+                a tuple of write operations, row numbers of the operations
+                and row errors.
+            required_columns (dict | None): Columns which should have a
+                value, with error of row when value is missing.
+            created_by: Unique identifier of user who imports the file.
+            college_id: Unique identifier of college of imported data.
+
+        Returns:
+            dict: A dictionary which contains the import report.
+                e.g., {"id": "...", "total_rows": 10, "inserted": 8,
+                "updated": 0, "skipped": 1, "failed": 1, "errors": [...]}
+        """
+        report = {
+            "import_type": self.import_type,
+            "file": object_key,
+            "status": "in_progress",
+            "created_by": str(created_by) if created_by else None,
+            "college_id": str(college_id) if college_id else None,
+            "created_at": datetime.datetime.utcnow(),
+            "total_rows": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0,
+            "errors": [],
+        }
+        report_id = (await DatabaseConfiguration().import_report_collection.insert_one(
+            report)).inserted_id
+        status = "completed"
+        try:
+            reader = await asyncio.to_thread(
+                self.read_csv_chunks, bucket_name, object_key)
+            while (chunk := await asyncio.to_thread(next, reader, None)) is not None:
+                valid, errors = self.validate_chunk(
+                    chunk, required_columns or {})
+                rows = json.loads(valid.to_json(orient="records"))
+                operations, row_numbers, row_errors = await build_operations(
+                    rows, [int(index) + 2 for index in valid.index])
+                counts, write_errors = await self.write_chunk(
+                    collection, operations, row_numbers)
+                errors += row_errors + write_errors
+                # Duplicate rows and rows which already exist are skipped
+                counts.update({
+                    "total_rows": len(chunk),
+                    "failed": len(errors),
+                    "skipped": len(chunk) - len(errors) - counts["inserted"]
+                               - counts["updated"],
+                })
+                await self.update_report(report_id, counts, errors)
+        except Exception as error:
+            logger.error(f"Failed to import `{object_key}`. Error - {error}")
+            status = "failed"
+            await self.update_report(
+                report_id, {}, [{"row": None, "error": str(error)}])
+        await DatabaseConfiguration().import_report_collection.update_one(
+            {"_id": report_id},
+            {"$set": {"status": status, "completed_at": datetime.datetime.utcnow()}})
+        report = await DatabaseConfiguration().import_report_collection.find_one(
+            {"_id": report_id})
+        report["id"] = str(report.pop("_id"))
+        logger.info(f"Import of `{object_key}` {status}, {report.get('inserted')} "
+                    f"rows inserted and {report.get('failed')} rows failed.")
+        return report
@@ -0,0 +1,316 @@
+"""
+This file contains class and functions related to compute the campaign
+manager summary of a college.
+"""
+
+import asyncio
+import json
+
+from bson import ObjectId
+
+from app.core.log_config import get_logger
+from app.core.utils import utility_obj, settings
+from app.database.configuration import DatabaseConfiguration
+
+logger = get_logger(__name__)
+
+SOURCE_LEVELS = ["primary_source", "secondary_source", "tertiary_source"]
+# Campaign summary of a college is invalidated when a lead/application is
+# created, a lead is verified or a payment is captured (see `bump_version`),
+# it is re-computed after below seconds to cover the other writes.
+SUMMARY_CACHE_TTL = 300
+
+
+class CampaignAnalytics:
+    """
+    Compute the campaign manager summary of a college: totals, source wise,
+    medium wise, organic vs campaign sources and verification/payment
+    funnel.
+
+    Summary is computed by two concurrent aggregations, one scan of leads
+    (applications of a lead are pre-joined as stage flags) and one scan of
+    applications. Summary is cached by college and date range, cached
+    summaries of a college are invalidated by incrementing the version of
+    college when a lead is created.
+
+    Usage:
+        summary = await CampaignAnalytics().get_summary(
+            college_id, start_date, end_date)
+    """
+
+    def get_version_key(self, college_id) -> str:
+        """
+        Get the cache key of summary version of a college.
+        """
+        return (f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}"
+                f"/campaign_summary_version/{college_id}")
+
+    async def bump_version(self, college_id) -> None:
+        """
+        Invalidate the cached summaries of a college, called when a
+        lead/application is created, a lead is verified or a payment is
+        captured.
+        """
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.dependencies.oauth import get_redis_client
+        if redis_client := get_redis_client():
+            try:
+                await redis_client.incr(self.get_version_key(college_id))
+            except Exception as error:
+                logger.error(f"Failed to invalidate campaign summary. Error - {error}")
+
+    def bump_version_sync(self, college_id) -> None:
+        """
+        Invalidate the cached summaries of a college from a celery task.
+        """
+        from app.dependencies.oauth import get_sync_redis_client
+        if redis_client := get_sync_redis_client():
+            try:
+                redis_client.incr(self.get_version_key(college_id))
+            except Exception as error:
+                logger.error(f"Failed to invalidate campaign summary. Error - {error}")
+
+    async def get_cache_key(self, college_id, start_date=None,
+                            end_date=None) -> str | None:
+        """
+        Get the cache key of summary of a college and date range, None when
+        cache is not available.
+        """
+        from app.dependencies.oauth import get_redis_client
+        redis_client = get_redis_client()
+        if not redis_client:
+            return None
+        version = await redis_client.get(self.get_version_key(college_id))
+        if isinstance(version, bytes):
+            version = version.decode("utf-8")
+        return (f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}"
+                f"/campaign_summary/{college_id}/{version or 0}/{start_date}_{end_date}")
+
+    def get_lead_pipeline(self, college_id, start_date=None,
+                          end_date=None) -> list:
+        """
+        Get the aggregation pipeline which groups the leads by source, medium
+        and source level in one scan.
+        """
+        match = {"college_id": ObjectId(college_id)}
+        if start_date and end_date:
+            match["created_at"] = {"$gte": start_date, "$lte": end_date}
+        stage_totals = {
+            "leads": {"$sum": 1},
+            "verified_leads": {"$sum": {"$cond": ["$is_verify", 1, 0]}},
+            "total_applications": {"$sum": "$applications"},
+            "paid_applications": {"$sum": "$paid_applications"},
+        }
+        facet = {
+            "sources": [
+                {"$group": {"_id": {"$ifNull": ["$primary", "organic"]},
+                            **stage_totals}}
+            ],
+            "mediums": [
+                {"$match": {"medium": {"$nin": [None, ""]}}},
+                {"$group": {"_id": "$medium", **stage_totals}}
+            ],
+            "levels": [
+                {"$group": {"_id": None, **{
+                    level: {"$sum": f"$has_{level}"} for level in SOURCE_LEVELS
+                }}}
+            ],
+        }
+        for level in SOURCE_LEVELS:
+            facet[level] = [
+                {"$match": {level: {"$ne": None}}},
+                {"$group": {"_id": f"${level}", "count": {"$sum": 1}}}
+            ]
+        return [
+            {"$match": match},
+            {
+                "$project": {
+                    "is_verify": 1,
+                    "primary": "$source.primary_source.utm_source",
+                    "medium": "$source.primary_source.utm_medium",
+                    **{level: f"$source.{level}.utm_source"
+                       for level in SOURCE_LEVELS},
+                    **{f"has_{level}": {
+                        "$cond": [{"$ifNull": [f"$source.{level}", False]}, 1, 0]
+                    } for level in SOURCE_LEVELS},
+                }
+            },
+            {
+                "$lookup": {
+                    "from": "studentApplicationForms",
+                    "let": {"student_id": "$_id"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$eq": ["$student_id", "$$student_id"]}}},
+                        {
+                            "$group": {
+                                "_id": None,
+                                "applications": {"$sum": 1},
+                                "paid_applications": {"$sum": {"$cond": [
+                                    {"$eq": ["$payment_info.status", "captured"]},
+                                    1, 0]}},
+                            }
+                        }
+                    ],
+                    "as": "stages",
+                }
+            },
+            {
+                "$addFields": {
+                    "applications": {"$ifNull": [
+                        {"$arrayElemAt": ["$stages.applications", 0]}, 0]},
+                    "paid_applications": {"$ifNull": [
+                        {"$arrayElemAt": ["$stages.paid_applications", 0]}, 0]},
+                }
+            },
+            {"$facet": facet},
+        ]
+
+    def get_application_pipeline(self, college_id, start_date=None,
+                                 end_date=None) -> list:
+        """
+        Get the aggregation pipeline which counts the stages of applications
+        in one scan.
+
+        In a date range, applications are counted by enquiry date and paid
+        applications by payment date, hence an application paid in the date
+        range is counted as paid even when it is created before the range.
+        """
+        match = {"college_id": ObjectId(college_id)}
+        in_range, paid_in_range = True, True
+        if start_date and end_date:
+            match["$or"] = [
+                {"enquiry_date": {"$gte": start_date, "$lte": end_date}},
+                {"payment_info.created_at": {"$gte": start_date,
+                                             "$lte": end_date}},
+            ]
+            in_range = {"$and": [{"$gte": ["$enquiry_date", start_date]},
+                                 {"$lte": ["$enquiry_date", end_date]}]}
+            paid_in_range = {"$and": [
+                {"$gte": ["$payment_info.created_at", start_date]},
+                {"$lte": ["$payment_info.created_at", end_date]}]}
+        return [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": None,
+                    "total_applications": {"$sum": {"$cond": [
+                        in_range, 1, 0]}},
+                    "form_initiated": {"$sum": {"$cond": [
+                        {"$and": [in_range, {"$gte": ["$current_stage", 2]}]},
+                        1, 0]}},
+                    "submitted_applications": {"$sum": {"$cond": [
+                        {"$and": [in_range, {"$eq": ["$declaration", True]}]},
+                        1, 0]}},
+                    "paid_applications": {"$sum": {"$cond": [
+                        {"$and": [paid_in_range, {"$eq": [
+                            "$payment_info.status", "captured"]}]}, 1, 0]}},
+                }
+            },
+            {"$project": {"_id": 0}},
+        ]
+
+    def format_stage_totals(self, name_field: str, data: dict) -> dict:
+        """
+        Format the stage totals of a source/medium.
+        """
+        return {
+            name_field: data.get("_id"),
+            "leads": data.get("leads", 0),
+            "verified_leads": data.get("verified_leads", 0),
+            "paid_applications": data.get("paid_applications", 0),
+            "unpaid_applications": data.get("total_applications", 0)
+                                   - data.get("paid_applications", 0),
+            "total_applications": data.get("total_applications", 0),
+        }
+
+    async def compute_summary(self, college_id, start_date=None,
+                              end_date=None) -> dict:
+        """
+        Compute the campaign summary of a college.
+
+        Returns:
+            dict: A dictionary which contains campaign summary.
+                e.g., {"campaign_count": {"all_source": 10, ...},
+                "source_wise_count": {"primary_source": {"google": 5}, ...},
+                "all_source_details": [...], "medium_wise_details": [...],
+                "funnel": {"leads": 10, ...}}
+        """
+        leads, applications = await asyncio.gather(
+            DatabaseConfiguration().studentsPrimaryDetails.aggregate(
+                self.get_lead_pipeline(college_id, start_date, end_date)
+            ).to_list(length=None),
+            DatabaseConfiguration().studentApplicationForms.aggregate(
+                self.get_application_pipeline(college_id, start_date, end_date)
+            ).to_list(length=None),
+        )
+        leads = leads[0] if leads else {}
+        applications = applications[0] if applications else {}
+        levels = (leads.get("levels") or [{}])[0]
+        campaign_count = {
+            level: levels.get(level, 0) for level in SOURCE_LEVELS
+        }
+        campaign_count = {"all_source": sum(campaign_count.values()),
+                          **campaign_count}
+        source_wise_count = {
+            level: {data.get("_id"): data.get("count", 0)
+                    for data in leads.get(level, [])}
+            for level in SOURCE_LEVELS
+        }
+        all_source_details = [
+            self.format_stage_totals("source_name", data)
+            for data in leads.get("sources", [])
+        ]
+        medium_wise_details = [
+            self.format_stage_totals("medium_name", data)
+            for data in leads.get("mediums", [])
+        ]
+        total_applications = applications.get("total_applications", 0)
+        paid_applications = applications.get("paid_applications", 0)
+        funnel = {
+            "leads": sum(data.get("leads") for data in all_source_details),
+            "verified_leads": sum(
+                data.get("verified_leads") for data in all_source_details),
+            "form_initiated": applications.get("form_initiated", 0),
+            "submitted_applications": applications.get(
+                "submitted_applications", 0),
+            "total_applications": total_applications,
+            "paid_applications": paid_applications,
+            "unpaid_applications": total_applications - paid_applications,
+        }
+        return {
+            "campaign_count": campaign_count,
+            "source_wise_count": source_wise_count,
+            "all_source_details": all_source_details,
+            "medium_wise_details": medium_wise_details,
+            "funnel": funnel,
+        }
+
+    async def get_summary(self, college_id, start_date=None,
+                          end_date=None) -> dict:
+        """
+        Get the campaign summary of a college from cache, summary is computed
+        when it is not cached.
+
+        Params:
+            college_id (str): An unique identifier of college.
+            start_date (datetime | None): Start date of leads/applications.
+            end_date (datetime | None): End date of leads/applications.
+
+        Returns:
+            dict: A dictionary which contains campaign summary, see
+                `compute_summary`.
+        """
+        from app.dependencies.oauth import get_redis_client, insert_data_in_cache
+        cache_key = None
+        try:
+            cache_key = await self.get_cache_key(college_id, start_date, end_date)
+            if cache_key and (cached := await get_redis_client().get(cache_key)):
+                return json.loads(cached)
+        except Exception as error:
+            logger.error(f"Failed to get cached campaign summary. Error - {error}")
+        summary = await self.compute_summary(college_id, start_date, end_date)
+        if cache_key:
+            await insert_data_in_cache(
+                cache_key, summary, expiration_time=SUMMARY_CACHE_TTL)
+        return summary
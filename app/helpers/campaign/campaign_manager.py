@@ -11,6 +11,7 @@ from fastapi.encoders import jsonable_encoder
 from app.core.utils import utility_obj
 from app.database.configuration import DatabaseConfiguration
 from app.dependencies.oauth import insert_data_in_cache
+from app.helpers.campaign.campaign_analytics import CampaignAnalytics
 
 
 @dataclass
@@ -179,86 +180,6 @@ class campaign:
                                 per))})
         return source_wise_count
 
-    async def all_source_details(self, start_date=None, end_date=None):
-        """
-        Get all source details
-        """
-        pipeline = [
-            {
-                "$project": {
-                    "_id": 1,
-                    "is_verify": 1,
-                    "source": 1
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "studentApplicationForms",
-                    "let": {"student_id": "$_id"},
-                    "pipeline": [
-                        {
-                            "$match": {
-                                "$expr": {
-                                    "$eq": ["$$student_id", "$student_id"]
-                                }
-                            }
-                        },
-                        {
-                            "$project": {
-                                "_id": 1,
-                                "payment_info": 1
-                            }
-                        }
-                    ],
-                    "as": "results",
-                }
-            },
-            {"$unwind": {"path": "$results", "includeArrayIndex": "arrayIndex",
-                         "preserveNullAndEmptyArrays": True}},
-            {
-                "$group": {
-                    "_id": "$source.primary_source.utm_source",
-                    "total_application": {"$sum": 1},
-                    "unpaid_count": {"$sum": {"$cond": [
-                        {"$ne": ["$results.payment_info.status", "captured"]},
-                        1, 0]}},
-                    "student_count": {"$addToSet": "$_id"},
-                    "verified_lead": {"$sum": {"$cond": ["is_verify", 1, 0]}},
-                    "paid_count": {"$sum": {"$cond": [
-                        {"$eq": ["$results.payment_info.status", "captured"]},
-                        1, 0]}}
-                }
-            },
-            {
-                "$project": {
-                    "_id": "$_id",
-                    "total_application": "$total_application",
-                    "unpaid_count": "$unpaid_count",
-                    "student_count": {"$size": "$student_count"},
-                    "verified_lead": "$verified_lead",
-                    "paid_count": "$paid_count"
-                }
-            }
-        ]
-        if start_date and end_date:
-            pipeline.insert(0, {"$match": {
-                "source.primary_source.utm_enq_date": {"$gte": start_date,
-                                                       "$lte": end_date}}})
-            pipeline[2].get("$lookup", {}).get("pipeline", []).insert(0, {
-                "$match": {
-                    "payment_info.created_at": {"$gte": start_date,
-                                                "$lte": end_date}
-                }})
-        result = DatabaseConfiguration().studentsPrimaryDetails.aggregate(
-            pipeline)
-        return [{"source_name": data.get("_id"),
-                 "leads": data.get("student_count", 0),
-                 "verified_leads": data.get("verified_lead", 0),
-                 "paid_applications": data.get("paid_count", 0),
-                 "unpaid_applications": data.get("unpaid_count", 0),
-                 "total_applications": data.get("total_application", 0)} async
-                for data in result]
-
     async def verified_unverified_leads_count(self, source_name,
                                               start_date=None, end_date=None):
         """
@@ -384,80 +305,26 @@ class campaign:
 
     async def campaign_manager_helper(self, college_id, date_range):
         """
-        get all utm_source from primary and secondary and tertiary
+        Get the campaign manager data of a college, i.e., count and percentage
+        of primary/secondary/tertiary sources, source wise and medium wise
+        details of leads and applications and funnel of leads.
         """
         start_date, end_date = None, None
-        if date_range is None:
-            total_leads = await DatabaseConfiguration().studentsPrimaryDetails.count_documents(
-                {'college_id': ObjectId(college_id)})
-            total_verified_leads = await DatabaseConfiguration().studentsPrimaryDetails.count_documents(
-                {'college_id': ObjectId(college_id), "is_verify": True})
-            total_applications = await DatabaseConfiguration().studentApplicationForms.count_documents(
-                {'college_id': ObjectId(college_id)})
-            total_paid_applications = await DatabaseConfiguration().studentApplicationForms.count_documents(
-                {'college_id': ObjectId(college_id),
-                 "payment_info.status": "captured"})
-            total_unpaid_applications = await DatabaseConfiguration().studentApplicationForms.count_documents(
-                {'college_id': ObjectId(college_id),
-                 "payment_info.status": {"$ne": "captured"}})
-        else:
+        if date_range is not None:
             date_range = await utility_obj.format_date_range(date_range)
             start_date, end_date = await utility_obj.get_start_and_end_date(
                 date_range=date_range)
-            total_leads = await DatabaseConfiguration().studentsPrimaryDetails.count_documents(
-                {'college_id': ObjectId(college_id),
-                 "created_at": {"$gte": start_date,
-                                "$lte": end_date}})
-            total_verified_leads = await DatabaseConfiguration().studentsPrimaryDetails.count_documents(
-                {'college_id': ObjectId(college_id), "is_verify": True,
-                 "created_at": {"$gte": start_date,
-                                "$lte": end_date}})
-            total_applications = await DatabaseConfiguration().studentApplicationForms.count_documents(
-                {'college_id': ObjectId(college_id),
-                 "enquiry_date": {"$gte": start_date,
-                                  "$lte": end_date}})
-            total_paid_applications = await DatabaseConfiguration().studentApplicationForms.count_documents(
-                {'college_id': ObjectId(college_id),
-                 "payment_info.status": "captured",
-                 "payment_info.created_at": {"$gte": start_date,
-                                             "$lte": end_date}})
-            total_unpaid_applications = total_applications - total_paid_applications
-        campaign_count = await self.total_campaign_count(start_date, end_date)
-        source_wise_details = await self.source_wise_table("utm_source",
-                                                           start_date,
-                                                           end_date)
-        total_percentage = await self.campaign_percentage(campaign_count)
-        source_wise_percentage = await self.source_wise_per(campaign_count,
-                                                            source_wise_details)
-        all_source_details: list = await self.all_source_details(start_date,
-                                                                 end_date)
-        if all_source_details:
-            count_of_leads = sum(
-                [item.get("leads") for item in all_source_details])
-            count_of_verified_leads = sum(
-                [item.get("verified_leads") for item in all_source_details])
-            count_of_paid_applications = sum(
-                [item.get("paid_applications") for item in all_source_details])
-            count_of_unpaid_applications = sum(
-                [item.get("unpaid_applications") for item in
-                 all_source_details])
-            count_of_total_applications = sum(
-                [item.get("total_applications") for item in
-                 all_source_details])
-            if (total_leads - count_of_leads) > 0:
-                all_source_details.append({"source_name": "organic",
-                                           "leads": total_leads - count_of_leads,
-                                           "verified_leads": total_verified_leads - count_of_verified_leads,
-                                           "paid_applications": abs(
-                                               total_paid_applications - count_of_paid_applications),
-                                           "unpaid_applications": abs(
-                                               total_unpaid_applications - count_of_unpaid_applications),
-                                           "total_applications": total_applications - count_of_total_applications})
-        if total_percentage is None:
-            total_percentage = {}
+        summary = await CampaignAnalytics().get_summary(
+            college_id, start_date, end_date)
+        total_percentage = await self.campaign_percentage(
+            summary.get("campaign_count"))
+        source_wise_percentage = await self.source_wise_per(
+            total_percentage, summary.get("source_wise_count"))
         total_percentage.update(
-            {"all_source_details": all_source_details,
-             "source_wise_percentage": source_wise_percentage})
+            {"all_source_details": summary.get("all_source_details"),
+             "source_wise_percentage": source_wise_percentage,
+             "medium_wise_details": summary.get("medium_wise_details"),
+             "funnel": summary.get("funnel")})
         return total_percentage
 
     async def source_wise_details(self, source_name, name="utm_source",
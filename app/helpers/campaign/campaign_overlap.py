@@ -2,6 +2,7 @@
 This file contain class and functions related to campaign routes
 """
 import datetime
+import time
 from dataclasses import dataclass
 
 from bson import ObjectId
@@ -13,6 +14,14 @@ from app.database.configuration import DatabaseConfiguration
 
 logger = get_logger(__name__)
 
+SOURCE_LEVELS = ["primary_source", "secondary_source", "tertiary_source"]
+# Source signatures of leads by college folder, college and date window.
+# e.g., {("college", "college_id", "start_date", "end_date"): (signatures,
+# expire_at)}
+_source_signatures: dict = {}
+SIGNATURE_CACHE_TTL = 300
+MAX_CACHED_SIGNATURES = 100
+
 
 @dataclass
 class SourceStats:
@@ -33,61 +42,20 @@ class campaign_source_overlap:
     A class representing a source overlap.
     """
 
-    async def extract_data(self,
-                           pipeline: list | None = None):
-        """
-        Get the source overlap data based on given pipeline from the database.
-
-         Params:
-            - pipeline (list): An aggregation pipeline for get source
-                 overlap data.
-
-        Returns:
-            - tuple: A tuple which contains source overlap data.
+    def get_signature_pipeline(self, college_id: str | None = None,
+                               start_date=None, end_date=None) -> list:
         """
-        result = DatabaseConfiguration().studentsPrimaryDetails.aggregate(
-            pipeline)
-        source_dict = {}
-        async for utm_data in result:
-            if source_dict.get(utm_data.get("_id", "")) is None:
-                source_helper = SourceStats(source_name=utm_data.get("_id",
-                                                                     ""))
-            else:
-                source_helper = source_dict.get(utm_data.get("_id", ""))
-            source_helper.primary_source += utm_data.get("primary_source",
-                                                         0)
-            source_helper.secondary_source += utm_data.get(
-                "secondary_source", 0)
-            source_helper.tertiary_source += utm_data.get(
-                "tertiary_source", 0)
-            source_helper.verified += utm_data.get("verified", 0)
-            source_helper.total_application += utm_data.get(
-                "total_application", 0)
-            source_helper.form_initiated += utm_data.get(
-                "form_initiated", 0)
-            source_dict[utm_data.get("_id", "")] = source_helper
-        return source_dict
-
-    async def get_aggregate_utm(self, college_id: str | None = None,
-                                utm_source="primary_source", start_date=None,
-                                end_date=None, source_name=None):
-        """
-        Get the source overlap for a given college
+        Get the aggregation pipeline which groups the leads by their source
+        signature, i.e., primary, secondary and tertiary utm source.
 
         Params:
-        - college_id (str): A unique id/identifier of a college which useful
-                for get particular college source overlap data.
-        - utm_source (str): Name of the utm source which can be primary_source,
-            secondary_source and tertiary_source, useful for get source
-                    overlap data according to utm source.
-        - start_date (datetime | None): Either None or a start date for get
-                source overlap data based on start_date.
-        - end_date (datetime | None): Either None or end_date for get source
-                overlap data based on end_date.
-        - source_name (str): Get the name of the source
+            - college_id (str): A unique id/identifier of a college.
+            - start_date (datetime | None): Either None or a start date of
+                leads.
+            - end_date (datetime | None): Either None or an end date of leads.
 
-    Returns:
-        - tuple: A tuple which contains source overlap data along with total count.
+        Returns:
+            - list: An aggregation pipeline.
         """
         pipeline = [
             {
@@ -101,10 +69,8 @@ class campaign_source_overlap:
                     "source": 1,
                     "is_verify": 1
                 }
-            }
-        ]
-        if utm_source == "primary_source":
-            pipeline.extend([{
+            },
+            {
                 "$lookup": {
                     "from": "studentApplicationForms",
                     "let": {"student_id": "$_id"},
@@ -116,13 +82,6 @@ class campaign_source_overlap:
                                 }
                             }
                         },
-                        {
-                            "$project": {
-                                "_id": 0,
-                                "payment_info": 1,
-                                "current_stage": 1
-                            }
-                        },
                         {
                             "$group": {
                                 "_id": "",
@@ -136,49 +95,83 @@ class campaign_source_overlap:
                     "as": "student_application"
                 }
             },
-                {
-                    "$unwind": {
-                        "path": "$student_application",
-                        "preserveNullAndEmptyArrays": True
-                    }
-                },
-                {
-                    "$group": {
-                        "_id": f"$source.{utm_source}.utm_source",
-                        f"{utm_source}": {"$sum": 1},
-                        "form_initiated": {"$sum": {
-                            "$ifNull": ["$student_application.form_initiated",
-                                        0]}},
-                        "total_application": {"$sum": {
-                            "$ifNull": [
-                                "$student_application.total_application", 0]}},
-                        "verified": {"$sum": {"$cond": ["$is_verify", 1, 0]}}
-                    }
-                }
-            ])
-        else:
-            pipeline.append({
+            {
                 "$group": {
-                    "_id": f"$source.{utm_source}.utm_source",
-                    f"{utm_source}": {"$sum": 1},
+                    "_id": {
+                        level: f"$source.{level}.utm_source"
+                        for level in SOURCE_LEVELS
+                    },
+                    "leads": {"$sum": 1},
+                    "verified": {"$sum": {"$cond": ["$is_verify", 1, 0]}},
+                    "total_application": {"$sum": {"$ifNull": [{
+                        "$arrayElemAt": [
+                            "$student_application.total_application", 0]}, 0]}},
+                    "form_initiated": {"$sum": {"$ifNull": [{
+                        "$arrayElemAt": [
+                            "$student_application.form_initiated", 0]}, 0]}},
                 }
-            })
+            }
+        ]
         if start_date is not None and end_date is not None:
             pipeline[0].get("$match", {}).update({
                 "created_at": {"$gte": start_date, "$lte": end_date}
             })
-        if source_name is not None and source_name:
-            pipeline[0].get("$match", {}).update({
-                f"source.{utm_source}.utm_source": {
-                    "$in": [source.lower() for source in source_name]}
-            })
-        return await self.extract_data(pipeline=pipeline)
+        return pipeline
+
+    async def get_source_signatures(self, college_id: str | None = None,
+                                    start_date=None, end_date=None) -> list:
+        """
+        Get the source signatures of leads of a college from cache, signatures
+        are built in one scan of leads when not cached.
+
+        Returns:
+            - list: A list which contains source signatures along with count
+                of leads. e.g., [{"_id": {"primary_source": "google",
+                "secondary_source": "facebook", "tertiary_source": None},
+                "leads": 10, "verified": 4, "total_application": 3,
+                "form_initiated": 2}]
+        """
+        key = (utility_obj.get_university_name_s3_folder(), str(college_id),
+               str(start_date), str(end_date))
+        signatures, expire_at = _source_signatures.get(key, (None, 0))
+        if signatures is not None and expire_at > time.monotonic():
+            return signatures
+        signatures = await DatabaseConfiguration().studentsPrimaryDetails.aggregate(
+            self.get_signature_pipeline(college_id, start_date, end_date)
+        ).to_list(length=None)
+        if len(_source_signatures) >= MAX_CACHED_SIGNATURES:
+            _source_signatures.clear()
+        _source_signatures[key] = (signatures,
+                                   time.monotonic() + SIGNATURE_CACHE_TTL)
+        return signatures
+
+    def get_overlap_count(self, signatures: list, sources: list) -> int:
+        """
+        Get the count of leads which have all the given sources at any source
+        level, e.g., pairwise overlap when two sources are given.
+
+        Params:
+            - signatures (list): Source signatures of leads, see
+                `get_source_signatures`.
+            - sources (list): Names of sources. e.g., ["google", "facebook"]
+
+        Returns:
+            - int: Count of overlapped leads.
+        """
+        sources = {source.lower() for source in sources}
+        return sum(
+            signature.get("leads", 0) for signature in signatures
+            if sources <= {signature.get("_id", {}).get(level)
+                           for level in SOURCE_LEVELS}
+        )
 
     async def get_call_aggregations(self, college_id: str | None = None,
                                     start_date=None, end_date=None,
                                     source_name=None):
         """
-        Get the call aggregations function
+        Get the source wise count of leads at each source level along with
+        verified leads and applications of primary source.
+
         Params:
             - college_id (str): A unique id/identifier of a college which useful
                 for get particular college source overlap data.
@@ -189,60 +182,32 @@ class campaign_source_overlap:
             - source_name (str): Get the name of the source
 
     Returns:
-        - tuple: A tuple which contains a dictionary of all the details of
-                primary, secondary and tertiary.
+        - dict: A dictionary which contains source name as a key and
+            details of primary, secondary and tertiary as value.
         """
-        secondary_count = await self.get_aggregate_utm(
-            college_id=college_id, start_date=start_date, end_date=end_date,
-            utm_source="secondary_source", source_name=source_name)
-        tertiary_count = await self.get_aggregate_utm(
-            college_id=college_id, start_date=start_date, end_date=end_date,
-            utm_source="tertiary_source", source_name=source_name)
-        primary_count = await self.get_aggregate_utm(
-            college_id=college_id, start_date=start_date, end_date=end_date,
-            utm_source="primary_source", source_name=source_name)
-        for key in primary_count.keys() | secondary_count.keys() | tertiary_count.keys():
-            if (key in primary_count) and (key in secondary_count) and (
-                    key in tertiary_count):
-                try:
-                    primary_count[key].secondary_source += secondary_count[
-                        key].secondary_source
-                    primary_count[key].tertiary_source += tertiary_count[
-                        key].tertiary_source
-                except KeyError as error:
-                    logger.error(f"An occur error: {error}")
-            elif (key in secondary_count) and (key in tertiary_count):
-                try:
-                    primary_count[key] = secondary_count[key]
-                    primary_count[key].tertiary_source += tertiary_count[
-                        key].tertiary_source
-                except KeyError as error:
-                    logger.error(f"An occur error with both: {error}")
-            elif (key in secondary_count) and (key in primary_count):
-                try:
-                    primary_count[key].secondary_source += secondary_count[
-                        key].secondary_source
-                except KeyError as error:
-                    logger.error(f"An occur error with secondary & "
-                                 f"primary: {error}")
-            elif (key in tertiary_count) and (key in primary_count):
-                try:
-                    primary_count[key].tertiary_source += tertiary_count[
-                        key].tertiary_source
-                except KeyError as error:
-                    logger.error(f"An occur error with"
-                                 f" tertiary & primary: {error}")
-            elif key in secondary_count:
-                try:
-                    primary_count[key] = secondary_count[key]
-                except KeyError as error:
-                    logger.error(f"An occur error with secondary: {error}")
-            elif key in tertiary_count:
-                try:
-                    primary_count[key] = tertiary_count[key]
-                except KeyError as error:
-                    logger.error(f"An occur error with tertiary: {error}")
-        return primary_count
+        signatures = await self.get_source_signatures(
+            college_id=college_id, start_date=start_date, end_date=end_date)
+        source_names = None
+        if source_name:
+            source_names = {source.lower() for source in source_name}
+        source_dict = {}
+        for signature in signatures:
+            for level in SOURCE_LEVELS:
+                name = signature.get("_id", {}).get(level)
+                if source_names is not None and name not in source_names:
+                    continue
+                if (source_helper := source_dict.get(name)) is None:
+                    source_helper = source_dict[name] = SourceStats(
+                        source_name=name)
+                setattr(source_helper, level, getattr(source_helper, level)
+                        + signature.get("leads", 0))
+                if level == "primary_source":
+                    source_helper.verified += signature.get("verified", 0)
+                    source_helper.total_application += signature.get(
+                        "total_application", 0)
+                    source_helper.form_initiated += signature.get(
+                        "form_initiated", 0)
+        return source_dict
 
     async def get_change_indicator_helper(self, college_id: str | None = None,
                                           change_indicator="last_7_days",
@@ -398,7 +363,9 @@ class campaign_source_overlap:
             - change_indicator (str | None): Either None or get the
                 data count according change indicator. e.q
                     last_7_days, last_15_days and last_30_days.
-            - source_name (str): Get the name of the source
+            - source_name (str): Get the name of the source, count of leads
+                which have all the sources is returned as `overlap` when
+                more than one source is given.
 
         Returns:
             - dict: A dict which containing the source overlap details
@@ -476,6 +443,11 @@ class campaign_source_overlap:
             "total_application": total_application,
             "form_initiated": form_initiated
         }
+        if source_name and len(source_name) > 1:
+            signatures = await self.get_source_signatures(
+                college_id=college_id, start_date=start_date, end_date=end_date)
+            total_count_data["overlap"] = self.get_overlap_count(
+                signatures, source_name)
         final_lst = final_lst[skip: limit]
         return {
             "total_count_data": total_count_data,
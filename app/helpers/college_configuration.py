@@ -12,6 +12,7 @@ from bson.objectid import ObjectId
 from fastapi import BackgroundTasks
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import HTTPException
+from pymongo import UpdateOne
 
 from app.core.custom_error import CustomError, DataNotFoundError
 from app.core.reset_credentials import Reset_the_settings
@@ -21,6 +22,7 @@ from app.database.aggregation.course import Course
 from app.database.configuration import DatabaseConfiguration
 from app.database.database_sync import DatabaseConfigurationSync
 from app.database.motor_base_singleton import MotorBaseSingleton
+from app.helpers.bulk_import import BulkImport
 from app.helpers.user_curd.user_configuration import UserHelper
 from app.models.student_user_schema import User
 
@@ -169,6 +171,12 @@ class CollegeHelper:
                 {"_id": ObjectId(college_id)}, {"$set": data}
             )
             await cache_invalidation(api_updated="updated_college", user_id=college_id)
+        if client_info.get("razorpay"):
+            # Do not move below statement at top otherwise we will get
+            # circular import error
+            from app.helpers.razorpay_gateway import RazorpayGateway
+
+            RazorpayGateway.evict(college_id)
         return {"message": "Updated college data."}
 
     async def get_course_details(self, course_name: str | None, college: dict,
@@ -827,206 +835,252 @@ class CollegeHelper:
             )
         return json.loads(json.dumps(colleges, default=str))
 
-    async def add_csv_file_college_data_into_database(self, csv_data):
+    async def get_college_document(self, i: dict, lookups: dict) -> dict:
         """
-        Add csv file college_data into database
+        Get the college document of a csv row.
+
+        Params:
+            i (dict): A row of csv file.
+            lookups (dict): Country, state and city codes which are already
+                found in the file, shared by all the rows of a file.
+
+        Returns:
+            dict: A dictionary which contains college data.
+
+        Raises:
+            HTTPException: An error occurred when row is not valid.
         """
         from app.dependencies.oauth import get_collection_from_cache, store_collection_in_cache
-        payload = json.loads(csv_data.to_json(orient="records"))
-        data_list = []
-        for i in payload:
-            if not i.get("name"):
-                raise HTTPException(
-                    status_code=400,
-                    detail="College name should be exist in csv."
-                )
-            pocs_name = []
-            if i.get("pocs_name"):
-                if i.get("pocs_name").find(","):
-                    for item in i.get("pocs_name").strip().split(","):
-                        pocs_name.append(item)
-            pocs_email = []
-            if i.get("pocs_email"):
-                if i.get("pocs_email").find(","):
-                    for item in i.get("pocs_email").strip().split(","):
-                        pocs_email.append(item)
-            pocs_mobile_number = []
-            if i.get("pocs_mobile_number"):
-                if str(i.get("pocs_mobile_number")).find(","):
-                    for item in str(i.get("pocs_mobile_number")).strip().split(
-                            ","):
-                        if len(item) == 10:
-                            pocs_mobile_number.append(int(item))
-                        else:
-                            raise HTTPException(
-                                status_code=400,
-                                detail="Mobile must be 10 digit in csv.",
-                            )
-            college_manager_name = []
-            if i.get("college_manager_name"):
-                if i.get("college_manager_name").find(","):
-                    for item in i.get("college_manager_name").split(","):
-                        college_manager_name.append(item)
-
-            country_code = i.get("country_code")
-            if country_code:
+        if not i.get("name"):
+            raise HTTPException(
+                status_code=400,
+                detail="College name should be exist in csv."
+            )
+        pocs_name = []
+        if i.get("pocs_name"):
+            if i.get("pocs_name").find(","):
+                for item in i.get("pocs_name").strip().split(","):
+                    pocs_name.append(item)
+        pocs_email = []
+        if i.get("pocs_email"):
+            if i.get("pocs_email").find(","):
+                for item in i.get("pocs_email").strip().split(","):
+                    pocs_email.append(item)
+        pocs_mobile_number = []
+        if i.get("pocs_mobile_number"):
+            if str(i.get("pocs_mobile_number")).find(","):
+                for item in str(i.get("pocs_mobile_number")).strip().split(
+                        ","):
+                    if len(item) == 10:
+                        pocs_mobile_number.append(int(item))
+                    else:
+                        raise HTTPException(
+                            status_code=400,
+                            detail="Mobile must be 10 digit in csv.",
+                        )
+        college_manager_name = []
+        if i.get("college_manager_name"):
+            if i.get("college_manager_name").find(","):
+                for item in i.get("college_manager_name").split(","):
+                    college_manager_name.append(item)
+
+        country_code = i.get("country_code")
+        if country_code:
+            key = ("country", country_code.strip().title())
+            if key not in lookups:
                 countries = await get_collection_from_cache(collection_name="countries")
                 if countries:
                     country = utility_obj.search_for_document(countries, field="name",
-                                                              search_name=country_code.strip().title())
+                                                              search_name=key[1])
                 else:
                     country = await DatabaseConfiguration().country_collection.find_one(
-                        {"name": country_code.strip().title()}
+                        {"name": key[1]}
                     )
                     countries = await DatabaseConfiguration().country_collection.aggregate(
                         []).to_list(None)
                     await store_collection_in_cache(collection=countries,
                                                     collection_name="countries")
-                if country:
-                    country_code = country.get("iso2")
-                else:
-                    raise HTTPException(
-                        status_code=400, detail="Enter valid country name"
-                    )
-            state_code = i.get("state_code")
-            if state_code:
+                lookups[key] = country.get("iso2") if country else None
+            country_code = lookups[key]
+            if not country_code:
+                raise HTTPException(
+                    status_code=400, detail="Enter valid country name"
+                )
+        state_code = i.get("state_code")
+        if state_code:
+            key = ("state", state_code.strip().title(), country_code)
+            if key not in lookups:
                 states = await get_collection_from_cache(collection_name="states")
                 if states:
-                    state = await utility_obj.search_for_document_two_field(states,
-                                                                            field1="name",
-                                                                            field1_search_name=state_code.strip().title(),
-                                                                            field2="country_code",
-                                                                            field2_search_name=country_code
-                                                                            )
+                    state = utility_obj.search_for_document_two_fields(
+                        states, field1="name", field1_search_name=key[1],
+                        field2="country_code", field2_search_name=country_code)
                 else:
                     state = await DatabaseConfiguration().state_collection.find_one(
-                        {"name": state_code.strip().title(),
-                         "country_code": country_code}
+                        {"name": key[1], "country_code": country_code}
                     )
                     collection = await DatabaseConfiguration().state_collection.aggregate(
                         []).to_list(None)
                     await store_collection_in_cache(collection, collection_name="states")
-
-                if state:
-                    state_code = state.get("state_code")
-                else:
-                    raise HTTPException(
-                        status_code=400, detail="Enter valid state name"
-                    )
-            city = i.get("city")
-            if city:
+                lookups[key] = state.get("state_code") if state else None
+            state_code = lookups[key]
+            if not state_code:
+                raise HTTPException(
+                    status_code=400, detail="Enter valid state name"
+                )
+        city = i.get("city")
+        if city:
+            key = ("city", city.title().strip(), country_code, state_code)
+            if key not in lookups:
                 found_city = await DatabaseConfiguration().city_collection.find_one(
                     {
-                        "name": city.title().strip(),
+                        "name": key[1],
                         "country_code": country_code,
                         "state_code": state_code,
                     }
                 )
-                if found_city:
-                    city = found_city.get("name")
-                else:
-                    raise HTTPException(status_code=400,
-                                        detail="Enter valid city name")
-            if pocs_name == [] and pocs_email == [] and pocs_mobile_number == []:
-                pocs = [
-                    {"name": None, "pocs_email": None,
-                     "pocs_mobile_number": None}
-                    for i, j, k in
-                    zip(pocs_name, pocs_email, pocs_mobile_number)
-                ]
-            elif pocs_name == [] and pocs_email == []:
-                pocs = [
-                    {"name": None, "pocs_email": None, "pocs_mobile_number": k}
-                    for i, j, k in
-                    zip(pocs_name, pocs_email, pocs_mobile_number)
-                ]
-            elif pocs_mobile_number == [] and pocs_email == []:
-                pocs = [
-                    {"name": i, "pocs_email": None, "pocs_mobile_number": k}
-                    for i, j, k in
-                    zip(pocs_name, pocs_email, pocs_mobile_number)
-                ]
-            elif pocs_mobile_number == [] and pocs_name == []:
-                pocs = [
-                    {"name": None, "pocs_email": j, "pocs_mobile_number": None}
-                    for i, j, k in
-                    zip(pocs_name, pocs_email, pocs_mobile_number)
-                ]
-            elif not pocs_name:
-                pocs = [
-                    {"name": None, "pocs_email": j, "pocs_mobile_number": k}
-                    for i, j, k in
-                    zip(pocs_name, pocs_email, pocs_mobile_number)
-                ]
-            elif not pocs_email:
-                pocs = [
-                    {"name": i, "pocs_email": None, "pocs_mobile_number": k}
-                    for i, j, k in
-                    zip(pocs_name, pocs_email, pocs_mobile_number)
-                ]
-            elif not pocs_mobile_number:
-                pocs = [
-                    {"name": i, "pocs_email": j, "pocs_mobile_number": None}
-                    for i, j, k in
-                    zip(pocs_name, pocs_email, pocs_mobile_number)
-                ]
-            else:
-                pocs = [
-                    {"name": i, "pocs_email": j, "pocs_mobile_number": None}
-                    for i, j, k in
-                    zip(pocs_name, pocs_email, pocs_mobile_number)
-                ]
-            data = {
-                "name": i.get("name").strip().title(),
-                "address": {
-                    "address_line_1": i.get("address_line_1"),
-                    "address_line_2": i.get("address_line_2"),
-                    "country_code": country_code,
-                    "state_code": state_code,
-                    "city": city,
-                },
-                "website_url": i.get("website_url"),
-                "pocs": pocs,
-                "subscriptions": {
-                    "raw_data_module": i.get("raw_data_module"),
-                    "lead_management_system": i.get("lead_management_system"),
-                    "app_management_system": i.get("app_management_system"),
-                },
-                "enforcements": {
-                    "lead_limit": i.get("lead_limit"),
-                    "counselor_limit": i.get("counselor_limit"),
-                    "college_managerLimit": i.get("college_managerLimit"),
-                    "publisher_account_limit": i.get(
-                        "publisher_account_limit"),
-                },
-                "leads": {
-                    "verification_type": i.get("verification_type"),
-                    "lead_api_enabled": i.get("lead_api_enabled"),
-                },
-                "number_of_forms": i.get("number_of_forms"),
-                "integrations": {
-                    "with_erp": i.get("with_erp"),
-                    "with_3rd_party_app": i.get("with_3rd_party_app"),
-                    "with_3rd_party_telephony": i.get(
-                        "with_3rd_party_telephony"),
-                },
-                "status_info": {
-                    "is_activated": i.get("is_activated"),
-                    "activation_date": i.get("activation_date"),
-                    "deactivation_date": i.get("deactivation_date"),
-                    "creation_date": i.get("creation_date"),
-                },
-                "college_manager_name": college_manager_name,
-            }
-            college = await DatabaseConfiguration().college_collection.find_one(
-                {"name": i.get("name").strip().title()}
-            )
-            if not college:
-                await DatabaseConfiguration().college_collection.insert_one(
-                    data)
-                data_list.append(self.college_helper(data))
-        if data_list:
-            return data_list
+                lookups[key] = found_city.get("name") if found_city else None
+            city = lookups[key]
+            if not city:
+                raise HTTPException(status_code=400,
+                                    detail="Enter valid city name")
+        if pocs_name == [] and pocs_email == [] and pocs_mobile_number == []:
+            pocs = [
+                {"name": None, "pocs_email": None,
+                 "pocs_mobile_number": None}
+                for i, j, k in
+                zip(pocs_name, pocs_email, pocs_mobile_number)
+            ]
+        elif pocs_name == [] and pocs_email == []:
+            pocs = [
+                {"name": None, "pocs_email": None, "pocs_mobile_number": k}
+                for i, j, k in
+                zip(pocs_name, pocs_email, pocs_mobile_number)
+            ]
+        elif pocs_mobile_number == [] and pocs_email == []:
+            pocs = [
+                {"name": i, "pocs_email": None, "pocs_mobile_number": k}
+                for i, j, k in
+                zip(pocs_name, pocs_email, pocs_mobile_number)
+            ]
+        elif pocs_mobile_number == [] and pocs_name == []:
+            pocs = [
+                {"name": None, "pocs_email": j, "pocs_mobile_number": None}
+                for i, j, k in
+                zip(pocs_name, pocs_email, pocs_mobile_number)
+            ]
+        elif not pocs_name:
+            pocs = [
+                {"name": None, "pocs_email": j, "pocs_mobile_number": k}
+                for i, j, k in
+                zip(pocs_name, pocs_email, pocs_mobile_number)
+            ]
+        elif not pocs_email:
+            pocs = [
+                {"name": i, "pocs_email": None, "pocs_mobile_number": k}
+                for i, j, k in
+                zip(pocs_name, pocs_email, pocs_mobile_number)
+            ]
+        elif not pocs_mobile_number:
+            pocs = [
+                {"name": i, "pocs_email": j, "pocs_mobile_number": None}
+                for i, j, k in
+                zip(pocs_name, pocs_email, pocs_mobile_number)
+            ]
+        else:
+            pocs = [
+                {"name": i, "pocs_email": j, "pocs_mobile_number": None}
+                for i, j, k in
+                zip(pocs_name, pocs_email, pocs_mobile_number)
+            ]
+        data = {
+            "name": i.get("name").strip().title(),
+            "address": {
+                "address_line_1": i.get("address_line_1"),
+                "address_line_2": i.get("address_line_2"),
+                "country_code": country_code,
+                "state_code": state_code,
+                "city": city,
+            },
+            "website_url": i.get("website_url"),
+            "pocs": pocs,
+            "subscriptions": {
+                "raw_data_module": i.get("raw_data_module"),
+                "lead_management_system": i.get("lead_management_system"),
+                "app_management_system": i.get("app_management_system"),
+            },
+            "enforcements": {
+                "lead_limit": i.get("lead_limit"),
+                "counselor_limit": i.get("counselor_limit"),
+                "college_managerLimit": i.get("college_managerLimit"),
+                "publisher_account_limit": i.get(
+                    "publisher_account_limit"),
+            },
+            "leads": {
+                "verification_type": i.get("verification_type"),
+                "lead_api_enabled": i.get("lead_api_enabled"),
+            },
+            "number_of_forms": i.get("number_of_forms"),
+            "integrations": {
+                "with_erp": i.get("with_erp"),
+                "with_3rd_party_app": i.get("with_3rd_party_app"),
+                "with_3rd_party_telephony": i.get(
+                    "with_3rd_party_telephony"),
+            },
+            "status_info": {
+                "is_activated": i.get("is_activated"),
+                "activation_date": i.get("activation_date"),
+                "deactivation_date": i.get("deactivation_date"),
+                "creation_date": i.get("creation_date"),
+            },
+            "college_manager_name": college_manager_name,
+        }
+        return data
+
+    async def import_colleges(self, bucket_name: str, object_key: str,
+                              created_by=None) -> dict:
+        """
+        Import the colleges of a csv file of S3, a college is inserted when
+        college with the same name does not exist.
+
+        Params:
+            bucket_name (str): Name of S3 bucket.
+            object_key (str): Key of csv file in the bucket.
+            created_by: Unique identifier of user who imports the file.
+
+        Returns:
+            dict: A dictionary which contains the import report.
+
+        Raises:
+            HTTPException: An error occurred when no college is inserted.
+        """
+        lookups = {}
+
+        async def build_operations(rows: list, row_numbers: list) -> tuple:
+            operations, operation_rows, errors, names = [], [], [], set()
+            for row, row_number in zip(rows, row_numbers):
+                try:
+                    data = await self.get_college_document(row, lookups)
+                except HTTPException as error:
+                    errors.append({"row": row_number, "error": error.detail})
+                    continue
+                if data.get("name") in names:
+                    continue
+                names.add(data.get("name"))
+                operations.append(UpdateOne(
+                    {"name": data.get("name")}, {"$setOnInsert": data}, upsert=True))
+                operation_rows.append(row_number)
+            return operations, operation_rows, errors
+
+        report = await BulkImport("colleges").run(
+            bucket_name, object_key, DatabaseConfiguration().college_collection,
+            build_operations,
+            required_columns={"name": "College name should be exist in csv."},
+            created_by=created_by)
+        if report.get("inserted"):
+            return report
+        if report.get("errors"):
+            raise HTTPException(status_code=400, detail=report["errors"][0].get("error"))
         raise HTTPException(
             status_code=422, detail="Colleges data already exist in database."
         )
@@ -7,6 +7,7 @@ import json
 from app.database.aggregation.admin_user import AdminUser
 from app.database.configuration import DatabaseConfiguration
 from app.core.utils import utility_obj
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 from bson.objectid import ObjectId
 
 
@@ -4026,15 +4027,7 @@ class CommunicationPerformanceHeader:
             last_match.update({"$or": course_filter})
         if search:
             search_match.update(
-                {
-                    "$or": [
-                        {"primary_details.basic_details.first_name": {"$regex": f".*{search}.*", "$options": "i"}},
-                        {"primary_details.basic_details.middle_name": {"$regex": f".*{search}.*", "$options": "i"}},
-                        {"primary_details.basic_details.last_name": {"$regex": f".*{search}.*", "$options": "i"}},
-                        {"primary_details.user_name": {"$regex": f".*{search}.*", "$options": "i"}},
-                        {"primary_details.basic_details.mobile_number": {"$regex": f".*{search}.*", "$options": "i"}}
-                   ]
-                }
+                SearchKeyHelper().get_search_query(search, prefix="primary_details.")
             )
         skip, limit = await utility_obj.return_skip_and_limit(page_num, page_size)
         pipeline = [
@@ -5,10 +5,13 @@ import json
 
 from bson import ObjectId
 from fastapi.exceptions import HTTPException
+from pymongo import UpdateOne
+
 from app.core.custom_error import CustomError, DataNotFoundError
 from app.core.utils import utility_obj
 from app.database.aggregation.course import Course
 from app.database.configuration import DatabaseConfiguration
+from app.helpers.bulk_import import BulkImport
 
 
 class CourseHelper:
@@ -221,79 +224,108 @@ class CourseHelper:
                 find_one({"_id": course.inserted_id})
             return self.course_helper(new_course)
 
-    async def add_course_data_into_database(self, csv_data, college_id):
+    def get_course_document(self, i: dict, college_id: str) -> dict:
         """
-        Add course data into database
+        Get the course document of a csv row.
         """
-        payload = json.loads(csv_data.to_json(orient="records"))
-        data_list = []
-        for i in payload:
-            if not i.get("course_name"):
-                raise HTTPException(
-                    status_code=400,
-                    detail="Course name should be exist in csv."
-                )
+        course_specialization = []
+        if (
+                i.get("course_specialization") is not None
+                and i.get("course_specialization") != ""
+        ):
+            if i.get("course_specialization").find(","):
+                for item in i.get("course_specialization").split(","):
+                    course_specialization.append(
+                        {"spec_name": item.strip(), "is_activated": True}
+                    )
 
-            course_specialization = []
-            if (
-                    i.get("course_specialization") is not None
-                    and i.get("course_specialization") != ""
-            ):
-                if i.get("course_specialization").find(","):
-                    for item in i.get("course_specialization").split(","):
-                        course_specialization.append(
-                            {"spec_name": item.strip(), "is_activated": True}
-                        )
+        return {
+            "college_id": ObjectId(college_id),
+            "course_name": i.get("course_name"),
+            "course_description": i.get("course_description"),
+            "duration": f"{i.get('duration')} Years",
+            "fees": f"Rs.{i.get('Application_fees')}.0/-",
+            "is_activated": i.get("is_activated"),
+            "banner_image_url": i.get("banner_image_url"),
+            "course_specialization": course_specialization
+            if course_specialization
+            else None,
+        }
 
-            data = {
-                "college_id": ObjectId(college_id),
-                "course_name": i.get("course_name"),
-                "course_description": i.get("course_description"),
-                "duration": f"{i.get('duration')} Years",
-                "fees": f"Rs.{i.get('Application_fees')}.0/-",
-                "is_activated": i.get("is_activated"),
-                "banner_image_url": i.get("banner_image_url"),
-                "course_specialization": course_specialization
-                if course_specialization
-                else None,
-            }
-            course = await DatabaseConfiguration().course_collection.find_one(
-                {"college_id": ObjectId(college_id),
-                 "course_name": i["course_name"]}
-            )
-            if not course:
-                checked = await DatabaseConfiguration().course_collection.insert_one(
-                    data)
-                course_data = await DatabaseConfiguration().course_collection.find_one(
-                    {"_id": checked.inserted_id})
-                data_list.append(self.course_helper(course_data))
-            else:
-                for item in course_specialization:
-                    if item not in course.get("course_specialization"):
-                        if course.get("course_specialization") is None:
-                            await DatabaseConfiguration().course_collection.update_one(
-                                {"_id": ObjectId(course.get("_id"))},
-                                {"$set": {
-                                    "course_specialization": course_specialization}},
-                            )
-                        else:
-                            try:
-                                await DatabaseConfiguration().course_collection.update_one(
-                                    {"_id": ObjectId(course.get("_id"))},
-                                    {
-                                        "$set": {
-                                            "course_specialization": course.get(
-                                                "course_specialization"
-                                            )
-                                                                     + course_specialization
-                                        }
-                                    },
-                                )
-                            except:
-                                continue
+    async def import_courses(self, bucket_name: str, object_key: str,
+                             college_id: str, created_by=None) -> dict:
+        """
+        Import the courses of a csv file of S3. A course is inserted when
+        course with the same name does not exist in the college, otherwise
+        new specializations of row are added in the course.
+
+        Params:
+            bucket_name (str): Name of S3 bucket.
+            object_key (str): Key of csv file in the bucket.
+            college_id (str): An unique identifier of college.
+            created_by: Unique identifier of user who imports the file.
+
+        Returns:
+            dict: A dictionary which contains the import report.
+
+        Raises:
+            HTTPException: An error occurred when no course is inserted or
+                updated.
+        """
+        collection = DatabaseConfiguration().course_collection
+
+        async def build_operations(rows: list, row_numbers: list) -> tuple:
+            courses, errors = {}, []
+            for row, row_number in zip(rows, row_numbers):
+                try:
+                    data = self.get_course_document(row, college_id)
+                except Exception as error:
+                    errors.append({"row": row_number, "error": str(error)})
+                    continue
+                if (course := courses.get(data.get("course_name"))) is None:
+                    courses[data.get("course_name")] = (row_number, data)
                     continue
-        if data_list:
-            return data_list
+                # Specializations of duplicate rows are added in the course
+                specs = course[1].get("course_specialization") or []
+                specs += [spec for spec in data.get("course_specialization") or []
+                          if spec not in specs]
+                course[1]["course_specialization"] = specs or None
+            existing = {
+                course.get("course_name"): course
+                for course in await collection.find(
+                    {"college_id": ObjectId(college_id),
+                     "course_name": {"$in": list(courses)}},
+                    {"course_name": 1, "course_specialization": 1}
+                ).to_list(None)
+            }
+            operations, operation_rows = [], []
+            for course_name, (row_number, data) in courses.items():
+                course = existing.get(course_name)
+                if course is None:
+                    operation = UpdateOne(
+                        {"college_id": ObjectId(college_id), "course_name": course_name},
+                        {"$setOnInsert": data}, upsert=True)
+                else:
+                    specs = course.get("course_specialization") or []
+                    new_specs = [spec for spec in data.get("course_specialization") or []
+                                 if spec not in specs]
+                    if not new_specs:
+                        continue
+                    operation = UpdateOne(
+                        {"_id": course.get("_id")},
+                        {"$set": {"course_specialization": specs + new_specs}})
+                operations.append(operation)
+                operation_rows.append(row_number)
+            return operations, operation_rows, errors
+
+        report = await BulkImport("courses").run(
+            bucket_name, object_key, collection, build_operations,
+            required_columns={"course_name": "Course name should be exist in csv."},
+            created_by=created_by, college_id=college_id)
+        if report.get("inserted") or report.get("updated"):
+            return report
+        if report.get("errors"):
+            raise HTTPException(status_code=400, detail=report["errors"][0].get("error"))
         raise HTTPException(
             status_code=422, detail="Courses data already exist in a database."
         )
@@ -10,8 +10,9 @@ from app.core.custom_error import DataNotFoundError, CustomError
 from app.core.utils import utility_obj, settings
 from app.database.configuration import DatabaseConfiguration
 from app.dependencies.jwttoken import Authentication
-from app.dependencies.oauth import get_collection_from_cache, store_collection_in_cache
 from app.helpers.automation.automation_configuration import AutomationHelper
+from app.helpers.data_segment.segment_cardinality import SegmentCardinality
+from app.helpers.reference_resolver import ReferenceResolver
 
 
 class DataSegmentHelper:
@@ -26,37 +27,21 @@ class DataSegmentHelper:
         total_data, data_list = await AutomationHelper().get_data_from_db(
             data, college_id, data_segments=data_segments, call_segments=True
         )
-        if len(data.get("filters", {}).get("state_code", [])) > 0:
-            state_names = []
-            states = await get_collection_from_cache(collection_name="states")
-            for state_code in data.get("filters", {}).get("state_code", []):
-                if states:
-                    state = utility_obj.search_for_document_two_fields(states,
-                                                                       field1="state_code",
-                                                                       field1_search_name=str(state_code).upper(),
-                                                                       field2="country_code",
-                                                                       field2_search_name="IN"
-                                                                       )
-                else:
-                    state = await DatabaseConfiguration().state_collection.find_one(
-                        {"state_code": state_code.upper(), "country_code": "IN"}
-                    )
-                state_names.append(state.get("name"))
-            if not states:
-                collection = await DatabaseConfiguration().state_collection.aggregate([]).to_list(None)
-                await store_collection_in_cache(collection, collection_name="states")
-            data["filters"]["state_names"] = state_names
-        if len(data.get("filters", {}).get("counselor_id", [])) > 0:
-            counselor_names, counselor_ids = [], []
-            for counselor_id in data.get("filters", {}).get("counselor_id",
-                                                            []):
-                counselor = await DatabaseConfiguration().user_collection.find_one(
-                    {"_id": ObjectId(counselor_id)}
-                )
-                counselor_names.append(utility_obj.name_can(counselor))
-                counselor_ids.append(str(counselor_id))
-            data["filters"]["counselor_names"] = counselor_names
-            data["filters"]["counselor_id"] = counselor_ids
+        filters = data.get("filters", {})
+        resolver = await self.get_reference_resolver([data])
+        if len(filters.get("state_code", [])) > 0:
+            data["filters"]["state_names"] = [
+                resolver.state_name(state_code)
+                for state_code in filters.get("state_code", [])
+            ]
+        if len(filters.get("counselor_id", [])) > 0:
+            counselor_ids = filters.get("counselor_id", [])
+            data["filters"]["counselor_names"] = [
+                resolver.user_name(counselor_id) for counselor_id in counselor_ids
+            ]
+            data["filters"]["counselor_id"] = [
+                str(counselor_id) for counselor_id in counselor_ids
+            ]
         if len(data.get("filters", {}).get("course", {})) > 0:
             temp_list = []
             if type(data.get("filters", {}).get("course")) == str:
@@ -111,29 +96,23 @@ class DataSegmentHelper:
             "entities_data": data_list,
         }
 
-    async def get_state_names(self, state_codes: list[str]) -> list:
+    async def get_reference_resolver(self, data_segments: list) -> ReferenceResolver:
         """
-        Get state names based on state codes
+        Get the resolver which have counselor and state details of all the
+            given data segments.
 
         Params:
-            state_codes (list[str]): A list which contains state codes. e.g., ["AP", "UP"]
+            data_segments (list): A list which contains data segments details.
 
         Returns:
-            list: A list which contains state names.
-                e.g., ["Andra Pradesh", "Uttar Pradesh"]
+            ReferenceResolver: Resolver which have counselor and state details.
         """
-        aggregation_pipeline = [
-            {"$match": {"state_code": {"$in": state_codes},
-                        "country_code": "IN"}},
-            {"$project": {"_id": 0, "name": 1}},
-            {"$group": {"_id": "", "state_name": {"$push": "$name"}}},
-        ]
-        result = DatabaseConfiguration().state_collection.aggregate(
-            aggregation_pipeline
-        )
-        async for document in result:
-            return document.get("state_name")
-        return []
+        resolver = ReferenceResolver()
+        for data_segment in data_segments:
+            filters = data_segment.get("filters") or {}
+            resolver.add("states", filters.get("state_code", [])).add(
+                "users", filters.get("counselor_id", []))
+        return await resolver.resolve()
 
     async def get_data_segment_communication_info(
             self, data_segment_id: ObjectId | None = None,
@@ -207,37 +186,37 @@ class DataSegmentHelper:
             return document
         return {"total": 0, "email": 0, "sms": 0, "whatsapp": 0}
 
-    async def data_helper(self, data, college_id, data_segments):
+    async def data_helper(self, data, college_id, data_segments,
+                          resolver: ReferenceResolver | None = None):
         """
         Return data segment details
+
+        Params:
+            - resolver (ReferenceResolver | None): Resolver which already
+                have counselor and state details of the data segments, useful
+                when data segments are rendered in a list.
         """
+        if resolver is None:
+            resolver = await self.get_reference_resolver([data])
         authentication_obj = Authentication()
         if data.get("segment_type", "").lower() == "dynamic":
-            total_data, data_list = await AutomationHelper().get_data_from_db(
-                data,
-                college_id,
-                data_segments=data_segments,
-                call_segments=True,
-                skip=0,
-                limit=5,
-            )
+            count_info = await SegmentCardinality().get_count(data, college_id)
         else:
-            total_data, data_list = 0, []
+            count_info = {}
         if data.get("filters", {}).get("state_code"):
-            data["filters"]["state_names"] = await self.get_state_names(
-                data.get("filters", {}).get("state_code", [])
-            )
+            data["filters"]["state_names"] = [
+                state_name
+                for state_code in data.get("filters", {}).get("state_code", [])
+                if (state_name := resolver.state_name(state_code))
+            ]
         if len(data.get("filters", {}).get("counselor_id", [])) > 0:
-            counselor_names, counselor_ids = [], []
-            for counselor_id in data.get("filters", {}).get("counselor_id",
-                                                            []):
-                counselor = await DatabaseConfiguration().user_collection.find_one(
-                    {"_id": ObjectId(counselor_id)}
-                )
-                counselor_names.append(utility_obj.name_can(counselor))
-                counselor_ids.append(str(counselor_id))
-            data["filters"]["counselor_names"] = counselor_names
-            data["filters"]["counselor_id"] = counselor_ids
+            counselor_ids = data.get("filters", {}).get("counselor_id", [])
+            data["filters"]["counselor_names"] = [
+                resolver.user_name(counselor_id) for counselor_id in counselor_ids
+            ]
+            data["filters"]["counselor_id"] = [
+                str(counselor_id) for counselor_id in counselor_ids
+            ]
         if len(data.get("filters", {}).get("course", {})) > 1:
             if type(data.get("filters", {}).get("course")) == str:
                 data["filters"]["course"] = {}
@@ -274,11 +253,11 @@ class DataSegmentHelper:
             "module_name": data.get("module_name"),
             "segment_type": data.get("segment_type"),
             "count_of_entities": data.get("count_at_origin", 0),
-            "current_data_count": (
-                total_data
-                if data.get("segment_type", "").lower() == "dynamic"
-                else data.get("data_count", 0)
+            "current_data_count": count_info.get(
+                "count", data.get("data_count", 0)
             ),
+            "current_data_count_computed_at": count_info.get("computed_at"),
+            "is_current_data_count_fresh": count_info.get("is_fresh", True),
             "communication_info": await self.get_data_segment_communication_info(
                 data.get("_id")
             ),
@@ -323,57 +302,72 @@ class DataSegmentHelper:
             dict: A dictionary which contains data segments quick view info.
         """
         match_filter = {}
-        lead_filter = {"module_name": "Lead"}
-        application_filter = {"module_name": "Application"}
-        raw_filter = {"module_name": "Raw Data"}
-        payment_filter = {"module_name": "Payment"}
-        active_filter = {"enabled": True}
-        closed_filter = {"enabled": False}
         status_filter = {}
-        if status not in ["", None]:
-            if status in ["Active", "Closed"]:
-                status_filter: dict = {
-                    "enabled": True if status == "Active" else False}
-                lead_filter.update(status_filter)
-                application_filter.update(status_filter)
-                raw_filter.update(status_filter)
-                payment_filter.update(status_filter)
+        if status in ["Active", "Closed"]:
+            status_filter = {"enabled": True if status == "Active" else False}
         if counselor_id:
-            counselor_filter = {"shared_with.user_id": {"$in": counselor_id}}
-            match_filter.update(counselor_filter)
-            lead_filter.update(counselor_filter)
-            application_filter.update(counselor_filter)
-            raw_filter.update(counselor_filter)
-            payment_filter.update(counselor_filter)
-            status_filter.update(counselor_filter)
-            active_filter.update(counselor_filter)
-            closed_filter.update(counselor_filter)
+            match_filter.update({"shared_with.user_id": {"$in": counselor_id}})
+
+        # Module wise counts and communication counts are calculated only
+        # for the data segments of given status.
+        in_status = (
+            {"$eq": ["$enabled", status_filter.get("enabled")]}
+            if status_filter
+            else True
+        )
+
+        def count_if(condition: dict) -> dict:
+            return {"$sum": {"$cond": [condition, 1, 0]}}
+
+        def module_count(module_name: str) -> dict:
+            return count_if({"$and": [{"$eq": ["$module_name", module_name]},
+                                      in_status]})
+
+        def communication_sum(field: str) -> dict:
+            return {"$sum": {"$cond": [
+                in_status, {"$ifNull": [f"$communication_count.{field}", 0]},
+                0]}}
 
+        pipeline = [
+            {
+                "$group": {
+                    "_id": "",
+                    "total_data_segments": {"$sum": 1},
+                    "active_data_segments": count_if(
+                        {"$eq": ["$enabled", True]}),
+                    "closed_data_segments": count_if(
+                        {"$eq": ["$enabled", False]}),
+                    "lead_data_segments": module_count("Lead"),
+                    "application_data_segments": module_count("Application"),
+                    "raw_data_segments": module_count("Raw Data"),
+                    "payment_data_segments": module_count("Payment"),
+                    "email": communication_sum("email"),
+                    "sms": communication_sum("sms"),
+                    "whatsapp": communication_sum("whatsapp"),
+                }
+            }
+        ]
+        if match_filter:
+            pipeline.insert(0, {"$match": match_filter})
+        result = await DatabaseConfiguration().data_segment_collection.aggregate(
+            pipeline).to_list(None)
+        info = result[0] if result else {}
+        communication_info = {
+            "total": 0, "email": info.get("email", 0), "sms": info.get("sms", 0),
+            "whatsapp": info.get("whatsapp", 0)}
+        communication_info["total"] = (
+            communication_info["email"] + communication_info["sms"]
+            + communication_info["whatsapp"])
         return {
-            "total_data_segments": await DatabaseConfiguration().data_segment_collection.count_documents(
-                match_filter
-            ),
-            "active_data_segments": await DatabaseConfiguration().data_segment_collection.count_documents(
-                active_filter
-            ),
-            "closed_data_segments": await DatabaseConfiguration().data_segment_collection.count_documents(
-                closed_filter
-            ),
-            "lead_data_segments": await DatabaseConfiguration().data_segment_collection.count_documents(
-                lead_filter
-            ),
-            "application_data_segments": await DatabaseConfiguration().data_segment_collection.count_documents(
-                application_filter
-            ),
-            "raw_data_segments": await DatabaseConfiguration().data_segment_collection.count_documents(
-                raw_filter
-            ),
-            "payment_data_segments": await DatabaseConfiguration().data_segment_collection.count_documents(
-                payment_filter
-            ),
-            "communication_info": await self.get_data_segment_communication_info(
-                status_dict=status_filter
-            ),
+            "total_data_segments": info.get("total_data_segments", 0),
+            "active_data_segments": info.get("active_data_segments", 0),
+            "closed_data_segments": info.get("closed_data_segments", 0),
+            "lead_data_segments": info.get("lead_data_segments", 0),
+            "application_data_segments": info.get(
+                "application_data_segments", 0),
+            "raw_data_segments": info.get("raw_data_segments", 0),
+            "payment_data_segments": info.get("payment_data_segments", 0),
+            "communication_info": communication_info,
         }
 
     async def get_count_of_entities(
@@ -549,7 +543,8 @@ class DataSegmentHelper:
             )
         )
         await DatabaseConfiguration().data_segment_collection.update_one(
-            {"_id": ObjectId(data_segment_id)}, {"$set": {"data_count": count}}
+            {"_id": ObjectId(data_segment_id)},
+            {"$set": {"data_count": count}, "$unset": {"cardinality": ""}}
         )
         return {"message": "student added successfully in data segment."}
 
@@ -20,6 +20,8 @@ from app.dependencies.cryptography import EncryptionDecryption
 from app.dependencies.jwttoken import Authentication
 from app.dependencies.oauth import is_testing_env, cache_invalidation
 from app.helpers.automation.automation_configuration import AutomationHelper
+from app.helpers.data_segment.segment_cardinality import SegmentCardinality
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 
 logger = get_logger(__name__)
 
@@ -156,6 +158,16 @@ class data_segment_automation:
                             "timezone": "+05:30",
                         }
                     },
+                    "segment_details": {
+                        "_id": "$_id",
+                        "module_name": "$module_name",
+                        "segment_type": "$segment_type",
+                        "filters": "$filters",
+                        "advance_filters": "$advance_filters",
+                        "period": "$period",
+                        "raw_data_name": "$raw_data_name",
+                        "cardinality": "$cardinality",
+                    },
                     "initial_count": {"$ifNull": ["$count_at_origin", 0]},
                     "current_data_count": {"$ifNull": ["$data_count", 0]},
                     "filters": "$filters",
@@ -185,6 +197,7 @@ class data_segment_automation:
         async for data in result:
             if data is None:
                 return {}
+            segment_details = data.pop("segment_details", {})
             filters = data.get("filters", {})
             counselor_ids = filters.get("counselor_id")
             course_ids = filters.get("course", {}).get("course_id")
@@ -197,9 +210,12 @@ class data_segment_automation:
                     str(counselor_id) for counselor_id in counselor_ids
                 ]
             if data.get("data_segment_type", "").lower() == "dynamic":
-                data["current_data_count"] = await self.get_count_current_data(
-                    data, college_id=college_id, skip=0, limit=10
-                )
+                count_info = await SegmentCardinality().get_count(
+                    segment_details, college_id=college_id)
+                data["current_data_count"] = count_info.get("count")
+                data["current_data_count_computed_at"] = count_info.get(
+                    "computed_at")
+                data["is_current_data_count_fresh"] = count_info.get("is_fresh")
             return data
         return {}
 
@@ -566,6 +582,10 @@ class data_segment_automation:
         ) is None:
             data_segment_details = {}
         module_name = data_segment_details.get("module_name", "")
+        # Search is applied on the student lookup, hence students which are
+        # not matching are dropped before looking up remaining details
+        student_match = {"$expr": {"$eq": ["$_id", "$$student_id"]}}
+        student_match.update(SearchKeyHelper().get_search_query(search))
         pipeline = [
             {"$match": {"data_segment_id": ObjectId(data_segment_id)}},
             {
@@ -599,8 +619,7 @@ class data_segment_automation:
                     "from": "studentsPrimaryDetails",
                     "let": {"student_id": "$student_id"},
                     "pipeline": [
-                        {"$match": {
-                            "$expr": {"$eq": ["$_id", "$$student_id"]}}},
+                        {"$match": student_match},
                         {
                             "$project": {
                                 "_id": 1,
@@ -664,17 +683,6 @@ class data_segment_automation:
             pipeline[5].get("$lookup", {}).get("pipeline", [{}])[0].get(
                 "$match", {}
             ).update({"lead_stage": "Fresh Lead"})
-        if search:
-            search_match = {
-                "$match": {
-                    "$or": [
-                        {"student_name": {"$regex": search, "$options": "i"}},
-                        {"email": {"$regex": search, "$options": "i"}},
-                        {"mobile_number": {"$regex": search, "$options": "i"}},
-                    ]
-                }
-            }
-            pipeline.append(search_match)
         if basic_filter in [None, False]:
             if skip is not None and limit is not None:
                 if fresh_lead or payment_status or is_verify or search:
@@ -1215,33 +1223,8 @@ class data_segment_automation:
                 }
             },
         ]
-        if search_string is not None:
-            pipeline.append(
-                {
-                    "$match": {
-                        "$or": [
-                            {
-                                "student_name": {
-                                    "$regex": search_string,
-                                    "$options": "i",
-                                }
-                            },
-                            {
-                                "student_email_id": {
-                                    "$regex": search_string,
-                                    "$options": "i",
-                                }
-                            },
-                            {
-                                "student_mobile_no": {
-                                    "$regex": search_string,
-                                    "$options": "i",
-                                }
-                            },
-                        ]
-                    }
-                }
-            )
+        if search_query := SearchKeyHelper().get_search_query(search_string):
+            pipeline.insert(0, {"$match": search_query})
         skip, limit = await utility_obj.return_skip_and_limit(page_num,
                                                               page_size)
         pipeline.append(
@@ -1321,6 +1304,14 @@ class data_segment_automation:
         name = f"{settings.client_name.lower().replace(' ', '_')}_{settings.current_season.lower()}"
         if payload.get("verified"):
             filters.append([f"is_verified = verified"])
+        if data_type.lower() in ["application", "lead"] and (
+                client is None or not settings.meilisearch_url
+        ):
+            return await self.get_lead_application_search_details(
+                data_type=data_type, college_id=college_id,
+                search_string=search_string, page_num=page_num,
+                page_size=page_size, payload=payload
+            )
         try:
             if data_type.lower() in ["application", "lead"]:
                 if payload.get("lead_stage"):
@@ -1344,14 +1335,151 @@ class data_segment_automation:
                 "message": "Fetched student records successfully",
             }
         except MeilisearchCommunicationError as error:
-            logger.error(f"Error - {str(error.args)}")
-            raise HTTPException(
-                status_code=404, detail="Meilisearch server is not running."
+            logger.error(f"Meilisearch server is not running, searching "
+                         f"in the database. Error - {str(error.args)}")
+            return await self.get_lead_application_search_details(
+                data_type=data_type, college_id=college_id,
+                search_string=search_string, page_num=page_num,
+                page_size=page_size, payload=payload
             )
         except MeilisearchApiError as error:
             logger.error(f"Error - {str(error.args)}")
             raise HTTPException(status_code=404, detail=str(error.args))
 
+    async def get_lead_application_search_details(
+            self,
+            data_type: str,
+            college_id: str | None,
+            search_string: str | None,
+            page_num: int,
+            page_size: int,
+            payload: dict | None = None,
+    ):
+        """
+        Get the search student details from the database based on data type,
+        used when meilisearch server is not configured or not running.
+        Search is performed on the indexed search keys of
+        student/application.
+
+        params:
+            - data_type (str): The data type, e.q. lead or application
+            - college_id (str): Get the college id based on search based on
+                college
+            - search_string (str): The search string to search for student
+            - page_num (int): Get the integer number, e.q. 1,2,3
+            - page_size (int): Get the integer number count of student showing,
+                    e.q. 1,2,3
+            - payload (dict): Payload containing filter parameters for
+                lead_stage, verified and payment_status
+
+        return:
+            - A list of student details based on data type
+        """
+        if payload is None:
+            payload = {}
+        is_application = data_type.lower() == "application"
+        match = SearchKeyHelper().get_search_query(search_string)
+        if college_id:
+            match.update({"college_id": ObjectId(college_id)})
+        if is_application and payload.get("payment_status"):
+            match.update({"payment_info.status": "captured"})
+        if not is_application and payload.get("verified"):
+            match.update({"is_verify": True})
+        student_id_field = "$student_id" if is_application else "$_id"
+        pipeline = [{"$match": match}]
+        if payload.get("lead_stage"):
+            pipeline.extend([
+                {
+                    "$lookup": {
+                        "from": "leadsFollowUp",
+                        "let": {"student_id": student_id_field},
+                        "pipeline": [
+                            {"$match": {"$expr": {
+                                "$eq": ["$student_id", "$$student_id"]},
+                                "lead_stage": "Fresh Lead"}},
+                            {"$project": {"_id": 1}},
+                        ],
+                        "as": "lead_details",
+                    }
+                },
+                {"$match": {"lead_details": {"$ne": []}}},
+            ])
+        paginated_results = [
+            {"$skip": (page_num - 1) * page_size},
+            {"$limit": page_size},
+        ]
+        if is_application:
+            paginated_results.extend([
+                {
+                    "$lookup": {
+                        "from": "studentsPrimaryDetails",
+                        "localField": "student_id",
+                        "foreignField": "_id",
+                        "pipeline": [{"$project": {
+                            "basic_details": 1, "user_name": 1,
+                            "is_verify": 1}}],
+                        "as": "student_primary",
+                    }
+                },
+                {"$unwind": {"path": "$student_primary"}},
+            ])
+        student = "$student_primary" if is_application else "$$ROOT"
+        paginated_results.append(
+            {
+                "$project": {
+                    "_id": 0,
+                    "student_id": {"$toString": student_id_field},
+                    "application_id": {"$toString": "$_id"},
+                    "custom_application_id": "$custom_application_id",
+                    "student_name": {
+                        "$trim": {
+                            "input": {
+                                "$concat": [
+                                    {"$ifNull": [
+                                        f"{student}.basic_details.first_name",
+                                        ""]},
+                                    " ",
+                                    {"$ifNull": [
+                                        f"{student}.basic_details.last_name",
+                                        ""]},
+                                ]
+                            }
+                        }
+                    },
+                    "email": f"{student}.user_name",
+                    "mobile_number": f"{student}.basic_details.mobile_number",
+                    "is_verify": f"{student}.is_verify",
+                    "payment_status": "$payment_info.status",
+                }
+            }
+        )
+        if not is_application:
+            paginated_results[-1]["$project"].pop("application_id")
+        pipeline.append(
+            {
+                "$facet": {
+                    "paginated_results": paginated_results,
+                    "totalCount": [{"$count": "count"}],
+                }
+            }
+        )
+        collection = (
+            DatabaseConfiguration().studentApplicationForms
+            if is_application
+            else DatabaseConfiguration().studentsPrimaryDetails
+        )
+        total_data, data = 0, []
+        async for result in collection.aggregate(pipeline):
+            total_data = (result.get("totalCount") or [{}])[0].get("count", 0)
+            data = result.get("paginated_results", [])
+        return {
+            "data": data,
+            "total": total_data,
+            "count": page_size,
+            "page_num": page_num,
+            "message": "Fetched student records successfully",
+        }
+
     async def get_data_segment_id_from_token(self, token: str,
                                              current_user: str):
         """
@@ -0,0 +1,270 @@
+"""
+This file contains class and functions related to data segment cardinality
+(count of entities) cache.
+"""
+
+import datetime
+import hashlib
+import json
+
+from bson import ObjectId
+from kombu.exceptions import KombuError
+
+from app.core.log_config import get_logger
+from app.core.utils import utility_obj
+from app.database.configuration import DatabaseConfiguration
+from app.helpers.automation.automation_configuration import AutomationHelper
+
+logger = get_logger(name=__name__)
+
+
+class SegmentCardinality:
+    """
+    Contain functions related to the cached count of dynamic data segments.
+
+    Cached count is stored in the data segment document under the field
+    `cardinality` with below structure:
+        {"count": 10, "member_digest": "..." | None,
+         "filters_digest": "...", "computed_at": datetime,
+         "refresh_requested_at": datetime}
+    """
+
+    # Cached count older than below time is served as stale count and a
+    # recompute of it is queued when it is read. Scheduled job (celery beat)
+    # refreshes the stale counts which are not read.
+    freshness_window = datetime.timedelta(minutes=30)
+    refresh_batch_size = 50
+
+    def get_filters_digest(self, segment: dict) -> str:
+        """
+        Get the digest of data segment fields which decide the segment members.
+
+        Params:
+            segment (dict): A dictionary which contains data segment details.
+
+        Returns:
+            str: A digest of data segment filters.
+        """
+        filters = {
+            key: segment.get(key)
+            for key in [
+                "module_name",
+                "segment_type",
+                "filters",
+                "advance_filters",
+                "period",
+                "raw_data_name",
+            ]
+        }
+        return hashlib.sha1(
+            json.dumps(filters, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get_member_digest(self, members: list) -> str:
+        """
+        Get the digest of data segment members.
+
+        Params:
+            members (list): A list which contains data segment members.
+
+        Returns:
+            str: A digest of data segment members.
+        """
+        member_keys = sorted(
+            str(
+                member.get("application_id")
+                or member.get("student_id")
+                or member.get("email")
+            )
+            for member in members
+            if isinstance(member, dict)
+        )
+        return hashlib.sha1("|".join(member_keys).encode()).hexdigest()
+
+    def get_cached_cardinality(self, segment: dict) -> dict | None:
+        """
+        Get the cached cardinality of data segment when it is computed for
+        current filters of data segment.
+
+        Params:
+            segment (dict): A dictionary which contains data segment details.
+
+        Returns:
+            dict | None: A dictionary which contains cached cardinality.
+        """
+        cardinality = segment.get("cardinality")
+        if (
+            not cardinality
+            or cardinality.get("filters_digest")
+            != self.get_filters_digest(segment)
+        ):
+            return None
+        return cardinality
+
+    def is_fresh(self, cardinality: dict) -> bool:
+        """
+        Check the cached cardinality is computed within freshness window.
+
+        Params:
+            cardinality (dict): A dictionary which contains cached cardinality.
+
+        Returns:
+            bool: True if cached cardinality is fresh else False.
+        """
+        computed_at = cardinality.get("computed_at")
+        return bool(
+            computed_at
+            and datetime.datetime.utcnow() - computed_at < self.freshness_window
+        )
+
+    async def refresh(
+        self, segment: dict, college_id: str, with_members: bool = False
+    ) -> dict:
+        """
+        Compute the count of data segment and store it in the data segment.
+
+        Params:
+            segment (dict): A dictionary which contains data segment details.
+            college_id (str): An unique identifier of college.
+                e.g., "123456789012345678901234"
+            with_members (bool): True for compute the member digest along with
+                count. It reads all members of data segment hence useful only
+                for scheduled job.
+
+        Returns:
+            dict: A dictionary which contains computed cardinality.
+        """
+        if with_members:
+            count, members = await AutomationHelper().get_data_from_db(
+                segment, college_id, call_segments=True
+            )
+            member_digest = self.get_member_digest(members)
+        else:
+            count, _ = await AutomationHelper().get_data_from_db(
+                segment, college_id, call_segments=True, skip=0, limit=1
+            )
+            member_digest = segment.get("cardinality", {}).get("member_digest")
+        cardinality = {
+            "count": count,
+            "member_digest": member_digest,
+            "filters_digest": self.get_filters_digest(segment),
+            "computed_at": datetime.datetime.utcnow(),
+        }
+        if segment.get("_id"):
+            await DatabaseConfiguration().data_segment_collection.update_one(
+                {"_id": ObjectId(str(segment.get("_id")))},
+                {"$set": {"cardinality": cardinality}},
+            )
+        segment["cardinality"] = cardinality
+        return cardinality
+
+    async def get_count(self, segment: dict, college_id: str) -> dict:
+        """
+        Get the count of dynamic data segment from cache.
+
+        Count is computed only when it is not cached yet or filters of data
+        segment are changed after count is cached, stale count is served
+        as it is with freshness indicator and its recompute is queued.
+
+        Params:
+            segment (dict): A dictionary which contains data segment details.
+            college_id (str): An unique identifier of college.
+                e.g., "123456789012345678901234"
+
+        Returns:
+            dict: A dictionary which contains count information.
+                e.g., {"count": 10, "computed_at": "2024-01-01 10:00:00",
+                    "is_fresh": True}
+        """
+        if (cardinality := self.get_cached_cardinality(segment)) is None:
+            cardinality = await self.refresh(segment, college_id)
+        elif not self.is_fresh(cardinality):
+            await self.request_refresh(segment, college_id)
+        return {
+            "count": cardinality.get("count", 0),
+            "computed_at": utility_obj.get_local_time(
+                cardinality.get("computed_at")
+            ),
+            "is_fresh": self.is_fresh(cardinality),
+        }
+
+    async def request_refresh(self, segment: dict, college_id: str) -> bool:
+        """
+        Queue the recompute of stale count of data segment. A count is queued
+        once in a freshness window, count is recomputed in place when it can
+        not be queued.
+
+        Params:
+            segment (dict): A dictionary which contains data segment details.
+            college_id (str): An unique identifier of college.
+                e.g., "123456789012345678901234"
+
+        Returns:
+            bool: True if recompute of count is requested else False.
+        """
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.celery_tasks.celery_data_segment import DataSegmentCeleryTasks
+        from app.dependencies.oauth import is_testing_env
+        if not segment.get("_id"):
+            return False
+        requested_at = datetime.datetime.utcnow()
+        result = await DatabaseConfiguration().data_segment_collection.update_one(
+            {
+                "_id": ObjectId(str(segment.get("_id"))),
+                "$or": [
+                    {"cardinality.refresh_requested_at": {"$exists": False}},
+                    {"cardinality.refresh_requested_at": {
+                        "$lt": requested_at - self.freshness_window}},
+                ],
+            },
+            {"$set": {"cardinality.refresh_requested_at": requested_at}},
+        )
+        if not result.modified_count:
+            return False
+        if is_testing_env():
+            await self.refresh(segment, college_id)
+            return True
+        try:
+            DataSegmentCeleryTasks.refresh_segment_cardinality.delay(
+                segment_id=str(segment.get("_id")), college_id=college_id)
+        except KombuError as error:
+            logger.error(f"Unable to queue the count refresh of data segment "
+                         f"`{segment.get('_id')}`. Error - {error}")
+            await self.refresh(segment, college_id)
+        return True
+
+    async def refresh_stale_segments(self, college_id: str) -> int:
+        """
+        Refresh the cached count of stale dynamic data segments of a college.
+        Data segments whose cached count is still fresh are skipped.
+
+        Params:
+            college_id (str): An unique identifier of college.
+                e.g., "123456789012345678901234"
+
+        Returns:
+            int: Number of data segments refreshed.
+        """
+        stale_before = datetime.datetime.utcnow() - self.freshness_window
+        segments = DatabaseConfiguration().data_segment_collection.find(
+            {
+                "segment_type": "Dynamic",
+                "enabled": {"$ne": False},
+                "$or": [
+                    {"cardinality.computed_at": {"$exists": False}},
+                    {"cardinality.computed_at": {"$lt": stale_before}},
+                ],
+            }
+        ).sort("cardinality.computed_at", 1).limit(self.refresh_batch_size)
+        refreshed = 0
+        async for segment in segments:
+            try:
+                await self.refresh(segment, college_id, with_members=True)
+                refreshed += 1
+            except Exception as error:
+                logger.error(
+                    f"An error occurred when refresh count of data segment "
+                    f"`{segment.get('_id')}`. Error - {error}"
+                )
+        return refreshed
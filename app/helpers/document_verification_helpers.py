@@ -412,6 +412,10 @@ class DocumentVerification:
         match_conditions = {'current_stage': {'$gte': 8.75}}
         if counselor_ids:
             match_conditions["allocate_to_counselor.counselor_id"] = {"$in": counselor_ids}
+        if search_condition:
+            # Search keys are fields of application, hence applications are
+            # searched before the lookups.
+            match_conditions.update(search_condition)
         pipeline = [
             {'$match': match_conditions},
             {
@@ -498,8 +502,7 @@ class DocumentVerification:
                 }
             }
         ]
-        search_condition = search_condition or {}
-        conditions = search_condition
+        conditions = {}
 
         course_ids = []
         specializations = []
@@ -552,28 +555,9 @@ class DocumentVerification:
                 }
                 check = True
 
-        if check or search_condition:
+        if check:
             pipeline.append({'$match': conditions})
 
-        advance_filters = payload.get("advance_filters", [])
-        if advance_filters:
-            check = str(advance_filters)
-
-            pipeline = await Application().apply_lookup_on_communication_log(
-                pipeline)
-            if "queries" in check:
-                pipeline = await Application().apply_lookup_on_queries(pipeline)
-            pipeline = await AdvanceFilterHelper().apply_advance_filter(
-                advance_filters,
-                pipeline,
-                student_primary="result",
-                courses="course_details",
-                student_secondary="education",
-                lead_followup="leads",
-                communication_log="communication_log",
-                queries="queries",
-            )
-
         pagination_stage = [
             {'$sort': {'enquiry_date': -1}
              }, {
@@ -759,9 +743,28 @@ class DocumentVerification:
             sort_order = 1 if sort_type == "asc" else -1
             pipeline2.append({"$sort": {column_name: sort_order}})
 
+        advance_filters = payload.get("advance_filters", [])
+        if advance_filters:
+            pipeline = await AdvanceFilterHelper().apply_advance_filter(
+                advance_filters,
+                pipeline,
+                student_primary="result",
+                courses="course_details",
+                student_secondary="education",
+                lead_followup="leads",
+                communication_log="communication_log",
+                queries="queries",
+                lazy_lookups=[
+                    await Application().apply_lookup_on_communication_log([]),
+                    await Application().apply_lookup_on_queries([]),
+                ],
+                required_fields=AdvanceFilterHelper().get_referenced_fields(
+                    pipeline2),
+            )
+
         pipeline.extend(pipeline2)
 
-        if check or search_condition:
+        if check or advance_filters:
             pipeline.extend(pagination_stage)
         else:
             pipeline[1:1] = pagination_stage
@@ -4,92 +4,245 @@ This file contains class and functions related to notification
 import asyncio
 import datetime
 import json
+import time
 from json import dumps
 
-from bson import ObjectId
+from bson import ObjectId, Timestamp
 from fastapi import WebSocket
 from pymongo.errors import OperationFailure
 
 from app.core.log_config import get_logger
-from app.core.utils import utility_obj
+from app.core.utils import utility_obj, settings
 from app.database.configuration import DatabaseConfiguration
-from app.dependencies.oauth import Authentication
+from app.dependencies.oauth import Authentication, get_redis_client
+from app.helpers.websocket_gateway import Subscription
 
 logger = get_logger(name=__name__)
 
+# Resume token of notification change stream of a college is kept for below
+# seconds. A stream restarted within this time resumes from the token, an
+# older token is expired hence the stream starts from the current time
+# instead of replaying old notifications.
+RESUME_TOKEN_TTL = 600
 
-class Notification:
+
+class NotificationDispatcher:
     """
-    Contains functions related to notification
+    Deliver the real time notifications to the websockets of a worker.
+
+    Worker holds one change stream of notification collection per college,
+    filtered on the server by operation type and database. Inserted
+    notification is formatted once and routed by `send_to` to the websockets
+    registered by the user. Resume token of stream is persisted in redis
+    after every batch, a restarted stream resumes from it, hence
+    notifications inserted while the worker is down or the stream reconnects
+    are not lost. Stream starts from the current operation time when there
+    is no resume token.
+
+    Usage:
+        subscription = await notification_dispatcher.register(user_id, websocket)
+        await notification_dispatcher.unregister(subscription)
     """
 
-    async def send_notifications(self, websocket: WebSocket, user_id: str):
+    def __init__(self):
+        # e.g., {"college_folder": {"user_id": {subscription}}}
+        self._subscriptions: dict = {}
+        # e.g., {"college_folder": asyncio.Task}
+        self._streams: dict = {}
+
+    def get_resume_token_key(self, college: str) -> str:
+        """
+        Get the redis key of resume token of notification stream of a college.
+        """
+        return f"{settings.aws_env}/{college}/notifications_resume_token"
+
+    async def get_resume_token(self, college: str) -> dict | None:
+        """
+        Get the persisted resume token of notification stream of a college.
+        """
+        r = get_redis_client()
+        if not r:
+            return None
+        try:
+            token = await r.get(self.get_resume_token_key(college))
+            return json.loads(token) if token else None
+        except Exception as error:
+            logger.error(f"Unable to get notification resume token: {error}")
+            return None
+
+    async def save_resume_token(self, college: str, token: dict) -> None:
         """
-        Send notification through websocket
+        Persist the resume token of notification stream of a college.
         """
-        if not user_id:
-            logger.warning("User not found, skipping sending notifications.")
+        r = get_redis_client()
+        if not r or not token:
             return
-        # Listen for changes in the notifications collection
         try:
-            async with DatabaseConfiguration().notification_collection.watch(full_document='updateLookup') as stream:
-                async for change in stream:
-                    if change is None:
-                        continue
-                    # Check if the inserted document contains the specified user ID
-                    if change.get('operationType') == "insert":
-                        if str(change.get("fullDocument", {}).get("send_to", "")) == user_id:
-                            current_datetime = datetime.datetime.utcnow()
-                            hours = abs(
-                                int((current_datetime - change.get("fullDocument", {}).get("event_datetime",
-                                                                                           current_datetime)).total_seconds() // 3600))
-                            if utility_obj.local_time_for_compare(
-                                    current_datetime.strftime("%d-%m-%Y %H:%M:%S")).strftime(
-                                "%d-%m-%Y") == utility_obj.local_time_for_compare(
-                                change.get("fullDocument", {}).get("event_datetime", current_datetime).strftime(
-                                    "%d-%m-%Y %H:%M:%S")).strftime("%d-%m-%Y"):
-                                event_datetime = f"{hours} hours ago"
-                                category = "today"
-                            else:
-                                yesterday = str(datetime.date.today() - datetime.timedelta(days=1)).split(
-                                    " "
-                                )
-                                days = abs((
-                                                   utility_obj.local_time_for_compare(
-                                                       current_datetime.strftime("%d-%m-%Y %H:%M:%S"))
-                                                   - utility_obj.local_time_for_compare(
-                                               change.get("fullDocument", {}).get("event_datetime",
-                                                                                  current_datetime).strftime(
-                                                   "%d-%m-%Y %H:%M:%S"
-                                               ))).days)
-                                if yesterday[0] == utility_obj.local_time_for_compare(
-                                        change.get("fullDocument", {}).get("event_datetime").strftime(
-                                            "%d-%m-%Y %H:%M:%S")
-                                ).strftime("%Y-%m-%d"):
-                                    if hours < 24:
-                                        event_datetime = f"{hours} hours ago"
-                                    else:
-                                        event_datetime = f"{days} day ago"
-                                    category = "yesterday"
-                                else:
-                                    event_datetime = f"{days} days ago"
-                                    category = "older"
-                            # Send the notification to the React web app via the WebSocket connection
-                            await websocket.send_text(dumps({
-                                "notification_id": str(change.get("fullDocument", {}).get("_id")),
-                                "event_type": change.get("fullDocument", {}).get("event_type"),
-                                "student_id": str(change.get("fullDocument", {}).get("student_id")),
-                                "application_id": str(change.get("fullDocument", {}).get("application_id")),
-                                "message": change.get("fullDocument", {}).get("message"),
-                                "mark_as_read": change.get("fullDocument", {}).get("mark_as_read"),
-                                "event_datetime": event_datetime,
-                                "category": category
-                            }))
-                            await asyncio.sleep(18000)
-        except OperationFailure as e:
-            logger.error("Unable to start change stream: %s" % e)
-        finally:
-            pass
+            await r.set(self.get_resume_token_key(college), json.dumps(token),
+                        ex=RESUME_TOKEN_TTL)
+        except Exception as error:
+            logger.error(f"Unable to save notification resume token: {error}")
+
+    def format_notification(self, notification: dict) -> str:
+        """
+        Format a notification which has to be send to the websocket.
+
+        Params:
+            notification (dict): Notification document.
+
+        Returns:
+            str: JSON string of notification with relative event time and
+                category. e.g., "2 hours ago", "today"
+        """
+        current_datetime = datetime.datetime.utcnow()
+        event_datetime = notification.get("event_datetime") or current_datetime
+        hours = abs(int((current_datetime - event_datetime).total_seconds() // 3600))
+        local_current = utility_obj.local_time_for_compare(
+            current_datetime.strftime("%d-%m-%Y %H:%M:%S"))
+        local_event = utility_obj.local_time_for_compare(
+            event_datetime.strftime("%d-%m-%Y %H:%M:%S"))
+        if local_current.strftime("%d-%m-%Y") == local_event.strftime("%d-%m-%Y"):
+            relative_time = f"{hours} hours ago"
+            category = "today"
+        else:
+            yesterday = str(datetime.date.today() - datetime.timedelta(days=1))
+            days = abs((local_current - local_event).days)
+            if yesterday == local_event.strftime("%Y-%m-%d"):
+                relative_time = f"{hours} hours ago" if hours < 24 else f"{days} day ago"
+                category = "yesterday"
+            else:
+                relative_time = f"{days} days ago"
+                category = "older"
+        return dumps({
+            "notification_id": str(notification.get("_id")),
+            "event_type": notification.get("event_type"),
+            "student_id": str(notification.get("student_id") or ""),
+            "application_id": str(notification.get("application_id") or ""),
+            "message": notification.get("message"),
+            "mark_as_read": notification.get("mark_as_read"),
+            "event_datetime": relative_time,
+            "category": category
+        })
+
+    async def _watch(self, college: str, collection) -> None:
+        """
+        Watch the inserted notifications of a college and route them to the
+        registered websockets.
+
+        Stream is resumed from the persisted resume token, when there is no
+        token it starts at the operation time of the first start, hence a
+        failure before the first notification doesn't lose the changes.
+        """
+        pipeline = [
+            {"$match": {"operationType": "insert",
+                        "ns.db": collection.database.name}},
+            {"$project": {"fullDocument": 1}},
+        ]
+        resume_after = saved_token = await self.get_resume_token(college)
+        start_at = Timestamp(int(time.time()), 0)
+        saved_at = time.monotonic()
+        while self._subscriptions.get(college):
+            try:
+                options = {"resume_after": resume_after} if resume_after else {
+                    "start_at_operation_time": start_at}
+                async with collection.watch(pipeline, **options) as stream:
+                    while stream.alive:
+                        change = await stream.try_next()
+                        if change is not None:
+                            notification = change.get("fullDocument") or {}
+                            subscriptions = self._subscriptions.get(
+                                college, {}).get(str(notification.get("send_to")))
+                            if subscriptions:
+                                message = self.format_notification(notification)
+                                for subscription in list(subscriptions):
+                                    subscription.put(message)
+                        # Resume token of an empty batch is advanced as well
+                        resume_after = stream.resume_token or resume_after
+                        # Token is persisted when batch is consumed, a busy
+                        # stream persists it at least once a second
+                        if resume_after != saved_token and (
+                                change is None
+                                or time.monotonic() - saved_at >= 1):
+                            await self.save_resume_token(college, resume_after)
+                            saved_token, saved_at = resume_after, time.monotonic()
+            except OperationFailure as e:
+                if resume_after is None:
+                    logger.error("Unable to start change stream: %s" % e)
+                    await asyncio.sleep(5)
+                else:
+                    # Resume token is not in oplog anymore
+                    logger.warning("Unable to resume change stream: %s" % e)
+                resume_after = None
+                start_at = Timestamp(int(time.time()), 0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Notification change stream stopped: %s" % e)
+                await asyncio.sleep(5)
+
+    async def _send(self, websocket: WebSocket, message: str) -> None:
+        """
+        Send a formatted notification to the websocket.
+        """
+        await websocket.send_text(message)
+
+    async def register(self, user_id: str, websocket: WebSocket) -> Subscription:
+        """
+        Register a websocket to receive the notifications of a user, stream
+        of college is started when it is not running.
+
+        Params:
+            user_id (str): Unique id of the user.
+            websocket (WebSocket): Websocket connection of the user.
+
+        Returns:
+            Subscription: Subscription of the websocket.
+        """
+        college = utility_obj.get_university_name_s3_folder()
+        subscription = Subscription(f"{college}/{user_id}", websocket, self._send)
+        self._subscriptions.setdefault(college, {}).setdefault(
+            str(user_id), set()).add(subscription)
+        stream = self._streams.get(college)
+        if stream is None or stream.done():
+            self._streams[college] = asyncio.create_task(self._watch(
+                college, DatabaseConfiguration().notification_collection))
+        return subscription
+
+    async def unregister(self, subscription: Subscription) -> None:
+        """
+        Remove the subscription of a websocket, stream of college is stopped
+        when no websocket of the college is registered.
+        """
+        subscription.close()
+        college, user_id = subscription.key.rsplit("/", 1)
+        users = self._subscriptions.get(college, {})
+        subscriptions = users.get(user_id, set())
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            users.pop(user_id, None)
+        if not users:
+            self._subscriptions.pop(college, None)
+            if (stream := self._streams.pop(college, None)) is not None:
+                stream.cancel()
+
+    async def close(self) -> None:
+        """
+        Stop the notification streams of the worker.
+        """
+        for users in self._subscriptions.values():
+            for subscriptions in users.values():
+                for subscription in subscriptions:
+                    subscription.close()
+        self._subscriptions = {}
+        for stream in self._streams.values():
+            stream.cancel()
+        self._streams = {}
+
+
+class Notification:
+    """
+    Contains functions related to notification
+    """
 
     async def get_user_details(self, websocket: WebSocket, college_id):
         """
@@ -115,3 +268,6 @@ class Notification:
 
         except Exception as e:
             logger.error(f"Something went wrong. {e}")
+
+
+notification_dispatcher = NotificationDispatcher()
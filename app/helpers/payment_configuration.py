@@ -16,6 +16,7 @@ from app.core.utils import utility_obj, settings
 from app.database.configuration import DatabaseConfiguration
 from app.database.database_sync import DatabaseConfigurationSync
 from app.dependencies.oauth import cache_invalidation, is_testing_env
+from app.helpers.campaign.campaign_analytics import CampaignAnalytics
 from app.helpers.student_curd.student_application_configuration import (
     StudentApplicationHelper,
 )
@@ -296,6 +297,7 @@ class PaymentHelper:
             )
             is not None
         ):
+            await CampaignAnalytics().bump_version(application.get("college_id"))
             await StudentApplicationHelper().update_stage(
                 str(application.get("student_id")), course_name, 7.50,
                 spec_name, college_id=str(application.get("college_id"))
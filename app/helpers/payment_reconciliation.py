@@ -0,0 +1,244 @@
+"""
+This file contains class and functions related to reconcile the payment
+and order state idempotently.
+"""
+
+import datetime
+import time
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from app.core.log_config import get_logger
+from app.core.utils import utility_obj
+from app.database.configuration import DatabaseConfiguration
+
+logger = get_logger(name=__name__)
+
+# Course name and fees by college and course id, courses are read on every
+# order/payment request. e.g., {("college_folder", "course_id"): (course,
+# expire_at)}
+_course_cache: dict = {}
+COURSE_CACHE_TTL = 300
+MAX_CACHED_COURSES = 1000
+# Payment statuses after which order is not reconciled with gateway again.
+TERMINAL_STATUSES = {"captured"}
+# Reservation of order without gateway order id is reclaimed after below
+# seconds, i.e., request which reserved the order died before order creation.
+# Should be more than the timeout of gateway request.
+ORDER_RESERVATION_TIMEOUT = 120
+# Payment collections (by full name) whose unique indexes are ensured by this
+# process, reservation and captured payment upserts depend on them.
+_indexed_collections: set = set()
+
+
+class PaymentReconciliation:
+    """
+    Reconcile the order and payment state of an application.
+
+    Order of an application and amount is reserved with a conditional upsert
+    keyed on idempotency key (unique index), hence duplicate requests
+    (double-click, retry) do not create duplicate orders, and payment state
+    transitions are conditional updates which are applied only once. A
+    reservation whose order is not created within `ORDER_RESERVATION_TIMEOUT`
+    is reclaimed by the next request.
+
+    Usage:
+        reconciliation = PaymentReconciliation()
+        existing = await reconciliation.reserve_order(
+            application_id, amount, payment_doc)
+    """
+
+    def get_idempotency_key(self, application_id: ObjectId,
+                            amount: int) -> str:
+        """
+        Get the idempotency key of order. e.g., "628374373cd9fae967aa63ee:50000"
+        """
+        return f"{application_id}:{amount}"
+
+    async def ensure_indexes(self, collection) -> None:
+        """
+        Create the unique indexes of payment collection once per process.
+        Idempotency key index deduplicates the order reservations and payment
+        id index (of captured payments) deduplicates the captured payments.
+
+        Params:
+            collection: Payment collection of the season database.
+
+        Returns: None
+        """
+        if collection.full_name in _indexed_collections:
+            return
+        try:
+            await collection.create_index(
+                "idempotency_key", name="idempotency_key_1", unique=True,
+                sparse=True)
+            await collection.create_index(
+                "payment_id", name="payment_id_captured", unique=True,
+                partialFilterExpression={"status": "captured"})
+        except OperationFailure as error:
+            logger.error(f"Unable to create the unique indexes of "
+                         f"`{collection.full_name}`. Error - {error}")
+        _indexed_collections.add(collection.full_name)
+
+    async def get_course(self, course_id) -> dict:
+        """
+        Get the course name and fees of a course from cache, course is
+        fetched from the DB when it is not cached.
+
+        Params:
+            course_id (str | ObjectId): An unique identifier of course.
+
+        Returns:
+            dict: A dictionary which contains course name and fees. Empty
+                dictionary when course not found.
+        """
+        key = (utility_obj.get_university_name_s3_folder(), str(course_id))
+        course, expire_at = _course_cache.get(key, (None, 0))
+        if course is not None and expire_at > time.monotonic():
+            return course
+        if not ObjectId.is_valid(str(course_id)):
+            return {}
+        course = await DatabaseConfiguration().course_collection.find_one(
+            {"_id": ObjectId(str(course_id))}, {"course_name": 1, "fees": 1}
+        ) or {}
+        if len(_course_cache) >= MAX_CACHED_COURSES:
+            _course_cache.clear()
+        _course_cache[key] = (course, time.monotonic() + COURSE_CACHE_TTL)
+        return course
+
+    def is_terminal(self, application: dict, order_data: dict) -> bool:
+        """
+        Check whether payment of application/order is already in a terminal
+        state, no need to fetch the order from gateway in this case.
+        """
+        return (
+            application.get("payment_info", {}).get("status") in TERMINAL_STATUSES
+            or order_data.get("status") in TERMINAL_STATUSES
+        )
+
+    async def reserve_order(self, application_id: ObjectId, amount: int,
+                            payment_doc: dict) -> dict | None:
+        """
+        Reserve the order of an application and amount.
+
+        Params:
+            application_id (ObjectId): An unique identifier of application.
+            amount (int): Amount of order in paise.
+            payment_doc (dict): Payment document which inserted when order is
+                not exist. `order_id` of it is set after order creation.
+
+        Returns:
+            dict | None: Existing payment document of the order. None when
+                order is reserved (or a stale reservation is reclaimed) by this
+                call, i.e., caller has to create the order and call
+                `attach_order`.
+        """
+        key = self.get_idempotency_key(application_id, amount)
+        reserved_at = datetime.datetime.utcnow()
+        payment_collection = DatabaseConfiguration().payment_collection
+        await self.ensure_indexes(payment_collection)
+        try:
+            existing = await payment_collection.find_one_and_update(
+                {
+                    "$or": [
+                        {"idempotency_key": key},
+                        {"details.application_id": application_id,
+                         "order_amount": amount},
+                    ]
+                },
+                {"$setOnInsert": {**payment_doc, "order_id": None,
+                                  "idempotency_key": key,
+                                  "reserved_at": reserved_at}},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            existing = await payment_collection.find_one(
+                {"idempotency_key": key}
+            )
+        if existing is None or existing.get("order_id") is not None:
+            return existing
+        if await self.reclaim_order(existing.get("_id"), reserved_at):
+            return None
+        return existing
+
+    async def reclaim_order(self, reservation_id: ObjectId,
+                            reserved_at: datetime.datetime) -> bool:
+        """
+        Reclaim a stale reservation of order, only one of the concurrent
+        calls can reclaim a reservation.
+
+        Params:
+            reservation_id (ObjectId): An unique identifier of reserved payment
+                document.
+            reserved_at (datetime): Time of new reservation.
+
+        Returns:
+            bool: True when reservation is reclaimed by this call.
+        """
+        stale_before = reserved_at - datetime.timedelta(
+            seconds=ORDER_RESERVATION_TIMEOUT)
+        return await DatabaseConfiguration().payment_collection.find_one_and_update(
+            {
+                "_id": reservation_id,
+                "order_id": None,
+                "$or": [{"reserved_at": {"$lt": stale_before}},
+                        {"reserved_at": {"$exists": False}}],
+            },
+            {"$set": {"reserved_at": reserved_at}},
+            projection={"_id": 1},
+        ) is not None
+
+    async def attach_order(self, application_id: ObjectId, amount: int,
+                           order_id: str) -> None:
+        """
+        Set the gateway order id in the reserved payment document.
+        """
+        await DatabaseConfiguration().payment_collection.update_one(
+            {"idempotency_key": self.get_idempotency_key(application_id, amount)},
+            {"$set": {"order_id": order_id}},
+        )
+
+    async def release_order(self, application_id: ObjectId,
+                            amount: int) -> None:
+        """
+        Remove the reservation of order when order creation failed, hence
+        retry of request can create the order.
+        """
+        await DatabaseConfiguration().payment_collection.delete_one(
+            {"idempotency_key": self.get_idempotency_key(application_id, amount),
+             "order_id": None}
+        )
+
+    async def record_captured_payment(self, payment_id: str,
+                                      payment_doc: dict) -> None:
+        """
+        Insert the captured payment document when it is not exist.
+        """
+        payment_collection = DatabaseConfiguration().payment_collection
+        await self.ensure_indexes(payment_collection)
+        try:
+            await payment_collection.update_one(
+                {"payment_id": payment_id}, {"$setOnInsert": payment_doc},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # Captured payment is inserted by a concurrent request.
+            pass
+
+    async def mark_application_paid(self, application_id: ObjectId,
+                                    payment_id: str, update_info: dict) -> bool:
+        """
+        Update the payment information of application when payment is not
+        recorded in the application yet.
+
+        Returns:
+            bool: True when application updated by this call.
+        """
+        result = await DatabaseConfiguration().studentApplicationForms.update_one(
+            {"_id": application_id, "payment_info.payment_id": {"$ne": payment_id}},
+            {"$set": update_info},
+        )
+        return result.modified_count > 0
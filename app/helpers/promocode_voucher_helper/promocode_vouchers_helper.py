@@ -17,6 +17,7 @@ from app.core.log_config import get_logger
 from app.core.utils import utility_obj, settings
 from app.database.configuration import DatabaseConfiguration
 from app.dependencies.oauth import cache_invalidation, is_testing_env
+from app.helpers.campaign.campaign_analytics import CampaignAnalytics
 from app.helpers.student_curd.student_application_configuration import (
     StudentApplicationHelper,
 )
@@ -1593,6 +1594,7 @@ class PromocodeVouchers:
             await DatabaseConfiguration().payment_collection.insert_one(
                 payment_collection_doc
             )
+            await CampaignAnalytics().bump_version(application.get("college_id"))
             await StudentApplicationHelper().update_stage(
                 application.get("student_id"), course.get("course_name"),
                 7.50, application.get("spec_name1"), college_id=str(application.get("college_id"))
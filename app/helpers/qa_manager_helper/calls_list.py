@@ -2,6 +2,8 @@
 This file contains class and functions related to calls list.
 """
 
+import asyncio
+
 from app.database.configuration import DatabaseConfiguration
 from app.core.utils import utility_obj
 from bson import ObjectId
@@ -57,9 +59,9 @@ class CallsListReview:
         return data
 
 
-    async def retrieve_call_list(self, qc_date_range: dict, call_date_range: dict, qa: dict|None = None, counsellors: dict|None = None, call_type: str|None = None, qc_status: dict|None = None) -> dict:
+    async def build_call_list_query(self, qc_date_range: dict, call_date_range: dict, qa: dict|None = None, counsellors: dict|None = None, call_type: str|None = None, qc_status: dict|None = None) -> dict:
         """
-        Function of retriving data from database for all calls list.
+        Build the match query of calls list according to the given filters.
 
         Params:
             qc_date_range (dict): start_date and end_date dictionary
@@ -70,10 +72,12 @@ class CallsListReview:
             qc_status (str | None, optional): It must be 'Accepted', 'Rejected', 'Fatal Rejected' or 'Not QCed'. Defaults to None.
 
         Returns:
-            dict: data of all calls for qa manager review section.
+            dict: A dictionary which contains match query of calls list.
         """
-
+        qa, counsellors, qc_status = qa or {}, counsellors or {}, qc_status or {}
         query = {"duration": {"$ne": 0}}
+        # Multiple list filters are ANDed together, each list filter is an $or of its values.
+        or_conditions = []
 
         if qc_date_range:
             qc_start_date, qc_end_date = await utility_obj.date_change_format(
@@ -117,11 +121,7 @@ class CallsListReview:
 
                 else:
                     qc_status_params.append({"qced.0.qc_status": qc})
-            query.update(
-                {
-                    "$or": qc_status_params
-                }
-            )
+            or_conditions.append({"$or": qc_status_params})
         
         if call_type:
             query.update(
@@ -131,29 +131,118 @@ class CallsListReview:
             )
         
         if counsellors.get("counsellor"):
-            counsellor_params = []
-            for counsellor in counsellors.get("counsellor"):
-                counsellor_params.append({"call_from": ObjectId(counsellor)})
             query.update(
                 {
-                    "$or": counsellor_params
+                    "call_from": {
+                        "$in": [ObjectId(counsellor) for counsellor in counsellors.get("counsellor")]
+                    }
                 }
             )
 
         if qa.get("qa"):
-            qa_params = []
-            for q in qa.get("qa"):
-                qa_params.append({"qced.0.qced_qa": ObjectId(q)})
             query.update(
                 {
-                    "$or": qa_params
+                    "qced.0.qced_qa": {
+                        "$in": [ObjectId(q) for q in qa.get("qa")]
+                    }
                 }
             )
 
-        calls_list = DatabaseConfiguration().call_activity_collection.aggregate([{"$match": query}, {"$sort": {"created_at": -1}}])
+        if or_conditions:
+            query.update({"$and": or_conditions})
+
+        return query
+
+    async def get_cursor_query(self, cursor: str, sort_order: int) -> dict:
+        """
+        Get the keyset query which returns calls placed after the cursor call.
+
+        Params:
+            cursor (str): Unique id of the last call of the previous page.
+            sort_order (int): Sort order of created_at, -1 for descending and 1 for ascending.
+
+        Returns:
+            dict: A dictionary which contains keyset query, empty when cursor call not found.
+        """
+        last_call = await DatabaseConfiguration().call_activity_collection.find_one(
+            {"_id": ObjectId(cursor)}, {"created_at": 1}
+        )
+        if not last_call:
+            return {}
+        operator = "$lt" if sort_order == -1 else "$gt"
+        return {
+            "$or": [
+                {"created_at": {operator: last_call.get("created_at")}},
+                {"created_at": last_call.get("created_at"), "_id": {operator: last_call.get("_id")}}
+            ]
+        }
+
+    async def retrieve_call_list(self, qc_date_range: dict, call_date_range: dict, qa: dict|None = None, counsellors: dict|None = None, call_type: str|None = None, qc_status: dict|None = None, page_num: int = 1, page_size: int = 10, sort_type: str|None = None, cursor: str|None = None) -> tuple:
+        """
+        Function of retriving one page of calls list from database.
+
+        Calls are sorted on created_at (and _id as tie-breaker) which is served by index.
+        When cursor is given, the page starts after the cursor call instead of skipping
+        page_num - 1 pages, so the cost of the query depends only on page size.
+
+        Params:
+            qc_date_range (dict): start_date and end_date dictionary
+            call_date_range (dict): start_date and end_date dictionary
+            qa (str | None, optional): QA for filtering the calls. Defaults to None.
+            counsellor (str | None, optional): Counsellor unique id for filteration of calls as per counsellor. Defaults to None.
+            call_type (str | None, optional): It must be "Outbound" or "Inbound". Defaults to None.
+            qc_status (str | None, optional): It must be 'Accepted', 'Rejected', 'Fatal Rejected' or 'Not QCed'. Defaults to None.
+            page_num (int, optional): Page no which data has to be fetched. Defaults to 1.
+            page_size (int, optional): No. of data in one page. Defaults to 10.
+            sort_type (str | None, optional): Sort order of call date, "asc" or "dsc". Defaults to None (latest first).
+            cursor (str | None, optional): Unique id of the last call of previous page. Defaults to None.
+
+        Returns:
+            tuple: A tuple which contains calls list of the page, total count of calls and cursor of next page.
+        """
+        query = await self.build_call_list_query(
+            qc_date_range, call_date_range, qa, counsellors, call_type, qc_status
+        )
+        sort_order = 1 if sort_type == "asc" else -1
+
+        page_query = dict(query)
+        skip = 0
+        if cursor:
+            cursor_query = await self.get_cursor_query(cursor, sort_order)
+            if cursor_query:
+                page_query = {"$and": [query, cursor_query]}
+        else:
+            skip, _ = await utility_obj.return_skip_and_limit(page_num, page_size)
+
+        pipeline = [
+            {"$match": page_query},
+            {"$sort": {"created_at": sort_order, "_id": sort_order}},
+            {"$skip": skip},
+            {"$limit": page_size},
+            # Only the calls of the page carry their latest QC review forward.
+            {
+                "$project": {
+                    "created_at": 1,
+                    "type": 1,
+                    "duration": 1,
+                    "mcube_file_path": 1,
+                    "call_from": 1,
+                    "call_from_name": 1,
+                    "call_to": 1,
+                    "call_to_name": 1,
+                    "qced": {"$slice": ["$qced", 1]},
+                }
+            },
+        ]
+        collection = DatabaseConfiguration().call_activity_collection
+        calls, total = await asyncio.gather(
+            collection.aggregate(pipeline).to_list(None),
+            collection.count_documents(query),
+        )
 
         call_dict = [
-            await self.call_review_helper(item) for item in await calls_list.to_list(None)
+            await self.call_review_helper(item) for item in calls
         ]
+        next_cursor = str(calls[-1].get("_id")) if len(calls) == page_size else None
 
-        return call_dict
+        return call_dict, total, next_cursor
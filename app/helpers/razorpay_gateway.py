@@ -0,0 +1,165 @@
+"""
+This file contains class and functions related to call the Razorpay APIs of
+a college without blocking the event loop.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import razorpay
+from fastapi.exceptions import HTTPException
+from razorpay.errors import BadRequestError, SignatureVerificationError
+
+from app.core.log_config import get_logger
+from app.helpers.college_configuration import CollegeHelper
+
+logger = get_logger(name=__name__)
+
+# Razorpay client and headers of a college, client keeps the connection
+# alive between calls. e.g., {"college_id": (client, headers, expire_at)}
+_gateway_clients: dict = {}
+# Circuit state of a college. e.g., {"college_id": (failures, open_until)}
+_circuits: dict = {}
+# Razorpay credentials of college are re-read after below seconds.
+CLIENT_TTL = 300
+MAX_CLIENTS = 1000
+# Razorpay SDK is blocking, hence calls run in a bounded thread pool.
+GATEWAY_WORKERS = 32
+REQUEST_TIMEOUT = 20
+# Circuit of a college is opened after below consecutive failures, calls are
+# rejected till `CIRCUIT_RESET_TIMEOUT` seconds and then one call is allowed
+# to check whether gateway is back.
+FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30
+_gateway_executor = ThreadPoolExecutor(
+    max_workers=GATEWAY_WORKERS, thread_name_prefix="razorpay"
+)
+
+
+class RazorpayGateway:
+    """
+    Call the Razorpay APIs of a college.
+
+    Client and partner headers of a college are cached (see `CLIENT_TTL`),
+    calls run in a bounded thread pool with timeout and a circuit breaker per
+    college. `BadRequestError` of Razorpay is raised as it is.
+
+    Usage:
+        gateway = await RazorpayGateway.get(college)
+        order_info = await gateway.call("order", "create", data=data)
+    """
+
+    def __init__(self, college_id: str, client: razorpay.Client,
+                 headers: dict):
+        self.college_id = college_id
+        self.client = client
+        self.headers = headers
+
+    @classmethod
+    async def get(cls, college: dict) -> "RazorpayGateway":
+        """
+        Get the gateway of a college.
+
+        Params:
+            college (dict): A dictionary which contains college data, should
+                contain `id`.
+
+        Returns:
+            RazorpayGateway: Gateway of the college.
+        """
+        college_id = str(college.get("id"))
+        client, headers, expire_at = _gateway_clients.get(
+            college_id, (None, None, 0))
+        if client is None or expire_at < time.monotonic():
+            headers, _, client_id, client_secret = (
+                await CollegeHelper().razorpay_header_update_partner(college)
+            )
+            client = razorpay.Client(auth=(client_id, client_secret))
+            if len(_gateway_clients) >= MAX_CLIENTS:
+                _gateway_clients.clear()
+            _gateway_clients[college_id] = (
+                client, headers, time.monotonic() + CLIENT_TTL)
+        return cls(college_id, client, headers)
+
+    @staticmethod
+    def evict(college_id: str) -> None:
+        """
+        Remove the cached client of a college, useful when Razorpay
+        credentials of college are updated.
+        """
+        _gateway_clients.pop(str(college_id), None)
+        _circuits.pop(str(college_id), None)
+
+    def _check_circuit(self) -> None:
+        """
+        Reject the call when circuit of college is open.
+
+        Raises:
+            HTTPException: An error occurred with status code 503 when circuit
+                is open.
+        """
+        failures, open_until = _circuits.get(self.college_id, (0, 0))
+        if failures >= FAILURE_THRESHOLD and open_until > time.monotonic():
+            raise HTTPException(
+                status_code=503,
+                detail="Payment gateway is not available. Please try again "
+                       "after some time.",
+            )
+
+    def _record(self, success: bool) -> None:
+        """
+        Record the result of a call in the circuit of college.
+        """
+        if success:
+            _circuits.pop(self.college_id, None)
+            return
+        failures, _ = _circuits.get(self.college_id, (0, 0))
+        failures += 1
+        if failures >= FAILURE_THRESHOLD:
+            logger.error(f"Razorpay circuit opened for college "
+                         f"{self.college_id} after {failures} failures.")
+        _circuits[self.college_id] = (
+            failures, time.monotonic() + CIRCUIT_RESET_TIMEOUT)
+
+    async def call(self, resource: str, method: str, *args, **kwargs):
+        """
+        Call a method of Razorpay client resource with the headers of college.
+
+        Params:
+            resource (str): Name of client resource. e.g., "order"
+            method (str): Name of resource method. e.g., "create"
+            args: Positional arguments of the method. e.g., order id
+            kwargs: Keyword arguments of the method. e.g., data
+
+        Returns:
+            Response of the Razorpay API.
+
+        Raises:
+            BadRequestError: An error returned by Razorpay for invalid request.
+            HTTPException: An error occurred with status code 503 when circuit
+                is open or 504 when Razorpay not responded in time.
+        """
+        self._check_circuit()
+        function = getattr(getattr(self.client, resource), method)
+        kwargs.setdefault("headers", self.headers)
+        try:
+            response = await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(
+                    _gateway_executor, lambda: function(*args, **kwargs)
+                ),
+                timeout=REQUEST_TIMEOUT,
+            )
+        except (BadRequestError, SignatureVerificationError):
+            self._record(success=True)
+            raise
+        except asyncio.TimeoutError:
+            self._record(success=False)
+            raise HTTPException(
+                status_code=504, detail="Payment gateway not responded in time."
+            )
+        except Exception:
+            self._record(success=False)
+            raise
+        self._record(success=True)
+        return response
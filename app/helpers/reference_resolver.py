@@ -0,0 +1,185 @@
+"""
+This file contains class and functions related to resolve the reference ids
+(users, states, data segments) into their details in batch.
+"""
+
+import time
+
+from bson import ObjectId
+
+from app.core.utils import utility_obj
+from app.database.configuration import DatabaseConfiguration
+
+# Details of master/reference entities shared across requests for a short
+# time. e.g., {("college_folder", "users", "123456789012345678901234"):
+# (expire_at, {...})}
+_shared_cache: dict = {}
+SHARED_CACHE_TTL = 60
+SHARED_CACHE_MAX_SIZE = 10000
+
+
+class ReferenceResolver:
+    """
+    Collect the reference ids needed to render a response and resolve them
+    with one `$in` query per entity type.
+
+    An instance lives for a single request/response. Resolved details are
+    memoized on the instance, user and state details are also shared across
+    requests for `SHARED_CACHE_TTL` seconds.
+
+    Usage:
+        resolver = ReferenceResolver()
+        resolver.add("users", counselor_ids)
+        resolver.add("states", state_codes)
+        await resolver.resolve()
+        counselor_names = [resolver.user_name(_id) for _id in counselor_ids]
+    """
+
+    entities = {
+        "users": {
+            "collection": "user_collection",
+            "key": "_id",
+            "projection": {"first_name": 1, "middle_name": 1, "last_name": 1},
+            "shared": True,
+        },
+        "states": {
+            "collection": "state_collection",
+            "key": "state_code",
+            "match": {"country_code": "IN"},
+            "projection": {"_id": 0, "state_code": 1, "name": 1},
+            "shared": True,
+            "upper_case": True,
+        },
+        "segments": {
+            "collection": "data_segment_collection",
+            "key": "_id",
+            "projection": None,
+            "shared": False,
+        },
+    }
+
+    def __init__(self):
+        self._pending = {entity: set() for entity in self.entities}
+        self._resolved = {entity: {} for entity in self.entities}
+
+    def _normalize(self, entity: str, _id) -> str:
+        """
+        Get the normalized form of reference id which used as lookup key.
+        """
+        if self.entities[entity].get("upper_case"):
+            return str(_id).upper()
+        return str(_id)
+
+    def add(self, entity: str, ids: list | None) -> "ReferenceResolver":
+        """
+        Add the reference ids of an entity which needs to be resolved.
+
+        Params:
+            entity (str): Name of the entity. Possible values: users, states
+                and segments.
+            ids (list | None): A list which contains reference ids.
+
+        Returns:
+            ReferenceResolver: Instance of the class for chaining the calls.
+        """
+        for _id in ids or []:
+            if _id in ["", None]:
+                continue
+            key = self._normalize(entity, _id)
+            if (self.entities[entity].get("key") == "_id"
+                    and not ObjectId.is_valid(key)):
+                continue
+            if key not in self._resolved[entity]:
+                self._pending[entity].add(key)
+        return self
+
+    def _shared_key(self, entity: str, key: str) -> tuple:
+        """
+        Get the key of shared cache, season data is kept separate per college.
+        """
+        return utility_obj.get_university_name_s3_folder(), entity, key
+
+    def _get_from_shared_cache(self, entity: str, keys: set) -> set:
+        """
+        Resolve the ids from shared cache and return the ids which are not
+        found in the shared cache.
+        """
+        now = time.monotonic()
+        missing = set()
+        for key in keys:
+            cached = _shared_cache.get(self._shared_key(entity, key))
+            if cached and cached[0] > now:
+                self._resolved[entity][key] = cached[1]
+            else:
+                missing.add(key)
+        return missing
+
+    def _store_in_shared_cache(self, entity: str, documents: dict) -> None:
+        """
+        Store the resolved details in the shared cache.
+        """
+        if len(_shared_cache) + len(documents) > SHARED_CACHE_MAX_SIZE:
+            _shared_cache.clear()
+        expire_at = time.monotonic() + SHARED_CACHE_TTL
+        for key, document in documents.items():
+            _shared_cache[self._shared_key(entity, key)] = (expire_at, document)
+
+    async def resolve(self) -> "ReferenceResolver":
+        """
+        Resolve all the pending reference ids, one query per entity type.
+
+        Returns:
+            ReferenceResolver: Instance of the class.
+        """
+        for entity, keys in self._pending.items():
+            if not keys:
+                continue
+            config = self.entities[entity]
+            if config.get("shared"):
+                keys = self._get_from_shared_cache(entity, keys)
+            if keys:
+                key_field = config.get("key")
+                values = (
+                    list(keys)
+                    if key_field != "_id"
+                    else [ObjectId(key) for key in keys]
+                )
+                query = {key_field: {"$in": values}}
+                query.update(config.get("match", {}))
+                collection = getattr(
+                    DatabaseConfiguration(), config.get("collection"))
+                documents = {
+                    self._normalize(entity, document.get(key_field)): document
+                    async for document in collection.find(
+                        query, config.get("projection"))
+                }
+                self._resolved[entity].update(documents)
+                if config.get("shared"):
+                    self._store_in_shared_cache(entity, documents)
+            self._pending[entity] = set()
+        return self
+
+    def get(self, entity: str, _id) -> dict | None:
+        """
+        Get the resolved details of a reference id.
+
+        Params:
+            entity (str): Name of the entity.
+            _id: A reference id.
+
+        Returns:
+            dict | None: Details of the reference id if found else None.
+        """
+        return self._resolved[entity].get(self._normalize(entity, _id))
+
+    def user_name(self, _id) -> str:
+        """
+        Get the full name of user by id.
+        """
+        return utility_obj.name_can(self.get("users", _id))
+
+    def state_name(self, state_code: str) -> str | None:
+        """
+        Get the state name by state code.
+        """
+        return (self.get("states", state_code) or {}).get("name")
@@ -90,12 +90,7 @@ class Updates:
             college_id, selected_profiles, content, current_datetime,
             update_id, title)
         if len(notification_info) >= 1:
-            inserted_data = await (DatabaseConfiguration().
-                                   notification_collection.insert_many(
+            await (DatabaseConfiguration().notification_collection.insert_many(
                 notification_info))
-            inserted_ids = inserted_data.inserted_ids
-            for new_id, info in zip(inserted_ids, notification_info):
-                info["id"] = new_id
-            await utility_obj.bulk_update_to_redis(notification_info)
             return {"message": "Send update to the selected profiles."}
         return {"detail": "No user found for send update."}
@@ -0,0 +1,176 @@
+"""
+This file contains class and functions related to authorize the features of
+a user with compiled permission maps.
+"""
+
+import time
+
+from app.core.log_config import get_logger
+from app.core.utils import utility_obj, settings
+
+logger = get_logger(name=__name__)
+
+# Compiled permission maps by college folder, dashboard, requested college,
+# role and groups. e.g., {("college", "admin_dashboard", "college_id",
+# "role_id", ("group_id",)): (version, expire_at, features, compiled)}
+_permission_maps: dict = {}
+# Permission map is re-built after below seconds even when version is not
+# changed, e.g., when version key is not available in the cache.
+PERMISSION_MAP_TTL = 3600
+MAX_PERMISSION_MAPS = 1000
+
+
+class FeaturePermissionMap:
+    """
+    Authorize the features of a user.
+
+    Features of a role (merged with the groups of user and college screen)
+    are compiled once to a flat map of feature key to visibility and allowed
+    permissions, and held in process memory. Map is versioned by a counter in
+    the cache which is incremented when roles/features change, hence a
+    request only reads the version instead of the features of user.
+
+    Usage:
+        features, compiled = await feature_permission_map.get(
+            user, "admin_dashboard", college_id)
+        allowed = feature_permission_map.is_allowed(
+            compiled, feature_key, "write")
+    """
+
+    def get_version_key(self) -> str:
+        """
+        Get the cache key of permission map version of a college.
+        """
+        return (f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}"
+                f"/feature_permissions_version")
+
+    async def get_version(self) -> str | None:
+        """
+        Get the current version of permission maps, None when cache is not
+        available.
+        """
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.dependencies.oauth import get_redis_client
+        redis_client = get_redis_client()
+        if not redis_client:
+            return None
+        try:
+            version = await redis_client.get(self.get_version_key())
+        except Exception as error:
+            logger.error(f"Failed to get the permission map version. Error - {error}")
+            return None
+        if isinstance(version, bytes):
+            version = version.decode("utf-8")
+        return version or "0"
+
+    async def bump_version(self) -> None:
+        """
+        Increment the version of permission maps, maps of all the processes
+        are re-built on next request.
+        """
+        from app.dependencies.oauth import get_redis_client
+        _permission_maps.clear()
+        redis_client = get_redis_client()
+        if redis_client:
+            await redis_client.incr(self.get_version_key())
+
+    def get_map_key(self, user: dict, dashboard_type: str,
+                    college_id: str | None = None) -> tuple:
+        """
+        Get the key of permission map of a user, users with same role and
+        groups share a map.
+
+        Raises:
+            CustomError: An error occurred when requested college is not one
+                of the associated colleges of user, checked before the map is
+                read from the cache.
+        """
+        folder = utility_obj.get_university_name_s3_folder()
+        if dashboard_type != "admin_dashboard":
+            return folder, dashboard_type, str(user.get("college_id")), None, ()
+        role_id = str(user.get("role", {}).get("role_id"))
+        if user.get("associated_colleges", []):
+            college_id = utility_obj.get_associated_college_id(user)
+            # Role features are stored by the first associated college.
+            role_id = f"{user.get('associated_colleges')[0]}/{role_id}"
+        group_ids = tuple(sorted(
+            str(group.get("group_id"))
+            for group in user.get("assign_group_permissions", [])
+        ))
+        return folder, dashboard_type, str(college_id), role_id, group_ids
+
+    def compile(self, features: dict) -> dict:
+        """
+        Compile the features to a map of feature key to visibility and
+        allowed permissions.
+
+        Params:
+            features (dict): Flat features of a user. e.g., {"feature_key":
+                {"visibility": True, "permissions": {"read": True}}}
+
+        Returns:
+            dict: A dictionary which contains compiled features.
+                e.g., {"feature_key": (True, frozenset({"read"}))}
+        """
+        compiled = {}
+        for feature_key, feature in features.items():
+            if not isinstance(feature, dict):
+                continue
+            permissions = feature.get("permissions") or {}
+            compiled[feature_key] = (
+                bool(feature.get("visibility", False)),
+                frozenset(name for name, value in permissions.items() if value),
+            )
+        return compiled
+
+    async def get(self, user: dict, dashboard_type: str = "admin_dashboard",
+                  college_id: str | None = None) -> tuple:
+        """
+        Get the features and compiled permission map of a user.
+
+        Params:
+            user (dict): A dictionary which contains user details.
+            dashboard_type (str): Type of dashboard. e.g., "admin_dashboard"
+            college_id (str | None): An unique identifier of college.
+
+        Returns:
+            tuple: A tuple which contains features and compiled features.
+
+        Raises:
+            DataNotFoundError: An error occurred when permissions of role are
+                not found.
+        """
+        key = self.get_map_key(user, dashboard_type, college_id)
+        version = await self.get_version()
+        cached_version, expire_at, features, compiled = _permission_maps.get(
+            key, (None, 0, None, None))
+        if (
+            compiled is not None
+            and cached_version == version
+            and expire_at > time.monotonic()
+        ):
+            return features, compiled
+        features = await utility_obj.get_user_feature_permissions(
+            user=user, dashboard_type=dashboard_type, college_id=college_id
+        )
+        compiled = self.compile(features)
+        if len(_permission_maps) >= MAX_PERMISSION_MAPS:
+            _permission_maps.clear()
+        _permission_maps[key] = (
+            version, time.monotonic() + PERMISSION_MAP_TTL, features, compiled)
+        return features, compiled
+
+    def is_allowed(self, compiled: dict, feature_key: str,
+                   required_permission: str | None = None) -> bool:
+        """
+        Check whether a feature is visible to the user and required
+        permission is allowed.
+        """
+        visibility, permissions = compiled.get(feature_key, (False, frozenset()))
+        if not visibility:
+            return False
+        return not required_permission or required_permission in permissions
+
+
+feature_permission_map = FeaturePermissionMap()
@@ -0,0 +1,198 @@
+"""
+This file contains class and functions related to synchronize the cached
+roles, groups, permissions and role descendants with PostgreSQL.
+"""
+
+import json
+
+from sqlalchemy import text
+
+from app.core.log_config import get_logger
+from app.helpers.roles.role_group_query import (PERMISSIONS_SELECT,
+                                                RoleGroupQuery)
+
+logger = get_logger(name=__name__)
+
+ROLES_KEY = "roles_permissions"
+GROUPS_KEY = "groups_and_permissions"
+
+
+class RBACCacheSync:
+    """
+    Synchronize the RBAC hashes of the cache with PostgreSQL.
+
+    A change of roles/groups re-queries only the changed rows (by id) and
+    writes only their hash fields, rows which no longer exist are removed
+    from the hash. A full sync (no ids, e.g., on startup) compares the rows
+    with the cached hash and writes only the fields which differ. Writes are
+    sent in one pipeline and dependent caches (permission maps, role/group
+    pages and verified tokens) are invalidated only when a field changed.
+
+    Usage:
+        changed = await RBACCacheSync().sync_roles(mongo_ids=[role_id])
+    """
+
+    async def write_hash(self, key: str, fields: dict, removed=(),
+                         replace: bool = False) -> int:
+        """
+        Write the changed fields of a hash.
+
+        Params:
+            key (str): Name of the hash. e.g., "roles_permissions"
+            fields (dict): Fields with serialized values which should be in
+                the hash.
+            removed (iterable): Fields which should be removed from the hash.
+            replace (bool): When True, `fields` are all the fields of hash,
+                cached fields which are not in `fields` are removed.
+
+        Returns:
+            int: Number of fields written or removed.
+        """
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.dependencies.oauth import get_redis_client, is_testing_env
+        if is_testing_env() or not (redis_client := get_redis_client()):
+            return 0
+        if replace:
+            cached = {
+                (field.decode("utf-8") if isinstance(field, bytes) else field):
+                    (value.decode("utf-8") if isinstance(value, bytes) else value)
+                for field, value in (await redis_client.hgetall(key)).items()
+            }
+            removed = set(cached) - set(fields)
+        else:
+            cached = {}
+            if fields:
+                values = await redis_client.hmget(key, list(fields))
+                cached = {
+                    field: value.decode("utf-8") if isinstance(value, bytes) else value
+                    for field, value in zip(fields, values)
+                }
+        changed = {field: value for field, value in fields.items()
+                   if cached.get(field) != value}
+        removed = [field for field in removed if field not in fields]
+        if not changed and not removed:
+            return 0
+        async with redis_client.pipeline(transaction=False) as pipe:
+            if changed:
+                pipe.hset(key, mapping=changed)
+            if removed:
+                pipe.hdel(key, *removed)
+            await pipe.execute()
+        return len(changed) + len(removed)
+
+    async def get_roles(self, db, mongo_ids: list | None = None) -> dict:
+        """
+        Get the roles with their permissions.
+
+        Returns:
+            dict: A dictionary which contains mongo id of role as key and
+                serialized role as value.
+        """
+        where, params = "", {}
+        if mongo_ids is not None:
+            where, params = "WHERE r.mongo_id = ANY(:mongo_ids)", {
+                "mongo_ids": [str(mongo_id) for mongo_id in mongo_ids]}
+        result = await db.execute(text(f"""
+            SELECT r.id, r.name, r.description, r.scope, r.mongo_id, {PERMISSIONS_SELECT}
+            FROM roles r
+            LEFT JOIN role_permissions rp ON r.id = rp.role_id
+            LEFT JOIN permissions p ON rp.permission_id = p.id
+            {where}
+            GROUP BY r.id
+        """), params)
+        return {str(row.mongo_id): json.dumps({**row._mapping})
+                for row in result.fetchall()}
+
+    async def get_groups(self, db, group_ids: list | None = None) -> dict:
+        """
+        Get the groups with their permissions and users.
+
+        Returns:
+            dict: A dictionary which contains id of group as key and
+                serialized group as value.
+        """
+        where, params = "", {}
+        if group_ids is not None:
+            where, params = "WHERE g.id = ANY(:group_ids)", {
+                "group_ids": [int(group_id) for group_id in group_ids]}
+        result = (await db.execute(text(f"""
+            SELECT row_to_json(g) AS group_data, {PERMISSIONS_SELECT}
+            FROM groups g
+            LEFT JOIN group_permissions gp ON g.id = gp.group_id
+            LEFT JOIN permissions p ON gp.permission_id = p.id
+            {where}
+            GROUP BY g.id
+        """), params)).fetchall()
+        group_to_users = await RoleGroupQuery().get_group_users(
+            [row.group_data.get("id") for row in result])
+        return {
+            str(row.group_data.get("id")): json.dumps(
+                {**row.group_data, "permissions": row.permissions,
+                 "users": group_to_users.get(row.group_data.get("id"), [])}
+            )
+            for row in result
+        }
+
+    async def invalidate_dependents(self, roles_changed: bool = True) -> None:
+        """
+        Invalidate the caches which are derived from roles/groups.
+        """
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.dependencies.jwttoken import Authentication
+        from app.helpers.roles.feature_permissions import feature_permission_map
+        await RoleGroupQuery.bump_version()
+        if roles_changed:
+            await feature_permission_map.bump_version()
+            Authentication.invalidate_verified_tokens()
+
+    async def sync_roles(self, mongo_ids: list | None = None) -> dict:
+        """
+        Synchronize the cached roles with PostgreSQL.
+
+        Params:
+            mongo_ids (list | None): Mongo ids of changed roles, all the
+                roles are synchronized when not given.
+
+        Returns:
+            dict: A dictionary which contains synchronized roles.
+        """
+        from app.database.motor_base import pgsql_conn
+        db = await pgsql_conn.get_db_session()
+        try:
+            roles_data = await self.get_roles(db, mongo_ids)
+        finally:
+            await db.close()
+        written = await self.write_hash(
+            ROLES_KEY, roles_data, removed=map(str, mongo_ids or []),
+            replace=mongo_ids is None)
+        if written:
+            await self.invalidate_dependents()
+        logger.info(f"Roles cache synchronized, {written} fields changed.")
+        return roles_data
+
+    async def sync_groups(self, group_ids: list | None = None) -> dict:
+        """
+        Synchronize the cached groups with PostgreSQL.
+
+        Params:
+            group_ids (list | None): Ids of changed groups, all the groups
+                are synchronized when not given.
+
+        Returns:
+            dict: A dictionary which contains synchronized groups.
+        """
+        from app.database.motor_base import pgsql_conn
+        db = await pgsql_conn.get_db_session()
+        try:
+            groups_data = await self.get_groups(db, group_ids)
+        finally:
+            await db.close()
+        written = await self.write_hash(
+            GROUPS_KEY, groups_data, removed=map(str, group_ids or []),
+            replace=group_ids is None)
+        if written:
+            await self.invalidate_dependents(roles_changed=False)
+        logger.info(f"Groups cache synchronized, {written} fields changed.")
+        return groups_data
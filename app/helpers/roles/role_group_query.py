@@ -0,0 +1,278 @@
+"""
+This file contains class and functions related to list the roles and groups
+with filters and pagination in PostgreSQL.
+"""
+
+import base64
+import hashlib
+import json
+
+from sqlalchemy import text
+
+from app.core.log_config import get_logger
+from app.core.utils import CustomJSONEncoder, settings
+from app.database.configuration import DatabaseConfiguration
+
+logger = get_logger(name=__name__)
+
+# Pages of roles/groups are cached for below seconds, cached pages are
+# invalidated when roles/groups are re-cached (see `bump_version`).
+PAGE_CACHE_TTL = 300
+PAGE_VERSION_KEY = "role_group_pages_version"
+
+PERMISSIONS_SELECT = """
+    JSONB_BUILD_OBJECT(
+        'college_permissions', COALESCE(
+            JSONB_AGG(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL AND p.scope = 'college'
+        ), '[]'::jsonb),
+        'global_permissions', COALESCE(
+            JSONB_AGG(DISTINCT p.name) FILTER (WHERE p.name IS NOT NULL AND p.scope = 'global'
+        ), '[]'::jsonb)
+    ) AS permissions
+"""
+
+
+class RoleGroupQuery:
+    """
+    List the roles or groups visible to a user.
+
+    Scope, college and role hierarchy (descendants of role of user) filters
+    are applied in SQL, rows are ordered by name and paged with keyset
+    (`after` cursor of last row) or page number. Only the rows of requested
+    page are read and cached.
+
+    Usage:
+        page = await RoleGroupQuery().fetch_page(
+            "roles", scopes=["college"], root_role_id=role_id, page_size=10)
+    """
+
+    @staticmethod
+    def encode_cursor(row: dict) -> str:
+        """
+        Get the cursor of a row, i.e., sort key of the row.
+        """
+        return base64.urlsafe_b64encode(
+            json.dumps([row.get("name", "").lower(), row.get("id")]).encode("utf-8")
+        ).decode("utf-8")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        """
+        Get the sort key of a cursor.
+
+        Raises:
+            ValueError: An error occurred when cursor is not valid.
+        """
+        try:
+            name, _id = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+            return str(name), int(_id)
+        except Exception:
+            raise ValueError("Invalid cursor.")
+
+    def get_filters(self, data_type: str, scopes: list, root_role_id: str | None = None,
+                    college_ids: list | None = None,
+                    global_only: bool = False) -> tuple:
+        """
+        Get the where clause and params of the roles/groups query.
+
+        Params:
+            data_type (str): Either "roles" or "groups".
+            scopes (list): Allowed scopes. e.g., ["global", "college"]
+            root_role_id (str | None): Mongo id of role, only descendants of
+                the role are returned when given.
+            college_ids (list | None): Only groups of these colleges or
+                groups without college are returned when given.
+            global_only (bool): Only groups without college are returned
+                when True.
+
+        Returns:
+            tuple: A tuple which contains where clause and params.
+        """
+        alias = "r" if data_type == "roles" else "g"
+        conditions, params = [f"{alias}.scope = ANY(:scopes)"], {"scopes": list(scopes)}
+        if data_type == "roles" and root_role_id:
+            conditions.append(
+                "r.id IN (SELECT id FROM descendants) AND r.mongo_id != :root_role_id"
+            )
+            params["root_role_id"] = root_role_id
+        if data_type == "groups":
+            if global_only:
+                conditions.append("g.college_id IS NULL")
+            elif college_ids is not None:
+                conditions.append("(g.college_id IS NULL OR g.college_id = ANY(:college_ids))")
+                params["college_ids"] = [str(college_id) for college_id in college_ids]
+        return " AND ".join(conditions), params
+
+    def get_descendants_cte(self, data_type: str, root_role_id: str | None = None) -> str:
+        """
+        Get the recursive CTE of descendants of a role.
+        """
+        if data_type != "roles" or not root_role_id:
+            return ""
+        return """
+            WITH RECURSIVE descendants AS (
+                SELECT id FROM roles WHERE mongo_id = :root_role_id
+                UNION ALL
+                SELECT r.id FROM roles r JOIN descendants d ON r.parent_id = d.id
+            )
+        """
+
+    @staticmethod
+    def get_version_key() -> str:
+        """
+        Get the cache key of version of cached pages.
+        """
+        return f"{settings.aws_env}/{PAGE_VERSION_KEY}"
+
+    async def get_page_cache_key(self, params: dict) -> str | None:
+        """
+        Get the cache key of a page, None when cache is not available.
+        """
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.dependencies.oauth import get_redis_client
+        redis_client = get_redis_client()
+        if not redis_client:
+            return None
+        version = await redis_client.get(self.get_version_key())
+        if isinstance(version, bytes):
+            version = version.decode("utf-8")
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return f"{settings.aws_env}/role_group_pages/{version or 0}/{digest}"
+
+    @staticmethod
+    async def bump_version() -> None:
+        """
+        Invalidate the cached pages of roles and groups.
+        """
+        from app.dependencies.oauth import get_redis_client
+        if redis_client := get_redis_client():
+            await redis_client.incr(RoleGroupQuery.get_version_key())
+
+    async def get_group_users(self, group_ids: list) -> dict:
+        """
+        Get the users of groups.
+
+        Returns:
+            dict: A dictionary which contains group id as key and user ids as
+                value. e.g., {1: ["123456789012345678901234"]}
+        """
+        if not group_ids:
+            return {}
+        pipeline = [
+            {"$match": {"group_ids": {"$in": group_ids}}},
+            {"$unwind": "$group_ids"},
+            {"$match": {"group_ids": {"$in": group_ids}}},
+            {"$group": {"_id": "$group_ids",
+                        "user_ids": {"$addToSet": {"$toString": "$_id"}}}}
+        ]
+        group_user_map = await DatabaseConfiguration().user_collection.aggregate(
+            pipeline).to_list(None)
+        return {item["_id"]: item["user_ids"] for item in group_user_map}
+
+    async def fetch_page(self, data_type: str, scopes: list,
+                         root_role_id: str | None = None,
+                         college_ids: list | None = None, global_only: bool = False,
+                         page_num: int | None = None, page_size: int | None = None,
+                         after: str | None = None) -> dict:
+        """
+        Get a page of roles or groups.
+
+        Params:
+            data_type (str): Either "roles" or "groups".
+            scopes (list): Allowed scopes. e.g., ["global", "college"]
+            root_role_id (str | None): Mongo id of role, only descendants of
+                the role are returned when given.
+            college_ids (list | None): Only groups of these colleges or
+                groups without college are returned when given.
+            global_only (bool): Only groups without college are returned
+                when True.
+            page_num (int | None): Page number, used when `after` is not
+                given.
+            page_size (int | None): Number of rows in a page, all rows are
+                returned when not given.
+            after (str | None): Cursor of last row of previous page.
+
+        Returns:
+            dict: A dictionary which contains rows, total and cursor of next
+                page. e.g., {"data": [...], "total": 20, "next_cursor": "..."}
+
+        Raises:
+            ValueError: An error occurred when cursor is not valid.
+        """
+        # Do not move below statement at top otherwise we will get circular
+        # import error
+        from app.database.motor_base import pgsql_conn
+        from app.dependencies.oauth import get_redis_client, insert_data_in_cache
+
+        where, params = self.get_filters(
+            data_type, scopes, root_role_id, college_ids, global_only)
+        cache_key = await self.get_page_cache_key({
+            "data_type": data_type, **params, "global_only": global_only,
+            "page_num": page_num, "page_size": page_size, "after": after})
+        if cache_key and (cached := await get_redis_client().get(cache_key)):
+            return json.loads(cached)
+        count_params = dict(params)
+        alias = "r" if data_type == "roles" else "g"
+        page_where = where
+        if after:
+            params["after_name"], params["after_id"] = self.decode_cursor(after)
+            page_where += (f" AND (LOWER({alias}.name), {alias}.id) > "
+                           f"(:after_name, :after_id)")
+        limit = ""
+        if page_size:
+            limit = " LIMIT :limit"
+            params["limit"] = page_size
+            if not after and page_num:
+                limit += " OFFSET :offset"
+                params["offset"] = (page_num - 1) * page_size
+        cte = self.get_descendants_cte(data_type, root_role_id)
+        if data_type == "roles":
+            select_query = f"""
+                {cte}
+                SELECT r.id, r.name, r.description, r.scope, r.mongo_id, {PERMISSIONS_SELECT}
+                FROM roles r
+                LEFT JOIN role_permissions rp ON r.id = rp.role_id
+                LEFT JOIN permissions p ON rp.permission_id = p.id
+                WHERE {page_where}
+                GROUP BY r.id
+                ORDER BY LOWER(r.name), r.id{limit}
+            """
+            count_query = f"{cte} SELECT COUNT(*) FROM roles r WHERE {where}"
+        else:
+            select_query = f"""
+                SELECT row_to_json(g) AS group_data, {PERMISSIONS_SELECT}
+                FROM groups g
+                LEFT JOIN group_permissions gp ON g.id = gp.group_id
+                LEFT JOIN permissions p ON gp.permission_id = p.id
+                WHERE {page_where}
+                GROUP BY g.id
+                ORDER BY LOWER(g.name), g.id{limit}
+            """
+            count_query = f"SELECT COUNT(*) FROM groups g WHERE {where}"
+        db = await pgsql_conn.get_db_session()
+        try:
+            rows = (await db.execute(text(select_query), params)).fetchall()
+            total = (await db.execute(text(count_query), count_params)).scalar() or 0
+        finally:
+            await db.close()
+        if data_type == "roles":
+            data = [{**row._mapping} for row in rows]
+        else:
+            group_users = await self.get_group_users(
+                [row.group_data.get("id") for row in rows])
+            data = [{**row.group_data, "permissions": row.permissions,
+                     "users": group_users.get(row.group_data.get("id"), [])}
+                    for row in rows]
+        data = json.loads(json.dumps(data, cls=CustomJSONEncoder))
+        page = {
+            "data": data,
+            "total": total,
+            "next_cursor": self.encode_cursor(data[-1])
+            if page_size and len(data) == page_size else None,
+        }
+        if cache_key:
+            await insert_data_in_cache(cache_key, page, expiration_time=PAGE_CACHE_TTL)
+        return page
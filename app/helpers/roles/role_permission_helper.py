@@ -17,6 +17,7 @@ from app.core.log_config import get_logger
 from app.core.utils import utility_obj, CustomJSONEncoder
 from app.database.configuration import DatabaseConfiguration
 from app.dependencies.oauth import get_cache_roles_permissions, get_redis_client, is_testing_env
+from app.helpers.roles.role_group_query import RoleGroupQuery
 from app.models.role_permission_schema import (
     PermissionCreate, RolePermission, Roles, GroupPermission, GroupPermissionBase, GroupUpdateBase,
     RoleCreate, RoleUpdate, PermissionUpdate)
@@ -226,17 +227,17 @@ class RolePermissionHelper:
                      "created_by": ObjectId(current_user.get("user_id"))})
                 await DatabaseConfiguration().role_collection.insert_one(data_obj)
                 await utility_obj.cache_descendant_mongo_ids()
+                await utility_obj.cache_roles_and_permissions(role_ids=[str(mongo_id)])
             elif model_name == "Permission":
-                # Todo: instead of cacheing the all roles and permission objects, we can cache the target object only
                 if super_admin_role := (
                         await db.execute(
                             select(Roles).where(Roles.name == "super_admin"))).scalar_one_or_none():
                     db.add(RolePermission(role_id=super_admin_role.id, permission_id=new_entry.id))
                     await db.commit()
+                    await utility_obj.cache_roles_and_permissions(
+                        role_ids=[super_admin_role.mongo_id])
                 await utility_obj.cache_permissions(collection="system_permissions")
 
-            await utility_obj.cache_roles_and_permissions()
-
             data = json.dumps(data, cls=CustomJSONEncoder)
             return JSONResponse(
                 status_code=201,
@@ -466,10 +467,12 @@ class RolePermissionHelper:
                         "last_modified_at": existing_entry.last_modified_at
                     }}
                 )
+                await utility_obj.cache_roles_and_permissions(role_ids=[entity_id])
             elif model_name == "Permission":
-                # Todo: instead of cacheing the all objects, we can cache the required object only
                 await utility_obj.cache_permissions(collection="system_permissions")
-            await utility_obj.cache_roles_and_permissions()
+                # Renamed permission can be assigned to any role, only the
+                # changed roles are written
+                await utility_obj.cache_roles_and_permissions()
 
             data = json.dumps(data, cls=CustomJSONEncoder)
             return JSONResponse(
@@ -576,8 +579,7 @@ class RolePermissionHelper:
 
             await db.commit()
             await db.refresh(existing_entry)
-            # Todo: Instead of initializing whole object we can update the required object only
-            await utility_obj.cache_groups_and_permissions()
+            await utility_obj.cache_groups_and_permissions(group_ids=[entity_id])
             return JSONResponse(
                 status_code=200,
                 content={"message": f"Group updated successfully.", "id": entity_id, "data": data}
@@ -592,11 +594,14 @@ class RolePermissionHelper:
     async def fetch_pgsql_entity(
             self, current_user, data_type: Literal["roles", "permissions", "groups"],
             item_id: Union[str, int, None] = None, scope: str | None = None,
-            college_id: str | None = None, page_num: int | None = None, page_size: int | None = None
+            college_id: str | None = None, page_num: int | None = None, page_size: int | None = None,
+            after: str | None = None
     ):
         """
         Fetch roles or permissions or groups based on user scope and permissions.
 
+        Roles and groups lists are filtered and paged in PostgreSQL (see `RoleGroupQuery`).
+
         Parameters:
             current_user (User): The current user.
             data_type (str): Either "roles" or "permissions".
@@ -605,6 +610,8 @@ class RolePermissionHelper:
             college_id (str | None): College ID.
             page_num (int | None): Pagination page number.
             page_size (int | None): Pagination page size.
+            after (str | None): Cursor of last role/group of previous page, used instead
+                of `page_num` when given.
 
         Returns:
             JSONResponse: Role or permission data with optional pagination.
@@ -667,14 +674,17 @@ class RolePermissionHelper:
                 if not college:
                     raise HTTPException(status_code=404, detail="College not found")
 
+            if data_type in ["roles", "groups"] and item_id is None:
+                return await self.fetch_role_group_page(
+                    data_type, filter_scopes, allowed_scopes, current_role_id, user_colleges,
+                    scope, college_id, page_num, page_size, after)
+
             # Apply descendant filter for roles
-            descendant_ids = None
-            if data_type == "roles":
+            if data_type == "roles" and item_id:
                 descendant_ids = await self.fetch_role_descendants(role_id=current_role_id)
-                if item_id:
-                    await utility_obj.is_id_length_valid(item_id, "Role ID")
-                    if item_id not in descendant_ids:
-                        raise HTTPException(status_code=401, detail="Not enough permissions")
+                await utility_obj.is_id_length_valid(item_id, "Role ID")
+                if item_id not in descendant_ids:
+                    raise HTTPException(status_code=401, detail="Not enough permissions")
 
             data = await get_cache_roles_permissions(
                 collection_name=collection_name, field=item_id, scope=filter_scopes)
@@ -700,32 +710,6 @@ class RolePermissionHelper:
             if not data:
                 raise HTTPException(status_code=404,
                                     detail=f"{data_type[:-1].capitalize()} not found")
-            if data_type == "roles" and descendant_ids is not None and not item_id:
-                data = [d for d in data if d.get("mongo_id") in descendant_ids]
-            if data_type == "groups" and isinstance(data, list):
-                if user_colleges:
-                    # If college_id is passed, filter by it only if it's allowed
-                    if college_id:
-                        data = [d for d in data if
-                                d.get("college_id") is None or d.get("college_id") == college_id]
-                    else:
-                        # No specific filter, show all accessible
-                        data = [
-                            d for d in data
-                            if d.get("college_id") is None or d.get("college_id") in user_colleges
-                        ]
-                elif "college" in allowed_scopes:
-                    # Global user with college read access: filter by passed college_id if given
-                    if scope == "college" and college_id:
-                        data = [
-                            d for d in data
-                            if d.get("scope") == "college" and (
-                                    d.get("college_id") is None or d.get("college_id") == college_id
-                            )
-                        ]
-                else:
-                    # Global user without college read access: show only global groups
-                    data = [d for d in data if d.get("college_id") is None]
             if page_num and page_size:
                 route_name = f"/role_permissions/{data_type}"
                 total = len(data)
@@ -748,6 +732,76 @@ class RolePermissionHelper:
             raise HTTPException(status_code=400,
                                 detail=f"Something went wrong while fetching {data_type}: {e}")
 
+    async def fetch_role_group_page(
+            self, data_type: str, filter_scopes: list, allowed_scopes: list, current_role_id: str,
+            user_colleges: list, scope: str | None = None, college_id: str | None = None,
+            page_num: int | None = None, page_size: int | None = None, after: str | None = None
+    ) -> JSONResponse:
+        """
+        Fetch the roles (descendants of role of user) or groups visible to the user.
+
+        Params:
+            data_type (str): Either "roles" or "groups".
+            filter_scopes (list): Scopes of roles/groups which need to fetch.
+            allowed_scopes (list): Scopes which user is allowed to read.
+            current_role_id (str): Mongo ID of role of user.
+            user_colleges (list): Associated colleges of user.
+            scope (str | None): Scope passed by the user.
+            college_id (str | None): College ID passed by the user.
+            page_num (int | None): Pagination page number.
+            page_size (int | None): Pagination page size.
+            after (str | None): Cursor of last role/group of previous page.
+
+        Returns:
+            JSONResponse: Roles or groups data with optional pagination.
+
+        Raises:
+            HTTPException: When roles/groups are not found or cursor is invalid.
+        """
+        college_ids, global_only = None, False
+        if data_type == "groups":
+            if user_colleges:
+                # If college_id is passed, filter by it only if it's allowed
+                college_ids = [college_id] if college_id else user_colleges
+            elif "college" in allowed_scopes:
+                # Global user with college read access: filter by passed college_id if given
+                if scope == "college" and college_id:
+                    college_ids = [college_id]
+            else:
+                # Global user without college read access: show only global groups
+                global_only = True
+        if not (page_size and (page_num or after)):
+            page_num, page_size, after = None, None, None
+        try:
+            page = await RoleGroupQuery().fetch_page(
+                data_type, filter_scopes,
+                root_role_id=current_role_id if data_type == "roles" else None,
+                college_ids=college_ids, global_only=global_only, page_num=page_num,
+                page_size=page_size, after=after)
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+        data, total = page.get("data", []), page.get("total", 0)
+        if not data:
+            raise HTTPException(status_code=404,
+                                detail=f"{data_type[:-1].capitalize()} not found")
+        if page_size:
+            pagination = await utility_obj.pagination_in_aggregation(
+                page_num or 1, page_size, total, f"/role_permissions/{data_type}")
+            if after:
+                pagination["pagination"]["previous"] = None
+            return JSONResponse(status_code=200, content={
+                "message": f"{data_type.capitalize()} Fetched Successfully",
+                "data": data,
+                "total": total,
+                "count": len(data),
+                "pagination": pagination["pagination"],
+                "next_cursor": page.get("next_cursor")
+            })
+        return JSONResponse(status_code=200,
+                            content={
+                                "message": f"{data_type[:-1].capitalize()} Fetched Successfully",
+                                "data": data})
+
     async def validate_and_fetch_target_data(self, target_type: str, target_id: str | int,
                                              db: AsyncSession, redis_client) -> dict:
         """
@@ -1004,11 +1058,11 @@ class RolePermissionHelper:
                                          "permission_ids": list(map(int, permissions_to_modify))})
 
             await db.commit()
-            # Todo: Instead of initializing whole roles_and_permissions object, we can update the request object only
             if model_obj == "role":
-                await utility_obj.cache_roles_and_permissions()
+                await utility_obj.cache_roles_and_permissions(
+                    role_ids=[target_data.get("mongo_id")])
             else:
-                await utility_obj.cache_groups_and_permissions()
+                await utility_obj.cache_groups_and_permissions(group_ids=[target_id])
             return JSONResponse(
                 status_code=200,
                 content={
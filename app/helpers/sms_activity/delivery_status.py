@@ -0,0 +1,183 @@
+"""
+This file contains class and functions related to update the SMS delivery
+status received from the webhook in batches.
+"""
+
+import asyncio
+
+from pymongo import UpdateMany
+
+from app.core.log_config import get_logger
+from app.core.utils import utility_obj
+from app.database.configuration import DatabaseConfiguration
+
+logger = get_logger(name=__name__)
+
+# Delivery statuses received in the current flush window, by college and
+# transaction id. Database of college is captured when status is received.
+# e.g., {"college_folder": (DatabaseConfiguration(),
+#        {123456: {"transactionId": 123456, "sms_delivered": True, ...}})}
+_pending_statuses: dict = {}
+_flush_task: asyncio.Task | None = None
+# Held while pending statuses are written, a flush waits for the write in
+# progress, e.g., flush of app shutdown waits for the scheduled flush.
+_flush_lock = asyncio.Lock()
+# Pending statuses are written after below seconds or when number of pending
+# statuses reaches `FLUSH_SIZE`, whichever comes first.
+FLUSH_INTERVAL = 1
+FLUSH_SIZE = 500
+
+
+class SMSDeliveryStatus:
+    """
+    Update the SMS delivery status in communication logs, automation
+    communication logs and SMS activities.
+
+    Statuses are buffered per flush window and written with `bulk_write`,
+    nested transaction is updated in place using `arrayFilters`.
+
+    Usage:
+        await SMSDeliveryStatus().add(data)
+    """
+
+    def get_operations(
+            self, statuses: list, array_path: str, summary_field: str | None
+    ) -> list:
+        """
+        Get the bulk write operations for update delivery statuses.
+
+        Params:
+            statuses (list): A list which contains delivery statuses.
+            array_path (str): Path of transactions array.
+                e.g., "sms_summary.transaction_id"
+            summary_field (str | None): Path of delivered count field which
+                want to increment when SMS delivered first time.
+                e.g., "sms_summary.sms_delivered"
+
+        Returns:
+            list: A list which contains bulk write operations.
+        """
+        operations = []
+        for status in statuses:
+            transaction_id = status.get("transactionId")
+            update = {
+                f"{array_path}.$[transaction].{key}": value
+                for key, value in status.items()
+                if key != "transactionId"
+            }
+            array_filters = [{"transaction.transactionId": transaction_id}]
+            if summary_field and status.get("sms_delivered"):
+                # Delivered count is incremented only for the transaction which
+                # is not marked as delivered yet.
+                operations.append(
+                    UpdateMany(
+                        {array_path: {"$elemMatch": {
+                            "transactionId": transaction_id,
+                            "sms_delivered": {"$ne": True}}}},
+                        {"$set": update, "$inc": {summary_field: 1}},
+                        array_filters=array_filters,
+                    )
+                )
+            operations.append(
+                UpdateMany(
+                    {f"{array_path}.transactionId": transaction_id},
+                    {"$set": update},
+                    array_filters=array_filters,
+                )
+            )
+        return operations
+
+    async def flush(self) -> int:
+        """
+        Write the pending delivery statuses of all the colleges.
+
+        Returns:
+            int: Number of delivery statuses written.
+        """
+        global _pending_statuses
+        async with _flush_lock:
+            pending, _pending_statuses = _pending_statuses, {}
+            written = 0
+            for database, statuses in pending.values():
+                await self.write(database, list(statuses.values()))
+                written += len(statuses)
+        return written
+
+    async def write(self, database: DatabaseConfiguration,
+                    statuses: list) -> None:
+        """
+        Write the delivery statuses in the database of a college.
+
+        Params:
+            database (DatabaseConfiguration): Database of the college.
+            statuses (list): A list which contains delivery statuses.
+        """
+        for collection, array_path, summary_field in [
+            (database.communication_log_collection,
+             "sms_summary.transaction_id", "sms_summary.sms_delivered"),
+            (database.automation_communicationLog_details,
+             "sms_summary.transaction_id", "sms_summary.sms_delivered"),
+            (database.sms_activity, "sms_response.submitResponses", None),
+        ]:
+            try:
+                await collection.bulk_write(
+                    self.get_operations(statuses, array_path, summary_field),
+                    ordered=True,
+                )
+            except Exception as error:
+                logger.error(f"An error got when update SMS delivery status "
+                             f"of `{collection.name}`. Error - {error}")
+
+    async def _flush_later(self) -> None:
+        """
+        Write the pending delivery statuses after flush interval.
+        """
+        global _flush_task
+        try:
+            await asyncio.sleep(FLUSH_INTERVAL)
+        finally:
+            if _flush_task is asyncio.current_task():
+                _flush_task = None
+        await self.flush()
+
+    async def close(self) -> int:
+        """
+        Write the pending delivery statuses when app shuts down, so statuses
+        received in the last flush window are not lost.
+
+        Returns:
+            int: Number of delivery statuses written.
+        """
+        global _flush_task
+        if _flush_task is not None:
+            _flush_task.cancel()
+            _flush_task = None
+        return await self.flush()
+
+    async def add(self, data: dict) -> None:
+        """
+        Add a delivery status received from the webhook. Statuses of same
+        transaction received in a flush window are merged.
+
+        Params:
+            data (dict): A dictionary which contains delivery status.
+                e.g., {"transactionId": "123456", "sms_delivered": True,
+                "description": "...", "delivery_date": "..."}
+        """
+        global _flush_task
+        data = dict(data, transactionId=int(data.get("transactionId")))
+        transaction_id = data.get("transactionId")
+        _, statuses = _pending_statuses.setdefault(
+            utility_obj.get_university_name_s3_folder(),
+            (DatabaseConfiguration(), {}))
+        if (pending := statuses.get(transaction_id)) is not None:
+            data["sms_delivered"] = bool(
+                pending.get("sms_delivered") or data.get("sms_delivered"))
+            pending.update(data)
+        else:
+            statuses[transaction_id] = data
+        if sum(len(statuses) for _, statuses in
+               _pending_statuses.values()) >= FLUSH_SIZE:
+            await self.flush()
+        elif _flush_task is None:
+            _flush_task = asyncio.create_task(self._flush_later())
@@ -1,6 +1,9 @@
 """
 This file contain class and functions related to SMS activity process
 """
+import asyncio
+import re
+import time
 from datetime import datetime, timezone
 import json
 
@@ -13,139 +16,22 @@ from app.core.log_config import get_logger
 from app.core.utils import settings, utility_obj
 from app.database.configuration import DatabaseConfiguration
 from app.database.database_sync import DatabaseConfigurationSync
+from app.helpers.sms_activity.sms_dispatch import SMSDispatcher
 
 logger = get_logger(name=__name__)
 
+# SMS templates by DLT content id.
+# e.g., {("college_folder", "dlt_content_id"): (expire_at, {...})}
+_dlt_template_cache: dict = {}
+DLT_TEMPLATE_CACHE_TTL = 300
+DLT_TEMPLATE_CACHE_MAX_SIZE = 1000
+
 
 class SMSHelper:
     """
     Perform sms related activity
     """
 
-    async def update_delivery_status(self, data):
-        """
-        Update sms delivery status
-        """
-        try:
-            result = (DatabaseConfiguration()
-            .communication_log_collection.aggregate(
-                [
-                    {'$match': {
-                        "sms_summary.transaction_id.transactionId": int(
-                            data.get('transactionId'))}},
-                    {'$group': {
-                        '_id': "$_id"
-                    }}
-                ]
-            ))
-            async for item in result:
-                communication_data = await (DatabaseConfiguration()
-                .communication_log_collection.find_one(
-                    {'_id': item.get('_id')}))
-                if communication_data:
-                    for _id, element in enumerate(
-                            communication_data.get("sms_summary", {}).get(
-                                "transaction_id", [])):
-                        if element.get('transactionId') == int(
-                                data.get('transactionId')):
-                            if len(data) > 0:
-                                element.update(data)
-                            else:
-                                break
-                            if data.get("sms_delivered"):
-                                communication_data["sms_summary"][
-                                    "sms_delivered"] = \
-                                    communication_data["sms_summary"][
-                                        "sms_delivered"] + 1
-                                await utility_obj.update_transaction_details_by_message_id(
-                                    message_id=data.get('transactionId'),
-                                    communication_data=communication_data,
-                                    name="transactionId", com_type="sms")
-
-                            communication_data["sms_summary"][
-                                "transaction_id"][_id] = element
-
-                            await (DatabaseConfiguration()
-                            .communication_log_collection.update_one(
-                                {"_id": item.get('_id')},
-                                {'$set': communication_data}))
-            activity_result = DatabaseConfiguration().sms_activity.aggregate(
-                [
-                    {"$unwind": {"path": "$sms_response.submitResponses"}},
-                    {'$match': {
-                        "sms_response.submitResponses.transactionId": int(
-                            data.get('transactionId'))}},
-                    {'$group': {
-                        '_id': "$_id"
-                    }}
-                ]
-            )
-            async for item in activity_result:
-                sms_activity_data = await (DatabaseConfiguration()
-                .sms_activity.find_one(
-                    {'_id': item.get('_id')}))
-                if sms_activity_data:
-                    for _id, element in enumerate(
-                            sms_activity_data.get("sms_response", {}).get(
-                                "submitResponses", [])):
-                        if element.get('transactionId') == int(
-                                data.get('transactionId')):
-                            if len(data) > 0:
-                                element.update(data)
-                                await (DatabaseConfiguration()
-                                .sms_activity.update_one(
-                                    {"_id": item.get('_id')}, {
-                                        '$set': {
-                                            f'sms_response.submitResponses.{_id}': element}}))
-                            else:
-                                break
-        except Exception as e:
-            logger.error("Something went wrong. ", e)
-
-    async def automation_update_sms_status(self, data):
-        """
-        Update the automation status update for the specified
-        """
-        try:
-            result = (DatabaseConfiguration()
-            .automation_communicationLog_details.aggregate(
-                [
-                    {"$unwind": {"path": "$sms_summary.transaction_id"}},
-                    {'$match': {
-                        "sms_summary.transaction_id.transactionId": int(
-                            data.get('transactionId'))}},
-                    {'$group': {
-                        '_id': "$_id"
-                    }}
-                ]
-            ))
-            async for item in result:
-                communication_data = await (DatabaseConfiguration()
-                .automation_communicationLog_details.find_one(
-                    {'_id': item.get('_id')}))
-                if communication_data:
-                    for _id, element in enumerate(communication_data.get(
-                            "sms_summary", {}).get("transaction_id", [])):
-                        if element.get('transactionId') == int(data.get(
-                                'transactionId')):
-                            if len(data) > 0:
-                                element.update(data)
-                            else:
-                                break
-                            if data.get("sms_delivered"):
-                                communication_data["sms_summary"][
-                                    "sms_delivered"] = communication_data.get(
-                                    "sms_summary", {}).get("sms_delivered",
-                                                           0) + 1
-                            communication_data["sms_summary"][
-                                "transaction_id"][_id] = element
-                            await (DatabaseConfiguration()
-                            .automation_communicationLog_details.update_one(
-                                {"_id": item.get('_id')},
-                                {'$set': communication_data}))
-        except Exception as e:
-            logger.error("Something went wrong. ", e)
-
     def text_message_activity(self, send_to, sms_content, dlt_content_id):
         """
         Send the SMS to particular student and return the response accordingly
@@ -185,43 +71,70 @@ class SMSHelper:
             data (list): A list which can contains mobile numbers or
              email ids of interview lists students.
         """
-        data = []
+        list_ids = [ObjectId(list_id) for list_id in interview_lists]
+        interview_data = await DatabaseConfiguration().interview_list_collection.aggregate(
+            [
+                {"$match": {"_id": {"$in": list_ids}}},
+                {"$project": {"eligible_applications": 1}},
+                {"$lookup": {
+                    "from": "studentApplicationForms",
+                    "localField": "eligible_applications",
+                    "foreignField": "_id",
+                    "pipeline": [{"$project": {"student_id": 1}}],
+                    "as": "applications",
+                }},
+                {"$lookup": {
+                    "from": "studentsPrimaryDetails",
+                    "localField": "applications.student_id",
+                    "foreignField": "_id",
+                    "pipeline": [{"$project": {
+                        "user_name": 1, "basic_details.mobile_number": 1}}],
+                    "as": "students",
+                }},
+            ]
+        ).to_list(None)
+        interview_data = {
+            str(interview_list.get("_id")): interview_list
+            for interview_list in interview_data
+        }
+        data, student_ids = [], []
         for list_id in interview_lists:
-            if (
-                    interview_list := await DatabaseConfiguration()
-                            .interview_list_collection.find_one(
-                        {"_id": ObjectId(list_id)})) is None:
+            if (interview_list := interview_data.get(str(list_id))) is None:
                 raise DataNotFoundError(_id=list_id, message="Interview List")
-            applications = interview_list.get("eligible_applications", [])
-            if applications:
-                for application_id in applications:
-                    if (
-                            app_doc := await DatabaseConfiguration()
-                                    .studentApplicationForms.find_one(
-                                {"_id": application_id})) is None:
-                        raise DataNotFoundError(_id=application_id,
-                                                message="Application")
-                    student_id = app_doc.get("student_id")
-                    if (
-                            stu_doc := await DatabaseConfiguration()
-                                    .studentsPrimaryDetails.find_one(
-                                {"_id": student_id})) is None:
-                        raise DataNotFoundError(_id=student_id,
-                                                message="Student")
-                    if get_email_ids:
-                        data.append(stu_doc.get("user_name"))
-                    else:
-                        if (basic_details := stu_doc.get("basic_details",
-                                                         {})) is None:
-                            basic_details = {}
-                        data.append(basic_details.get("mobile_number"))
-                    current_datetime = datetime.now(timezone.utc)
-                    update_data = {"last_user_activity_date": current_datetime}
-                    if stu_doc and not stu_doc.get("first_lead_activity_date"):
-                        update_data["first_lead_activity_date"] = current_datetime
-                    await DatabaseConfiguration().studentsPrimaryDetails.update_one({
-                        "_id": ObjectId(student_id)},
-                        {"$set": update_data})
+            applications = {
+                application.get("_id"): application
+                for application in interview_list.get("applications", [])
+            }
+            students = {
+                student.get("_id"): student
+                for student in interview_list.get("students", [])
+            }
+            for application_id in interview_list.get(
+                    "eligible_applications", []):
+                if (app_doc := applications.get(application_id)) is None:
+                    raise DataNotFoundError(_id=application_id,
+                                            message="Application")
+                student_id = app_doc.get("student_id")
+                if (stu_doc := students.get(student_id)) is None:
+                    raise DataNotFoundError(_id=student_id,
+                                            message="Student")
+                if get_email_ids:
+                    data.append(stu_doc.get("user_name"))
+                else:
+                    if (basic_details := stu_doc.get("basic_details",
+                                                     {})) is None:
+                        basic_details = {}
+                    data.append(basic_details.get("mobile_number"))
+                student_ids.append(student_id)
+        if student_ids:
+            current_datetime = datetime.now(timezone.utc)
+            await DatabaseConfiguration().studentsPrimaryDetails.update_many(
+                {"_id": {"$in": student_ids}},
+                {"$set": {"last_user_activity_date": current_datetime}})
+            await DatabaseConfiguration().studentsPrimaryDetails.update_many(
+                {"_id": {"$in": student_ids},
+                 "first_lead_activity_date": {"$in": [None, ""]}},
+                {"$set": {"first_lead_activity_date": current_datetime}})
         return data
 
     async def get_mobile_numbers(self, interview_lists: list | None):
@@ -252,9 +165,77 @@ class SMSHelper:
         return await self.get_data_from_interview_list(interview_lists,
                                                        get_email_ids=True)
 
-    def send_sms_to_many(self, send_to, dlt_content_id, sms_content, sms_type,
-                         sender_name, mobile_prefix=None, college_id=None):
-        url = "https://api.oot.bz/api/v1/one2Many"
+    async def get_dlt_template(self, dlt_content_id: str | None) -> dict:
+        """
+        Get the SMS template by DLT content id. Templates are cached for
+        `DLT_TEMPLATE_CACHE_TTL` seconds.
+
+        Params:
+            dlt_content_id (str | None): DLT content id of the template.
+
+        Returns:
+            dict: A dictionary which contains template details, empty
+                dictionary when template not found.
+        """
+        key = (utility_obj.get_university_name_s3_folder(), dlt_content_id)
+        cached = _dlt_template_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        if (template := await DatabaseConfiguration().template_collection.find_one(
+                {"dlt_content_id": dlt_content_id})) is None:
+            template = {}
+        if len(_dlt_template_cache) >= DLT_TEMPLATE_CACHE_MAX_SIZE:
+            _dlt_template_cache.clear()
+        _dlt_template_cache[key] = (
+            time.monotonic() + DLT_TEMPLATE_CACHE_TTL, template)
+        return template
+
+    def get_sms_contents(self, send_to: list, sms_content: str,
+                         college_id=None) -> list:
+        """
+        Get the personalized SMS content of every number. Students are
+        fetched with one query and only when content has variables.
+
+        Params:
+            send_to (list): A list which contains mobile numbers.
+            sms_content (str): Content of SMS.
+            college_id (str | None): An unique identifier of college.
+
+        Returns:
+            list: A list which contains SMS content of every number.
+        """
+        if not college_id or not re.search(r"{.*?}", sms_content or ""):
+            return [sms_content for _ in send_to]
+        numbers = [str(number) for number in send_to]
+        students = {
+            str(student.get("basic_details", {}).get("mobile_number")): student
+            for student in DatabaseConfigurationSync().studentsPrimaryDetails.find(
+                {"basic_details.mobile_number": {"$in": numbers}},
+                {"user_name": 1, "basic_details.mobile_number": 1},
+            )
+        }
+        email_activity_obj = EmailActivity()
+        contents = []
+        for number in numbers:
+            content = sms_content
+            if student := students.get(number):
+                content = email_activity_obj.detect_and_validate_variables(
+                    sms_content, ObjectId(college_id), student.get("user_name")
+                )
+            contents.append(content)
+        return contents
+
+    async def send_sms_to_many_async(
+            self, send_to, dlt_content_id, sms_content, sms_type,
+            sender_name, mobile_prefix=None, college_id=None):
+        """
+        Send the SMS to many numbers. Numbers having the same content are
+        sent in one provider request through `SMSDispatcher`.
+
+        Returns:
+            SMSBatchResponse: Combined response of provider requests,
+                `submitResponses` are in the order of numbers.
+        """
         if sms_type.lower() == "service implicit":
             user_name = settings.sms_username_trans
         elif sms_type.lower() == "service explicit":
@@ -263,40 +244,28 @@ class SMSHelper:
             user_name = settings.sms_username_pro
         if mobile_prefix is None:
             mobile_prefix = settings.sms_send_to_prefix
-        number_list, response, contents = [], {}, []
-        for number in send_to:
-            number = str(number)
-            number_list.append({"mobile": mobile_prefix + number})
+        contents = self.get_sms_contents(send_to, sms_content, college_id)
+        dispatcher = SMSDispatcher(
+            credentials={"password": settings.sms_password, "user": user_name},
+            dlt_content_id=dlt_content_id,
+            sender_name=sender_name,
+        )
+        return await dispatcher.dispatch(
+            [
+                (mobile_prefix + str(number), content)
+                for number, content in zip(send_to, contents)
+            ]
+        )
 
-            email_activity_obj = EmailActivity()
-            student = (DatabaseConfigurationSync().studentsPrimaryDetails.find_one(
-                {"basic_details.mobile_number": number}))
-            content = sms_content
-            if student:
-                content = email_activity_obj.detect_and_validate_variables(
-                    sms_content, ObjectId(college_id), student.get("user_name")
-                )
-            contents.append(content)
-        for number_info, content in zip(number_list, contents):
-            payload = json.dumps(
-                {
-                    "options": {
-                        "dltContentId": dlt_content_id},
-                    "credentials": {
-                        "password": settings.sms_password,
-                        "user": user_name,
-                    },
-                    "recpients": [number_info],
-                    "messageText": content,
-                    "from": sender_name,
-                    "unicode": "True",
-                }
-            )
-            headers = {"Content-Type": "application/json",
-                       "Accept": "application/json"}
-            response = requests.request("POST", url,
-                                        headers=headers, data=payload)
-        return response
+    def send_sms_to_many(self, send_to, dlt_content_id, sms_content, sms_type,
+                         sender_name, mobile_prefix=None, college_id=None):
+        """
+        Send the SMS to many numbers, used where event loop is not running
+        e.g., celery task.
+        """
+        return asyncio.run(self.send_sms_to_many_async(
+            send_to, dlt_content_id, sms_content, sms_type, sender_name,
+            mobile_prefix=mobile_prefix, college_id=college_id))
 
 
 smshelper_obj = SMSHelper()
@@ -0,0 +1,235 @@
+"""
+This file contains class and functions related to dispatch the SMS in
+batches.
+"""
+
+import asyncio
+import bisect
+import json
+import time
+
+import httpx
+
+from app.core.log_config import get_logger
+from app.helpers.whatsapp_sms_activity.whatsapp_dispatch import (
+    RETRY_ERRORS, RETRY_STATUS_CODES)
+
+logger = get_logger(name=__name__)
+
+SMS_ONE_TO_MANY_URL = "https://api.oot.bz/api/v1/one2Many"
+# Maximum number of recipients in one provider request.
+RECIPIENT_BATCH_SIZE = 500
+MAX_CONCURRENCY = 10
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+REQUEST_TIMEOUT = 30
+# Upper bounds (in seconds) of provider latency histogram buckets.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class SMSDispatchMetrics:
+    """
+    Throughput and provider latency of a SMS dispatch.
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.sent = 0
+        self.failed = 0
+        self.requests = 0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, latency: float, recipients: int, success: bool) -> None:
+        """
+        Record a provider request.
+
+        Params:
+            latency (float): Time taken by provider request in seconds.
+            recipients (int): Number of recipients in the request.
+            success (bool): True when request succeeded.
+        """
+        self.requests += 1
+        self.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        if success:
+            self.sent += recipients
+        else:
+            self.failed += recipients
+
+    def summary(self) -> dict:
+        """
+        Get the summary of dispatch.
+
+        Returns:
+            dict: A dictionary which contains summary of dispatch.
+                e.g., {"sent": 1000, "failed": 0, "requests": 2,
+                "sent_per_second": 850.5, "latency_histogram": {...}}
+        """
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        labels = [f"<={bucket}s" for bucket in LATENCY_BUCKETS] + [
+            f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "requests": self.requests,
+            "sent_per_second": round(self.sent / elapsed, 2),
+            "latency_histogram": dict(zip(labels, self.latency_histogram)),
+        }
+
+
+class SMSBatchResponse:
+    """
+    Combined response of the provider requests of a SMS dispatch. Submit
+    responses are in the order of recipients, hence it can be used same as
+    response of a single provider request.
+    """
+
+    def __init__(self, status_code: int, data: dict):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self) -> dict:
+        """
+        Get the combined response data.
+        """
+        return self._data
+
+
+class SMSDispatcher:
+    """
+    Send the SMS to the provider in batches.
+
+    Recipients having the same message are sent in one provider request
+    (up to `RECIPIENT_BATCH_SIZE` recipients), requests are sent
+    concurrently (bounded by `MAX_CONCURRENCY`) over a pooled client with
+    retry and backoff.
+
+    Usage:
+        dispatcher = SMSDispatcher(credentials, dlt_content_id, sender_name)
+        response = await dispatcher.dispatch([("919876543210", "Hello")])
+    """
+
+    def __init__(
+            self,
+            credentials: dict,
+            dlt_content_id: str,
+            sender_name: str,
+            max_concurrency: int = MAX_CONCURRENCY,
+    ):
+        self.credentials = credentials
+        self.dlt_content_id = dlt_content_id
+        self.sender_name = sender_name
+        self.metrics = SMSDispatchMetrics()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def pack(self, messages: list) -> list:
+        """
+        Group the recipients having the same message into batches.
+
+        Params:
+            messages (list): A list which contains tuple of mobile number
+                (with prefix) and its message.
+
+        Returns:
+            list: A list which contains tuple of message and list of
+                (position of recipient, mobile number).
+        """
+        groups = {}
+        for position, (mobile_number, content) in enumerate(messages):
+            groups.setdefault(content, []).append((position, mobile_number))
+        return [
+            (content, recipients[index: index + RECIPIENT_BATCH_SIZE])
+            for content, recipients in groups.items()
+            for index in range(0, len(recipients), RECIPIENT_BATCH_SIZE)
+        ]
+
+    async def _send(
+            self, client: httpx.AsyncClient, content: str, recipients: list
+    ) -> httpx.Response:
+        """
+        Send a batch to provider with retry and backoff.
+        """
+        payload = json.dumps(
+            {
+                "options": {"dltContentId": self.dlt_content_id},
+                "credentials": self.credentials,
+                "recpients": [
+                    {"mobile": mobile_number} for _, mobile_number in recipients
+                ],
+                "messageText": content,
+                "from": self.sender_name,
+                "unicode": "True",
+            }
+        )
+        async with self._semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                started_at = time.monotonic()
+                try:
+                    response = await client.post(
+                        SMS_ONE_TO_MANY_URL,
+                        content=payload,
+                        headers={"Content-Type": "application/json",
+                                 "Accept": "application/json"},
+                    )
+                except httpx.RequestError as error:
+                    if (not isinstance(error, RETRY_ERRORS)
+                            or attempt == MAX_RETRIES):
+                        self.metrics.observe(
+                            time.monotonic() - started_at, len(recipients),
+                            success=False)
+                        raise
+                    logger.warning(f"SMS request failed, retrying. "
+                                   f"Error - {error}")
+                else:
+                    if (response.status_code not in RETRY_STATUS_CODES
+                            or attempt == MAX_RETRIES):
+                        self.metrics.observe(
+                            time.monotonic() - started_at, len(recipients),
+                            success=response.status_code == 200)
+                        return response
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+    async def dispatch(self, messages: list) -> SMSBatchResponse:
+        """
+        Pack and send the messages to provider.
+
+        Params:
+            messages (list): A list which contains tuple of mobile number
+                (with prefix) and its message.
+
+        Returns:
+            SMSBatchResponse: Combined response of provider requests,
+                `submitResponses` are in the order of messages.
+        """
+        packed = self.pack(messages)
+        async with httpx.AsyncClient(
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(max_connections=MAX_CONCURRENCY),
+        ) as client:
+            responses = await asyncio.gather(
+                *[self._send(client, content, recipients)
+                  for content, recipients in packed],
+                return_exceptions=True,
+            )
+        status_code, data = 200, {}
+        submit_responses = [{} for _ in messages]
+        for response, (_, recipients) in zip(responses, packed):
+            if isinstance(response, BaseException):
+                logger.error(f"Failed to send SMS to {len(recipients)} "
+                             f"numbers. Error - {response}")
+                status_code = 503
+                continue
+            if response.status_code != 200:
+                status_code = response.status_code
+            try:
+                response_data = response.json()
+            except ValueError:
+                response_data = {}
+            for key, value in response_data.items():
+                if key != "submitResponses":
+                    data.setdefault(key, value)
+            for (position, _), submit_response in zip(
+                    recipients, response_data.get("submitResponses", [])):
+                submit_responses[position] = submit_response
+        data["submitResponses"] = submit_responses
+        logger.info(f"SMS dispatch summary: {self.metrics.summary()}")
+        return SMSBatchResponse(status_code, data)
@@ -19,6 +19,7 @@ from app.helpers.student_curd.student_application_configuration import (
 from app.helpers.student_curd.student_user_crud_configuration import (
     StudentUserCrudHelper,
 )
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 from app.models.serialize import StudentCourse
 from app.models.student_serialize import BoardHelper
 
@@ -285,11 +286,14 @@ class StudentHelper:
                     "specs", [{}])[0].update({"spec_name": main})
                 data1["basic_details"].update(basic_detail)
                 data1["user_name"] = basic_detail.get("email", data1.get("user_name"))
+                search_fields = SearchKeyHelper().for_student(data1)
+                data1.update(search_fields)
                 updated_student = (
                     await DatabaseConfiguration().studentsPrimaryDetails.update_one(
                         {"_id": ObjectId(_id)}, {"$set": data1}
                     )
                 )
+                await SearchKeyHelper().update_applications(_id, search_fields)
                 if updated_student:
                     await StudentApplicationHelper().update_stage(
                         _id, course_name, 2.50, main, college_id=college_id
@@ -21,7 +21,9 @@ from app.database.configuration import DatabaseConfiguration
 from app.database.database_sync import DatabaseConfigurationSync
 from app.database.motor_base_singleton import MotorBaseSingleton
 from app.dependencies.hashing import Hash
+from app.helpers.campaign.campaign_analytics import CampaignAnalytics
 from app.helpers.counselor_deshboard.counselor import CounselorDashboardHelper
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 from app.helpers.user_curd.user_configuration import UserHelper
 from app.models.serialize import StudentCourse
 
@@ -282,11 +284,15 @@ class StudentUserCrudHelper:
                     student["address_details"]["communication_address"].update(address)
                     data["address_details"] = student["address_details"]
                 data["user_name"] = user.get("email", student.get("user_name"))
+                search_fields = SearchKeyHelper().for_student(data)
+                data.update(search_fields)
                 updated_student = (
                     await DatabaseConfiguration().studentsPrimaryDetails.update_one(
                         {"_id": student.get("_id")}, {"$set": data}
                     )
                 )
+                await SearchKeyHelper().update_applications(
+                    student.get("_id"), search_fields)
                 if updated_student.modified_count == 1:
                     if (
                         updated_student := await DatabaseConfiguration().studentsPrimaryDetails.find_one(
@@ -664,6 +670,7 @@ class StudentUserCrudHelper:
                 {"_id": ObjectId(_id)}
             )
             data["source"] = student.get("source")
+            data.update(SearchKeyHelper().for_student(student))
             if application_id is not None:
                 data["_id"] = ObjectId(application_id)
             if (
@@ -673,6 +680,7 @@ class StudentUserCrudHelper:
             ) is not None:
                 app_id = check.inserted_id
                 new_app_create = True
+                await CampaignAnalytics().bump_version(data.get("college_id"))
         data1 = dict()
         data = {
             find_course["course_name"]: {
@@ -913,6 +921,7 @@ class StudentUserCrudHelper:
         Check duplicate key error at the time of student register
         """
         check = None
+        data.update(SearchKeyHelper().for_student(data))
         try:
             check = await DatabaseConfiguration().studentsPrimaryDetails.insert_one(
                 data
@@ -920,6 +929,7 @@ class StudentUserCrudHelper:
 
             # For billing Dashboard
             if check and check.inserted_id:
+                await CampaignAnalytics().bump_version(data.get("college_id"))
                 selected_college_id = MotorBaseSingleton.get_instance().master_data.get("client_id")
                 await DatabaseConfiguration().college_collection.update_one(
                     {"_id": ObjectId(selected_college_id)}, {"$inc": {"usages.lead_registered": 1}}
@@ -1530,6 +1540,7 @@ class StudentUserCrudHelper:
                     "created_at": datetime.utcnow(),
                     "dv_status": "To be verified"
                 }
+                data.update(SearchKeyHelper().for_student(data))
 
                 # insert data in database
                 if (
@@ -1540,6 +1551,7 @@ class StudentUserCrudHelper:
                     await DatabaseConfiguration().college_collection.update_one(
                         {"_id": ObjectId(college_id)}, {"$inc": {"usages.lead_registered": 1}}
                     )
+                    await CampaignAnalytics().bump_version(college_id)
 
                     social = {
                         "utm_source": "Organic",
@@ -0,0 +1,335 @@
+"""
+This file contains class and functions related to the search keys of
+student, application and raw data documents.
+"""
+
+import re
+import unicodedata
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.database.configuration import DatabaseConfiguration
+
+# Length of the name n-grams stored in the search keys, name prefixes
+# shorter than the n-gram are stored as it is.
+NGRAM_LENGTH = 3
+MOBILE_NUMBER_LENGTH = 10
+
+
+class SearchKeyHelper:
+    """
+    Build and query the normalized search keys of a document.
+
+    Search keys are stored on the document with below structure and
+    maintained on write:
+        {"search_keys": ["r", "ra", "rah", "ahu", "hul", ...],
+         "search_email": "rahul@example.com",
+         "search_mobile": "9876543210"}
+
+    `search_keys` contains the lowercased name prefixes (shorter than
+    `NGRAM_LENGTH`) and the name n-grams, hence a name term is searched with
+    an exact (indexed) match of its keys instead of an unanchored regex.
+    Email and mobile number are searched with anchored prefix match.
+    """
+
+    def normalize(self, text) -> str:
+        """
+        Get the normalized form of text, i.e., lowercased text without
+        accents and special characters.
+
+        Params:
+            text: Text which need to normalize.
+
+        Returns:
+            str: Normalized text. e.g., "rahul kumar"
+        """
+        if text in ["", None]:
+            return ""
+        text = unicodedata.normalize("NFKD", str(text))
+        text = "".join(char for char in text if not unicodedata.combining(char))
+        return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+    def get_term_keys(self, term: str) -> list:
+        """
+        Get the keys of a normalized term (word).
+
+        Params:
+            term (str): A normalized term. e.g., "rahul"
+
+        Returns:
+            list: Keys of the term. e.g., ["rah", "ahu", "hul"]
+        """
+        if len(term) < NGRAM_LENGTH:
+            return [term]
+        return [
+            term[index: index + NGRAM_LENGTH]
+            for index in range(len(term) - NGRAM_LENGTH + 1)
+        ]
+
+    def get_name_keys(self, *names) -> list:
+        """
+        Get the search keys of names, i.e., prefixes and n-grams of every
+        word of names.
+
+        Params:
+            names: Names of a student. e.g., "Rahul", "", "Kumar"
+
+        Returns:
+            list: Search keys of the names.
+        """
+        keys = set()
+        for name in names:
+            for term in self.normalize(name).split():
+                keys.update(term[:length] for length in range(1, NGRAM_LENGTH))
+                keys.update(self.get_term_keys(term))
+        return sorted(keys)
+
+    def canonical_email(self, email) -> str:
+        """
+        Get the canonical form of email. e.g., "rahul@example.com"
+        """
+        return str(email or "").strip().lower()
+
+    def canonical_mobile(self, mobile_number) -> str:
+        """
+        Get the canonical form of mobile number, i.e., last 10 digits of
+        mobile number. e.g., "9876543210"
+        """
+        return re.sub(r"\D", "", str(mobile_number or ""))[-MOBILE_NUMBER_LENGTH:]
+
+    def build(
+            self, names: list, email=None, mobile_number=None
+    ) -> dict:
+        """
+        Build the search fields of a document.
+
+        Params:
+            names (list): A list which contains names.
+                e.g., ["Rahul", "", "Kumar"]
+            email (str | None): Email of the student.
+            mobile_number (str | int | None): Mobile number of the student.
+
+        Returns:
+            dict: A dictionary which contains search fields.
+        """
+        return {
+            "search_keys": self.get_name_keys(*names),
+            "search_email": self.canonical_email(email),
+            "search_mobile": self.canonical_mobile(mobile_number),
+        }
+
+    def for_student(self, student: dict) -> dict:
+        """
+        Build the search fields of student primary details (also used for
+        application of the student).
+
+        Params:
+            student (dict): A dictionary which contains student primary
+                details, should contain `basic_details` and `user_name`.
+
+        Returns:
+            dict: A dictionary which contains search fields.
+        """
+        basic_details = student.get("basic_details") or {}
+        return self.build(
+            [
+                basic_details.get("first_name"),
+                basic_details.get("middle_name"),
+                basic_details.get("last_name"),
+            ],
+            email=student.get("user_name") or basic_details.get("email"),
+            mobile_number=basic_details.get("mobile_number"),
+        )
+
+    def for_raw_data(self, raw_data: dict) -> dict:
+        """
+        Build the search fields of a raw data document.
+
+        Params:
+            raw_data (dict): A dictionary which contains raw data details.
+
+        Returns:
+            dict: A dictionary which contains search fields.
+        """
+        other_field = raw_data.get("other_field") or {}
+        mandatory_field = raw_data.get("mandatory_field") or {}
+        return self.build(
+            [
+                other_field.get("full_name") or other_field.get("name"),
+                other_field.get("first_name"),
+                other_field.get("last_name"),
+            ],
+            email=mandatory_field.get("email"),
+            mobile_number=mandatory_field.get("mobile_number"),
+        )
+
+    def get_search_query(self, search: str | None, prefix: str = "") -> dict:
+        """
+        Get the query for search a term in the search fields. Every word of
+        term should match the name keys or term should be a prefix of
+        email/mobile number.
+
+        Params:
+            search (str | None): A term which want to search.
+                e.g., "rahul", "rahul@exa", "98765"
+            prefix (str): Prefix of search fields when fields are nested
+                e.g., "student_primary."
+
+        Returns:
+            dict: A query for search. Empty dictionary when search term is
+                empty.
+        """
+        search = str(search or "").strip()
+        if not search:
+            return {}
+        conditions = []
+        if terms := self.normalize(search).split():
+            name_keys = {key for term in terms for key in self.get_term_keys(term)}
+            conditions.append(
+                {f"{prefix}search_keys": {"$all": sorted(name_keys)}}
+            )
+        if email := self.canonical_email(search):
+            conditions.append(
+                {f"{prefix}search_email": {"$regex": f"^{re.escape(email)}"}}
+            )
+        if re.fullmatch(r"[\d\s+\-()]+", search):
+            conditions.extend(
+                {f"{prefix}search_mobile": {"$regex": f"^{mobile_number}"}}
+                for mobile_number in self.get_mobile_prefixes(search)
+            )
+        return {"$or": conditions}
+
+    def get_mobile_prefixes(self, search: str) -> list:
+        """
+        Get the prefixes of stored (canonical) mobile number which can match
+        a mobile number search term, country code (e.g., "+91 98765",
+        "0091-98765") or trunk prefix (e.g., "098765") of term is removed.
+
+        Params:
+            search (str): A mobile number search term. e.g., "+91 98765"
+
+        Returns:
+            list: Prefixes of canonical mobile number. e.g., ["98765"]
+        """
+        digits = re.sub(r"\D", "", search)
+        if len(digits) >= MOBILE_NUMBER_LENGTH:
+            return [digits[-MOBILE_NUMBER_LENGTH:]]
+        if code_match := re.fullmatch(
+                r"\s*(?:\+|00)\(?\d{1,3}\)?[\s\-]+(.*)", search):
+            digits = re.sub(r"\D", "", code_match.group(1))
+            return [digits] if digits else []
+        prefixes = [digits] if digits else []
+        if search.strip().startswith(("+", "00")):
+            # Length of country code is not known when term has no separator
+            code_digits = digits[2:] if search.strip().startswith("00") else digits
+            prefixes = [code_digits[length:] for length in range(1, 4)
+                        if code_digits[length:]]
+        elif digits.startswith("0") and digits.lstrip("0"):
+            prefixes.append(digits.lstrip("0"))
+        return prefixes
+
+    async def update_student(self, student_id) -> dict:
+        """
+        Re-compute the search fields of a student and its applications, called
+        when name, email or mobile number of student is changed.
+
+        Params:
+            student_id (str | ObjectId): An unique identifier of student.
+
+        Returns:
+            dict: A dictionary which contains search fields. Empty dictionary
+                when student not found.
+        """
+        student_id = ObjectId(str(student_id))
+        student = await DatabaseConfiguration().studentsPrimaryDetails.find_one(
+            {"_id": student_id}, {"basic_details": 1, "user_name": 1})
+        if not student:
+            return {}
+        search_fields = self.for_student(student)
+        await DatabaseConfiguration().studentsPrimaryDetails.update_one(
+            {"_id": student_id}, {"$set": search_fields})
+        await self.update_applications(student_id, search_fields)
+        return search_fields
+
+    async def update_applications(self, student_id, search_fields: dict) -> None:
+        """
+        Store the search fields of a student in its applications.
+
+        Params:
+            student_id (str | ObjectId): An unique identifier of student.
+            search_fields (dict): A dictionary which contains search fields
+                of student.
+        """
+        await DatabaseConfiguration().studentApplicationForms.update_many(
+            {"student_id": ObjectId(str(student_id))}, {"$set": search_fields})
+
+    async def backfill(
+            self, collection, build_function, batch_size: int = 1000
+    ) -> int:
+        """
+        Store the search fields in the documents of collection which don't
+        have search fields yet.
+
+        Params:
+            collection: A collection in which want to store search fields.
+            build_function: A function which build the search fields of a
+                document. e.g., SearchKeyHelper().for_student
+            batch_size (int): Maximum number of documents to update.
+
+        Returns:
+            int: Number of documents updated.
+        """
+        operations = [
+            UpdateOne({"_id": document.get("_id")},
+                      {"$set": build_function(document)})
+            async for document in collection.find(
+                {"search_keys": {"$exists": False}},
+                {
+                    "basic_details": 1,
+                    "user_name": 1,
+                    "other_field": 1,
+                    "mandatory_field": 1,
+                },
+            ).limit(batch_size)
+        ]
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    async def backfill_applications(self, batch_size: int = 1000) -> int:
+        """
+        Store the search fields (of student) in the applications which don't
+        have search fields yet.
+
+        Params:
+            batch_size (int): Maximum number of applications to update.
+
+        Returns:
+            int: Number of applications updated.
+        """
+        applications = await DatabaseConfiguration().studentApplicationForms.find(
+            {"search_keys": {"$exists": False}}, {"student_id": 1}
+        ).limit(batch_size).to_list(None)
+        if not applications:
+            return 0
+        students = {
+            student.get("_id"): student
+            async for student in DatabaseConfiguration().studentsPrimaryDetails.find(
+                {"_id": {"$in": list({
+                    application.get("student_id")
+                    for application in applications})}},
+                {"basic_details": 1, "user_name": 1},
+            )
+        }
+        operations = [
+            UpdateOne(
+                {"_id": application.get("_id")},
+                {"$set": self.for_student(
+                    students.get(application.get("student_id"), {}))},
+            )
+            for application in applications
+        ]
+        await DatabaseConfiguration().studentApplicationForms.bulk_write(
+            operations, ordered=False)
+        return len(operations)
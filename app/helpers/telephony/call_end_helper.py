@@ -3,7 +3,6 @@ This file contains class and functions related to call end popup dispose.
 """
 from app.database.configuration import DatabaseConfiguration
 from bson.objectid import ObjectId
-from app.helpers.telephony.telephony_webhook_helper import TelephonyWebhook
 from app.helpers.telephony.call_popup_websocket import manager
 
 class CallEndHelper:
@@ -37,7 +36,5 @@ class CallEndHelper:
 
         user_id = user.get("_id")
 
-        call_activity = await TelephonyWebhook().websocket_data(user_id)
-        await manager.publish_data_on_redis(f"{user_id}_telephony", call_activity)
-        # await manager.send_message(call_activity, user_id)
+        await manager.remove_live_call(user_id, str(call_end.get("call_id")))
         return {"message": "Call end and dispose successfully."}
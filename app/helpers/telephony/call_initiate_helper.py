@@ -6,7 +6,6 @@ from app.core.utils import settings, utility_obj
 from fastapi.exceptions import HTTPException
 from bson.objectid import ObjectId
 from app.helpers.telephony.telephony_webhook_helper import TelephonyWebhook
-from app.helpers.telephony.call_popup_websocket import manager
 from app.core.log_config import get_logger
 from datetime import datetime
 import httpx, json
@@ -112,8 +111,10 @@ class CallInitiateHelper:
             else:
                 await DatabaseConfiguration().call_activity_collection.insert_one(data)
 
-        call_activity = await TelephonyWebhook().websocket_data(user.get("_id"))
-        await manager.publish_data_on_redis(f"{user.get('_id')}_telephony", call_activity)
+        call_data = await DatabaseConfiguration().call_activity_collection.find_one({
+            "call_id": response_data.get("callid")
+        })
+        await TelephonyWebhook().update_live_call(str(user.get("_id")), call_data)
 
 
         return {"message": "Call initiate successfully."}
@@ -1,26 +1,30 @@
 """
 Telephony websocket connection
 """
-import asyncio
-import json, redis
-import random
-from typing import Dict, List
+import json
 
-import aio_pika
 from fastapi import WebSocket
 from app.core.log_config import get_logger
 from app.core.utils import utility_obj, settings
-from app.dependencies.oauth import get_redis_client, insert_data_in_cache, get_sync_redis_client
+from app.dependencies.oauth import get_redis_client
 from app.helpers.notification.real_time_configuration import Notification
-import threading
+from app.helpers.websocket_gateway import websocket_gateway
 
 
 logger = get_logger(name=__name__)
 
 
+# Live call state of a user is kept for below seconds after the last update
+LIVE_CALLS_TTL = 86400
+
+
 class ConnectionManager:
     """
     This class contains all related functions for telephony websocket connections
+
+    Live call state of every user is kept in a redis hash (call id to call
+    popup data). Full call activity is sent on connect, after that only the
+    changed/removed calls are pushed to the popup.
     """
 
     async def connect(self, websocket: WebSocket, college: dict) -> dict:
@@ -42,103 +46,132 @@ class ConnectionManager:
                 call_activity = await TelephonyWebhook().websocket_data(user.get("_id"))
 
                 await websocket.send_json({
-                        "data": call_activity
+                        "data": call_activity,
+                        "is_delta": False
                     })
-                await self.publish_data_on_redis(f"{user.get('_id')}_telephony", call_activity)
+                await self.set_live_calls(user.get("_id"), call_activity)
             return user
         except Exception as e:
             logger.error(f"Something want wrong in connection websocket - {e}")
 
+    def get_live_calls_key(self, user_id: str) -> str:
+        """Get the redis key of live call state of a user
+
+        Params:
+            user_id (str): Unique id of the user
+
+        Returns:
+            str: redis key of live call state. e.g., "dev/college/user_id_telephony_calls"
+        """
+        return f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/{user_id}_telephony_calls"
 
-    async def send_message(self, websocket, key):
-        """Send data to the browser from the websocket
+    async def set_live_calls(self, user_id: str, call_activity: list):
+        """Replace the live call state of a user
 
         Params:
-            websocket: Websocket details
-            key: cache data unique key
+            user_id (str): Unique id of the user
+            call_activity (list): list of calls popup data
         """
+        r = get_redis_client()
+        if not r:
+            return
         try:
-            r = get_redis_client()
-            data = await r.get(key)
-            data = json.loads(data)
-            await websocket.send_json({
-                "data": data
-            })
+            key = self.get_live_calls_key(user_id)
+            async with r.pipeline() as pipe:
+                pipe.delete(key)
+                if call_activity:
+                    pipe.hset(key, mapping={
+                        call.get("call_id"): json.dumps(call) for call in call_activity
+                    })
+                    pipe.expire(key, LIVE_CALLS_TTL)
+                await pipe.execute()
         except Exception as e:
-            logger.error("Message could not be sent by websocket")
-
-    def run_async_function_telephony(self, websocket, key):
-        """
-            create a loop to run async function in thread
+            logger.error(f"While storing live calls in cache got error: {e}")
 
-            Params:
-                - websocket_con (obj): The websocket connection object to perform websocket operations
-                - key: cache data unique key
+    async def get_live_call(self, user_id: str, call_id: str) -> dict | None:
+        """Get a call from the live call state of a user
 
-            Returns:
-                None
+        Params:
+            user_id (str): Unique id of the user
+            call_id (str): Unique id of the call activity
 
-            Raises:
-                - Exception: An error occurred when something wrong happen in the code.
+        Returns:
+            dict | None: call popup data, None when call is not in the state
         """
+        r = get_redis_client()
+        if not r:
+            return None
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(self.send_message(websocket, key))
-            else:
-                loop.run_until_complete(self.send_message(websocket, key))
-        except Exception as error:
-            logger.error(f"An error occurred while creating loop to call async telephony popup: {error}")
+            call = await r.hget(self.get_live_calls_key(user_id), call_id)
+            return json.loads(call) if call else None
+        except Exception as e:
+            logger.error(f"While reading live call from cache got error: {e}")
+            return None
 
-    async def publish_data_on_redis(self, key: str, data: list):
-        """Function of publish data to the websocket
+    async def update_live_call(self, user_id: str, call: dict):
+        """Add/Update a call in the live call state of a user and push it to the
+        popup of user
 
         Params:
-            key (str): redis key
-            data (list): data list which is to be sent on websocket
+            user_id (str): Unique id of the user
+            call (dict): call popup data
         """
-        
-        try:
-            key = f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/{key}"
-            call_activity = json.dumps(data)
-            r = get_sync_redis_client()
+        r = get_redis_client()
+        if r:
             try:
-                with r.pipeline() as pipe:
-                    while True:
-                        try:
-                            pipe.watch(key)
-                            pipe.multi()
-                            if pipe.set(key, call_activity):
-                                pipe.expire(key, (300 + random.randint(0, 300)))
-                            pipe.execute()
-                            break
-                        except redis.WatchError as e:
-                            logger.error(f"While storing telephony data in cache got error: {e}")
-                            break
-                        except redis.TimeoutError as e:
-                            logger.error(f"Timeout while storing telephony data in cache: {e}")
-                            break
-                        except Exception as e:
-                            logger.error(f"Some telephony internal error occurred: {e}")
-                            break
-                connection = await utility_obj.get_rabbitMQ_connection_channel()
-                async with connection:
-                    channel = await connection.channel()
-                    message_body = "Data published"
-                    exchange = await channel.declare_exchange(key, aio_pika.ExchangeType.FANOUT, durable=True)
-                    await exchange.publish(
-                        aio_pika.Message(body=message_body.encode()),
-                        routing_key=""
-                    )
-                    await channel.close()
-                await connection.close()
-            except Exception as error:
-                logger.error(f"An error occurred while storing the data in redis: {error} ")
+                key = self.get_live_calls_key(user_id)
+                async with r.pipeline() as pipe:
+                    pipe.hset(key, call.get("call_id"), json.dumps(call))
+                    pipe.expire(key, LIVE_CALLS_TTL)
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"While storing live call in cache got error: {e}")
+        await self.publish_call_activity(f"{user_id}_telephony", {"data": [call], "removed": []})
+
+    async def remove_live_call(self, user_id: str, call_id: str):
+        """Remove a call from the live call state of a user and from the popup
+        of user
+
+        Params:
+            user_id (str): Unique id of the user
+            call_id (str): Unique id of the call activity
+        """
+        r = get_redis_client()
+        if r:
+            try:
+                await r.hdel(self.get_live_calls_key(user_id), call_id)
+            except Exception as e:
+                logger.error(f"While removing live call from cache got error: {e}")
+        await self.publish_call_activity(f"{user_id}_telephony", {"data": [], "removed": [call_id]})
+
+    async def send_call_activity(self, websocket: WebSocket, delta: dict):
+        """Send the changed calls to the browser from the websocket
+
+        Params:
+            websocket (WebSocket): websocket instance
+            delta (dict): changed calls and ids of removed calls which
+                published for the user. e.g., {"data": [...], "removed": ["call_id"]}
+        """
+        await websocket.send_json({
+            "data": delta.get("data", []),
+            "removed": delta.get("removed", []),
+            "is_delta": True
+        })
 
+    async def publish_call_activity(self, key: str, delta: dict):
+        """Function of publish changed calls to the websockets of user
 
+        Params:
+            key (str): unique key of user events. e.g., "user_id_telephony"
+            delta (dict): changed calls and ids of removed calls
+        """
+        try:
+            await websocket_gateway.publish(
+                f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/{key}",
+                delta
+            )
         except Exception as e:
             logger.error(f"Publish data error - {e}")
 
 
-
 manager = ConnectionManager()
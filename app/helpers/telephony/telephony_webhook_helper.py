@@ -36,6 +36,88 @@ class TelephonyWebhook:
         }
     
 
+    async def get_application_list(self, student_id: ObjectId | None) -> list:
+        """Get the applications of a student which shown in the call popup
+
+        Params:
+            student_id (ObjectId | None): Unique id of the student
+
+        Returns:
+            list: list of serialized applications of the student
+        """
+        applications = DatabaseConfiguration().studentsPrimaryDetails.aggregate([
+            {
+                '$match': {
+                    '_id': student_id
+                }
+            }, {
+                '$lookup': {
+                    'from': 'studentApplicationForms', 
+                    'localField': '_id', 
+                    'foreignField': 'student_id', 
+                    'as': 'applications'
+                }
+            }, {
+                '$unwind': '$applications'
+            }, {
+                '$lookup': {
+                    'from': 'courses', 
+                    'localField': 'applications.course_id', 
+                    'foreignField': '_id', 
+                    'as': 'courses'
+                }
+            }, {
+                '$unwind': '$courses'
+            }, {
+                '$group': {
+                    '_id': '$applications._id', 
+                    'application_id': {
+                        '$first': '$applications.custom_application_id'
+                    }, 
+                    'course_name': {
+                        '$first': '$courses.course_name'
+                    }, 
+                    'spec_name': {
+                        '$first': '$applications.spec_name1'
+                    }
+                }
+            }
+        ])
+        return [await self.application_details_helper(application) for application in await applications.to_list(None)]
+
+
+    async def call_popup_data(self, call: dict, application_list: list | None = None) -> dict:
+        """Serialize a call which has to be send to the frontend
+
+        Params:
+            call (dict): Call activity document
+            application_list (list | None): Applications of the student, fetched
+                from the database when not given
+
+        Returns:
+            dict: call popup data
+        """
+        if call.get("type") == "Outbound":
+            student_id, prefix, calling_status = call.get("call_to"), "call_to", "Originate"
+        else:
+            student_id, prefix, calling_status = call.get("call_from"), "call_from", "CONNECTING"
+        if application_list is None:
+            application_list = await self.get_application_list(student_id)
+        return {
+            "call_id": str(call.get("_id")),
+            "student_id": str(student_id) if student_id else None,
+            "student_phone": call.get(f"{prefix}_number"),
+            "student_name": call.get(f"{prefix}_name") if call.get(f"{prefix}_name", "") else "Unknown",
+            "call_type": call.get("type"),
+            "is_student_exist": True if student_id else False,
+            "is_call_end": False if call.get("status") == calling_status else True,
+            "call_initiate_time": utility_obj.get_local_time(call.get("starttime")),
+            "call_end_time": utility_obj.get_local_time(call.get("endtime")),
+            "duration": call.get("duration") if call.get("duration") else 0,
+            "application_list": application_list
+        }
+
+
     async def websocket_data(self, call_from: str|None) -> list:
         """Searilize websocket data which has to be send to the frontend
 
@@ -45,109 +127,59 @@ class TelephonyWebhook:
         Returns:
             list: list of calls popup data
         """
-        calls = []
-        if call_from:
-            calls = DatabaseConfiguration().call_activity_collection.aggregate([
-                {
-                    '$match': {
-                        "$or": [
-                            {
-                                "call_from": ObjectId(call_from)
-                            },
-                            {
-                                "call_to": ObjectId(call_from)
-                            }
-                        ],
-                        'show_popup': True
-                    }
-                }
-            ])
-
         call_activity = []
+        if not call_from:
+            return call_activity
 
-        async for call in calls:
-            pipeline = []
-            if call.get("type") == "Outbound":
-                pipeline.append({
-                    '$match': {
-                        '_id': call.get("call_to")
-                    }
-                })
-            else:
-                pipeline.append({
-                    "$match": {
-                        "_id": call.get("call_from")
-                    }
-                })
-
-            pipeline.extend([
-                {
-                    '$lookup': {
-                        'from': 'studentApplicationForms', 
-                        'localField': '_id', 
-                        'foreignField': 'student_id', 
-                        'as': 'applications'
-                    }
-                }, {
-                    '$unwind': '$applications'
-                }, {
-                    '$lookup': {
-                        'from': 'courses', 
-                        'localField': 'applications.course_id', 
-                        'foreignField': '_id', 
-                        'as': 'courses'
-                    }
-                }, {
-                    '$unwind': '$courses'
-                }, {
-                    '$group': {
-                        '_id': '$applications._id', 
-                        'application_id': {
-                            '$first': '$applications.custom_application_id'
-                        }, 
-                        'course_name': {
-                            '$first': '$courses.course_name'
-                        }, 
-                        'spec_name': {
-                            '$first': '$applications.spec_name1'
+        calls = DatabaseConfiguration().call_activity_collection.aggregate([
+            {
+                '$match': {
+                    "$or": [
+                        {
+                            "call_from": ObjectId(call_from)
+                        },
+                        {
+                            "call_to": ObjectId(call_from)
                         }
-                    }
+                    ],
+                    'show_popup': True
                 }
-            ])
-            applications = DatabaseConfiguration().studentsPrimaryDetails.aggregate(pipeline)
-            if call.get("type") == "Outbound":
-                data = {
-                    "call_id": str(call.get("_id")),
-                    "student_id": str(call.get("call_to")) if call.get("call_to") else None,
-                    "student_phone": call.get("call_to_number"),
-                    "student_name": call.get("call_to_name") if call.get("call_to_name", "") else "Unknown",
-                    "call_type": call.get("type"),
-                    "is_student_exist": True if call.get("call_to") else False,
-                    "is_call_end": False if call.get("status") == "Originate" else True,
-                    "call_initiate_time": utility_obj.get_local_time(call.get("starttime")),
-                    "call_end_time": utility_obj.get_local_time(call.get("endtime")),
-                    "duration": call.get("duration") if call.get("duration") else 0,
-                    "application_list": [await self.application_details_helper(application) for application in await applications.to_list(None)]
-                }
-            else:
-                data = {
-                    "call_id": str(call.get("_id")),
-                    "student_id": str(call.get("call_from")) if call.get("call_from") else None,
-                    "student_phone": call.get("call_from_number"),
-                    "student_name": call.get("call_from_name") if call.get("call_from_name", "") else "Unknown",
-                    "call_type": call.get("type"),
-                    "is_student_exist": True if call.get("call_from") else False,
-                    "is_call_end": False if call.get("status") == "CONNECTING" else True,
-                    "call_initiate_time": utility_obj.get_local_time(call.get("starttime")),
-                    "call_end_time": utility_obj.get_local_time(call.get("endtime")),
-                    "duration": call.get("duration") if call.get("duration") else 0,
-                    "application_list": [await self.application_details_helper(application) for application in await applications.to_list(None)]
-                }
-            call_activity.append(data)
+            }
+        ])
+
+        async for call in calls:
+            call_activity.append(await self.call_popup_data(call))
 
         return call_activity
 
 
+    async def update_live_call(self, user_id: str | None, call: dict) -> None:
+        """Patch a call in the live call state of user and push the change to
+        the call popup of user
+
+        Only the changed call is sent to the popup. Applications of the student
+        are taken from the live call state when call is already in it, hence
+        cost of a webhook does not depend on the number of calls of user.
+
+        Params:
+            user_id (str | None): Unique id of the counsellor of call
+            call (dict): Updated call activity document
+        """
+        if not user_id or not call:
+            return
+        call_id = str(call.get("_id"))
+        if not call.get("show_popup"):
+            await manager.remove_live_call(user_id, call_id)
+            return
+        live_call = await manager.get_live_call(user_id, call_id) or {}
+        application_list = None
+        if live_call and live_call.get("student_id") == (
+                str(call.get("call_to" if call.get("type") == "Outbound" else "call_from"))):
+            application_list = live_call.get("application_list")
+        await manager.update_live_call(
+            user_id, await self.call_popup_data(call, application_list))
+
+
     async def update_outbound_call_data(self, data: dict) -> dict:
         """Update telephony outbound call webhook data into database
 
@@ -207,11 +239,7 @@ class TelephonyWebhook:
             "call_id": data.get("callid")
         })
 
-        call_from = str(call_data.get("call_from"))
-
-        call_activity = await self.websocket_data(call_from)
-
-        await manager.publish_data_on_redis(f"{call_from}_telephony", call_activity)
+        await self.update_live_call(str(call_data.get("call_from")), call_data)
 
         return {"message": "Data saved successfully!!"}
 
@@ -318,8 +346,7 @@ class TelephonyWebhook:
         
         call_to = str(call_data.get("call_to")) if call_data.get("call_to") else None
 
-        call_activity = await self.websocket_data(call_to)
-        await manager.publish_data_on_redis(f"{call_to}_telephony", call_activity)
+        await self.update_live_call(call_to, call_data)
 
         return {"message": "Data saved successfully!!"}
 
@@ -1,9 +1,7 @@
-import asyncio
 import datetime
 import json
 from json import dumps
 
-import aio_pika
 import redis
 from bson import ObjectId
 from fastapi import HTTPException
@@ -16,6 +14,7 @@ from app.database.configuration import DatabaseConfiguration
 from app.database.database_sync import DatabaseConfigurationSync
 from app.dependencies.jwttoken import Authentication
 from app.dependencies.oauth import get_redis_client, get_sync_redis_client
+from app.helpers.websocket_gateway import websocket_gateway
 
 logger = get_logger(name=__name__)
 
@@ -231,16 +230,9 @@ class WebhookHelper:
                 "applications": application,
             }
             await self.update_data_in_redis(data, student_status)
-            connection = await utility_obj.get_rabbitMQ_connection_channel()
-            async with connection:
-                channel = await connection.channel()
-                key = f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/students_online"
-                message_body = "Data published"
-                exchange = await channel.declare_exchange(key, aio_pika.ExchangeType.FANOUT,
-                                                          durable=True)
-                await exchange.publish(aio_pika.Message(body=message_body.encode()), routing_key="")
-                await channel.close()
-            await connection.close()
+            await websocket_gateway.publish(
+                f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/students_online"
+            )
         except Exception as error:
             logger.error(
                 f"An error occurred while processing the student student_status update: {error}"
@@ -313,84 +305,6 @@ class WebhookHelper:
             logger.error(f"An error occurred while fetching students online: {error}")
             return []
 
-    async def get_notifications(self, user, websocket_con):
-        """
-        This returns all real time notifications
-        Params:
-            r : redis client to make redis operations
-            user : details of user
-        Returns:
-            None
-        Raises:
-            - Exception: An error occurred when something wrong happen in the code.
-        """
-        try:
-            r = get_sync_redis_client()
-            key = f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/{str(user.get('_id'))}_notifications"
-            notifications = r.lrange(key, 0, -1)
-            r.expire(key, 10)
-            for notification in notifications:
-                notification = json.loads(notification)
-                current_datetime = datetime.datetime.utcnow()
-                event_datetime = datetime.datetime.strptime(
-                    notification.get("event_datetime"), "%Y-%m-%d %H:%M:%S.%f"
-                )
-                hours = abs(
-                    int(
-                        (datetime.datetime.utcnow() - event_datetime).total_seconds()
-                        // 3600
-                    )
-                )
-                if utility_obj.local_time_for_compare(
-                    current_datetime.strftime("%d-%m-%Y %H:%M:%S")
-                ).strftime("%d-%m-%Y") == utility_obj.local_time_for_compare(
-                    current_datetime.strftime("%d-%m-%Y %H:%M:%S")
-                ).strftime(
-                    "%d-%m-%Y"
-                ):
-                    event_datetime = f"{hours} hours ago"
-                    category = "today"
-                else:
-                    yesterday = str(
-                        datetime.date.today() - datetime.timedelta(days=1)
-                    ).split(" ")
-                    days = abs(
-                        (
-                            utility_obj.local_time_for_compare(
-                                current_datetime.strftime("%d-%m-%Y %H:%M:%S")
-                            )
-                            - utility_obj.local_time_for_compare(
-                                event_datetime.strftime("%d-%m-%Y %H:%M:%S")
-                            )
-                        ).days
-                    )
-                    if yesterday[0] == utility_obj.local_time_for_compare(
-                        event_datetime.strftime("%d-%m-%Y %H:%M:%S")
-                    ).strftime("%Y-%m-%d"):
-                        if hours < 24:
-                            event_datetime = f"{hours} hours ago"
-                        else:
-                            event_datetime = f"{days} day ago"
-                        category = "yesterday"
-                    else:
-                        event_datetime = f"{days} days ago"
-                        category = "older"
-                temp_result = {
-                    "notification_id": notification.get("_id"),
-                    "event_type": notification.get("event_type"),
-                    "student_id": notification.get("student_id"),
-                    "application_id": notification.get("application_id"),
-                    "message": notification.get("message"),
-                    "mark_as_read": notification.get("mark_as_read"),
-                    "event_datetime": event_datetime,
-                    "category": category,
-                }
-                await websocket_con.send_text(dumps(temp_result))
-        except ConnectionError as e:
-            logger.error(f"Redis connection error: {e}")
-        except Exception as error:
-            logger.error(f"An error occurred while fetching students online: {error}")
-
     async def live_applicants(self, websocket_con, user):
         """
         Sends live applicants count via websocket.
@@ -412,71 +326,5 @@ class WebhookHelper:
         except Exception as error:
             logger.error(f"some exception while sending websocket.send_text: {error}")
 
-    def run_async_function_in_thread(self, websocket_con, user):
-        """
-        create a loop to run async function in thread
-
-        Params:
-            - websocket_con (obj): The websocket connection object to perform websocket operations
-            - user (dict): The user details dict
-
-        Returns:
-            None
-
-        Raises:
-            - Exception: An error occurred when something wrong happen in the code.
-        """
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(self.live_applicants(websocket_con, user))
-            else:
-                loop.run_until_complete(self.live_applicants(websocket_con, user))
-        except Exception as error:
-            logger.error(
-                f"An error occurred while creating loop to call async live applicants function: {error}"
-            )
-
-    async def live_notifications(self, websocket_con, user):
-        """
-        Sends live notifications via websocket
-        Params:
-            - websocket_con (obj): The websocket connection object to perform websocket operations
-            - user (dict): The details of user
-        Returns:
-            - None
-            - sends message to websocket
-        Raises:
-            - Exception: An error occurred when something wrong happen in the code.
-        """
-        await webhook_helper.get_notifications(
-            user=user, websocket_con=websocket_con
-        )
-
-    def run_async_thread_for_notifications(self, websocket_con, user):
-        """
-        create a loop to run async function in thread for notifications
-
-        Params:
-            - websocket_con (obj): The websocket connection object to perform websocket operations
-            - user (dict): The user details dict
-
-        Returns:
-            None
-
-        Raises:
-            - Exception: An error occurred when something wrong happen in the code.
-        """
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(self.live_notifications(websocket_con, user))
-            else:
-                loop.run_until_complete(self.live_notifications(websocket_con, user))
-        except Exception as error:
-            logger.error(
-                f"An error occurred while creating loop to call async notification function: {error}"
-            )
-
 
 webhook_helper = WebhookHelper()
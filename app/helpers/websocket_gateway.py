@@ -0,0 +1,235 @@
+"""
+This file contains class and functions related to deliver the real time
+events to the websocket connections of a worker.
+"""
+
+import asyncio
+import json
+
+import aio_pika
+from fastapi import WebSocket
+from starlette.websockets import WebSocketState
+
+from app.core.log_config import get_logger
+from app.core.utils import utility_obj, settings
+
+logger = get_logger(name=__name__)
+
+# Maximum number of events waiting to be sent on a websocket, oldest event
+# is dropped when a slow client has more events waiting.
+SEND_QUEUE_SIZE = 32
+
+
+class Subscription:
+    """
+    Subscription of a websocket to a key, events of the key are sent to the
+    websocket one by one by the sender task of subscription.
+    """
+
+    def __init__(self, key: str, websocket: WebSocket, handler):
+        """
+        Params:
+            key (str): Key of events. e.g., "dev/college/user_id_telephony"
+            websocket (WebSocket): Websocket connection of the client.
+            handler: An async function which sends an event to websocket,
+                called with websocket and payload of event.
+        """
+        self.key = key
+        self.websocket = websocket
+        self.handler = handler
+        self.dropped = 0
+        self._queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._send_events())
+
+    def put(self, payload) -> None:
+        """
+        Add an event in the send queue, oldest event is dropped when queue is
+        full.
+        """
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+            if self.dropped % SEND_QUEUE_SIZE == 1:
+                logger.warning(f"Websocket of `{self.key}` is slow, "
+                               f"{self.dropped} events dropped.")
+        self._queue.put_nowait(payload)
+
+    async def _send_events(self) -> None:
+        """
+        Send the queued events to the websocket.
+        """
+        while True:
+            payload = await self._queue.get()
+            if self.websocket.client_state != WebSocketState.CONNECTED:
+                break
+            try:
+                await self.handler(self.websocket, payload)
+            except Exception as error:
+                logger.error(f"Failed to send event of `{self.key}` on "
+                             f"websocket. Error - {error}")
+
+    def close(self) -> None:
+        """
+        Stop the sender task of subscription.
+        """
+        self._task.cancel()
+
+
+class WebsocketGateway:
+    """
+    Deliver the real time events to the websockets of a worker.
+
+    Every worker holds one broker connection with one exclusive queue bound
+    to a direct exchange, and a registry of key (college, user and channel)
+    to websockets. Queue is bound to a key while at least one websocket of
+    the worker is subscribed to it. Payload of event is carried in the
+    message, hence subscribers don't re-read it from the cache.
+
+    Usage:
+        subscription = await websocket_gateway.subscribe(key, websocket, handler)
+        await websocket_gateway.publish(key, payload)
+        await websocket_gateway.unsubscribe(subscription)
+    """
+
+    def __init__(self):
+        self._subscriptions: dict = {}
+        self._connection = None
+        self._exchange = None
+        self._queue = None
+        self._loop = None
+        self._lock = None
+
+    @property
+    def exchange_name(self) -> str:
+        """
+        Get the name of exchange of websocket events.
+        """
+        return f"{settings.aws_env}/websocket_gateway"
+
+    def _encode(self, payload) -> bytes:
+        """
+        Get the message body of payload.
+        """
+        return json.dumps(
+            {"payload": payload}, default=utility_obj.custom_serializer
+        ).encode("utf-8")
+
+    async def _start(self) -> None:
+        """
+        Connect to the broker and start consuming the events of worker, when
+        not connected in the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._lock = loop, asyncio.Lock()
+            self._connection = self._exchange = self._queue = None
+            self._subscriptions = {}
+        async with self._lock:
+            if self._connection is not None:
+                return
+            connection = await utility_obj.get_rabbitMQ_connection_channel()
+            if connection is None:
+                raise ConnectionError("Unable to connect with the broker.")
+            channel = await connection.channel()
+            self._exchange = await channel.declare_exchange(
+                self.exchange_name, aio_pika.ExchangeType.DIRECT, durable=True
+            )
+            self._queue = await channel.declare_queue("", exclusive=True)
+            await self._queue.consume(self._on_message, no_ack=True)
+            self._connection = connection
+
+    async def _on_message(self, message) -> None:
+        """
+        Put the event of a message in the send queue of subscribed
+        websockets.
+        """
+        subscriptions = self._subscriptions.get(message.routing_key)
+        if not subscriptions:
+            return
+        try:
+            payload = json.loads(message.body).get("payload")
+        except (ValueError, AttributeError):
+            payload = None
+        for subscription in list(subscriptions):
+            subscription.put(payload)
+
+    async def subscribe(self, key: str, websocket: WebSocket,
+                        handler) -> Subscription:
+        """
+        Subscribe a websocket to the events of a key.
+
+        Params:
+            key (str): Key of events. e.g., "dev/college/user_id_telephony"
+            websocket (WebSocket): Websocket connection of the client.
+            handler: An async function which sends an event to websocket,
+                called with websocket and payload of event.
+
+        Returns:
+            Subscription: Subscription of the websocket.
+        """
+        await self._start()
+        subscription = Subscription(key, websocket, handler)
+        subscriptions = self._subscriptions.setdefault(key, set())
+        subscriptions.add(subscription)
+        if len(subscriptions) == 1:
+            await self._queue.bind(self._exchange, routing_key=key)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Remove the subscription of a websocket, queue is unbound from the key
+        when no other websocket of worker is subscribed to it.
+        """
+        subscription.close()
+        subscriptions = self._subscriptions.get(subscription.key, set())
+        subscriptions.discard(subscription)
+        if subscriptions or subscription.key not in self._subscriptions:
+            return
+        self._subscriptions.pop(subscription.key, None)
+        try:
+            await self._queue.unbind(self._exchange, routing_key=subscription.key)
+        except Exception as error:
+            logger.error(f"Failed to unbind `{subscription.key}` from "
+                         f"websocket queue. Error - {error}")
+
+    async def publish(self, key: str, payload=None) -> None:
+        """
+        Publish an event to the websockets subscribed to a key, in all the
+        workers.
+
+        Params:
+            key (str): Key of events. e.g., "dev/college/user_id_telephony"
+            payload: Data of event which sent to the websockets, should be
+                JSON serializable.
+        """
+        message = aio_pika.Message(body=self._encode(payload))
+        if self._loop is asyncio.get_running_loop() and self._connection:
+            await self._exchange.publish(message, routing_key=key)
+            return
+        # Publisher is not a websocket worker (e.g., celery task), hence uses
+        # a short-lived connection.
+        connection = await utility_obj.get_rabbitMQ_connection_channel()
+        if connection is None:
+            logger.error(f"Unable to publish websocket event of `{key}`.")
+            return
+        async with connection:
+            channel = await connection.channel()
+            exchange = await channel.declare_exchange(
+                self.exchange_name, aio_pika.ExchangeType.DIRECT, durable=True
+            )
+            await exchange.publish(message, routing_key=key)
+
+    async def close(self) -> None:
+        """
+        Close the broker connection of worker.
+        """
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+        self._subscriptions = {}
+        if self._connection is not None:
+            await self._connection.close()
+        self._connection = self._exchange = self._queue = None
+
+
+websocket_gateway = WebsocketGateway()
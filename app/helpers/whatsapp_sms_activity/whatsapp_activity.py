@@ -2,14 +2,12 @@
 This file contain class and functions related to whatsapp functionality
 """
 
-import json
+import asyncio
 from datetime import datetime
 
-import requests
 from bson import ObjectId
 from fastapi.exceptions import HTTPException
 from kombu.exceptions import KombuError
-from requests.auth import HTTPBasicAuth
 
 from app.background_task.send_mail_configuration import EmailActivity
 from app.celery_tasks.celery_communication_log import CommunicationLogActivity
@@ -19,6 +17,7 @@ from app.core.utils import settings
 from app.database.database_sync import DatabaseConfigurationSync
 from app.database.motor_base_singleton import MotorBaseSingleton
 from app.dependencies.oauth import is_testing_env
+from app.helpers.whatsapp_sms_activity.whatsapp_dispatch import WhatsappDispatcher
 
 logger = get_logger(__name__)
 
@@ -214,18 +213,83 @@ class WhatsappHelper:
             )
         return data
 
-    def token_genrate_and_enable(self):
+    def get_whatsapp_payload(
+            self,
+            number,
+            whatsapp_details: dict,
+            variable_values: str = "",
+            media=None,
+            template=None,
+            location=None,
+            file=None,
+    ) -> dict:
         """
-        Generate token for sending message
+        Get the provider payload of whatsapp message for a number.
+
+        Params:
+            number (int | str): Mobile number of a student. e.g., 1234567890
+            whatsapp_details (dict): Details of whatsapp template.
+            variable_values (str): Values of template variables.
+            media (dict | None): Media information.
+            template (dict | None): Template information.
+            location (dict | None): Location information.
+            file: Uploaded file which want to send.
+
+        Returns:
+            dict: Provider payload of whatsapp message.
         """
-        token_generation_response = requests.post(
-            settings.generate_whatsapp_token, auth=HTTPBasicAuth(settings.whatsapp_username, settings.whatsapp_password)
-        )
-        if token_generation_response.status_code == 200:
-            return token_generation_response
-        raise HTTPException(status_code=401, detail="Whatsapp token generation failed.")
+        data = {
+            "@VER": "1.2",
+            "USER": {"@CH_TYPE": "4", "@UNIXTIMESTAMP": ""},
+            "SMS": [
+                {
+                    "@UDH": "",
+                    "@CODING": "",
+                    "@TEXT": "",
+                    "@TEMPLATEINFO": f"{whatsapp_details.get('template_id')}{variable_values}",
+                    "@PROPERTY": "",
+                    "@MSGTYPE": "1",
+                    "@ID": "",
+                    "ADDRESS": [
+                        {
+                            "@FROM": settings.whatsapp_sender,
+                            "@TO": "91" + str(number),
+                            "@SEQ": "1",
+                            "@TAG": "some client side random data",
+                        }
+                    ]
+                }
+            ]
+        }
+
+        if location:
+            data, whatsapp_data = self.get_whatsapp_location(data, location)
+
+        media_type = whatsapp_details.get("attachmentType")
+        if media_type not in ["", None]:
+            if media_type == "pdf":
+                media_type = "document"
+            data.get("SMS", [{}])[0].update(
+                {
+                    "@MSGTYPE": "3",
+                    "@TYPE": media_type,
+                    "@MEDIADATA": whatsapp_details.get("attachmentURL")
+                }
+            )
+
+        button_url = whatsapp_details.get("b_url")
+        if button_url not in ["", None]:
+            data.get("SMS", [{}])[0].update({"@B_URLINFO": button_url})
+
+        # if media is available
+        if media is not None:
+            if media.get("url") not in ["", None]:
+                data = self.media_helper(
+                    data=data, media=media, template=template, file=file
+                )
+        return data
 
-    def send_whatsapp_to_users(
+    async def send_whatsapp_batches_async(
             self,
             send_to: list,
             text,
@@ -241,9 +305,16 @@ class WhatsappHelper:
             college_id=None
     ):
         """
-        Send message from whatsapp
+        Send message from whatsapp.
+
+        Recipients are fetched with one query, messages are sent in batches
+        through `WhatsappDispatcher`.
+
+        Returns:
+            list: A list which contains tuple of provider response and
+                numbers sent in the request, one for every batch.
         """
-        whatsapp_details, response = {}, {}
+        whatsapp_details = {}
         if _id:
             if len(_id) != 24:
                 raise HTTPException(
@@ -254,86 +325,84 @@ class WhatsappHelper:
             whatsapp_details = DatabaseConfigurationSync().template_collection.find_one(
                 {"_id": ObjectId(_id)}
             )
+        if whatsapp_details is None:
+            whatsapp_details = {}
+        if media is None:
+            media = whatsapp_details.get("media")
+
+        numbers = {str(number) for number in send_to}
+        students = {
+            str(student.get("basic_details", {}).get("mobile_number")): student
+            for student in DatabaseConfigurationSync().studentsPrimaryDetails.find(
+                {"basic_details.mobile_number": {
+                    "$in": list(numbers) + [number for number in send_to
+                                            if not isinstance(number, str)]}},
+                {"user_name": 1, "basic_details.mobile_number": 1},
+            )
+        }
 
+        email_activity_obj = EmailActivity()
+        messages, texts = [], {}
         for number in send_to:
-            email_activity_obj = EmailActivity()
-            student = (DatabaseConfigurationSync().studentsPrimaryDetails.find_one(
-                {"basic_details.mobile_number": number}))
-            variable_values = ""
+            student = students.get(str(number))
+            message_text, variable_values = text, ""
             if student and college_id:
-                text, variable_values = email_activity_obj.detect_and_validate_variables(
+                message_text, variable_values = email_activity_obj.detect_and_validate_variables(
                     text, ObjectId(college_id), student.get("user_name"),
                     whatsapp_functionality=True
                 )
-            data = {
-                "@VER": "1.2",
-                "USER": {"@CH_TYPE": "4", "@UNIXTIMESTAMP": ""},
-                "SMS": [
-                    {
-                        "@UDH": "",
-                        "@CODING": "",
-                        "@TEXT": "",
-                        "@TEMPLATEINFO": f"{whatsapp_details.get('template_id')}{variable_values}",
-                        "@PROPERTY": "",
-                        "@MSGTYPE": "1",
-                        "@ID": "",
-                        "ADDRESS": [
-                            {
-                                "@FROM": settings.whatsapp_sender,
-                                "@TO": "91" + str(number),
-                                "@SEQ": "1",
-                                "@TAG": "some client side random data",
-                            }
-                        ]
-                    }
-                ]
-            }
+            texts[str(number)] = message_text
+            messages.append((number, self.get_whatsapp_payload(
+                number, whatsapp_details, variable_values=variable_values,
+                media=media, template=template, location=location, file=file
+            )))
 
-            if location:
-                data, whatsapp_data = self.get_whatsapp_location(data, location)
-
-            media_type = whatsapp_details.get("attachmentType")
-            if media_type not in ["", None]:
-                if media_type == "pdf":
-                    media_type = "document"
-                data.get("SMS", [{}])[0].update(
-                    {
-                        "@MSGTYPE": "3",
-                        "@TYPE": media_type,
-                        "@MEDIADATA": whatsapp_details.get("attachmentURL")
-                    }
-                )
+        results = await WhatsappDispatcher().dispatch(messages)
+        if not results:
+            raise HTTPException(status_code=503, detail="Whatsapp msg not sent")
+        for batch_response, batch_numbers in results:
+            if batch_response.status_code != 200:
+                continue
+            for number in batch_numbers:
+                try:
+                    if not is_testing_env():
+                        WhatsappHelper().store_whatsapp_activity.delay(
+                            response=batch_response.json(),
+                            number=number,
+                            text=texts.get(str(number)),
+                            ip_address=ip_address,
+                            data_segments=data_segments,
+                        )
+                except KombuError as celery_error:
+                    logger.error(f"error storing whatsapp activity {celery_error}")
+                except Exception as error:
+                    logger.error(f"error storing whatsapp activity {error}")
+        return results
 
-            button_url = whatsapp_details.get("b_url")
-            if button_url not in ["", None]:
-                data.get("SMS", [{}])[0].update({"@B_URLINFO": button_url})
+    async def send_whatsapp_to_users_async(self, send_to: list, text, **kwargs):
+        """
+        Send message from whatsapp. Accepts the same arguments as
+        `send_whatsapp_batches_async`.
 
-            if media is None:
-                if whatsapp_details is None:
-                    whatsapp_details = {}
-                media = whatsapp_details.get("media")
+        Returns:
+            httpx.Response: Response of the first failed request if any
+                request failed else response of the last request.
+        """
+        results = await self.send_whatsapp_batches_async(send_to, text, **kwargs)
+        return next(
+            (response for response, _ in results
+             if response.status_code != 200), results[-1][0]
+        )
 
-            # if media is available
-            if media is not None:
-                if media.get("url") not in ["", None]:
-                    data = self.media_helper(
-                        data=data, media=media, template=template, file=file
-                    )
-            response = requests.post(settings.send_whatsapp_url, data=json.dumps(data), headers={
-                "Authorization": f"Bearer {json.loads(self.token_genrate_and_enable().text).get('token')}",
-                "Content-Type": "application/json",
-            })
-            try:
-                if not is_testing_env():
-                    WhatsappHelper().store_whatsapp_activity.delay(
-                        response=response.json(),
-                        number=number,
-                        text=text,
-                        ip_address=ip_address,
-                        data_segments=data_segments,
-                    )
-            except KombuError as celery_error:
-                logger.error(f"error storing whatsapp activity {celery_error}")
-            except Exception as error:
-                logger.error(f"error storing whatsapp activity {error}")
-        return response
+    def send_whatsapp_batches(self, send_to: list, text, **kwargs) -> list:
+        """
+        Send message from whatsapp, used where event loop is not running
+        e.g., celery task. Accepts the same arguments as
+        `send_whatsapp_batches_async`.
+
+        Returns:
+            list: A list which contains tuple of provider response and
+                numbers sent in the request, one for every batch.
+        """
+        return asyncio.run(
+            self.send_whatsapp_batches_async(send_to, text, **kwargs))
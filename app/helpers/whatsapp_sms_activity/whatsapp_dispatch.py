@@ -0,0 +1,198 @@
+"""
+This file contains class and functions related to dispatch the whatsapp
+messages in batches.
+"""
+
+import asyncio
+import copy
+import json
+import time
+
+import httpx
+from fastapi.exceptions import HTTPException
+
+from app.core.log_config import get_logger
+from app.core.utils import settings
+
+logger = get_logger(__name__)
+
+# Bearer token of whatsapp provider shared by all the dispatches.
+# e.g., {("token_url", "user_name"): ("token", expire_at)}
+_token_cache: dict = {}
+# Provider token is valid for longer time, it is refreshed before that or
+# when provider rejects it.
+TOKEN_TTL = 30 * 60
+# Maximum number of addresses packed in a message of provider payload.
+ADDRESS_BATCH_SIZE = 100
+MAX_CONCURRENCY = 10
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+REQUEST_TIMEOUT = 30
+# Sending a message is not idempotent, hence a request is retried only when
+# it is not sent (connection errors) or provider rejected it due to rate limit.
+RETRY_STATUS_CODES = {429}
+RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class WhatsappDispatcher:
+    """
+    Send the whatsapp messages to the provider in batches.
+
+    Messages having the same content are packed into one provider message
+    with many addresses, batches are sent concurrently (bounded by
+    `MAX_CONCURRENCY`) with retry and backoff, using a cached bearer token.
+
+    Usage:
+        dispatcher = WhatsappDispatcher()
+        responses = await dispatcher.dispatch(messages)
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._token_lock = asyncio.Lock()
+
+    def _token_key(self) -> tuple:
+        """
+        Get the key of cached token.
+        """
+        return settings.generate_whatsapp_token, settings.whatsapp_username
+
+    async def get_token(
+            self, client: httpx.AsyncClient, refresh: bool = False
+    ) -> str:
+        """
+        Get the bearer token of provider from cache, generate the token when
+        it is not cached, expired or refresh is requested.
+
+        Params:
+            client (httpx.AsyncClient): A client for send the request.
+            refresh (bool): True for generate new token.
+
+        Returns:
+            str: Bearer token of provider.
+
+        Raises:
+            HTTPException: An error occurred when token generation failed.
+        """
+        async with self._token_lock:
+            token, expire_at = _token_cache.get(self._token_key(), (None, 0))
+            if not refresh and token and expire_at > time.monotonic():
+                return token
+            response = await client.post(
+                settings.generate_whatsapp_token,
+                auth=(settings.whatsapp_username, settings.whatsapp_password),
+            )
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=401, detail="Whatsapp token generation failed."
+                )
+            token = json.loads(response.text).get("token")
+            _token_cache[self._token_key()] = (
+                token, time.monotonic() + TOKEN_TTL)
+            return token
+
+    def pack(self, messages: list) -> list:
+        """
+        Pack the messages having same content into provider payloads.
+
+        Params:
+            messages (list): A list which contains tuple of number and its
+                provider payload, i.e., payload having one address.
+
+        Returns:
+            list: A list which contains tuple of provider payload and numbers
+                packed in it.
+        """
+        groups = {}
+        for number, payload in messages:
+            sms = copy.deepcopy(payload.get("SMS", [{}])[0])
+            addresses = sms.pop("ADDRESS", [])
+            key = json.dumps(
+                {**payload, "SMS": [sms]}, sort_keys=True, default=str)
+            groups.setdefault(key, (payload, sms, []))[2].append(
+                (number, addresses))
+        packed = []
+        for payload, sms, recipients in groups.values():
+            for index in range(0, len(recipients), ADDRESS_BATCH_SIZE):
+                batch = recipients[index: index + ADDRESS_BATCH_SIZE]
+                batch_addresses = []
+                for number, addresses in batch:
+                    for address in addresses:
+                        batch_addresses.append(
+                            {**address,
+                             "@SEQ": str(len(batch_addresses) + 1)})
+                packed.append(
+                    (
+                        {**payload,
+                         "SMS": [{**sms, "ADDRESS": batch_addresses}]},
+                        [number for number, _ in batch],
+                    )
+                )
+        return packed
+
+    async def _send(
+            self, client: httpx.AsyncClient, payload: dict
+    ) -> httpx.Response:
+        """
+        Send a payload to provider with retry and backoff, token is refreshed
+        once when provider rejects it.
+        """
+        refresh_token = token_refreshed = False
+        async with self._semaphore:
+            for attempt in range(MAX_RETRIES + 1):
+                try:
+                    token = await self.get_token(client, refresh=refresh_token)
+                    refresh_token = False
+                    response = await client.post(
+                        settings.send_whatsapp_url,
+                        content=json.dumps(payload),
+                        headers={
+                            "Authorization": f"Bearer {token}",
+                            "Content-Type": "application/json",
+                        },
+                    )
+                except RETRY_ERRORS as error:
+                    if attempt == MAX_RETRIES:
+                        raise
+                    logger.warning(f"Whatsapp request failed, retrying. "
+                                   f"Error - {error}")
+                else:
+                    if response.status_code == 401 and not token_refreshed:
+                        refresh_token = token_refreshed = True
+                        continue
+                    if (response.status_code not in RETRY_STATUS_CODES
+                            or attempt == MAX_RETRIES):
+                        return response
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        return response
+
+    async def dispatch(self, messages: list) -> list:
+        """
+        Pack and send the messages to provider.
+
+        Params:
+            messages (list): A list which contains tuple of number and its
+                provider payload.
+
+        Returns:
+            list: A list which contains tuple of provider response and
+                numbers sent in the request. Requests which failed after
+                retries are logged and not included.
+        """
+        packed = self.pack(messages)
+        async with httpx.AsyncClient(
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(max_connections=MAX_CONCURRENCY),
+        ) as client:
+            responses = await asyncio.gather(
+                *[self._send(client, payload) for payload, _ in packed],
+                return_exceptions=True,
+            )
+        result = []
+        for response, (_, numbers) in zip(responses, packed):
+            if isinstance(response, BaseException):
+                logger.error(f"Failed to send whatsapp message to "
+                             f"{len(numbers)} numbers. Error - {response}")
+                continue
+            result.append((response, numbers))
+        return result
@@ -31,12 +31,12 @@ class Roles(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
     description = Column(String, nullable=True)
-    scope = Column(String, nullable=False, default="college")
+    scope = Column(String, nullable=False, default="college", index=True)
     created_by = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_modified_at = Column(DateTime(timezone=True), server_default=func.now())
-    mongo_id = Column(String, nullable=False)
-    parent_id = Column(Integer, ForeignKey("roles.id"), nullable=True)
+    mongo_id = Column(String, nullable=False, index=True)
+    parent_id = Column(Integer, ForeignKey("roles.id"), nullable=True, index=True)
 
     parent = relationship("Roles", remote_side=[id], backref="children")
 
@@ -57,8 +57,8 @@ class Groups(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
     description = Column(String, nullable=True)
-    scope = Column(String, nullable=False, default="college")
-    college_id = Column(String, nullable=True)
+    scope = Column(String, nullable=False, default="college", index=True)
+    college_id = Column(String, nullable=True, index=True)
     created_by = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_modified_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -9,8 +9,6 @@ import tracemalloc
 from json import dumps
 from sys import platform
 import datetime
-import asyncio
-import aio_pika
 import boto3
 import redis
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -39,11 +37,14 @@ from app.dependencies.oauth import (
     get_sync_redis_client
 )
 from app.dependencies.security_auth import get_current_username
-from app.helpers.notification.real_time_configuration import Notification
+from app.helpers.notification.real_time_configuration import Notification, \
+    notification_dispatcher
+from app.helpers.sms_activity.delivery_status import SMSDeliveryStatus
 from app.helpers.telephony.call_popup_websocket import manager
 from app.helpers.user_curd.role_configuration import RoleHelper
 from app.helpers.webhook_helper.student_status_webhook_helper import \
     webhook_helper
+from app.helpers.websocket_gateway import websocket_gateway
 from app.models.role_schema import Role
 from app.routers.api_v1.routes.admin_dashboard_geographical_map_data_routes import (
     map_router as MapRouter,
@@ -717,10 +718,6 @@ async def startup():
     logger.info("Connected to Database.")
     # deleting the data in redis regarding students online
     await delete_keys_matching_pattern(["students_online"])
-    # Commented below statement for check server performance
-    # app.state.background_task = asyncio.create_task(Notification()
-    #                                                 .send_notifications(None,
-    #                                                                     None))
 
 
 def close_clients(db_connection):
@@ -744,6 +741,7 @@ async def shutdown():
     from app.database.database_sync import pymongo_base
     from app.database.master_db_connection import singleton_client
     from app.database.no_auth_connection_db import motor_base_no_auth
+    await SMSDeliveryStatus().close()
     singleton_client.close()
     if pymongo_base.client is not None:
         pymongo_base.client.close()
@@ -760,9 +758,10 @@ async def shutdown():
     if redis_client:
         await redis_client.close()
         logger.info("Connection with Redis is closed!")
+    await websocket_gateway.close()
+    await notification_dispatcher.close()
     logger.info("connection to mongodb database has been closed.")
-    await pgsql_conn.engine_generate.dispose()
-    logger.info("PostgresSQL connection closed successfully")
+    await pgsql_conn.dispose()
     log_memory_usage()
 
 
@@ -853,46 +852,6 @@ async def create_role(role: Role):
         )
 
 
-async def handle_message_telephony(message, websocket: WebSocket, key: str) -> None:
-    """
-    Process a RabbitMQ message and trigger the corresponding function to handle telephony events.
-
-    Params:
-        message (Message): The RabbitMQ message received from the queue.
-        websocket (WebSocket): The WebSocket connection to send data back to the client.
-        key (str): A unique identifier (usually the queue name) used to route the message to the correct function.
-
-    Returns:
-        None
-    """
-    async with message.process():
-        manager.run_async_function_telephony(websocket, key)
-
-
-async def consume_rabbitmq_messages_telephony(queue_name: str, websocket: WebSocket, channel):
-    """
-    Consumes RabbitMQ messages asynchronously from a specified queue and sends them to a WebSocket connection.
-
-    Args:
-        queue_name (str): The name of the RabbitMQ queue to consume messages from.
-        websocket (WebSocket): The WebSocket connection where the messages will be sent.
-        channel (RabbitMQ): The RabbitMQ channel
-
-    Returns:
-        None: This function is asynchronous and does not return any value.
-
-    Raises:
-        ConnectionError: If there is an issue with the RabbitMQ connection.
-        WebSocketDisconnect: If the WebSocket connection is closed unexpectedly.
-    """
-    exchange = await channel.declare_exchange(queue_name, aio_pika.ExchangeType.FANOUT, durable=True)
-    queue = await channel.declare_queue('', exclusive=True)
-    await queue.bind(exchange)
-    consumer_task = await queue.consume(lambda message: asyncio.create_task(handle_message_telephony(message, websocket,
-                                                                                                     queue_name)))
-    return queue, consumer_task
-
-
 @app.websocket("/call_initiation_popup")
 async def check_in_or_out(
     websocket: WebSocket,
@@ -915,20 +874,17 @@ async def check_in_or_out(
         user = await manager.connect(websocket, college)
         if user:
             key = f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/{user.get('_id')}_telephony"
-            connection = await utility_obj.get_rabbitMQ_connection_channel()
-            channel = await connection.channel()
-            queue, consume_task = await consume_rabbitmq_messages_telephony(key, websocket, channel)
+            subscription = await websocket_gateway.subscribe(
+                key, websocket, manager.send_call_activity
+            )
             try:
                 while True:
                     try:
                         await websocket.receive_text()
                     except WebSocketDisconnect:
-                        await queue.cancel(consume_task)
                         break
             finally:
-                await queue.cancel(consume_task)
-                await channel.close()
-                await connection.close()
+                await websocket_gateway.unsubscribe(subscription)
     except redis.exceptions.ConnectionError as error:
         logger.error(f"Some error occurred regarding redis connection. Error: {error}")
     except WebSocketDisconnect:
@@ -1002,50 +958,6 @@ async def update_student_status_websocket(websocket_info: WebSocket, college_id:
         logger.error(f"Something went wrong. {e}")
 
 
-async def handle_message_students_live(message, websocket: WebSocket, user: dict) -> None:
-    """
-    Processes a single RabbitMQ message and sends the processed data to a WebSocket connection.
-
-    Args:
-        message (IncomingMessage): The RabbitMQ message received for processing.
-        websocket (WebSocket): The WebSocket connection where the processed message will be sent.
-        user (dict): The identifier of the user associated with the WebSocket connection.
-
-    Returns:
-        None: This function is asynchronous and does not return any value.
-
-    Raises:
-        WebSocketDisconnect: If the WebSocket connection is closed unexpectedly during message handling.
-    """
-    async with message.process():
-        webhook_helper.run_async_function_in_thread(websocket, user)
-
-
-async def consume_rabbitmq_messages_students_live(routing_key: str, websocket: WebSocket, user: dict, channel):
-    """
-    Consumes RabbitMQ messages asynchronously from the specified queue and processes each message
-    for a live student session, sending the data to a WebSocket connection.
-
-    Args:
-        routing_key (str): The name of the RabbitMQ queue to consume messages from.
-        websocket (WebSocket): The WebSocket connection where the messages will be sent.
-        user (dict): The identifier of the user associated with the WebSocket connection.
-        channel (RabbitMQ): The RabbitMQ channel
-
-    Returns:
-        None: This function is asynchronous and does not return any value.
-
-    Raises:
-        ConnectionError: If there is an issue with the RabbitMQ connection.
-        WebSocketDisconnect: If the WebSocket connection is closed unexpectedly.
-    """
-    exchange = await channel.declare_exchange(routing_key, aio_pika.ExchangeType.FANOUT, durable=True)
-    queue = await channel.declare_queue('', exclusive=True)
-    await queue.bind(exchange)
-    consumer_tag = await queue.consume(lambda message: asyncio.create_task(handle_message_students_live(message, websocket, user)))
-    return (queue, consumer_tag)
-
-
 @app.websocket("/ws/liveApplicants/{college_id}/")
 async def get_student_status_websocket(websocket_con: WebSocket, college_id: str):
     """
@@ -1071,20 +983,21 @@ async def get_student_status_websocket(websocket_con: WebSocket, college_id: str
         if user:
             result = await webhook_helper.get_students_online(user=user)
             await websocket_con.send_text(dumps(result))
-            connection = await utility_obj.get_rabbitMQ_connection_channel()
-            channel = await connection.channel()
-            queue, consume_task = await consume_rabbitmq_messages_students_live(key, websocket_con, user, channel)
+            # Online students list is filtered by the role of user, hence
+            # it is re-read for the user on every event.
+            subscription = await websocket_gateway.subscribe(
+                key, websocket_con,
+                lambda websocket, payload: webhook_helper.live_applicants(
+                    websocket, user)
+            )
             try:
                 while True:
                     try:
                         await websocket_con.receive_text()
                     except WebSocketDisconnect:
-                        await queue.cancel(consume_task)
                         break
             finally:
-                await queue.cancel(consume_task)
-                await channel.close()
-                await connection.close()
+                await websocket_gateway.unsubscribe(subscription)
         else:
             logger.info("User details not found")
     except redis.exceptions.ConnectionError as error:
@@ -1095,51 +1008,6 @@ async def get_student_status_websocket(websocket_con: WebSocket, college_id: str
         logger.error(f"Something went wrong. {e}")
 
 
-async def handle_message_notifications(message, websocket: WebSocket, user: dict) -> None:
-    """
-    Processes a single RabbitMQ message related to notifications and sends the processed
-    data to a WebSocket connection.
-
-    Args:
-        message: The RabbitMQ message received for processing.
-        websocket (WebSocket): The WebSocket connection where the processed message will be sent.
-        user (dict): The identifier of the user associated with the WebSocket connection.
-
-    Returns:
-        None: This function is asynchronous and does not return any value.
-
-    Raises:
-        WebSocketDisconnect: If the WebSocket connection is closed unexpectedly during message handling.
-    """
-    async with message.process():
-        webhook_helper.run_async_thread_for_notifications(websocket, user)
-
-
-async def consume_rabbitmq_messages_notifications(routing_key: str, websocket: WebSocket, user: dict, channel):
-    """
-    Consumes RabbitMQ messages asynchronously from a specified notifications queue
-    and processes each message, sending the data to a WebSocket connection.
-
-    Args:
-        routing_key (str): The name of the RabbitMQ queue to consume notification messages from.
-        websocket (WebSocket): The WebSocket connection where the messages will be sent.
-        user (dict): The identifier of the user associated with the WebSocket connection.
-        channel (RabbitMQ): The RabbitMQ channel
-
-    Returns:
-        None: This function is asynchronous and does not return any value.
-
-    Raises:
-        ConnectionError: If there is an issue with the RabbitMQ connection.
-        WebSocketDisconnect: If the WebSocket connection is closed unexpectedly.
-    """
-    exchange = await channel.declare_exchange(routing_key, aio_pika.ExchangeType.FANOUT, durable=True)
-    queue = await channel.declare_queue('', exclusive=True)
-    await queue.bind(exchange)
-    consume_task = await queue.consume(lambda message: asyncio.create_task(handle_message_notifications(message, websocket, user)))
-    return queue, consume_task
-
-
 @app.websocket("/ws/notification/{college_id}/")
 async def get_notifications_websocket(websocket_con: WebSocket, college_id: str):
     """
@@ -1160,25 +1028,19 @@ async def get_notifications_websocket(websocket_con: WebSocket, college_id: str)
         await websocket_con.accept()
         Reset_the_settings().check_college_mapped(college_id)
         Reset_the_settings().get_user_database(college_id)
-        r = get_redis_client()
         user = await Notification().get_user_details(websocket_con, college_id)
         if user:
-            key = f"{settings.aws_env}/{utility_obj.get_university_name_s3_folder()}/{str(user.get('_id'))}_notifications"
-            await r.delete(key)
-            connection = await utility_obj.get_rabbitMQ_connection_channel()
-            channel = await connection.channel()
-            queue, consume_task = await consume_rabbitmq_messages_notifications(key, websocket_con, user, channel)
+            subscription = await notification_dispatcher.register(
+                str(user.get('_id')), websocket_con
+            )
             try:
                 while True:
                     try:
                         await websocket_con.receive_text()
                     except WebSocketDisconnect:
-                        await queue.cancel(consume_task)
                         break
             finally:
-                await queue.cancel(consume_task)
-                await channel.close()
-                await connection.close()
+                await notification_dispatcher.unregister(subscription)
     except redis.exceptions.ConnectionError as error:
         logger.error(f"Some error occurred regarding redis connection. Error: {error}")
     except WebSocketDisconnect:
@@ -60,6 +60,7 @@ from app.helpers.admin_dashboard.admin_board import AdminBoardHelper
 from app.helpers.admin_dashboard.admin_dashboard import AdminDashboardHelper
 from app.helpers.admin_dashboard.user_audit_trail import AuditTrail
 from app.helpers.admin_dashboard.admin_crud import AdminCRUD
+from app.helpers.admin_dashboard.season_comparison import SeasonComparison
 from app.helpers.college_configuration import CollegeHelper
 from app.helpers.course_configuration import CourseHelper
 from app.helpers.student_curd.student_application_configuration import (
@@ -1684,17 +1685,14 @@ async def upload_colleges(
     )
 
     if uploads3:
-        csv_data = await s3_client.read_csv_from_s3(
-            bucket_name=base_bucket, object_key=f"{path}{file_name}"
+        import_report = await CollegeHelper().import_colleges(
+            bucket_name=base_bucket, object_key=f"{path}{file_name}",
+            created_by=user.get("_id")
         )
-        inserted_data = await CollegeHelper().add_csv_file_college_data_into_database(
-            csv_data
+        return utility_obj.response_model(
+            import_report,
+            message="Colleges data successfully " "inserted into the database.",
         )
-        if inserted_data:
-            return utility_obj.response_model(
-                inserted_data,
-                message="Colleges data successfully " "inserted into the database.",
-            )
 
 
 @admin.post(
@@ -1754,19 +1752,15 @@ async def upload_courses(
                 )
 
                 if uploads3:
-                    csv_data = await s3_client.read_csv_from_s3(
-                        bucket_name=base_bucket,
-                        object_key=path,
+                    import_report = await CourseHelper().import_courses(
+                        bucket_name=base_bucket, object_key=path,
+                        college_id=college_id, created_by=user.get("_id")
                     )
-                    inserted_data = await CourseHelper().add_course_data_into_database(
-                        csv_data, college_id
+                    return utility_obj.response_model(
+                        import_report,
+                        message="Courses data successfully"
+                                " inserted into the database.",
                     )
-                    if inserted_data:
-                        return utility_obj.response_model(
-                            inserted_data,
-                            message="Courses data successfully"
-                                    " inserted into the database.",
-                        )
     else:
         return HTTPException(status_code=422, detail="Not enough permissions.")
 
@@ -2370,6 +2364,33 @@ async def get_source_name(
     return data
 
 
+@admin.put("/season_comparison/")
+@requires_feature_permission("read")
+async def season_comparison(
+        current_user: CurrentUser,
+        seasons: List[str] = Body(
+            ..., description="Enter season ids which want to compare"),
+        college: dict = Depends(get_college_id_short_version(short_version=True)),
+):
+    """
+    Get the lead and application counts of every season and source wise lead
+    counts of all the given seasons.
+
+    Params:\n
+        seasons (list): A list which contains season ids.
+            e.g., ["season_id_1", "season_id_2"]
+        college_id (str): An unique identifier of college.
+
+    Returns:\n
+        dict: A dictionary which contains season wise counts, total counts
+            and source wise lead counts.
+    """
+    await UserHelper().is_valid_user(current_user)
+    data = await SeasonComparison().get_season_comparison(seasons)
+    return utility_obj.response_model(data=data,
+                                      message="Get season comparison.")
+
+
 @admin.get("/users_by_college_id")
 @requires_feature_permission("read")
 async def users_by_colleges(
@@ -77,6 +77,7 @@ async def login(
             user_name=form_data.username,
             password=form_data.password,
             scopes=form_data.scopes,
+            user=users,
         )
 
     if not user:
@@ -85,7 +86,8 @@ async def login(
     ip_address = utility_obj.get_ip_address(request)
 
     await utility_obj.store_login_activity_helper(
-        username=form_data.username, ip_address=ip_address
+        username=form_data.username, ip_address=ip_address,
+        college_id=college_id if scope == "student" else None
     )
     if scope == "student":
         try:
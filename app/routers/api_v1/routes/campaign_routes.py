@@ -218,22 +218,16 @@ async def update_status_of_campaign_rule(
 @requires_feature_permission("read")
 async def get_source_campaign(
         current_user: CurrentUser,
-        cache_data=Depends(cache_dependency),
         date_range: DateRange = None,
         college: dict = Depends(get_college_id_short_version(short_version=True)),):
     """
-    Get source based campaign data
+    Get source based campaign data, data is cached by college and date range
+    (see `CampaignAnalytics`).
     """
     await UserHelper().is_valid_user(current_user)
-    cache_key, data = cache_data
-    if data:
-        return data
     data = await campaign().campaign_manager_helper(college.get('id'),
                                                     date_range)
-    data = {"data": data, "message": "Get campaign manager data."}
-    if cache_key:
-        await insert_data_in_cache(cache_key, data)
-    return data
+    return {"data": data, "message": "Get campaign manager data."}
 
 
 @campaign_router.post('_manager/source_wise_details/')
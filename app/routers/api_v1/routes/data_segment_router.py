@@ -141,8 +141,10 @@ async def create_data_segment(
             ):
                 return {"detail": "Data segment name already exists."}
 
+        # Cached count of data segment is not valid after update of filters
         await DatabaseConfiguration().data_segment_collection.update_one(
-            {"_id": data_segment.get("_id")}, {"$set": data_segment_create}
+            {"_id": data_segment.get("_id")},
+            {"$set": data_segment_create, "$unset": {"cardinality": ""}},
         )
         return {"message": "Data segment details updated."}
 
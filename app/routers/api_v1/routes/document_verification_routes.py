@@ -21,6 +21,7 @@ from app.dependencies.college import get_college_id, get_college_id_short_versio
 from app.dependencies.oauth import insert_data_in_cache, CurrentUser, cache_dependency, \
     change_indicator_cache, is_testing_env, cache_invalidation
 from app.helpers.document_verification_helpers import doc_verification_obj, DocumentVerification
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 from app.helpers.user_curd.user_configuration import UserHelper
 from app.models.applications import DateRange
 from app.models.lead_schema import DvStatus
@@ -83,13 +84,7 @@ async def get_all_application_details(
 
         search_condition = None
         if search_input:
-            search_condition = {
-                "$or": [
-                    {"result.user_name": {"$regex": search_input, "$options": "i"}},
-                    {"result.basic_details.first_name": {"$regex": search_input, "$options": "i"}},
-                    {"result.basic_details.mobile_number": {"$regex": search_input, "$options": "i"}}
-                ]
-            }
+            search_condition = SearchKeyHelper().get_search_query(search_input)
 
         data = await DocumentVerification().get_application_data(
             payload=payload,
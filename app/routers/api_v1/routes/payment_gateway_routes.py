@@ -33,11 +33,13 @@ from app.database.aggregation.payment import Payment
 from app.database.configuration import DatabaseConfiguration
 from app.dependencies.college import get_college_id
 from app.dependencies.oauth import CurrentUser, Is_testing, is_testing_env
-from app.helpers.college_configuration import CollegeHelper
+from app.helpers.campaign.campaign_analytics import CampaignAnalytics
 from app.helpers.payment_configuration import PaymentHelper
+from app.helpers.payment_reconciliation import PaymentReconciliation
 from app.helpers.promocode_voucher_helper.promocode_vouchers_helper import (
     promocode_vouchers_obj,
 )
+from app.helpers.razorpay_gateway import RazorpayGateway
 from app.helpers.student_curd.student_application_configuration import StudentApplicationHelper
 from app.helpers.user_curd.user_configuration import UserHelper
 from app.models.payment_gateway_schema import UpdatePaymentDetails
@@ -86,12 +88,9 @@ async def card_details_of_payment(
     * :*return* **Card details of a payment**:
     """
 
-    headers, x_razorpay_account, client_id, client_secret = (
-        await CollegeHelper().razorpay_header_update_partner(college)
-    )
-    client = razorpay.Client(auth=(client_id, client_secret))
+    gateway = await RazorpayGateway.get(college)
     try:
-        card_details = client.payment.fetchCardDetails(payment_id, headers=headers)
+        card_details = await gateway.call("payment", "fetchCardDetails", payment_id)
     except BadRequestError as e:
         raise HTTPException(status_code=500, detail=str(e.args)[2:-3])
     if card_details:
@@ -209,14 +208,11 @@ async def capture_payment(
     * :*param* **amount** e.g., 5:\n
     * :*return* **Payment details**:
     """
-    headers, x_razorpay_account, client_id, client_secret = (
-        await CollegeHelper().razorpay_header_update_partner(college)
-    )
-    client = razorpay.Client(auth=(client_id, client_secret))
+    gateway = await RazorpayGateway.get(college)
 
     try:
-        payment_capture = client.payment.capture(
-            payment_id, amount=amount, headers=headers
+        payment_capture = await gateway.call(
+            "payment", "capture", payment_id, amount=amount
         )
     except BadRequestError as e:
         raise HTTPException(status_code=500, detail=str(e.args)[2:-3])
@@ -243,11 +239,7 @@ async def validate_details(application_id: str):
         raise HTTPException(status_code=400, detail=str(e.args))
     if not application:
         raise HTTPException(status_code=404, detail="Application not found.")
-    course = await DatabaseConfiguration().course_collection.find_one(
-        {"_id": ObjectId(application.get("course_id"))}
-    )
-    if course is None:
-        course = {}
+    course = await PaymentReconciliation().get_course(application.get("course_id"))
     return application, course
 
 
@@ -450,27 +442,26 @@ async def update_payment(
     raise HTTPException(status_code=500, detail="Something went wrong.")
 
 
-async def create_order_by_data(client, data, headers):
+async def create_order_by_data(gateway, data):
     """
     Create order with data and return order data.
 
     Params:
-        client: A client object for use razorpay methods.
+        gateway (RazorpayGateway): Razorpay gateway of college.
         data (dict): Data useful for create order.
-        headers (dict): Useful for pass data in headers.
 
     Returns:
         order_info (dict): order data.
     """
     try:
-        order_info = client.order.create(data=data, headers=headers)
+        order_info = await gateway.call("order", "create", data=data)
     except BadRequestError as e:
         raise HTTPException(status_code=500, detail=str(e.args)[2:-3])
     return order_info
 
 
 async def validate_existing_order_details(
-    order_data: dict, client, headers: dict, data: dict, request: Request, payment_attempt_info: dict,
+    order_data: dict, gateway, data: dict, request: Request, payment_attempt_info: dict,
         student_id: ObjectId, application: dict, promocode_update: dict, promocode: str | None, application_id: ObjectId
         , student: dict, amount: int, college: dict, background_tasks: BackgroundTasks
 ):
@@ -479,8 +470,7 @@ async def validate_existing_order_details(
 
     Params:
         - order_data (str): Existing order data.
-        - client: A client object for use razorpay methods.
-        - headers (dict): Useful for pass data in headers.
+        - gateway (RazorpayGateway): Razorpay gateway of college.
         - data (dict): Data useful for create order.
         - request (Request): An object of `Request` which contains request data, useful for get ip address.
         - payment_attempt_info (dict): A dictionary which contains payment attempt information.
@@ -501,14 +491,17 @@ async def validate_existing_order_details(
     Raises:
         - HTTPException: An error occurred with status code 422 when payment is already captured.
     """
+    reconciliation = PaymentReconciliation()
+    if reconciliation.is_terminal(application, order_data):
+        raise HTTPException(status_code=422, detail="Payment is captured.")
     order_id = order_data.get("order_id")
-    order_info = client.order.fetch(order_id, headers=headers)
+    order_info = await gateway.call("order", "fetch", order_id)
     if order_info.get("status") == "paid":
-        orders = client.order.payments(order_id, headers=headers)
+        orders = await gateway.call("order", "payments", order_id)
         items = orders.get("items")
         for item in items:
             if item.get("status") == "refunded":
-                order_info = await create_order_by_data(client, data, headers)
+                order_info = await create_order_by_data(gateway, data)
                 break
             if item.get("status") == "captured":
                 payment_mode, payment_mode_info, payment_id = (
@@ -529,138 +522,127 @@ async def validate_existing_order_details(
                 })
                 if promocode:
                     payment_attempt_info.update(promocode_update)
-                if (
-                    await DatabaseConfiguration().payment_collection.find_one(
-                        {"payment_id": payment_id}
-                    )
-                ) is None:
-                    data = {
-                        "merchant": "RazorPay",
-                        "user_id": student_id,
-                        "details": {
-                            "purpose": "studentApplication",
-                            "application_id": application_id,
-                        },
-                        "error": {
-                            "error_code": None,
-                            "description": None,
-                            "created_at": payment_date
-                        }
-                    }
-                    data.update(payment_attempt_info)
-                    await DatabaseConfiguration().payment_collection.insert_one(data)
-                if (await DatabaseConfiguration().studentApplicationForms.find_one(
-                        {"_id": application_id, "payment_info.payment_id": payment_id})) is None:
-                    payment_info = application.get("payment_info", {})
-                    payment_info.update(payment_attempt_info)
-                    application.get("payment_attempts", []).insert(0, payment_attempt_info)
-                    update_info = {
-                        "payment_attempts": application.get("payment_attempts", []),
-                        "payment_initiated": True,
-                        "payment_info": payment_info
+                data = {
+                    "merchant": "RazorPay",
+                    "user_id": student_id,
+                    "details": {
+                        "purpose": "studentApplication",
+                        "application_id": application_id,
+                    },
+                    "error": {
+                        "error_code": None,
+                        "description": None,
+                        "created_at": payment_date
                     }
-                    if (
-                        await DatabaseConfiguration().studentApplicationForms.update_one(
-                            {"_id": application_id}, {"$set": update_info}
-                        )
-                        is not None
-                    ):
-                        if (course := await DatabaseConfiguration().course_collection.find_one(
-                            {"_id": ObjectId(application.get("course_id"))}
-                        )) is None:
-                            course = {}
-                        await StudentApplicationHelper().update_stage(
-                            str(student_id), course.get("course_name"),
-                            7.50, application.get("spec_name1"), college_id=application.get("college_id")
+                }
+                data.update(payment_attempt_info)
+                await reconciliation.record_captured_payment(payment_id, data)
+                payment_info = application.get("payment_info", {})
+                payment_info.update(payment_attempt_info)
+                application.get("payment_attempts", []).insert(0, payment_attempt_info)
+                update_info = {
+                    "payment_attempts": application.get("payment_attempts", []),
+                    "payment_initiated": True,
+                    "payment_info": payment_info
+                }
+                if await reconciliation.mark_application_paid(
+                        application_id, payment_id, update_info):
+                    await CampaignAnalytics().bump_version(
+                        application.get("college_id"))
+                    course = await reconciliation.get_course(
+                        application.get("course_id"))
+                    await StudentApplicationHelper().update_stage(
+                        str(student_id), course.get("course_name"),
+                        7.50, application.get("spec_name1"), college_id=application.get("college_id")
+                    )
+                    toml_data = utility_obj.read_current_toml_file()
+                    if toml_data.get("testing", {}).get("test") is False:
+                        basic_details = student.get("basic_details", {})
+                        background_tasks.add_task(
+                            EmailActivity().payment_successful,
+                            data={
+                                "payment_status": "success",
+                                "created_at": payment_date,
+                                "order_id": order_id,
+                                "payment_id": payment_id,
+                                "student_name": utility_obj.name_can(basic_details),
+                                "student_email_id": basic_details.get("email"),
+                                "student_mobile_no": basic_details.get("mobile_number"),
+                                "application_number": application.get(
+                                    "custom_application_id"
+                                ),
+                                "degree": f"{course.get('course_name')} in "
+                                          f"{application.get('spec_name1')}",
+                                "college_name": college.get("name"),
+                                "nationality": basic_details.get("nationality"),
+                                "application_fees": (
+                                    course.get("fees")
+                                    if promocode is None
+                                    else amount
+                                ),
+                                "college_id": str(college.get("id")),
+                                "student_first_name": basic_details.get(
+                                    "first_name", {}
+                                ),
+                            },
+                            event_type="email",
+                            event_status="sent",
+                            event_name=f"Application "
+                                       f"({course.get('course_name')} in "
+                                       f"{application.get('spec_name1')}) "
+                                       f"payment successful",
+                            email_preferences=college.get("email_preferences", {}),
+                            college=college,
                         )
-                        toml_data = utility_obj.read_current_toml_file()
-                        if toml_data.get("testing", {}).get("test") is False:
-                            basic_details = student.get("basic_details", {})
-                            background_tasks.add_task(
-                                EmailActivity().payment_successful,
-                                data={
-                                    "payment_status": "success",
-                                    "created_at": payment_date,
-                                    "order_id": order_id,
-                                    "payment_id": payment_id,
-                                    "student_name": utility_obj.name_can(basic_details),
-                                    "student_email_id": basic_details.get("email"),
-                                    "student_mobile_no": basic_details.get("mobile_number"),
-                                    "application_number": application.get(
-                                        "custom_application_id"
-                                    ),
-                                    "degree": f"{course.get('course_name')} in "
-                                              f"{application.get('spec_name1')}",
-                                    "college_name": college.get("name"),
-                                    "nationality": basic_details.get("nationality"),
-                                    "application_fees": (
-                                        course.get("fees")
-                                        if promocode is None
-                                        else amount
-                                    ),
-                                    "college_id": str(college.get("id")),
-                                    "student_first_name": basic_details.get(
-                                        "first_name", {}
-                                    ),
-                                },
-                                event_type="email",
-                                event_status="sent",
-                                event_name=f"Application "
-                                           f"({course.get('course_name')} in "
-                                           f"{application.get('spec_name1')}) "
-                                           f"payment successful",
-                                email_preferences=college.get("email_preferences", {}),
-                                college=college,
+                        try:
+                            # TODO: Not able to add student timeline
+                            #  data in the DB when performing celery
+                            #  task so added condition which add student
+                            #  timeline when environment is not
+                            #  development. We'll remove the condition
+                            #  when celery work fine.
+                            course_name = (
+                                f"{course.get('course_name')} in {application.get('spec_name1')}"
+                                if application.get("spec_name1") not in ["", None]
+                                else f"{course.get('course_name')} Program"
                             )
-                            try:
-                                # TODO: Not able to add student timeline
-                                #  data in the DB when performing celery
-                                #  task so added condition which add student
-                                #  timeline when environment is not
-                                #  development. We'll remove the condition
-                                #  when celery work fine.
-                                course_name = (
-                                    f"{course.get('course_name')} in {application.get('spec_name1')}"
-                                    if application.get("spec_name1") not in ["", None]
-                                    else f"{course.get('course_name')} Program"
+                            # TODO: Not able to add student timeline data
+                            #  using celery task when environment is
+                            #  demo. We'll remove the condition when
+                            #  celery work fine.
+                            if settings.environment in ["demo"]:
+                                StudentActivity().student_timeline(
+                                    student_id=str(application.get("student_id")),
+                                    event_type="Payment",
+                                    event_status="Done",
+                                    message=f"{utility_obj.name_can(student.get('basic_details', {}))} "
+                                            f"captured Payment of Application"
+                                            f" Name: {course_name}",
+                                    college_id=str(application.get("college_id")),
                                 )
-                                # TODO: Not able to add student timeline data
-                                #  using celery task when environment is
-                                #  demo. We'll remove the condition when
-                                #  celery work fine.
-                                if settings.environment in ["demo"]:
-                                    StudentActivity().student_timeline(
+                            else:
+                                if not is_testing_env():
+                                    StudentActivity().student_timeline.delay(
                                         student_id=str(application.get("student_id")),
                                         event_type="Payment",
                                         event_status="Done",
                                         message=f"{utility_obj.name_can(student.get('basic_details', {}))} "
-                                                f"captured Payment of Application"
+                                                f" has captured Payment of Application"
                                                 f" Name: {course_name}",
                                         college_id=str(application.get("college_id")),
                                     )
-                                else:
-                                    if not is_testing_env():
-                                        StudentActivity().student_timeline.delay(
-                                            student_id=str(application.get("student_id")),
-                                            event_type="Payment",
-                                            event_status="Done",
-                                            message=f"{utility_obj.name_can(student.get('basic_details', {}))} "
-                                                    f" has captured Payment of Application"
-                                                    f" Name: {course_name}",
-                                            college_id=str(application.get("college_id")),
-                                        )
-                            except KombuError as celery_error:
-                                logger.error(
-                                    f"error storing payment done"
-                                    f" timeline data "
-                                    f"{celery_error}"
-                                )
-                            except Exception as error:
-                                logger.error(
-                                    f"error storing payment done"
-                                    f" timeline data "
-                                    f"{error}"
-                                )
+                        except KombuError as celery_error:
+                            logger.error(
+                                f"error storing payment done"
+                                f" timeline data "
+                                f"{celery_error}"
+                            )
+                        except Exception as error:
+                            logger.error(
+                                f"error storing payment done"
+                                f" timeline data "
+                                f"{error}"
+                            )
                 raise HTTPException(status_code=422, detail="Payment is captured.")
     return order_info
 
@@ -708,10 +690,7 @@ async def create_order(
     student_id, application_id = application.get("student_id"), application.get("_id")
     data = {"amount": amount, "currency": "INR", "receipt": "#1"}
 
-    headers, x_razorpay_account, client_id, client_secret = (
-        await CollegeHelper().razorpay_header_update_partner(college)
-    )
-    client = razorpay.Client(auth=(client_id, client_secret))
+    gateway = await RazorpayGateway.get(college)
     current_datetime = datetime.datetime.utcnow()
     payment_attempt_info = {
         "payment_id": "None",
@@ -744,17 +723,40 @@ async def create_order(
         "used_promocode": promocode,
         "paid_amount": temp_amount
     }
+    payment_doc = {
+        "payment_id": "None",
+        "merchant": "RazorPay",
+        "user_id": student_id,
+        "details": {
+            "purpose": "StudentApplication",
+            "application_id": application_id,
+        },
+        "status": "attempted",
+        "attempt_time": current_datetime,
+        "error": {
+            "error_code": None,
+            "description": None,
+            "created_at": current_datetime,
+        },
+        "order_amount": amount,
+    }
+    payment_doc.update(payment_extra_info)
+    if promocode:
+        payment_doc.update(promocode_update)
+    reconciliation = PaymentReconciliation()
     if (
-        order_data := await DatabaseConfiguration().payment_collection.find_one(
-            {"details.application_id": application_id, "order_amount": amount}
-        )
+        order_data := await reconciliation.reserve_order(
+            application_id, amount, payment_doc)
     ) is not None:
+        if order_data.get("order_id") is None:
+            raise HTTPException(
+                status_code=409, detail="Order creation is in progress.")
         if application.get("payment_attempts") is None:
             application["payment_attempts"] = []
         if promocode:
             payment_attempt_info.update(promocode_update)
         order_info = await validate_existing_order_details(
-            order_data, client, headers, data, request, payment_attempt_info, student_id, application, promocode_update,
+            order_data, gateway, data, request, payment_attempt_info, student_id, application, promocode_update,
             promocode, application_id, student, amount, college, background_tasks
         )
         application.get("payment_attempts", []).insert(0, payment_attempt_info)
@@ -763,29 +765,13 @@ async def create_order(
         )
         update_info = {"payment_attempts": application.get("payment_attempts")}
     else:
-        order_info = await create_order_by_data(client, data, headers)
-        payment_doc = {
-            "payment_id": "None",
-            "order_id": order_info.get("id"),
-            "merchant": "RazorPay",
-            "user_id": student_id,
-            "details": {
-                "purpose": "StudentApplication",
-                "application_id": application_id,
-            },
-            "status": "attempted",
-            "attempt_time": current_datetime,
-            "error": {
-                "error_code": None,
-                "description": None,
-                "created_at": current_datetime,
-            },
-            "order_amount": amount,
-        }
-        payment_doc.update(payment_extra_info)
-        if promocode:
-            payment_doc.update(promocode_update)
-        await DatabaseConfiguration().payment_collection.insert_one(payment_doc)
+        try:
+            order_info = await create_order_by_data(gateway, data)
+        except Exception:
+            await reconciliation.release_order(application_id, amount)
+            raise
+        await reconciliation.attach_order(
+            application_id, amount, order_info.get("id"))
         payment_attempt_info.update(
             {"order_id": order_info.get("id"), "status": order_info.get("status")}
         )
@@ -897,13 +883,10 @@ async def order_details(
     """
     Returns the order details using order_id
     """
-    headers, x_razorpay_account, client_id, client_secret = (
-        await CollegeHelper().razorpay_header_update_partner(college)
-    )
-    client = razorpay.Client(auth=(client_id, client_secret))
+    gateway = await RazorpayGateway.get(college)
 
     try:
-        details = client.order.fetch(order_id, headers=headers)
+        details = await gateway.call("order", "fetch", order_id)
     except BadRequestError as e:
         raise HTTPException(status_code=500, detail=str(e.args)[2:-3])
     return details["status"]
@@ -917,12 +900,9 @@ async def payment_details(
     """
     Returns the payment details
     """
-    headers, x_razorpay_account, client_id, client_secret = (
-        await CollegeHelper().razorpay_header_update_partner(college)
-    )
-    client = razorpay.Client(auth=(client_id, client_secret))
+    gateway = await RazorpayGateway.get(college)
     try:
-        details = client.payment.fetch(payment_id, headers=headers)
+        details = await gateway.call("payment", "fetch", payment_id)
     except BadRequestError as e:
         raise HTTPException(status_code=500, detail=str(e.args)[2:-3])
 
@@ -952,12 +932,8 @@ async def get_webhook_details(testing: Is_testing,
             raise HTTPException(status_code=400,
                                 detail="Missing x-razorpay-signature")
 
-        headers, x_razorpay_account, client_id, client_secret = (
-            await CollegeHelper().razorpay_header_update_partner(college)
-        )
-
-        client = razorpay.Client(auth=(client_id, client_secret))
-        verify_signature = client.utility.verify_webhook_signature(
+        gateway = await RazorpayGateway.get(college)
+        verify_signature = gateway.client.utility.verify_webhook_signature(
             request_data.decode("utf-8"),
             received_signature,
             settings.razorpay_webhook_secret,
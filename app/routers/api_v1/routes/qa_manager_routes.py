@@ -8,7 +8,7 @@ from fastapi.exceptions import HTTPException
 from app.core.utils import utility_obj, requires_feature_permission
 from app.dependencies.college import get_college_id, get_college_id_short_version
 from app.dependencies.oauth import CurrentUser
-from app.models.student_user_schema import User
+from app.models.student_user_schema import User, SortType
 from app.helpers.qa_manager_helper.counsellor_reviews import CounsellorReview
 from app.helpers.qa_manager_helper.calls_list import CallsListReview
 from app.helpers.qa_manager_helper.qa_reviews import QAReview
@@ -228,6 +228,8 @@ async def get_all_calls(
         qa: QAList = Body(None),
         counsellor: CounsellorList = Body(None),
         call_type: str|None = None,
+        sort_type: SortType | None = None,
+        cursor: str|None = None,
         qc_status: QCStatusList = Body(None),
         qc_date_range: DateRange = Body(None),
         call_date_range: DateRange = Body(None),
@@ -243,6 +245,9 @@ async def get_all_calls(
         - qa (str | None, optional): QA for filtering the calls. Defaults to None.
         - counsellor (str | None, optional): Counsellor unique id for filteration of calls as per counsellor. Defaults to None.
         - call_type (str | None, optional): It must be "Outbound" or "Inbound". Defaults to None.
+        - sort_type (SortType | None, optional): Sort order of call date, it must be "asc" or "dsc". Defaults to None (latest first).
+        - cursor (str | None, optional): Unique id of the last call of previous page, returned as `next_cursor`.
+            When given, page starts after this call instead of page_num. Defaults to None.
         - qc_status (str | None, optional): It must be 'Accepted', 'Rejected', 'Fatal Rejected' or 'Not QCed'. Defaults to None.
         - qc_date_range (DateRange, optional): start_date -> 'YYYY-mm-dd' or end_date -> 'YYYY-mm-dd'. Defaults to Body(None).
         - call_date_range (DateRange, optional): start_date -> 'YYYY-mm-dd' or end_date -> 'YYYY-mm-dd'. Defaults to Body(None).
@@ -263,6 +268,12 @@ async def get_all_calls(
     if user.get("role", {}).get("role_name") not in ["head_qa", "qa",  "college_super_admin", "college_head_counselor"]:
         raise HTTPException(status_code=401, detail=f"Not enough permissions")
 
+    if cursor:
+        try:
+            await utility_obj.is_length_valid(cursor, "Cursor")
+        except ObjectIdInValid as error:
+            raise HTTPException(status_code=422, detail=error.message)
+
     try:
         cache_key, data = cache_data
         if data:
@@ -274,16 +285,20 @@ async def get_all_calls(
         counsellor_dict = await utility_obj.format_filter_list(counsellor)
         qc_status_dict = await utility_obj.format_filter_list(qc_status)
 
-        data = await CallsListReview().retrieve_call_list(qc_date_range_dict, call_date_range_dict, qa_dict, counsellor_dict, call_type, qc_status_dict)
+        calls, total, next_cursor = await CallsListReview().retrieve_call_list(
+            qc_date_range_dict, call_date_range_dict, qa_dict, counsellor_dict, call_type, qc_status_dict,
+            page_num=page_num, page_size=page_size, sort_type=sort_type, cursor=cursor
+        )
 
-        response = await utility_obj.pagination_in_api(page_num, page_size, data, len(data),
+        response = await utility_obj.pagination_in_aggregation(page_num, page_size, total,
                                             route_name="/qa_manager/call_list/")
         
         data = {
-            "data": response["data"],
-            "total": len(data),
+            "data": calls,
+            "total": total,
             "count": page_size,
             "pagination": response["pagination"],
+            "next_cursor": next_cursor,
             "message": "Get the calls.",
         }
 
@@ -14,8 +14,7 @@ from app.core.log_config import get_logger
 from app.core.utils import utility_obj, requires_feature_permission
 from app.database.configuration import DatabaseConfiguration
 from app.dependencies.oauth import get_db, get_current_user_object, CurrentUser, \
-    get_collection_from_cache, \
-    store_collection_in_cache, get_current_user
+    get_current_user
 from app.helpers.roles.role_permission_helper import RolePermissionHelper
 from app.helpers.roles.roles_wrapper import RolePermissionFeature
 from app.helpers.user_curd.user_configuration import UserHelper
@@ -69,6 +68,8 @@ async def get_roles(
         page_size: int = Query(10, gt=0, description="Number of items per page"),
         scope: Optional[str] = Query(None,
                                      description="Filter roles by scope: 'global' or 'college'"),
+        after: Optional[str] = Query(None, description="Cursor of last role of previous page, "
+                                                       "`next_cursor` of previous response."),
         current_user: User = Depends(get_current_user_object)
 ) -> JSONResponse:
     """
@@ -82,6 +83,7 @@ async def get_roles(
         page_num (int): The page number, starting from 1.
         page_size (int): The number of roles per page.
         scope (str): Optional filter for role scope (e.g., 'global', 'college').
+        after (str): Optional cursor of last role of previous page, used instead of page_num.
         current_user (User): The currently authenticated user.
 
     Returns:
@@ -91,7 +93,8 @@ async def get_roles(
         HTTPException: If the user is unauthorized.
     """
     return await RolePermissionHelper().fetch_pgsql_entity(
-        current_user, data_type="roles", scope=scope, page_num=page_num, page_size=page_size)
+        current_user, data_type="roles", scope=scope, page_num=page_num, page_size=page_size,
+        after=after)
 
 
 @router.get(
@@ -448,6 +451,8 @@ async def get_groups(
         scope: Optional[str] = Query(None,
                                      description="Filter permissions by scope: 'global' or 'college'"),
         college_id: Optional[str] = Query(None, description="Enter college id."),
+        after: Optional[str] = Query(None, description="Cursor of last group of previous page, "
+                                                       "`next_cursor` of previous response."),
         current_user: User = Depends(get_current_user_object)
 ) -> JSONResponse:
     """
@@ -460,6 +465,7 @@ async def get_groups(
     Params:
         page_num (int): The page number, starting from 1.
         page_size (int): The number of groups per page.
+        after (str): Optional cursor of last group of previous page, used instead of page_num.
         current_user (User): The currently authenticated user.
 
     Returns:
@@ -470,7 +476,7 @@ async def get_groups(
     """
     return await RolePermissionHelper().fetch_pgsql_entity(
         current_user, data_type="groups", scope=scope, college_id=college_id, page_num=page_num,
-        page_size=page_size)
+        page_size=page_size, after=after)
 
 
 @router.get(
@@ -1180,15 +1186,12 @@ async def get_user_permissions(
         if dashboard_type not in ["admin_dashboard", "student_dashboard"]:
             raise CustomError("Invalid dashboard type. Must be"
                               " 'admin_dashboard' or 'student_dashboard'.")
-        data = await get_collection_from_cache(f"allowed_features/{dashboard_type}",
-                                               current_user.get("user_name"))
+        data = None
+        if current_user.get("dashboard_type") == dashboard_type:
+            data = current_user.get("allowed_features")
         if not data:
             data = await utility_obj.get_user_feature_permissions(
                 user=current_user, dashboard_type=dashboard_type)
-            if data:
-                await store_collection_in_cache(
-                    collection=data, collection_name=f"allowed_features/{dashboard_type}",
-                    field=current_user.get("user_name"))
         college_id = current_user.get("college_id")
         return {"message": f"Role permissions fetched successfully.",
                 "data": data,
@@ -19,6 +19,7 @@ from app.database.motor_base_singleton import MotorBaseSingleton
 from app.dependencies.college import get_college_id
 from app.dependencies.oauth import CurrentUser
 from app.dependencies.oauth import is_testing_env
+from app.helpers.sms_activity.delivery_status import SMSDeliveryStatus
 from app.helpers.sms_activity.sms_configuration import SMSHelper
 from app.helpers.user_curd.user_configuration import UserHelper
 
@@ -96,7 +97,7 @@ async def send_sms_activity(
                     ).data_segment_collection.update_one(
                         {"_id": ObjectId(data_segment_id)},
                         {"$inc": {"communication_count.sms": len(numbers)}})
-            response = SMSHelper().send_sms_to_many(
+            response = await SMSHelper().send_sms_to_many_async(
                 numbers, dlt_content_id, sms_content, sms_type, sender_name, college_id=college_id
             )
             if not is_testing_env():
@@ -193,7 +194,6 @@ async def sms_webhook(
         }
         data = {key: value for key, value in data.items() if value is not None}
         if txid:
-            await SMSHelper().update_delivery_status(data)
-            await SMSHelper().automation_update_sms_status(data)
+            await SMSDeliveryStatus().add(data)
     except Exception as e:
         logger.error("Something went wrong. ", e)
@@ -7,7 +7,6 @@ import json
 from pathlib import PurePath
 from typing import Union
 
-import razorpay
 from bson import ObjectId
 from fastapi import APIRouter, BackgroundTasks, Depends, Path, Query, Request, UploadFile, Form, File
 from fastapi.encoders import jsonable_encoder
@@ -25,11 +24,11 @@ from app.database.configuration import DatabaseConfiguration
 from app.dependencies.college import get_college_id, get_college_id_short_version
 from app.dependencies.oauth import CurrentUser, cache_invalidation, \
     is_testing_env, Is_testing
-from app.helpers.college_configuration import CollegeHelper
 from app.helpers.payment_configuration import PaymentHelper
 from app.helpers.promocode_voucher_helper.promocode_vouchers_helper import (
     promocode_vouchers_obj,
 )
+from app.helpers.razorpay_gateway import RazorpayGateway
 from app.helpers.student_curd.student_application_configuration import (
     StudentApplicationHelper,
 )
@@ -253,12 +252,9 @@ async def update_payment_status(
     if not student:
         student = {}
     try:
-        headers, x_razorpay_account, client_id, client_secret = (
-            await CollegeHelper().razorpay_header_update_partner(college)
-        )
-        client = razorpay.Client(auth=(client_id, client_secret))
+        gateway = await RazorpayGateway.get(college)
 
-        verify = client.utility.verify_payment_signature(
+        verify = gateway.client.utility.verify_payment_signature(
             {
                 "razorpay_order_id": order_id,
                 "razorpay_payment_id": payment_id,
@@ -275,7 +271,7 @@ async def update_payment_status(
                 payment_helper = PaymentHelper()
                 if verify_payment == "paid":
                     verify_payment = "captured"
-                    orders = client.order.payments(order_id, headers=headers)
+                    orders = await gateway.call("order", "payments", order_id)
                     items = orders.get("items")
                     for item in items:
                         if item.get("status") == "captured":
@@ -197,12 +197,12 @@ async def reset_password(
     data = await DatabaseConfiguration().studentsPrimaryDetails.find_one(
         {"_id": ObjectId(dt["userid"])}
     )
-    if Hash().verify_password(data.get("password"), new_password):
+    if await Hash().verify_password_async(data.get("password"), new_password):
         raise HTTPException(
             status_code=422,
             detail="Your new password should not match with last password.",
         )
-    password = Hash().get_password_hash(new_password)
+    password = await Hash().get_password_hash_async(new_password)
     updated_password = await DatabaseConfiguration().studentsPrimaryDetails.update_one(
         {"_id": ObjectId(data.get("_id"))}, {"$set": {"password": password}}
     )
@@ -245,7 +245,7 @@ async def send_verification_email(
             if not student:
                 raise HTTPException(status_code=404, detail="Student not found.")
             random_password = utility_obj.random_pass()
-            new_password = Hash().get_password_hash(random_password)
+            new_password = await Hash().get_password_hash_async(random_password)
             await DatabaseConfiguration().studentsPrimaryDetails.update_one(
                 {"user_name": email}, {"$set": {"password": new_password}}
             )
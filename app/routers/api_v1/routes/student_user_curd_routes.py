@@ -33,6 +33,7 @@ from app.dependencies.oauth import (
     get_collection_from_cache,
     store_collection_in_cache,
 )
+from app.helpers.campaign.campaign_analytics import CampaignAnalytics
 from app.helpers.student_curd.student_configuration import StudentHelper
 from app.helpers.student_curd.student_user_crud_configuration import (
     StudentUserCrudHelper,
@@ -505,6 +506,8 @@ async def verify_otp(
                     },
                     {"$set": update_status},
                 )
+                if update_status.get("is_verify"):
+                    await CampaignAnalytics().bump_version(college.get("id"))
             await DatabaseConfiguration().studentsPrimaryDetails.update_one(
                 {"_id": student.get("_id"), "college_id": ObjectId(college.get("id"))},
                 {"$unset": {"otp": True}},
@@ -29,6 +29,7 @@ from app.helpers.student_curd.student_configuration import StudentHelper
 from app.helpers.student_curd.student_user_crud_configuration import (
     StudentUserCrudHelper,
 )
+from app.helpers.student_helper.search_keys import SearchKeyHelper
 from app.helpers.user_curd.user_configuration import UserHelper
 from app.models.serialize import StudentCourse
 from app.models.student_user_crud_schema import (
@@ -558,18 +559,18 @@ async def change_password(
     student = await DatabaseConfiguration().studentsPrimaryDetails.find_one(
         {"user_name": current_user.get("user_name")}
     )
-    if Hash().verify_password(student.get("password"), current_password):
+    if await Hash().verify_password_async(student.get("password"), current_password):
         if new_password != confirm_password:
             raise HTTPException(
                 status_code=422,
                 detail="New Password and Confirm Password doesn't match.",
             )
-        if Hash().verify_password(student.get("password"), new_password):
+        if await Hash().verify_password_async(student.get("password"), new_password):
             raise HTTPException(
                 status_code=422,
                 detail="Your new password should not match with" " last password.",
             )
-        password = Hash().get_password_hash(new_password)
+        password = await Hash().get_password_hash_async(new_password)
         updated_password = (
             await DatabaseConfiguration().studentsPrimaryDetails.update_one(
                 {"_id": ObjectId(student.get("_id"))}, {"$set": {"password": password,
@@ -661,6 +662,7 @@ async def add_or_update_basic_details(
     await DatabaseConfiguration().studentsPrimaryDetails.update_one(
         {"user_name": user.get("user_name")}, {"$set": basic_details}, upsert=True
     )
+    await SearchKeyHelper().update_student(user.get("_id"))
     result = await DatabaseConfiguration().studentsPrimaryDetails.find_one(
         {"user_name": user.get("user_name")}
     )
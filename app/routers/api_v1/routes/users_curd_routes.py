@@ -24,6 +24,7 @@ from app.database.configuration import DatabaseConfiguration
 from app.dependencies.college import get_college_id, get_college_id_short_version
 from app.dependencies.cryptography import EncryptionDecryption
 from app.dependencies.hashing import Hash
+from app.dependencies.jwttoken import Authentication
 from app.dependencies.oauth import CurrentUser, cache_invalidation, Is_testing, get_current_user_object
 from app.helpers.user_curd.role_configuration import RoleHelper
 from app.helpers.user_curd.user_configuration import UserHelper
@@ -222,10 +223,11 @@ async def get_user_token(
                 )
         ) is None:
             raise HTTPException(status_code=404, detail="username not found")
-        password = Hash().get_password_hash(new_password)
+        password = await Hash().get_password_hash_async(new_password)
         updated_password = await DatabaseConfiguration().user_collection.update_one(
             {"_id": ObjectId(data["_id"])}, {"$set": {"password": password}}
         )
+        Authentication.invalidate_verified_tokens(user_id=str(data["_id"]))
     if updated_password:
         return utility_obj.response_model(
             data=True, message="Your password has been updated successfully."
@@ -327,21 +329,22 @@ async def change_user_password(
     user = await DatabaseConfiguration().user_collection.find_one(
         {"user_name": current_user.get("user_name")}
     )
-    if Hash().verify_password(user["password"], current_password):
+    if await Hash().verify_password_async(user["password"], current_password):
         if new_password != confirm_password:
             raise HTTPException(
                 status_code=422,
                 detail="New Password and Confirm Password doesn't match.",
             )
-        if Hash().verify_password(user["password"], new_password):
+        if await Hash().verify_password_async(user["password"], new_password):
             raise HTTPException(
                 status_code=422,
                 detail="Your new password should not match with last " "password.",
             )
-        password = Hash().get_password_hash(new_password)
+        password = await Hash().get_password_hash_async(new_password)
         updated_password = await DatabaseConfiguration().user_collection.update_one(
             {"_id": ObjectId(user["_id"])}, {"$set": {"password": password}}
         )
+        Authentication.invalidate_verified_tokens(user_id=str(user["_id"]))
         if updated_password:
             return utility_obj.response_model(
                 data=True, message="Your password has been updated successfully."
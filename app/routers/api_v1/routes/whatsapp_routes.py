@@ -103,7 +103,7 @@ async def send_whatsapp_sms(
                         {"_id": ObjectId(data_segment_id)},
                         {"$inc": {
                             "communication_count.whatsapp": len(send_to)}})
-            response = WhatsappHelper().send_whatsapp_to_users(
+            response = await WhatsappHelper().send_whatsapp_to_users_async(
                 send_to=send_to,
                 text=text if text is not None else "",
                 template=template,
@@ -170,7 +170,7 @@ async def whatsapp_file_send(
     ip_address = utility_obj.get_ip_address(request)
     if not send_to:
         raise HTTPException(status_code=422, detail="Please enter the number")
-    response = WhatsappHelper().send_whatsapp_to_users(
+    response = await WhatsappHelper().send_whatsapp_to_users_async(
         send_to=send_to,
         text=text if text is not None else "",
         media=payload,
@@ -190,10 +190,16 @@ async def whatsapp_activity(payload: whatsapp_webhook_schema = Depends()):
     data = payload.model_dump()
     guid = data.get("CLIENT_GUID")
     status = str(data.get("MSG_STATUS")).lower()
-    await DatabaseConfiguration().whatsapp_sms_activity.update_one(
-        {"guid": guid}, {"$set": {"status": status}}
-    )
     mobile_number = str(data.get("TO", ""))[2:]
+    # Messages sent in one batch have the same guid, hence status is updated
+    # for the recipient of the batch.
+    updated = await DatabaseConfiguration().whatsapp_sms_activity.update_many(
+        {"guid": guid, "send_to": mobile_number}, {"$set": {"status": status}}
+    )
+    if not updated.matched_count:
+        await DatabaseConfiguration().whatsapp_sms_activity.update_one(
+            {"guid": guid}, {"$set": {"status": status}}
+        )
     event_type = ""
     if str(data.get("MESSAGE_STATUS")) == "0":
         event_type = "whatsapp"
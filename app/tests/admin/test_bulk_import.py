@@ -0,0 +1,191 @@
+"""
+This file contains test cases related to import the college and course CSV
+files of S3 in chunks.
+"""
+import io
+
+import pandas as pd
+import pytest
+from fastapi.exceptions import HTTPException
+from pymongo.errors import BulkWriteError
+
+from app.core.utils import settings
+from app.database.configuration import DatabaseConfiguration
+from app.helpers.bulk_import import BulkImport
+from app.helpers.college_configuration import CollegeHelper
+from app.helpers.course_configuration import CourseHelper
+
+
+class FakeS3Client:
+    """
+    A fake S3 client which returns the given content as object body.
+    """
+
+    def __init__(self, content: str):
+        self.content = content.encode("utf-8")
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        return {"Body": io.BytesIO(self.content)}
+
+
+class FakeBulkWriteResult:
+    """
+    A fake result of `bulk_write`.
+    """
+
+    def __init__(self, bulk_api_result: dict):
+        self.bulk_api_result = bulk_api_result
+
+
+class FakeCollection:
+    """
+    A fake collection which upserts every operation, or raises the given
+    error.
+    """
+
+    def __init__(self, error: Exception | None = None):
+        self.error, self.operations = error, []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations.append(operations)
+        if self.error:
+            raise self.error
+        return FakeBulkWriteResult({"nUpserted": len(operations),
+                                    "nInserted": 0, "nModified": 0})
+
+
+@pytest.fixture
+def s3_object(monkeypatch):
+    """
+    Return a function which sets the content of S3 object.
+    """
+
+    def set_content(content: str) -> None:
+        monkeypatch.setattr(settings, "s3_client", FakeS3Client(content))
+
+    return set_content
+
+
+def test_read_csv_chunks(s3_object):
+    """
+    Rows of S3 object are read in chunks, index of rows continues across
+    chunks.
+    """
+    s3_object("name\nA\nB\nC\nD\nÉcole\n")
+    chunks = list(BulkImport("colleges", chunk_size=2).read_csv_chunks(
+        "bucket", "colleges.csv"))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert list(chunks[2].index) == [4]
+    assert chunks[2]["name"].tolist() == ["École"]
+
+
+def test_validate_chunk_row_numbers():
+    """
+    Row number of error is the line number of row in the file, a row missing
+    many required values has one error.
+    """
+    chunk = pd.DataFrame(
+        {"name": ["A", None, " ", "D"], "code": ["1", None, "3", None]},
+        index=range(5000, 5004))
+    valid, errors = BulkImport("colleges").validate_chunk(
+        chunk, {"name": "Name is required.", "code": "Code is required."})
+    assert valid["name"].tolist() == ["A"]
+    assert errors == [
+        {"row": 5003, "error": "Name is required."},
+        {"row": 5004, "error": "Name is required."},
+        {"row": 5005, "error": "Code is required."}]
+
+
+@pytest.mark.asyncio
+async def test_write_chunk_maps_write_errors_to_rows():
+    """
+    Write errors are reported against the row of failed operation, written
+    operations are counted.
+    """
+    collection = FakeCollection(BulkWriteError({
+        "writeErrors": [{"index": 1, "errmsg": "E11000 duplicate key"}],
+        "nUpserted": 2, "nInserted": 0, "nModified": 0}))
+    counts, errors = await BulkImport("courses").write_chunk(
+        collection, ["first", "second", "third"], [2, 5, 7])
+    assert counts == {"inserted": 2, "updated": 0}
+    assert errors == [{"row": 5, "error": "E11000 duplicate key"}]
+
+
+@pytest.mark.asyncio
+async def test_run_import_in_chunks(s3_object, setup_module):
+    """
+    Every chunk is written with one `bulk_write`, counts and row errors of
+    chunks are added in the import report.
+    """
+    s3_object("name,code\nA,1\n,2\nC,3\nD,4\nE,5\n")
+
+    async def build_operations(rows, row_numbers):
+        return [row.get("name") for row in rows], row_numbers, []
+
+    collection = FakeCollection()
+    report = await BulkImport("colleges", chunk_size=2).run(
+        "bucket", "colleges.csv", collection, build_operations,
+        required_columns={"name": "Name is required."})
+    assert [len(operations) for operations in collection.operations] == [
+        1, 2, 1]
+    assert report.get("status") == "completed"
+    assert (report.get("total_rows"), report.get("inserted"),
+            report.get("failed")) == (5, 4, 1)
+    assert report.get("errors") == [{"row": 3, "error": "Name is required."}]
+    await DatabaseConfiguration().import_report_collection.delete_many(
+        {"file": "colleges.csv"})
+
+
+@pytest.mark.asyncio
+async def test_import_courses_adds_specializations(
+        s3_object, test_college_validation, setup_module):
+    """
+    A new course is inserted, new specializations of existing course are
+    added and an upload without changes is rejected.
+    """
+    college_id = str(test_college_validation.get("_id"))
+    columns = "course_name,course_description,duration,Application_fees," \
+              "is_activated,banner_image_url,course_specialization\n"
+    s3_object(columns + "Bulk Course,Test,3,1000,TRUE,none,Physics\n")
+    report = await CourseHelper().import_courses(
+        "bucket", "courses.csv", college_id)
+    assert report.get("inserted") == 1
+
+    s3_object(columns + "Bulk Course,Test,3,1000,TRUE,none,Chemistry\n")
+    report = await CourseHelper().import_courses(
+        "bucket", "courses.csv", college_id)
+    assert (report.get("inserted"), report.get("updated")) == (0, 1)
+    course = await DatabaseConfiguration().course_collection.find_one(
+        {"course_name": "Bulk Course"})
+    assert [spec.get("spec_name") for spec in
+            course.get("course_specialization")] == ["Physics", "Chemistry"]
+
+    with pytest.raises(HTTPException) as error:
+        await CourseHelper().import_courses("bucket", "courses.csv", college_id)
+    assert error.value.status_code == 422
+    await DatabaseConfiguration().course_collection.delete_many(
+        {"course_name": "Bulk Course"})
+    await DatabaseConfiguration().import_report_collection.delete_many(
+        {"file": "courses.csv"})
+
+
+@pytest.mark.asyncio
+async def test_import_colleges(s3_object, setup_module):
+    """
+    A new college is inserted, invalid row is reported with its row number
+    and an upload of existing college is rejected.
+    """
+    s3_object("name,pocs_mobile_number\nBulk College,\nInvalid College,123\n")
+    report = await CollegeHelper().import_colleges("bucket", "colleges.csv")
+    assert report.get("inserted") == 1
+    assert report.get("errors") == [
+        {"row": 3, "error": "Mobile must be 10 digit in csv."}]
+
+    s3_object("name\nBulk College\n")
+    with pytest.raises(HTTPException) as error:
+        await CollegeHelper().import_colleges("bucket", "colleges.csv")
+    assert error.value.status_code == 422
+    await DatabaseConfiguration().college_collection.delete_many(
+        {"name": "Bulk College"})
+    await DatabaseConfiguration().import_report_collection.delete_many(
+        {"file": "colleges.csv"})
@@ -0,0 +1,110 @@
+"""
+This file contains test cases related to queries over multiple seasons and
+season comparison.
+"""
+import pytest
+
+from app.database.season_query import SeasonQuery
+from app.helpers.admin_dashboard.season_comparison import SeasonComparison
+from app.tests.conftest import user_feature_data
+
+feature_key = user_feature_data()
+
+# Documents of a season collection, i.e., result of the pipeline.
+# e.g., {("season", "collection_name"): [{...}]}
+SEASON_DATA = {
+    ("2023", "studentsPrimaryDetails"): [
+        {"_id": "google", "total_leads": 3, "created_at": 1},
+        {"_id": "facebook", "total_leads": 1, "created_at": 4}],
+    ("2024", "studentsPrimaryDetails"): [
+        {"_id": "google", "total_leads": 2, "created_at": 3},
+        {"_id": None, "total_leads": 5, "created_at": 2}],
+}
+
+
+class FakeCursor:
+    """
+    A fake aggregation cursor.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length):
+        return [dict(document) for document in self.documents]
+
+
+class FakeCollection:
+    """
+    A fake collection of a season which returns the given documents for
+    every pipeline.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def aggregate(self, pipeline):
+        return FakeCursor(self.documents)
+
+    async def count_documents(self, query):
+        return len(self.documents)
+
+
+@pytest.fixture
+def season_collections(monkeypatch):
+    """
+    Return the fake collections instead of collections of season databases.
+    """
+
+    def get_collection(self, season, collection_name):
+        return FakeCollection(SEASON_DATA.get((season, collection_name), []))
+
+    monkeypatch.setattr(SeasonQuery, "get_collection", get_collection)
+
+
+@pytest.mark.asyncio
+async def test_season_query_merge_results(season_collections):
+    """
+    Documents of seasons are merged, re-sorted and paged, counts and groups
+    are summed.
+    """
+    season_query = SeasonQuery(["2023", "2024", "2023"])
+    assert season_query.seasons == ["2023", "2024"]
+    documents = await season_query.aggregate(
+        "studentsPrimaryDetails", [], sort=[("created_at", -1)], skip=1,
+        limit=2)
+    assert [(document["season"], document["created_at"])
+            for document in documents] == [("2024", 3), ("2024", 2)]
+    assert await season_query.count("studentsPrimaryDetails", {}) == 4
+    groups = await season_query.group_sum("studentsPrimaryDetails", [])
+    assert {group["_id"]: group["total_leads"] for group in groups} == {
+        "google": 5, "facebook": 1, None: 5}
+
+
+@pytest.mark.asyncio
+async def test_season_comparison(season_collections):
+    """
+    Counts of every season, total counts and source wise lead counts of all
+    the seasons.
+    """
+    data = await SeasonComparison().get_season_comparison(["2023", "2024"])
+    assert [season["season"] for season in data["seasons"]] == [
+        "2023", "2024"]
+    assert data["total_applications"] == 0
+    assert data["source_wise_leads"][0] == {"source": "google",
+                                            "total_leads": 5}
+
+
+@pytest.mark.asyncio
+async def test_season_comparison_not_authenticated(
+        http_client_test, test_college_validation, setup_module
+):
+    """
+    Not Authenticated if user not logged in
+    """
+    response = await http_client_test.put(
+        f"/admin/season_comparison/?college_id="
+        f"{str(test_college_validation.get('_id'))}&feature_key={feature_key}",
+        json=["2023", "2024"])
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Not authenticated"}
@@ -0,0 +1,132 @@
+"""
+This file contains test cases related to placement of advance filter
+predicates in the aggregation pipeline.
+"""
+from app.database.aggregation.get_all_applications import Application
+from app.helpers.advance_filter_configuration import AdvanceFilterHelper
+
+COURSE_LOOKUP = [
+    {"$lookup": {"from": "courses", "localField": "course_id",
+                 "foreignField": "_id", "as": "course_details"}},
+    {"$unwind": {"path": "$course_details"}},
+]
+QUERY_LOOKUP = [
+    {"$lookup": {"from": "queries", "localField": "_id",
+                 "foreignField": "application_id", "as": "queries"}},
+]
+
+
+def test_plan_advance_filter_pushdown_in_separate_stage():
+    """
+    Predicates on the main collection are added in a separate stage after the
+    first match stage, the first match stage is not changed.
+    """
+    pipeline = [{"$match": {"college_id": 1}}, *COURSE_LOOKUP]
+    pipeline = AdvanceFilterHelper().plan_advance_filter(
+        [{"current_stage": {"$gte": 2}},
+         {"course_details.course_name": "BSc"}], pipeline)
+    assert pipeline[0] == {"$match": {"college_id": 1}}
+    assert pipeline[1] == {"$match": {"$and": [{"current_stage": {"$gte": 2}}]}}
+    assert pipeline[-1] == {
+        "$match": {"$and": [{"course_details.course_name": "BSc"}]}}
+
+
+def test_plan_advance_filter_pushdown_without_first_match():
+    """
+    Predicates on the main collection are added at the start of pipeline when
+    pipeline does not start with a match stage.
+    """
+    pipeline = AdvanceFilterHelper().plan_advance_filter(
+        [{"$and": [{"current_stage": 2}, {"is_verify": True}]}],
+        [*COURSE_LOOKUP])
+    assert pipeline[0] == {
+        "$match": {"$and": [{"current_stage": 2}, {"is_verify": True}]}}
+    assert pipeline[1:] == COURSE_LOOKUP
+
+
+def test_plan_advance_filter_not_moved_before_group():
+    """
+    Predicates are not moved before a stage which changes the documents.
+    """
+    pipeline = [{"$match": {"college_id": 1}},
+                {"$group": {"_id": "$student_id"}}]
+    pipeline = AdvanceFilterHelper().plan_advance_filter(
+        [{"current_stage": 2}], pipeline)
+    assert len(pipeline) == 3
+    assert pipeline[-1] == {"$match": {"$and": [{"current_stage": 2}]}}
+
+
+def test_plan_advance_filter_expr_predicate_not_moved():
+    """
+    Predicates whose fields can't be known are added after the pipeline.
+    """
+    predicate = {"$expr": {"$gt": ["$current_stage", 2]}}
+    pipeline = AdvanceFilterHelper().plan_advance_filter(
+        [predicate], [{"$match": {"college_id": 1}}, *COURSE_LOOKUP])
+    assert pipeline[-1] == {"$match": {"$and": [predicate]}}
+    assert len(pipeline) == 4
+
+
+def test_plan_advance_filter_lazy_lookup():
+    """
+    Lazy lookup is added only when a predicate uses its fields.
+    """
+    pipeline = AdvanceFilterHelper().plan_advance_filter(
+        [{"current_stage": 2}], [{"$match": {"college_id": 1}}],
+        lazy_lookups=[QUERY_LOOKUP])
+    assert QUERY_LOOKUP[0] not in pipeline
+
+    pipeline = AdvanceFilterHelper().plan_advance_filter(
+        [{"current_stage": 2}, {"queries.status": "Open"}],
+        [{"$match": {"college_id": 1}}], lazy_lookups=[QUERY_LOOKUP])
+    assert pipeline == [
+        {"$match": {"college_id": 1}},
+        {"$match": {"$and": [{"current_stage": 2}]}},
+        *QUERY_LOOKUP,
+        {"$match": {"$and": [{"queries.status": "Open"}]}},
+    ]
+
+
+def test_plan_advance_filter_lookup_of_columns():
+    """
+    Lazy lookup whose fields are read by the columns of response is added
+    even when no predicate uses its fields.
+    """
+    columns = [{"$project": {
+        "query_status": {"$ifNull": ["$queries.status", "$$REMOVE"]},
+        "course_name": "$course_details.course_name"}}]
+    required_fields = AdvanceFilterHelper().get_referenced_fields(columns)
+    assert required_fields == {"queries", "course_details"}
+    pipeline = AdvanceFilterHelper().plan_advance_filter(
+        [{"current_stage": 2}], [{"$match": {"college_id": 1}}],
+        lazy_lookups=[QUERY_LOOKUP], required_fields=required_fields)
+    assert pipeline == [
+        {"$match": {"college_id": 1}},
+        {"$match": {"$and": [{"current_stage": 2}]}},
+        *QUERY_LOOKUP,
+    ]
+
+    pipeline = AdvanceFilterHelper().plan_advance_filter(
+        [], [{"$match": {"college_id": 1}}], lazy_lookups=[QUERY_LOOKUP],
+        required_fields=AdvanceFilterHelper().get_referenced_fields(
+            [{"$project": {"course_name": "$course_details.course_name"}}]))
+    assert pipeline == [{"$match": {"college_id": 1}}]
+
+
+def test_add_or_filter_keeps_existing_conditions():
+    """
+    Filters which are added after the advance filter keep the existing
+    `$and`/`$or` conditions of match stage.
+    """
+    pipeline = AdvanceFilterHelper().plan_advance_filter(
+        [{"current_stage": 2}], [*COURSE_LOOKUP])
+    match_stage = pipeline[0]["$match"]
+    match_stage["$or"] = [{"spec_name1": "Physics"}]
+    Application().add_or_filter(match_stage, [{"course_id": 1}])
+    assert match_stage == {"$and": [
+        {"$or": [{"course_id": 1}]}, {"current_stage": 2},
+        {"$or": [{"spec_name1": "Physics"}]}]}
+
+    match_stage = {"college_id": 1}
+    Application().add_or_filter(match_stage, [{"course_id": 1}])
+    assert match_stage == {"college_id": 1, "$or": [{"course_id": 1}]}
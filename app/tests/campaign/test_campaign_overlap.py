@@ -0,0 +1,109 @@
+"""
+This file contains test cases related to overlap of UTM sources which is
+answered from cached source signatures of leads.
+"""
+import pytest
+from bson import ObjectId
+
+from app.helpers.campaign import campaign_overlap
+from app.helpers.campaign.campaign_overlap import (
+    SIGNATURE_CACHE_TTL, SOURCE_LEVELS, campaign_source_overlap)
+
+LEADS = [
+    ("google", "facebook", None),
+    ("google", "facebook", None),
+    ("facebook", "google", "instagram"),
+    ("google", None, None),
+    ("instagram", "google", None),
+    ("newspaper", "radio", None),
+    ("radio", None, "newspaper"),
+]
+
+
+def get_signatures(leads: list) -> list:
+    """
+    Group the sources of leads by signature, same as `$group` stage of
+    signature pipeline.
+    """
+    signatures = {}
+    for sources in leads:
+        signature = signatures.setdefault(
+            sources, {"_id": dict(zip(SOURCE_LEVELS, sources)), "leads": 0})
+        signature["leads"] += 1
+    return list(signatures.values())
+
+
+def get_baseline_count(leads: list, sources: list) -> int:
+    """
+    Count the leads which have all the sources by checking each lead.
+    """
+    return sum(
+        all(source in lead_sources for source in sources)
+        for lead_sources in leads
+    )
+
+
+@pytest.mark.parametrize("sources", [
+    ["google", "facebook"],
+    ["Google", "Instagram"],
+    ["google", "facebook", "instagram"],
+    ["newspaper", "radio"],
+    ["google", "radio"],
+    ["facebook", "newspaper"],
+    ["google", "unknown"],
+])
+def test_get_overlap_count(sources):
+    """
+    Overlap count of overlapping and disjoint sources is same as the count of
+    leads which have all the sources.
+    """
+    assert campaign_source_overlap().get_overlap_count(
+        get_signatures(LEADS), sources) == get_baseline_count(
+        LEADS, [source.lower() for source in sources])
+
+
+@pytest.mark.asyncio
+async def test_source_signatures_cached_until_expiry(monkeypatch):
+    """
+    Source signatures are built once and served from cache until they
+    expire, signatures are re-built after expiry.
+    """
+    leads = list(LEADS)
+    pipelines = []
+    now = [1000.0]
+
+    class FakeCursor:
+        def __init__(self, signatures):
+            self.signatures = signatures
+
+        async def to_list(self, length=None):
+            return self.signatures
+
+    class FakeStudentsCollection:
+        def aggregate(self, pipeline):
+            pipelines.append(pipeline)
+            return FakeCursor(get_signatures(leads))
+
+    class FakeDatabaseConfiguration:
+        studentsPrimaryDetails = FakeStudentsCollection()
+
+    monkeypatch.setattr(campaign_overlap, "DatabaseConfiguration",
+                        FakeDatabaseConfiguration)
+    monkeypatch.setattr(campaign_overlap, "_source_signatures", {})
+    monkeypatch.setattr(campaign_overlap.time, "monotonic", lambda: now[0])
+    overlap, college_id = campaign_source_overlap(), str(ObjectId())
+
+    signatures = await overlap.get_source_signatures(college_id)
+    leads.append(("google", "radio", None))
+    now[0] += SIGNATURE_CACHE_TTL - 1
+    assert await overlap.get_source_signatures(college_id) == signatures
+    assert len(pipelines) == 1
+    assert overlap.get_overlap_count(signatures, ["google", "radio"]) == 0
+
+    await overlap.get_source_signatures(str(ObjectId()))
+    assert len(pipelines) == 2
+
+    now[0] += 1
+    signatures = await overlap.get_source_signatures(college_id)
+    assert len(pipelines) == 3
+    assert overlap.get_overlap_count(signatures, ["google", "radio"]) == 1
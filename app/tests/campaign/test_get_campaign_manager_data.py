@@ -1,7 +1,12 @@
 """
 This file contains test cases related to API route/endpoint get campaign data
 """
+import datetime
+
 import pytest
+from bson import ObjectId
+
+from app.helpers.campaign.campaign_analytics import CampaignAnalytics
 from app.tests.conftest import user_feature_data
 
 feature_key = user_feature_data()
@@ -71,3 +76,22 @@ async def test_get_campaign_data_based_on_date_range(http_client_test, test_coll
            json={"date_range": start_end_date})
     assert response.status_code == 200
     assert response.json()['message'] == "Get campaign manager data."
+
+
+def test_application_pipeline_filters_paid_by_payment_date():
+    """
+    In a date range, applications are filtered by enquiry date and paid
+    applications by payment date.
+    """
+    start_date, end_date = datetime.datetime(2024, 1, 1), datetime.datetime(
+        2024, 1, 31)
+    match, group = [stage.get(name) for stage, name in zip(
+        CampaignAnalytics().get_application_pipeline(
+            str(ObjectId()), start_date, end_date), ["$match", "$group"])]
+    assert [list(condition) for condition in match["$or"]] == [
+        ["enquiry_date"], ["payment_info.created_at"]]
+    paid_condition = group["paid_applications"]["$sum"]["$cond"][0]["$and"]
+    assert paid_condition[0]["$and"][0] == {
+        "$gte": ["$payment_info.created_at", start_date]}
+    assert group["total_applications"]["$sum"]["$cond"][0]["$and"][0] == {
+        "$gte": ["$enquiry_date", start_date]}
@@ -91,3 +91,26 @@ async def test_leads_details_based_on_source_and_date_range(http_client_test, co
         headers={"Authorization": f"Bearer {college_super_admin_access_token}"}, json={"date_range": start_end_date})
     assert response.status_code == 200
     assert response.json()['message'] == "Get source performance details."
+
+
+@pytest.mark.asyncio
+async def test_leads_details_based_on_source_with_change_indicator(
+        http_client_test, college_super_admin_access_token, test_campaign_data,
+        setup_module, test_college_validation):
+    """
+    Get leads details based on source with source wise counts and change
+    indicator of sources
+    """
+    response = await http_client_test.post(
+        f"/campaign_manager/source_performance_details/"
+        f"?college_id={str(test_college_validation.get('_id'))}&feature_key={feature_key}"
+        f"&change_indicator=last_15_days",
+        headers={"Authorization": f"Bearer {college_super_admin_access_token}"})
+    assert response.status_code == 200
+    total_count_data = response.json()["total_count_data"]
+    assert total_count_data["name"] == "total"
+    for field in ["leads", "primary_leads", "secondary_leads", "tertiary_leads"]:
+        assert field in total_count_data
+    for source in response.json()["data"]:
+        assert "leads_perc" in source
+        assert "leads_pos" in source
@@ -4,6 +4,8 @@ This file contains methods/fixture which are useful for run test cases,
 """
 
 import asyncio
+import functools
+import json
 import random
 import time
 import uuid
@@ -4510,4 +4512,44 @@ async def test_client_validation(test_college_validation):
     updated_client = await DatabaseConfiguration().client_collection.find_one(
         {"client_id": ObjectId(college_id)}
     )
-    return updated_client
\ No newline at end of file
+    return updated_client
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    """
+    Return a function which sends the requests of a dispatch module (whatsapp
+    or SMS) to a fake provider and returns what the provider received.
+
+    The fake provider answers the given fixed urls (e.g., token url) as it
+    is, raises the errors of `received["errors"]` in order and then responds
+    with the status codes of `received["status_codes"]` in order (200 when
+    status codes are exhausted) and the body built from the payload.
+    """
+
+    def send_to_fake_provider(module, build_body, fixed_responses=None) -> dict:
+        received = {"payloads": [], "status_codes": [], "errors": []}
+        fixed_responses = fixed_responses or {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if str(request.url) in fixed_responses:
+                return httpx.Response(
+                    200, json=fixed_responses.get(str(request.url)))
+            if received["errors"]:
+                raise received["errors"].pop(0)(
+                    "Provider is down", request=request)
+            payload = json.loads(request.content)
+            received["payloads"].append(payload)
+            status_code = (received["status_codes"].pop(0)
+                           if received["status_codes"] else 200)
+            return httpx.Response(status_code,
+                                  json=build_body(payload, received))
+
+        monkeypatch.setattr(module, "RETRY_BACKOFF", 0)
+        monkeypatch.setattr(
+            module.httpx, "AsyncClient",
+            functools.partial(httpx.AsyncClient,
+                              transport=httpx.MockTransport(handler)))
+        return received
+
+    return send_to_fake_provider
@@ -0,0 +1,77 @@
+"""
+This file contains test cases related to cached count of dynamic data
+segments.
+"""
+import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.dependencies import oauth
+from app.helpers.data_segment import segment_cardinality
+from app.helpers.data_segment.segment_cardinality import SegmentCardinality
+
+
+class FakeUpdateResult:
+    """
+    A fake result of `update_one`.
+    """
+
+    def __init__(self, modified_count: int):
+        self.modified_count = modified_count
+
+
+class FakeDataSegmentCollection:
+    """
+    A fake data segment collection which keeps the refresh request time of
+    a data segment.
+    """
+
+    def __init__(self):
+        self.requested_at = None
+
+    async def update_one(self, query, update):
+        requested_at = update["$set"].get("cardinality.refresh_requested_at")
+        if requested_at is None:
+            return FakeUpdateResult(1)
+        window_start = query["$or"][1]["cardinality.refresh_requested_at"]["$lt"]
+        if self.requested_at is not None and self.requested_at >= window_start:
+            return FakeUpdateResult(0)
+        self.requested_at = requested_at
+        return FakeUpdateResult(1)
+
+
+@pytest.mark.asyncio
+async def test_stale_count_refreshed_once_per_window(monkeypatch):
+    """
+    Stale count is served with freshness indicator and its recompute is
+    requested once in a freshness window, fresh count is not recomputed.
+    """
+    collection, refreshed = FakeDataSegmentCollection(), []
+
+    class FakeDatabaseConfiguration:
+        data_segment_collection = collection
+
+    async def refresh(self, segment, college_id, with_members=False):
+        refreshed.append(segment.get("_id"))
+
+    monkeypatch.setattr(segment_cardinality, "DatabaseConfiguration",
+                        FakeDatabaseConfiguration)
+    monkeypatch.setattr(SegmentCardinality, "refresh", refresh)
+    monkeypatch.setattr(oauth, "is_testing_env", lambda: True)
+    cardinality = SegmentCardinality()
+    segment = {"_id": ObjectId(), "segment_type": "Dynamic"}
+    segment["cardinality"] = {
+        "count": 10, "filters_digest": cardinality.get_filters_digest(segment),
+        "computed_at": datetime.datetime.utcnow() - datetime.timedelta(hours=1)}
+
+    count_info = await cardinality.get_count(segment, str(ObjectId()))
+    assert (count_info.get("count"), count_info.get("is_fresh")) == (10, False)
+    await cardinality.get_count(segment, str(ObjectId()))
+    assert refreshed == [segment.get("_id")]
+
+    segment["cardinality"]["computed_at"] = datetime.datetime.utcnow()
+    collection.requested_at = None
+    count_info = await cardinality.get_count(segment, str(ObjectId()))
+    assert count_info.get("is_fresh") is True
+    assert len(refreshed) == 1
@@ -95,3 +95,20 @@ async def test_database_unauthorize(http_client_test, setup_module):
     )
     assert response.status_code == 401
     assert response.json() == {"detail": "Unauthorized."}
+
+
+@pytest.mark.asyncio
+async def test_mongo_only_request_not_checkout_pgsql_connection(
+        http_client_test, setup_module):
+    """
+    Test case -> PostgreSQL connection is not checked out from the pool when
+    request only uses MongoDB, country details are read from MongoDB because
+    cache is not used in the testing environment
+    :return:
+    """
+    from app.database.motor_base import pgsql_conn
+    checkouts = pgsql_conn.get_metrics().get("checkouts")
+    response = await http_client_test.get("/countries/IN/")
+    assert response.status_code == 200
+    assert response.json()["iso2"] == "IN"
+    assert pgsql_conn.get_metrics().get("checkouts") == checkouts
@@ -0,0 +1,153 @@
+"""
+This file contains test cases related to real time notification dispatcher.
+"""
+import asyncio
+import datetime
+import json
+
+import pytest
+from bson import ObjectId
+
+from app.helpers.notification import real_time_configuration
+from app.helpers.notification.real_time_configuration import (
+    NotificationDispatcher)
+
+
+class FakeStream:
+    """
+    A fake change stream which returns the given changes, None marks the
+    end of a batch and an exception is raised as it is.
+    """
+
+    def __init__(self, changes):
+        self.changes, self.resume_token, self.alive = changes, None, True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def try_next(self):
+        if not self.changes:
+            raise asyncio.CancelledError
+        change = self.changes.pop(0)
+        if isinstance(change, Exception):
+            raise change
+        if change is not None:
+            self.resume_token = {"_data": str(change["fullDocument"]["_id"])}
+        return change
+
+
+class FakeCollection:
+    """
+    A fake notification collection which records the options of watch.
+    """
+
+    class database:
+        name = "test"
+
+    def __init__(self, changes):
+        self.changes, self.options = changes, []
+
+    def watch(self, pipeline, **options):
+        self.options.append(options)
+        return FakeStream(self.changes)
+
+
+class FakeRedis:
+    """
+    A fake redis client which keeps the values in memory.
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+class FakeSubscription:
+    """
+    A fake subscription which records the sent messages.
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    def put(self, message):
+        self.messages.append(message)
+
+
+def test_format_notification_without_student_and_application():
+    """
+    Student id and application id are empty when notification doesn't have
+    them.
+    """
+    message = json.loads(NotificationDispatcher().format_notification(
+        {"_id": ObjectId(), "event_type": "payment", "message": "test",
+         "event_datetime": datetime.datetime.utcnow()}))
+    assert message["student_id"] == ""
+    assert message["application_id"] == ""
+    assert message["category"] == "today"
+
+
+def get_change(send_to: ObjectId | None = None) -> dict:
+    """
+    Get a change of inserted notification.
+    """
+    return {"fullDocument": {"_id": ObjectId(), "send_to": send_to or ObjectId(),
+                             "event_datetime": datetime.datetime.utcnow()}}
+
+
+@pytest.mark.asyncio
+async def test_notification_stream_starts_at_operation_time(monkeypatch):
+    """
+    Stream without resume token starts at the operation time of first start,
+    also when it fails before the first notification, and routes the
+    inserted notifications to the subscriptions of receiver.
+    """
+
+    async def sleep(seconds):
+        pass
+
+    monkeypatch.setattr(real_time_configuration, "get_redis_client", lambda: None)
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    dispatcher, subscription = NotificationDispatcher(), FakeSubscription()
+    user_id = str(ObjectId())
+    dispatcher._subscriptions = {"test": {user_id: {subscription}}}
+    collection = FakeCollection([
+        Exception("Connection lost"), get_change(ObjectId(user_id)),
+        get_change()])
+    with pytest.raises(asyncio.CancelledError):
+        await dispatcher._watch("test", collection)
+    assert len(collection.options) == 2
+    assert collection.options[0] == collection.options[1]
+    assert "start_at_operation_time" in collection.options[0]
+    assert len(subscription.messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_notification_stream_resumes_from_persisted_token(monkeypatch):
+    """
+    Resume token is persisted after a batch, restarted stream resumes from
+    the persisted token.
+    """
+    redis = FakeRedis()
+    monkeypatch.setattr(real_time_configuration, "get_redis_client", lambda: redis)
+    dispatcher = NotificationDispatcher()
+    dispatcher._subscriptions = {"test": {str(ObjectId()): {FakeSubscription()}}}
+    changes = [get_change(), get_change(), None]
+    collection = FakeCollection(list(changes))
+    with pytest.raises(asyncio.CancelledError):
+        await dispatcher._watch("test", collection)
+    token = {"_data": str(changes[1]["fullDocument"]["_id"])}
+    assert await dispatcher.get_resume_token("test") == token
+
+    collection = FakeCollection([get_change()])
+    with pytest.raises(asyncio.CancelledError):
+        await dispatcher._watch("test", collection)
+    assert collection.options == [{"resume_after": token}]
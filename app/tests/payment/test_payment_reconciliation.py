@@ -0,0 +1,92 @@
+"""
+This file contains test cases related to reservation of payment order.
+"""
+import asyncio
+import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.database.configuration import DatabaseConfiguration
+from app.helpers.payment_reconciliation import (
+    ORDER_RESERVATION_TIMEOUT, PaymentReconciliation)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_order_reservation(setup_module):
+    """
+    Only one of the concurrent requests reserve the order, a stale
+    reservation is reclaimed by only one of the concurrent requests and a
+    fresh reservation is not reclaimed.
+
+    Params:\n
+        setup_module: A fixture which upload necessary data in the db before
+            test cases start running/executing and delete data from collection
+             after test case execution completed.
+
+    Assertions:\n
+        Result of order reservations.
+    """
+    reconciliation = PaymentReconciliation()
+    application_id, amount = ObjectId(), 50000
+    payment_doc = {"details": {"purpose": "StudentApplication",
+                               "application_id": application_id},
+                   "order_amount": amount}
+    results = await asyncio.gather(*[
+        reconciliation.reserve_order(application_id, amount, payment_doc)
+        for _ in range(5)])
+    assert results.count(None) == 1
+    assert all(result.get("order_id") is None for result in results if result)
+
+    # Fresh reservation is not reclaimed
+    assert await reconciliation.reserve_order(
+        application_id, amount, payment_doc) is not None
+
+    # Stale reservation is reclaimed only once
+    key = reconciliation.get_idempotency_key(application_id, amount)
+    await DatabaseConfiguration().payment_collection.update_one(
+        {"idempotency_key": key},
+        {"$set": {"reserved_at": datetime.datetime.utcnow() - datetime.timedelta(
+            seconds=ORDER_RESERVATION_TIMEOUT + 1)}})
+    results = await asyncio.gather(*[
+        reconciliation.reserve_order(application_id, amount, payment_doc)
+        for _ in range(5)])
+    assert results.count(None) == 1
+
+    # Reservation with order is returned as it is
+    await reconciliation.attach_order(application_id, amount, "order_test")
+    result = await reconciliation.reserve_order(
+        application_id, amount, payment_doc)
+    assert result.get("order_id") == "order_test"
+    assert await DatabaseConfiguration().payment_collection.count_documents(
+        {"idempotency_key": key}) == 1
+    await DatabaseConfiguration().payment_collection.delete_many(
+        {"idempotency_key": key})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_captured_payment(setup_module):
+    """
+    Unique indexes of payment collection are created and a captured payment
+    recorded by concurrent requests is inserted only once.
+
+    Params:\n
+        setup_module: A fixture which upload necessary data in the db before
+            test cases start running/executing and delete data from collection
+             after test case execution completed.
+
+    Assertions:\n
+        Indexes of payment collection and count of captured payments.
+    """
+    reconciliation, payment_id = PaymentReconciliation(), f"pay_{ObjectId()}"
+    payment_doc = {"payment_id": payment_id, "status": "captured"}
+    await asyncio.gather(*[
+        reconciliation.record_captured_payment(payment_id, dict(payment_doc))
+        for _ in range(5)])
+    indexes = await DatabaseConfiguration().payment_collection.index_information()
+    assert indexes["idempotency_key_1"].get("unique") is True
+    assert indexes["payment_id_captured"].get("unique") is True
+    assert await DatabaseConfiguration().payment_collection.count_documents(
+        {"payment_id": payment_id}) == 1
+    await DatabaseConfiguration().payment_collection.delete_many(
+        {"payment_id": payment_id})
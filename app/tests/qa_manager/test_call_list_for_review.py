@@ -81,3 +81,44 @@ async def test_call_list_authorized_token(
     )
     assert response.status_code == 200
 
+
+
+@pytest.mark.asyncio
+async def test_call_list_invalid_cursor(
+    http_client_test, college_super_admin_access_token, setup_module, test_college_validation
+):
+    """
+    Invalid cursor
+    """
+    response = await http_client_test.post(
+        f"/qa_manager/call_list/"
+        f"?college_id={str(test_college_validation.get('_id'))}&cursor=1234&feature_key={feature_key}",
+        headers={"Authorization": f"Bearer {college_super_admin_access_token}"}
+    )
+    assert response.status_code == 422
+    assert response.json() == {"detail": "Cursor `1234` must be a 12-byte input or a 24-character hex string"}
+
+
+@pytest.mark.asyncio
+async def test_call_list_with_cursor(
+    http_client_test, college_super_admin_access_token, setup_module, test_college_validation
+):
+    """
+    Get the next page of calls with the help of cursor
+    """
+    response = await http_client_test.post(
+        f"/qa_manager/call_list/"
+        f"?college_id={str(test_college_validation.get('_id'))}&page_size=1&feature_key={feature_key}",
+        headers={"Authorization": f"Bearer {college_super_admin_access_token}"}
+    )
+    assert response.status_code == 200
+    next_cursor = response.json().get("next_cursor")
+    if next_cursor:
+        response = await http_client_test.post(
+            f"/qa_manager/call_list/"
+            f"?college_id={str(test_college_validation.get('_id'))}&page_size=1"
+            f"&cursor={next_cursor}&feature_key={feature_key}",
+            headers={"Authorization": f"Bearer {college_super_admin_access_token}"}
+        )
+        assert response.status_code == 200
+        assert next_cursor not in [call.get("_id") for call in response.json().get("data")]
@@ -0,0 +1,48 @@
+"""
+This file contains test cases related to compiled permission maps of users.
+"""
+import pytest
+from bson import ObjectId
+
+from app.core.custom_error import CustomError
+from app.core.utils import utility_obj
+from app.database.motor_base_singleton import MotorBaseSingleton
+from app.helpers.roles import feature_permissions
+from app.helpers.roles.feature_permissions import FeaturePermissionMap
+
+
+@pytest.mark.asyncio
+async def test_cached_map_checks_associated_college(monkeypatch):
+    """
+    Requested college is checked against the associated colleges of user
+    even when permission map of user is cached, map is cached per requested
+    college.
+    """
+    college_ids = [str(ObjectId()), str(ObjectId())]
+    master = {"college_id": college_ids[0]}
+    fetched = []
+
+    class FakeMasterDatabase:
+        master_data = master
+
+    async def get_user_feature_permissions(user, dashboard_type, college_id):
+        fetched.append(master.get("college_id"))
+        return {"feature": {"visibility": True, "permissions": {"read": True}}}
+
+    monkeypatch.setattr(MotorBaseSingleton, "get_instance",
+                        staticmethod(lambda: FakeMasterDatabase()))
+    monkeypatch.setattr(utility_obj, "get_user_feature_permissions",
+                        get_user_feature_permissions)
+    monkeypatch.setattr(feature_permissions, "_permission_maps", {})
+    user = {"role": {"role_id": "1"}, "associated_colleges": college_ids}
+
+    for college_id in college_ids + college_ids:
+        master["college_id"] = college_id
+        _, compiled = await FeaturePermissionMap().get(user)
+        assert FeaturePermissionMap().is_allowed(compiled, "feature", "read")
+    assert fetched == college_ids
+
+    master["college_id"] = str(ObjectId())
+    with pytest.raises(CustomError) as error:
+        await FeaturePermissionMap().get(user)
+    assert error.value.message == "College ID not found in associated colleges."
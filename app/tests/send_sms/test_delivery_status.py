@@ -0,0 +1,37 @@
+"""
+This file contains test cases related to buffered update of SMS delivery
+status.
+"""
+import pytest
+
+from app.helpers.sms_activity import delivery_status
+from app.helpers.sms_activity.delivery_status import SMSDeliveryStatus
+
+
+@pytest.mark.asyncio
+async def test_pending_delivery_statuses_written_on_close(monkeypatch):
+    """
+    Pending delivery statuses are merged by transaction and written when app
+    shuts down.
+    """
+    written = []
+
+    async def write(self, database, statuses):
+        written.extend(statuses)
+
+    monkeypatch.setattr(SMSDeliveryStatus, "write", write)
+    monkeypatch.setattr(delivery_status, "FLUSH_INTERVAL", 60)
+    await SMSDeliveryStatus().add({"transactionId": "123456",
+                                   "sms_delivered": True})
+    await SMSDeliveryStatus().add({"transactionId": "123456",
+                                   "sms_delivered": False,
+                                   "description": "Delivered"})
+    await SMSDeliveryStatus().add({"transactionId": "123457",
+                                   "sms_delivered": False})
+    assert written == []
+    assert await SMSDeliveryStatus().close() == 2
+    assert sorted(written, key=lambda status: status["transactionId"]) == [
+        {"transactionId": 123456, "sms_delivered": True,
+         "description": "Delivered"},
+        {"transactionId": 123457, "sms_delivered": False}]
+    assert delivery_status._flush_task is None
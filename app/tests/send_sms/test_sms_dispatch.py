@@ -0,0 +1,91 @@
+"""
+This file contains test cases related to dispatch of SMS in batches.
+"""
+import httpx
+import pytest
+
+from app.helpers.sms_activity import sms_dispatch
+from app.helpers.sms_activity.sms_dispatch import (
+    RECIPIENT_BATCH_SIZE, SMSDispatcher)
+
+
+def get_dispatcher() -> SMSDispatcher:
+    """
+    Get a SMS dispatcher which sends one request at a time.
+    """
+    return SMSDispatcher({"username": "test", "password": "test"}, "1234",
+                         "sender", max_concurrency=1)
+
+
+def get_submit_response(payload: dict, received: dict) -> dict:
+    """
+    Get the submit response of provider, a transaction id of request for
+    every recipient.
+    """
+    return {"status": "success",
+            "submitResponses": [
+                {"mobile": recipient["mobile"],
+                 "transactionId": f"{len(received['payloads'])}"}
+                for recipient in payload["recpients"]]}
+
+
+@pytest.fixture
+def provider(fake_provider):
+    """
+    Send the SMS requests to a fake provider.
+    """
+    return fake_provider(sms_dispatch, get_submit_response)
+
+
+def test_group_recipients_by_message():
+    """
+    Recipients are grouped by message text, a group is split after
+    `RECIPIENT_BATCH_SIZE` recipients and keeps each recipient's index.
+    """
+    messages = [(f"9198765{index:05}", "Hello")
+                for index in range(RECIPIENT_BATCH_SIZE + 10)]
+    messages.insert(1, ("919876543210", "Bye"))
+    packed = get_dispatcher().pack(messages)
+    assert [(content, len(recipients)) for content, recipients in packed] == [
+        ("Hello", RECIPIENT_BATCH_SIZE), ("Hello", 10), ("Bye", 1)]
+    assert packed[2][1] == [(1, "919876543210")]
+    assert packed[0][1][:2] == [(0, messages[0][0]), (2, messages[2][0])]
+
+
+@pytest.mark.asyncio
+async def test_submit_responses_in_message_order(provider):
+    """
+    Submit responses of all batches come back in the order of messages; when
+    a batch is lost, response is 503 and its recipients have empty entries.
+    """
+    messages = [(f"9198765{index:05}", "Hello" if index % 2 else "Bye")
+                for index in range(RECIPIENT_BATCH_SIZE * 2 + 2)]
+    provider["errors"] = [httpx.ConnectError]
+    response = await get_dispatcher().dispatch(messages)
+    assert response.status_code == 200
+    assert response.json()["status"] == "success"
+    assert [submit_response["mobile"] for submit_response in
+            response.json()["submitResponses"]] == [
+        mobile_number for mobile_number, _ in messages]
+    assert len(provider["payloads"]) == 4
+
+    provider["errors"] = [httpx.ReadTimeout]
+    response = await get_dispatcher().dispatch(messages)
+    assert response.status_code == 503
+    submit_responses = response.json()["submitResponses"]
+    assert sum(1 for submit_response in submit_responses
+               if not submit_response) == RECIPIENT_BATCH_SIZE
+
+
+@pytest.mark.asyncio
+async def test_sms_rate_limit_retried(provider):
+    """
+    The SMS batch is re-sent after a 429, the 500 after it is final and
+    counted as failed in metrics.
+    """
+    provider["status_codes"] = [429, 500]
+    dispatcher = get_dispatcher()
+    response = await dispatcher.dispatch([("919876543210", "Hello")])
+    assert response.status_code == 500
+    assert len(provider["payloads"]) == 2
+    assert dispatcher.metrics.summary()["failed"] == 1
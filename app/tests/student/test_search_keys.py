@@ -0,0 +1,90 @@
+"""
+This file contains test cases related to search keys of student, application
+and raw data documents.
+"""
+import re
+
+from app.helpers.student_helper.search_keys import SearchKeyHelper
+
+STUDENT = {
+    "user_name": "Rahul.Kumar@Example.com",
+    "basic_details": {
+        "first_name": "Ráhul",
+        "middle_name": "",
+        "last_name": "Kumar",
+        "mobile_number": "+91 9876543210",
+    },
+}
+
+
+def is_matched(query: dict, document: dict) -> bool:
+    """
+    Check whether a search query matches the search fields of a document.
+    """
+    for condition in query.get("$or", []):
+        field, value = next(iter(condition.items()))
+        if "$all" in value and set(value["$all"]).issubset(
+                document.get(field, [])):
+            return True
+        if "$regex" in value and re.match(
+                value["$regex"], document.get(field, "")):
+            return True
+    return False
+
+
+def test_build_search_fields_of_student():
+    """
+    Search fields of student are normalized.
+    """
+    search_fields = SearchKeyHelper().for_student(STUDENT)
+    assert search_fields["search_email"] == "rahul.kumar@example.com"
+    assert search_fields["search_mobile"] == "9876543210"
+    assert {"r", "ra", "rah", "ahu", "hul", "k", "ku", "kum", "uma",
+            "mar"} == set(search_fields["search_keys"])
+
+
+def test_search_query_empty_search():
+    """
+    Search query is empty when search term is empty.
+    """
+    assert SearchKeyHelper().get_search_query("  ") == {}
+    assert SearchKeyHelper().get_search_query(None) == {}
+
+
+def test_search_query_matches_name_email_and_mobile():
+    """
+    Search query matches the name, email prefix and mobile number prefix.
+    """
+    search_fields = SearchKeyHelper().for_student(STUDENT)
+    for search in ["rahul", "Rahul Kum", "hul", "RAHUL.KUMAR@exa",
+                   "98765", "9876543210"]:
+        assert is_matched(
+            SearchKeyHelper().get_search_query(search), search_fields), search
+    for search in ["rohit", "kumar@example", "87654"]:
+        assert not is_matched(
+            SearchKeyHelper().get_search_query(search), search_fields), search
+
+
+def test_search_query_mobile_number_with_country_code():
+    """
+    Search query matches the mobile number when search term has country code
+    or trunk prefix.
+    """
+    search_fields = SearchKeyHelper().for_student(STUDENT)
+    for search in ["+91 98765", "+91-9876543210", "+919876543210",
+                   "0091 98765", "919876543210", "098765", "+9198765"]:
+        assert is_matched(
+            SearchKeyHelper().get_search_query(search), search_fields), search
+    assert not is_matched(
+        SearchKeyHelper().get_search_query("+91 87654"), search_fields)
+
+
+def test_search_query_with_prefix():
+    """
+    Search fields of query are prefixed when fields are nested.
+    """
+    query = SearchKeyHelper().get_search_query(
+        "98765", prefix="primary_details.")
+    assert {next(iter(condition)) for condition in query["$or"]} == {
+        "primary_details.search_keys", "primary_details.search_email",
+        "primary_details.search_mobile"}
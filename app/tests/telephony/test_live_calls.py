@@ -0,0 +1,171 @@
+"""
+This file contains test cases related to live call state of telephony call
+popup and incremental updates pushed to the popup.
+"""
+import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.helpers.telephony import call_popup_websocket
+from app.helpers.telephony.call_popup_websocket import ConnectionManager, manager
+from app.helpers.telephony.telephony_webhook_helper import TelephonyWebhook
+
+
+class FakePipeline:
+    """
+    A fake redis pipeline which runs the commands on execute.
+    """
+
+    def __init__(self, redis):
+        self.redis, self.commands = redis, []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append(
+            (name, args, kwargs))
+
+    async def execute(self):
+        for name, args, kwargs in self.commands:
+            await getattr(self.redis, name)(*args, **kwargs)
+
+
+class FakeRedis:
+    """
+    A fake redis client which keeps the hashes in memory.
+    """
+
+    def __init__(self):
+        self.hashes = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        self.hashes.setdefault(key, {}).update(
+            mapping or {field: value})
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hdel(self, key, field):
+        self.hashes.get(key, {}).pop(field, None)
+
+
+@pytest.fixture
+def live_calls(monkeypatch):
+    """
+    Keep the live call state in a fake redis and return the state with the
+    deltas published to the popup.
+    """
+    redis, published = FakeRedis(), []
+
+    async def publish_call_activity(self, key, delta):
+        published.append((key, delta))
+
+    monkeypatch.setattr(call_popup_websocket, "get_redis_client", lambda: redis)
+    monkeypatch.setattr(ConnectionManager, "get_live_calls_key",
+                        lambda self, user_id: f"{user_id}_telephony_calls")
+    monkeypatch.setattr(ConnectionManager, "publish_call_activity",
+                        publish_call_activity)
+    return redis, published
+
+
+def get_call(user_id: str, student_id: ObjectId, status: str = "Originate",
+             show_popup: bool = True) -> dict:
+    """
+    Get an outbound call activity document.
+    """
+    return {"_id": ObjectId(), "type": "Outbound", "call_from": ObjectId(user_id),
+            "call_to": student_id, "call_to_number": 9876543210,
+            "call_to_name": "Test", "status": status, "show_popup": show_popup,
+            "starttime": datetime.datetime.utcnow()}
+
+
+@pytest.mark.asyncio
+async def test_live_calls_delta_payloads(live_calls):
+    """
+    Changed call and id of removed call are published as delta, live call
+    state is replaced by the full call activity.
+    """
+    redis, published = live_calls
+    user_id = str(ObjectId())
+    await manager.set_live_calls(user_id, [{"call_id": "1"}, {"call_id": "2"}])
+    assert set(redis.hashes[f"{user_id}_telephony_calls"]) == {"1", "2"}
+
+    await manager.update_live_call(user_id, {"call_id": "3"})
+    await manager.remove_live_call(user_id, "1")
+    assert published == [
+        (f"{user_id}_telephony", {"data": [{"call_id": "3"}], "removed": []}),
+        (f"{user_id}_telephony", {"data": [], "removed": ["1"]})]
+    assert set(redis.hashes[f"{user_id}_telephony_calls"]) == {"2", "3"}
+    assert await manager.get_live_call(user_id, "3") == {"call_id": "3"}
+
+    await manager.set_live_calls(user_id, [])
+    assert await manager.get_live_call(user_id, "2") is None
+
+
+@pytest.mark.asyncio
+async def test_send_call_activity_delta():
+    """
+    Published delta is sent to the popup with `is_delta` flag.
+    """
+
+    class FakeWebSocket:
+        def __init__(self):
+            self.messages = []
+
+        async def send_json(self, data):
+            self.messages.append(data)
+
+    websocket = FakeWebSocket()
+    await manager.send_call_activity(websocket, {"removed": ["1"]})
+    assert websocket.messages == [
+        {"data": [], "removed": ["1"], "is_delta": True}]
+
+
+@pytest.mark.asyncio
+async def test_update_live_call_reuse_application_list(live_calls, monkeypatch):
+    """
+    Applications of student are fetched only for a new call, an updated call
+    reuses the applications from the live call state and a call without popup
+    is removed.
+    """
+    redis, published = live_calls
+    fetched = []
+
+    async def get_application_list(self, student_id):
+        fetched.append(student_id)
+        return [{"application_id": str(student_id)}]
+
+    monkeypatch.setattr(TelephonyWebhook, "get_application_list",
+                        get_application_list)
+    user_id, student_id = str(ObjectId()), ObjectId()
+    call = get_call(user_id, student_id)
+    await TelephonyWebhook().update_live_call(user_id, call)
+    assert fetched == [student_id]
+
+    call["status"] = "Answered"
+    await TelephonyWebhook().update_live_call(user_id, call)
+    assert fetched == [student_id]
+    popup_data = published[-1][1]["data"][0]
+    assert popup_data["is_call_end"] is True
+    assert popup_data["application_list"] == [
+        {"application_id": str(student_id)}]
+
+    call["show_popup"] = False
+    await TelephonyWebhook().update_live_call(user_id, call)
+    assert published[-1][1] == {"data": [], "removed": [str(call["_id"])]}
+    assert await manager.get_live_call(user_id, str(call["_id"])) is None
+    assert len(fetched) == 1
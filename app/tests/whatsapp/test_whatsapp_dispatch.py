@@ -0,0 +1,92 @@
+"""
+This file contains test cases related to dispatch of whatsapp messages in
+batches.
+"""
+import httpx
+import pytest
+
+from app.core.utils import settings
+from app.helpers.whatsapp_sms_activity import whatsapp_dispatch
+from app.helpers.whatsapp_sms_activity.whatsapp_dispatch import (
+    ADDRESS_BATCH_SIZE, WhatsappDispatcher)
+
+SEND_URL = "https://whatsapp.test/send"
+TOKEN_URL = "https://whatsapp.test/token"
+
+
+def get_message(number: str, text: str = "Hello") -> tuple:
+    """
+    Get a whatsapp message having one address.
+    """
+    return number, {"@VER": "1.2", "SMS": [
+        {"@TEXT": text, "ADDRESS": [{"@FROM": "sender", "@TO": number}]}]}
+
+
+@pytest.fixture
+def provider(fake_provider, monkeypatch):
+    """
+    Send the whatsapp requests to a fake provider, provider returns a token
+    and a GUID of every request.
+    """
+    monkeypatch.setattr(settings, "send_whatsapp_url", SEND_URL)
+    monkeypatch.setattr(settings, "generate_whatsapp_token", TOKEN_URL)
+    monkeypatch.setattr(settings, "whatsapp_username", "test")
+    monkeypatch.setattr(settings, "whatsapp_password", "test")
+    monkeypatch.setattr(whatsapp_dispatch, "_token_cache", {})
+    return fake_provider(
+        whatsapp_dispatch,
+        lambda payload, received: {"GUID": str(len(received["payloads"]))},
+        fixed_responses={TOKEN_URL: {"token": "token"}})
+
+
+def test_pack_addresses_by_text():
+    """
+    Addresses of same text are packed into one provider message, a message
+    has at most `ADDRESS_BATCH_SIZE` addresses numbered from 1.
+    """
+    messages = [get_message(f"91987654{index:04}")
+                for index in range(ADDRESS_BATCH_SIZE + 50)]
+    messages.append(get_message("919876543210", text="Bye"))
+    packed = WhatsappDispatcher().pack(messages)
+    assert [len(numbers) for _, numbers in packed] == [
+        ADDRESS_BATCH_SIZE, 50, 1]
+    payload, numbers = packed[1]
+    addresses = payload["SMS"][0]["ADDRESS"]
+    assert [address["@TO"] for address in addresses] == numbers
+    assert [address["@SEQ"] for address in addresses] == [
+        str(index) for index in range(1, 51)]
+    assert payload["SMS"][0]["@TEXT"] == "Hello"
+    assert packed[2][0]["SMS"][0]["@TEXT"] == "Bye"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_returns_numbers_of_batch(provider):
+    """
+    A connection error is retried, a read timeout is not; every delivered
+    batch is returned along with the numbers it carried.
+    """
+    messages = [get_message(f"91987654{index:04}")
+                for index in range(ADDRESS_BATCH_SIZE + 1)]
+    provider["errors"] = [httpx.ConnectError]
+    results = await WhatsappDispatcher(max_concurrency=1).dispatch(messages)
+    assert [len(numbers) for _, numbers in results] == [ADDRESS_BATCH_SIZE, 1]
+    assert sorted(number for _, numbers in results for number in numbers) == [
+        number for number, _ in messages]
+    assert all(response.status_code == 200 for response, _ in results)
+    assert len(provider["payloads"]) == 2
+
+    provider["errors"] = [httpx.ReadTimeout]
+    results = await WhatsappDispatcher(max_concurrency=1).dispatch(messages)
+    assert [len(numbers) for _, numbers in results] == [1]
+
+
+@pytest.mark.asyncio
+async def test_whatsapp_rate_limit_retried(provider):
+    """
+    A 429 from provider is sent again, the following 500 is returned as it
+    is.
+    """
+    provider["status_codes"] = [429, 500]
+    results = await WhatsappDispatcher().dispatch([get_message("919876543210")])
+    assert [response.status_code for response, _ in results] == [500]
+    assert len(provider["payloads"]) == 2
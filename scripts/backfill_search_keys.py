@@ -0,0 +1,91 @@
+"""
+Search Keys Backfill Script
+
+This script stores the search keys (see `SearchKeyHelper`) in the students, applications and raw data which are created
+before search keys were maintained on write. Searches match only the documents which have search keys, hence the script
+should be run once for every college when search keys are deployed.
+
+Functions:
+-----------
+backfill_college(college_id, batch_size):
+    Stores the search keys in the documents of a college in batches.
+
+main(college_ids, batch_size):
+    Stores the search keys in the documents of colleges, all the configured colleges when college ids are not given.
+
+Usage:
+------
+1. Set the environment variables of application (same as the web application).
+2. Run the script from the root directory of repository.
+   e.g., python -m scripts.backfill_search_keys [college_id ...]
+"""
+
+import asyncio
+import logging
+import sys
+
+from app.core.reset_credentials import Reset_the_settings
+from app.database.configuration import DatabaseConfiguration
+from app.helpers.student_helper.search_keys import SearchKeyHelper
+
+BATCH_SIZE = 1000
+
+
+async def backfill_college(college_id: str, batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Store the search keys in the students, applications and raw data of a college.
+
+    Params:
+        college_id (str): An unique identifier of college.
+        batch_size (int): Number of documents updated at a time.
+
+    Returns:
+        dict: A dictionary which contains number of documents updated by collection.
+    """
+    Reset_the_settings().check_college_mapped(college_id)
+    search_key_obj = SearchKeyHelper()
+    backfills = {
+        "studentsPrimaryDetails": lambda: search_key_obj.backfill(
+            DatabaseConfiguration().studentsPrimaryDetails, search_key_obj.for_student, batch_size),
+        # Applications are updated after students because keys of application are built from its student
+        "studentApplicationForms": lambda: search_key_obj.backfill_applications(batch_size),
+        "raw_data": lambda: search_key_obj.backfill(
+            DatabaseConfiguration().raw_data, search_key_obj.for_raw_data, batch_size),
+    }
+    updated = {}
+    for collection, backfill in backfills.items():
+        updated[collection] = 0
+        while (count := await backfill()) > 0:
+            updated[collection] += count
+        logging.info(f"Search keys stored in {updated[collection]} documents of '{collection}' of college "
+                     f"'{college_id}'.")
+    return updated
+
+
+async def main(college_ids: list, batch_size: int = BATCH_SIZE) -> None:
+    """
+    Store the search keys in the documents of colleges.
+
+    Params:
+        college_ids (list): Unique identifiers of colleges, all the configured colleges when list is empty.
+        batch_size (int): Number of documents updated at a time.
+
+    Returns:
+        None
+    """
+    if not college_ids:
+        college_ids = [
+            str(college.get("_id"))
+            async for college in DatabaseConfiguration().college_collection.find(
+                {"is_configured": True}, {"_id": 1})
+        ]
+    for college_id in college_ids:
+        try:
+            await backfill_college(college_id, batch_size)
+        except Exception as error:
+            logging.error(f"Failed to store search keys of college '{college_id}': {error}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(sys.argv[1:]))
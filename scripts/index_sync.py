@@ -70,6 +70,8 @@ def get_collection_indexes(database, collection_name: str, get_names: bool = Fal
             data_dict = {"keys": dict(sorted(output_dict.items()))}
         if index_details.get('unique'):
             data_dict["type"] = "Unique Index"
+        if index_details.get('sparse'):
+            data_dict["sparse"] = True
         formatted_indexes.append(data_dict)
     return formatted_indexes
 
@@ -112,7 +114,7 @@ def sync_indexes(source_db: Database, target_db: Database) -> None:
                     del index["type"]
                 missing_indexes.append(index)
         for index in missing_indexes:
-            target_db[collection_name].create_index(index["keys"], unique=True if "type" in index else False)
+            target_db[collection_name].create_index(index["keys"], unique=True if "type" in index else False, sparse=index.get("sparse", False))
             logging.info(f"{index['keys']} index is created for collection {collection_name}.")
 
 
@@ -144,7 +146,7 @@ def delete_extra_indexes(source_db: Database, target_db: Database) -> None:
                         logging.info(
                             f"{index['keys']} present without unique property, recreating the same unique index.")
                         target_db[collection_name].drop_index(index_name)
-                        target_db[collection_name].create_index(index["keys"], unique=True if "type" in index else False)
+                        target_db[collection_name].create_index(index["keys"], unique=True if "type" in index else False, sparse=index.get("sparse", False))
                         continue
                     index['type'] = index_type
                 else:
@@ -153,7 +155,7 @@ def delete_extra_indexes(source_db: Database, target_db: Database) -> None:
                         logging.info(
                             f"{index['keys']} present with unique property, recreating the same non unique index.")
                         target_db[collection_name].drop_index(index_name)
-                        target_db[collection_name].create_index(index["keys"], unique=True if "type" in index else False)
+                        target_db[collection_name].create_index(index["keys"], unique=True if "type" in index else False, sparse=index.get("sparse", False))
                         continue
                     del index["type"]
                 index["name"] = index_name
@@ -126,6 +126,12 @@ indexes = {
         }
     ],
     "communicationLog": [
+        {
+            "name": "sms_summary.transaction_id.transactionId_1",
+            "keys": {
+                "sms_summary.transaction_id.transactionId": 1
+            }
+        },
         {
             "name": "student_id_1",
             "keys": {
@@ -133,7 +139,23 @@ indexes = {
             }
         }
     ],
+    "payments": [
+        {
+            "name": "idempotency_key_1",
+            "keys": {
+                "idempotency_key": 1
+            },
+            "type": "Unique Index",
+            "sparse": True
+        }
+    ],
     "whatsapp_sms_activity": [
+        {
+            "name": "guid_1",
+            "keys": {
+                "guid": 1
+            }
+        },
         {
             "name": "send_to_1",
             "keys": {
@@ -191,6 +213,36 @@ indexes = {
                 "call_to": 1,
                 "show_popup": 1
             }
+        },
+        {
+            "name": "created_at_-1__id_-1",
+            "keys": {
+                "created_at": -1,
+                "_id": -1
+            }
+        },
+        {
+            "name": "type_1_created_at_-1__id_-1",
+            "keys": {
+                "type": 1,
+                "created_at": -1,
+                "_id": -1
+            }
+        },
+        {
+            "name": "call_from_1_type_1_created_at_-1__id_-1",
+            "keys": {
+                "call_from": 1,
+                "type": 1,
+                "created_at": -1,
+                "_id": -1
+            }
+        },
+        {
+            "name": "qced.0.date_time_-1",
+            "keys": {
+                "qced.0.date_time": -1
+            }
         }
     ],
     "studentSecondaryDetails": [
@@ -218,6 +270,24 @@ indexes = {
         }
     ],
     "raw_data": [
+        {
+            "name": "search_keys_1",
+            "keys": {
+                "search_keys": 1
+            }
+        },
+        {
+            "name": "search_email_1",
+            "keys": {
+                "search_email": 1
+            }
+        },
+        {
+            "name": "search_mobile_1",
+            "keys": {
+                "search_mobile": 1
+            }
+        },
         {
             "name": "created_at_-1",
             "keys": {
@@ -226,6 +296,12 @@ indexes = {
         }
     ],
     "sms_activity": [
+        {
+            "name": "sms_response.submitResponses.transactionId_1",
+            "keys": {
+                "sms_response.submitResponses.transactionId": 1
+            }
+        },
         {
             "name": "sms_response.submitResponses.state_1",
             "keys": {
@@ -240,6 +316,12 @@ indexes = {
         }
     ],
     "automation_communicationLog": [
+        {
+            "name": "sms_summary.transaction_id.transactionId_1",
+            "keys": {
+                "sms_summary.transaction_id.transactionId": 1
+            }
+        },
         {
             "name": "student_id_1",
             "keys": {
@@ -254,6 +336,24 @@ indexes = {
         }
     ],
     "studentsPrimaryDetails": [
+        {
+            "name": "search_keys_1",
+            "keys": {
+                "search_keys": 1
+            }
+        },
+        {
+            "name": "search_email_1",
+            "keys": {
+                "search_email": 1
+            }
+        },
+        {
+            "name": "search_mobile_1",
+            "keys": {
+                "search_mobile": 1
+            }
+        },
         {
             "name": "user_name_1",
             "keys": {
@@ -424,6 +524,24 @@ indexes = {
         }
     ],
     "studentApplicationForms": [
+        {
+            "name": "search_keys_1",
+            "keys": {
+                "search_keys": 1
+            }
+        },
+        {
+            "name": "search_email_1",
+            "keys": {
+                "search_email": 1
+            }
+        },
+        {
+            "name": "search_mobile_1",
+            "keys": {
+                "search_mobile": 1
+            }
+        },
         {
             "name": "current_stage_1",
             "keys": {
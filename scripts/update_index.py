@@ -117,7 +117,7 @@ def create_indexes(collection: str, indexes: List[Dict[str, Union[str, Dict[str,
             if not index_exist(formatted_indexes, index['keys']):
                 index_name = hashlib.md5(index["name"].encode('utf-8')).hexdigest()
                 try:
-                    db[collection].create_index(index.get("keys"), name=index_name, unique=True if "type" in index else False)
+                    db[collection].create_index(index.get("keys"), name=index_name, unique=True if "type" in index else False, sparse=index.get("sparse", False))
                     logging.info(
                         f"Created index '{index_name}' on '{collection}' for field '{index}'.")
                 except Exception as e: